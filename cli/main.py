@@ -21,6 +21,7 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.agents.utils.report_store import hydrate_state
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
 from cli.utils import *
@@ -61,6 +62,7 @@ class MessageBuffer:
             "Portfolio Manager": "pending",
         }
         self.current_agent = None
+        self.streaming_text = ""  # Tokens of the LLM call currently streaming
         self.report_sections = {
             "market_report": None,
             "sentiment_report": None,
@@ -84,6 +86,17 @@ class MessageBuffer:
             self.agent_status[agent] = status
             self.current_agent = agent
 
+    def add_stream_event(self, event):
+        """Show a node's LLM output in the report panel while its tokens arrive"""
+        if event.type == "llm_start":
+            self.streaming_text = ""
+            if event.node in self.agent_status:
+                self.update_agent_status(event.node, "in_progress")
+        elif event.type == "token":
+            self.streaming_text += event.delta
+            # Only the tail fits in the panel
+            self.current_report = f"### {event.node} (live)\n{self.streaming_text[-3000:]}"
+
     def update_report_section(self, section_name, content):
         if section_name in self.report_sections:
             self.report_sections[section_name] = content
@@ -743,6 +756,7 @@ def run_analysis():
     config["deep_think_llm"] = selections["deep_thinker"]
     config["backend_url"] = selections["backend_url"]
     config["llm_provider"] = selections["llm_provider"].lower()
+    config["stream_tokens"] = True  # Live tokens in the message panel
 
     # Initialize the graph
     graph = TradingAgentsGraph(
@@ -835,246 +849,272 @@ def run_analysis():
         )
         update_display(layout, spinner_text)
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
+        # Initialize state and get graph args; stream node updates (deltas) instead of full state snapshots.
+        # An interrupted run for the same ticker, date and config resumes from its checkpoint (input None)
+        graph_input, args = graph.prepare_run(
+            selections["ticker"], selections["analysis_date"], stream_mode="updates"
+        )
+        init_agent_state = graph_input or graph.propagator.create_initial_state(
             selections["ticker"], selections["analysis_date"]
         )
-        args = graph.propagator.get_graph_args()
+
+        # Live token output from analyst, researcher and manager LLM calls
+        last_refresh = [0.0]
+
+        def on_stream_event(event):
+            message_buffer.add_stream_event(event)
+            now = time.monotonic()
+            if event.type != "token" or now - last_refresh[0] >= 0.25:
+                last_refresh[0] = now
+                update_display(layout)
+
+        unsubscribe = graph.event_bus.subscribe(on_stream_event)
 
         # Stream the analysis
-        trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
-            if len(chunk["messages"]) > 0:
-                # Get the last message from the chunk
-                last_message = chunk["messages"][-1]
-
-                # Extract message content and type
-                if hasattr(last_message, "content"):
-                    content = extract_content_string(last_message.content)  # Use the helper function
-                    msg_type = "Reasoning"
-                else:
-                    content = str(last_message)
-                    msg_type = "System"
-
-                # Add message to buffer
-                message_buffer.add_message(msg_type, content)                
-
-                # If it's a tool call, add it to tool calls
-                if hasattr(last_message, "tool_calls"):
-                    for tool_call in last_message.tool_calls:
-                        # Handle both dictionary and object tool calls
-                        if isinstance(tool_call, dict):
-                            message_buffer.add_tool_call(
-                                tool_call["name"], tool_call["args"]
-                            )
+        final_state = dict(init_agent_state)
+        try:
+            for update in graph.graph.stream(graph_input, **args):
+                for node_name, chunk in update.items():
+                    if not chunk:
+                        continue
+                    # Offloaded reports arrive as report store references
+                    chunk = hydrate_state(chunk)
+                    final_state.update({key: value for key, value in chunk.items() if key != "messages"})
+
+                    messages = chunk.get("messages") or []
+                    if messages:
+                        # Get the last message from the chunk
+                        last_message = messages[-1]
+
+                        # Extract message content and type
+                        if hasattr(last_message, "content"):
+                            content = extract_content_string(last_message.content)  # Use the helper function
+                            msg_type = "Reasoning"
                         else:
-                            message_buffer.add_tool_call(tool_call.name, tool_call.args)
-
-                # Update reports and agent status based on chunk content
-                # Analyst Team Reports
-                if "market_report" in chunk and chunk["market_report"]:
-                    message_buffer.update_report_section(
-                        "market_report", chunk["market_report"]
-                    )
-                    message_buffer.update_agent_status("Market Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "social" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Social Analyst", "in_progress"
-                        )
-
-                if "sentiment_report" in chunk and chunk["sentiment_report"]:
-                    message_buffer.update_report_section(
-                        "sentiment_report", chunk["sentiment_report"]
-                    )
-                    message_buffer.update_agent_status("Social Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "news" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "News Analyst", "in_progress"
+                            content = str(last_message)
+                            msg_type = "System"
+
+                        # Add message to buffer
+                        message_buffer.add_message(msg_type, content)
+
+                        # If it's a tool call, add it to tool calls
+                        if hasattr(last_message, "tool_calls"):
+                            for tool_call in last_message.tool_calls:
+                                # Handle both dictionary and object tool calls
+                                if isinstance(tool_call, dict):
+                                    message_buffer.add_tool_call(
+                                        tool_call["name"], tool_call["args"]
+                                    )
+                                else:
+                                    message_buffer.add_tool_call(tool_call.name, tool_call.args)
+
+                    # Update reports and agent status based on chunk content
+                    # Analyst Team Reports
+                    if "market_report" in chunk and chunk["market_report"]:
+                        message_buffer.update_report_section(
+                            "market_report", chunk["market_report"]
                         )
+                        message_buffer.update_agent_status("Market Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "social" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "Social Analyst", "in_progress"
+                            )
 
-                if "news_report" in chunk and chunk["news_report"]:
-                    message_buffer.update_report_section(
-                        "news_report", chunk["news_report"]
-                    )
-                    message_buffer.update_agent_status("News Analyst", "completed")
-                    # Set next analyst to in_progress
-                    if "fundamentals" in selections["analysts"]:
-                        message_buffer.update_agent_status(
-                            "Fundamentals Analyst", "in_progress"
+                    if "sentiment_report" in chunk and chunk["sentiment_report"]:
+                        message_buffer.update_report_section(
+                            "sentiment_report", chunk["sentiment_report"]
                         )
-
-                if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
-                    message_buffer.update_report_section(
-                        "fundamentals_report", chunk["fundamentals_report"]
-                    )
-                    message_buffer.update_agent_status(
-                        "Fundamentals Analyst", "completed"
-                    )
-                    # Set all research team members to in_progress
-                    update_research_team_status("in_progress")
-
-                # Research Team - Handle Investment Debate State
-                if (
-                    "investment_debate_state" in chunk
-                    and chunk["investment_debate_state"]
-                ):
-                    debate_state = chunk["investment_debate_state"]
-
-                    # Update Bull Researcher status and report
-                    if "bull_history" in debate_state and debate_state["bull_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bull response
-                        bull_responses = debate_state["bull_history"].split("\n")
-                        latest_bull = bull_responses[-1] if bull_responses else ""
-                        if latest_bull:
-                            message_buffer.add_message("Reasoning", latest_bull)
-                            # Update research report with bull's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"### Bull Researcher Analysis\n{latest_bull}",
+                        message_buffer.update_agent_status("Social Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "news" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "News Analyst", "in_progress"
                             )
 
-                    # Update Bear Researcher status and report
-                    if "bear_history" in debate_state and debate_state["bear_history"]:
-                        # Keep all research team members in progress
-                        update_research_team_status("in_progress")
-                        # Extract latest bear response
-                        bear_responses = debate_state["bear_history"].split("\n")
-                        latest_bear = bear_responses[-1] if bear_responses else ""
-                        if latest_bear:
-                            message_buffer.add_message("Reasoning", latest_bear)
-                            # Update research report with bear's latest analysis
-                            message_buffer.update_report_section(
-                                "investment_plan",
-                                f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
+                    if "news_report" in chunk and chunk["news_report"]:
+                        message_buffer.update_report_section(
+                            "news_report", chunk["news_report"]
+                        )
+                        message_buffer.update_agent_status("News Analyst", "completed")
+                        # Set next analyst to in_progress
+                        if "fundamentals" in selections["analysts"]:
+                            message_buffer.update_agent_status(
+                                "Fundamentals Analyst", "in_progress"
                             )
 
-                    # Update Research Manager status and final decision
-                    if (
-                        "judge_decision" in debate_state
-                        and debate_state["judge_decision"]
-                    ):
-                        # Keep all research team members in progress until final decision
-                        update_research_team_status("in_progress")
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Research Manager: {debate_state['judge_decision']}",
-                        )
-                        # Update research report with final decision
+                    if "fundamentals_report" in chunk and chunk["fundamentals_report"]:
                         message_buffer.update_report_section(
-                            "investment_plan",
-                            f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
+                            "fundamentals_report", chunk["fundamentals_report"]
                         )
-                        # Mark all research team members as completed
-                        update_research_team_status("completed")
-                        # Set first risk analyst to in_progress
                         message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
+                            "Fundamentals Analyst", "completed"
                         )
+                        # Set all research team members to in_progress
+                        update_research_team_status("in_progress")
 
-                # Trading Team
-                if (
-                    "trader_investment_plan" in chunk
-                    and chunk["trader_investment_plan"]
-                ):
-                    message_buffer.update_report_section(
-                        "trader_investment_plan", chunk["trader_investment_plan"]
-                    )
-                    # Set first risk analyst to in_progress
-                    message_buffer.update_agent_status("Risky Analyst", "in_progress")
-
-                # Risk Management Team - Handle Risk Debate State
-                if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
-                    risk_state = chunk["risk_debate_state"]
-
-                    # Update Risky Analyst status and report
+                    # Research Team - Handle Investment Debate State
                     if (
-                        "current_risky_response" in risk_state
-                        and risk_state["current_risky_response"]
+                        "investment_debate_state" in chunk
+                        and chunk["investment_debate_state"]
                     ):
-                        message_buffer.update_agent_status(
-                            "Risky Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Risky Analyst: {risk_state['current_risky_response']}",
-                        )
-                        # Update risk report with risky analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
-                        )
+                        debate_state = chunk["investment_debate_state"]
+
+                        # Update Bull Researcher status and report
+                        if "bull_history" in debate_state and debate_state["bull_history"]:
+                            # Keep all research team members in progress
+                            update_research_team_status("in_progress")
+                            # Extract latest bull response
+                            bull_responses = debate_state["bull_history"].split("\n")
+                            latest_bull = bull_responses[-1] if bull_responses else ""
+                            if latest_bull:
+                                message_buffer.add_message("Reasoning", latest_bull)
+                                # Update research report with bull's latest analysis
+                                message_buffer.update_report_section(
+                                    "investment_plan",
+                                    f"### Bull Researcher Analysis\n{latest_bull}",
+                                )
+
+                        # Update Bear Researcher status and report
+                        if "bear_history" in debate_state and debate_state["bear_history"]:
+                            # Keep all research team members in progress
+                            update_research_team_status("in_progress")
+                            # Extract latest bear response
+                            bear_responses = debate_state["bear_history"].split("\n")
+                            latest_bear = bear_responses[-1] if bear_responses else ""
+                            if latest_bear:
+                                message_buffer.add_message("Reasoning", latest_bear)
+                                # Update research report with bear's latest analysis
+                                message_buffer.update_report_section(
+                                    "investment_plan",
+                                    f"{message_buffer.report_sections['investment_plan']}\n\n### Bear Researcher Analysis\n{latest_bear}",
+                                )
+
+                        # Update Research Manager status and final decision
+                        if (
+                            "judge_decision" in debate_state
+                            and debate_state["judge_decision"]
+                        ):
+                            # Keep all research team members in progress until final decision
+                            update_research_team_status("in_progress")
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Research Manager: {debate_state['judge_decision']}",
+                            )
+                            # Update research report with final decision
+                            message_buffer.update_report_section(
+                                "investment_plan",
+                                f"{message_buffer.report_sections['investment_plan']}\n\n### Research Manager Decision\n{debate_state['judge_decision']}",
+                            )
+                            # Mark all research team members as completed
+                            update_research_team_status("completed")
+                            # Set first risk analyst to in_progress
+                            message_buffer.update_agent_status(
+                                "Risky Analyst", "in_progress"
+                            )
 
-                    # Update Safe Analyst status and report
+                    # Trading Team
                     if (
-                        "current_safe_response" in risk_state
-                        and risk_state["current_safe_response"]
+                        "trader_investment_plan" in chunk
+                        and chunk["trader_investment_plan"]
                     ):
-                        message_buffer.update_agent_status(
-                            "Safe Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Safe Analyst: {risk_state['current_safe_response']}",
-                        )
-                        # Update risk report with safe analyst's latest analysis only
                         message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
+                            "trader_investment_plan", chunk["trader_investment_plan"]
                         )
+                        # Set first risk analyst to in_progress
+                        message_buffer.update_agent_status("Risky Analyst", "in_progress")
+
+                    # Risk Management Team - Handle Risk Debate State
+                    if "risk_debate_state" in chunk and chunk["risk_debate_state"]:
+                        risk_state = chunk["risk_debate_state"]
+
+                        # Update Risky Analyst status and report
+                        if (
+                            "current_risky_response" in risk_state
+                            and risk_state["current_risky_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Risky Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Risky Analyst: {risk_state['current_risky_response']}",
+                            )
+                            # Update risk report with risky analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Risky Analyst Analysis\n{risk_state['current_risky_response']}",
+                            )
 
-                    # Update Neutral Analyst status and report
-                    if (
-                        "current_neutral_response" in risk_state
-                        and risk_state["current_neutral_response"]
-                    ):
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Neutral Analyst: {risk_state['current_neutral_response']}",
-                        )
-                        # Update risk report with neutral analyst's latest analysis only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
-                        )
+                        # Update Safe Analyst status and report
+                        if (
+                            "current_safe_response" in risk_state
+                            and risk_state["current_safe_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Safe Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Safe Analyst: {risk_state['current_safe_response']}",
+                            )
+                            # Update risk report with safe analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Safe Analyst Analysis\n{risk_state['current_safe_response']}",
+                            )
 
-                    # Update Portfolio Manager status and final decision
-                    if "judge_decision" in risk_state and risk_state["judge_decision"]:
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "in_progress"
-                        )
-                        message_buffer.add_message(
-                            "Reasoning",
-                            f"Portfolio Manager: {risk_state['judge_decision']}",
-                        )
-                        # Update risk report with final decision only
-                        message_buffer.update_report_section(
-                            "final_trade_decision",
-                            f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
-                        )
-                        # Mark risk analysts as completed
-                        message_buffer.update_agent_status("Risky Analyst", "completed")
-                        message_buffer.update_agent_status("Safe Analyst", "completed")
-                        message_buffer.update_agent_status(
-                            "Neutral Analyst", "completed"
-                        )
-                        message_buffer.update_agent_status(
-                            "Portfolio Manager", "completed"
-                        )
+                        # Update Neutral Analyst status and report
+                        if (
+                            "current_neutral_response" in risk_state
+                            and risk_state["current_neutral_response"]
+                        ):
+                            message_buffer.update_agent_status(
+                                "Neutral Analyst", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Neutral Analyst: {risk_state['current_neutral_response']}",
+                            )
+                            # Update risk report with neutral analyst's latest analysis only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Neutral Analyst Analysis\n{risk_state['current_neutral_response']}",
+                            )
 
-                # Update the display
-                update_display(layout)
+                        # Update Portfolio Manager status and final decision
+                        if "judge_decision" in risk_state and risk_state["judge_decision"]:
+                            message_buffer.update_agent_status(
+                                "Portfolio Manager", "in_progress"
+                            )
+                            message_buffer.add_message(
+                                "Reasoning",
+                                f"Portfolio Manager: {risk_state['judge_decision']}",
+                            )
+                            # Update risk report with final decision only
+                            message_buffer.update_report_section(
+                                "final_trade_decision",
+                                f"### Portfolio Manager Decision\n{risk_state['judge_decision']}",
+                            )
+                            # Mark risk analysts as completed
+                            message_buffer.update_agent_status("Risky Analyst", "completed")
+                            message_buffer.update_agent_status("Safe Analyst", "completed")
+                            message_buffer.update_agent_status(
+                                "Neutral Analyst", "completed"
+                            )
+                            message_buffer.update_agent_status(
+                                "Portfolio Manager", "completed"
+                            )
+
+                    # Update the display
+                    update_display(layout)
+        finally:
+            unsubscribe()
 
-            trace.append(chunk)
+        # Full state from the checkpoint (covers steps completed before a resume)
+        final_state = graph.finish_run(args, final_state)
 
-        # Get final state and decision
-        final_state = trace[-1]
+        # Get final decision
         decision = graph.process_signal(final_state["final_trade_decision"])
 
         # Update all agent statuses to completed
@@ -1095,6 +1135,14 @@ def run_analysis():
 
         update_display(layout)
 
+        # Report files are written in the background while the final report is displayed
+        outputs = graph.wait_for_artifacts()
+        if outputs:
+            message_buffer.add_message(
+                "Analysis", f"Report saved to {outputs.get('docx') or outputs.get('markdown')}"
+            )
+            update_display(layout)
+
 
 @app.command()
 def analyze():
@@ -7,10 +7,11 @@ Simple web chat interface without Gradio dependency.
 import os
 import sys
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory
 from datetime import datetime
 import json
 import re
+import threading
 import pandas as pd
 import yfinance as yf
 
@@ -26,6 +27,8 @@ sys.path.insert(0, str(project_root))
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.interactive.interactive_workflow import InteractiveWorkflowController
+from tradingagents.interactive.chat_jobs import ChatJobManager, SessionBusyError, ServerBusyError
+from tradingagents.graph.streaming import get_event_bus, stream_scope
 from tradingagents.interactive.user_preference_parser import create_preference_parser
 from tradingagents.interactive.feedback_analyzer import create_feedback_analyzer, FeedbackAction
 from tradingagents.agents.utils.report_generator import generate_comprehensive_word_report
@@ -33,6 +36,7 @@ from tradingagents.agents.utils.report_generator import generate_comprehensive_w
 # WatsonX Configuration
 WATSONX_CONFIG = {
     "llm_provider": "watsonx",
+    "stream_tokens": True,  # Live tokens in the chat
     "watsonx_url": os.getenv("WATSONX_URL") or "https://us-south.ml.cloud.ibm.com",
     "watsonx_api_key": os.getenv("WATSONX_APIKEY") or os.getenv("WATSONX_API_KEY") or "1NlP-L5h1DDEZFKkvJ92uTuMFNbkk0pmGJ4lMutJ44w2",
     "watsonx_project_id": os.getenv("WATSONX_PROJECT_ID") or "394811a9-3e1c-4b80-8031-3fda71e6dce1",
@@ -48,51 +52,88 @@ WATSONX_CONFIG = {
 
 app = Flask(__name__)
 
-# Global state
+# Analyses run as background jobs on a bounded worker pool; each browser session keeps
+# its own conversation state and receives progress over SSE or long-poll
+CHAT_MAX_WORKERS = int(os.getenv("CHAT_MAX_WORKERS", "4"))  # Analyses running at the same time
+CHAT_MAX_PENDING = int(os.getenv("CHAT_MAX_PENDING", "32"))  # Queued + running jobs before rejecting
+LONG_POLL_TIMEOUT = 25  # Max seconds a long-poll request waits
+SSE_HEARTBEAT = 15  # Seconds between keep-alive comments on idle event streams
+
+jobs = ChatJobManager(max_workers=CHAT_MAX_WORKERS, max_pending=CHAT_MAX_PENDING)
+
+# Shared by all sessions (LLM clients, toolkit, memories); workflow state lives in each session's controller
 graph = None
-controller = None
-waiting_for = None  # 'analyst_selection', 'initial_setup', 'feedback', 'optimization_preference', 'final_decision', 'next_stock_prompt', None
-current_analyst = None
-selected_analysts_choice = None  # User's chosen analysts
-pending_ticker = None  # Store ticker while waiting for optimization preference
-pending_analysts = None  # Store selected analysts while waiting for optimization preference
-pending_user_message = None  # Store initial message while waiting for optimization preference
-
-# Portfolio mode state
-portfolio_mode = False
-portfolio_tickers = []  # List of tickers to analyze
-current_portfolio_ticker_index = 0  # Current ticker being analyzed
-portfolio_results = {}  # Store results for each stock: {ticker: {state, report, decision}}
-portfolio_trade_date = None  # Shared trade date for all stocks in portfolio
-portfolio_optimization_preference = None  # Store optimization preference from first stock
-
-
-def initialize_components():
-    """Initialize graph and workflow controller"""
-    global graph, controller
-
-    if not graph:
-        print("[INIT] Creating TradingAgentsGraph...", flush=True)
-        graph = TradingAgentsGraph(
-            selected_analysts=["market", "fundamentals", "news", "social", "quantitative", "comprehensive_quantitative", "visualizer"],  # Include ALL available analysts
-            debug=False,
-            config=WATSONX_CONFIG
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """Create the shared TradingAgentsGraph on first use"""
+    global graph
+
+    with _graph_lock:
+        if graph is None:
+            print("[INIT] Creating TradingAgentsGraph...", flush=True)
+            graph = TradingAgentsGraph(
+                selected_analysts=["market", "fundamentals", "news", "social", "quantitative", "comprehensive_quantitative", "visualizer"],  # Include ALL available analysts
+                debug=False,
+                config=WATSONX_CONFIG
+            )
+    return graph
+
+
+def initialize_components(session):
+    """Initialize the shared graph and the session's workflow controller"""
+    if session.controller is None:
+        shared_graph = get_graph()
+        llm = shared_graph.quick_thinking_llm
+
+        print(f"[INIT] Creating workflow controller for session {session.session_id[:8]}...", flush=True)
+        session.controller = InteractiveWorkflowController(
+            graph=shared_graph,
+            preference_parser=create_preference_parser(llm),
+            feedback_analyzer=create_feedback_analyzer(llm),
+            ui_callback=session.ui_callback
         )
+        print("[INIT] Initialization complete!", flush=True)
 
-        llm = graph.quick_thinking_llm
 
-        print("[INIT] Creating parsers...", flush=True)
-        preference_parser = create_preference_parser(llm)
-        feedback_analyzer = create_feedback_analyzer(llm)
+def _forward_stream_event(event):
+    """Relay LLM token events to the session whose job produced them"""
+    session = jobs.get_session(event.channel)
+    if session is not None:
+        session.publish(event.type, {'node': event.node, 'delta': event.delta})
 
-        print("[INIT] Creating workflow controller...", flush=True)
-        controller = InteractiveWorkflowController(
-            graph=graph,
-            preference_parser=preference_parser,
-            feedback_analyzer=feedback_analyzer,
-            ui_callback=None
-        )
-        print("[INIT] Initialization complete!", flush=True)
+
+get_event_bus().subscribe(_forward_stream_event, event_types=['llm_start', 'token'])
+
+
+def _request_session_id():
+    """Session ID from the JSON body, X-Session-Id header or query string"""
+    data = request.get_json(silent=True) or {}
+    return data.get('session_id') or request.headers.get('X-Session-Id') or request.args.get('session_id')
+
+
+def _as_payload(rv):
+    """Convert a handler's Flask return value into (JSON payload, HTTP status)"""
+    response, status = rv if isinstance(rv, tuple) else (rv, None)
+    return response.get_json(), status or response.status_code
+
+
+def dispatch_message(session, message):
+    """Run the handler for the session's conversation state (called on a job worker)"""
+    with app.app_context(), stream_scope(session.session_id):
+        if session.waiting_for == 'initial_setup':
+            return _as_payload(handle_initial_setup(session, message))
+        if session.waiting_for == 'feedback':
+            return _as_payload(handle_feedback(session, message))
+        if session.waiting_for == 'optimization_preference':
+            return _as_payload(handle_optimization_preference(session, message))
+        if session.waiting_for == 'final_decision':
+            return _as_payload(handle_final_decision_request(session, message))
+        # Portfolio mode
+        if session.waiting_for == 'next_stock_prompt':
+            return _as_payload(handle_next_stock_prompt(session, message))
+        return {'error': 'Invalid state'}, 400
 
 
 @app.route('/')
@@ -103,45 +144,48 @@ def index():
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
-    """Handle chat messages"""
-    global waiting_for, current_analyst
-
+    """
+    Handle chat messages
+
+    Quick conversation steps are answered inline. Steps that run analysts, LLM calls or
+    report generation are queued as a job; the response is 202 with the job ID, and the
+    result is fetched from /api/jobs/<job_id> while progress streams from
+    /api/sessions/<session_id>/events.
+    """
     try:
-        data = request.json
+        data = request.get_json(silent=True) or {}
         message = data.get('message', '').strip()
 
         if not message:
             return jsonify({'error': 'Empty message'}), 400
 
-        # If no state is set, initialize and show welcome
-        if waiting_for is None:
-            return welcome()
-
-        # Handle analyst selection
-        if waiting_for == 'analyst_selection':
-            return handle_analyst_selection(message)
-
-        # Handle initial setup
-        if waiting_for == 'initial_setup':
-            return handle_initial_setup(message)
+        session = jobs.get_session(_request_session_id())
 
-        # Handle feedback
-        if waiting_for == 'feedback':
-            return handle_feedback(message)
+        # Unknown session or no state set: start a conversation and show welcome
+        if session is None or session.waiting_for is None:
+            return welcome_response(session or jobs.create_session())
 
-        # Handle optimization preference
-        if waiting_for == 'optimization_preference':
-            return handle_optimization_preference(message)
+        # Analyst selection only parses the message, answer inline
+        if session.waiting_for == 'analyst_selection':
+            payload, status = _as_payload(handle_analyst_selection(session, message))
+            payload['session_id'] = session.session_id
+            return jsonify(payload), status
 
-        # Handle final decision request
-        if waiting_for == 'final_decision':
-            return handle_final_decision_request(message)
-
-        # Handle next stock prompt (portfolio mode)
-        if waiting_for == 'next_stock_prompt':
-            return handle_next_stock_prompt(message)
+        try:
+            job = jobs.submit(session, dispatch_message, message)
+        except SessionBusyError as e:
+            return jsonify({'error': f'Still working on your previous message. {e}', 'job_id': session.active_job_id}), 409
+        except ServerBusyError:
+            return jsonify({'error': 'The server is busy with other analyses. Please try again shortly.'}), 503
 
-        return jsonify({'error': 'Invalid state'}), 400
+        return jsonify({
+            'job_id': job.job_id,
+            'session_id': session.session_id,
+            'status': job.status,
+            'job_url': f"/api/jobs/{job.job_id}",
+            # Start at this job's job_queued event rather than replaying the session's log
+            'events_url': f"/api/sessions/{session.session_id}/events?after={job.queued_seq - 1}"
+        }), 202
 
     except Exception as e:
         import traceback
@@ -149,11 +193,69 @@ def chat():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Job status and result; ?wait=N long-polls up to N seconds for completion"""
+    job = jobs.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    wait = min(request.args.get('wait', 0, type=float), LONG_POLL_TIMEOUT)
+    if wait > 0:
+        jobs.wait(job, wait)
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/sessions/<session_id>/events', methods=['GET'])
+def session_events(session_id):
+    """
+    Progress events for a session
+
+    Streams Server-Sent Events by default (resumes from Last-Event-ID). With ?poll=1 it
+    long-polls instead and returns the events after ?after=<seq> as JSON.
+    """
+    session = jobs.get_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown session'}), 404
+
+    after = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0, type=int))
+
+    if request.args.get('poll'):
+        timeout = min(request.args.get('timeout', LONG_POLL_TIMEOUT, type=float), LONG_POLL_TIMEOUT)
+        events = session.events_since(after, timeout=timeout)
+        return jsonify({
+            'events': [event.to_dict() for event in events],
+            'last_seq': events[-1].seq if events else after
+        })
+
+    def stream():
+        last_seq = after
+        # Ends when the session expires (the job manager closes it) or the client disconnects
+        while not session.closed:
+            events = session.events_since(last_seq, timeout=SSE_HEARTBEAT)
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                yield event.to_sse()
+                last_seq = event.seq
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/welcome', methods=['GET'])
 def welcome():
-    """Get initial welcome message"""
-    global waiting_for
-    waiting_for = 'analyst_selection'
+    """Get initial welcome message (reuses ?session_id= if known, otherwise starts a session)"""
+    session = jobs.get_session(_request_session_id()) or jobs.create_session()
+    return welcome_response(session)
+
+
+def welcome_response(session):
+    """Reset the session to analyst selection and return the welcome message"""
+    session.waiting_for = 'analyst_selection'
     return jsonify({
         'response': """Welcome to AI Trading Analysis!
 
@@ -174,13 +276,13 @@ Example: "market and fundamentals" or "all"
 
 **Note:** You can analyze multiple stocks for portfolio optimization (e.g., "NVDA, AAPL")
 """,
-        'waiting_for': 'analyst_selection'
+        'waiting_for': 'analyst_selection',
+        'session_id': session.session_id
     })
 
 
-def handle_analyst_selection(message):
+def handle_analyst_selection(session, message):
     """Handle analyst selection"""
-    global waiting_for, selected_analysts_choice
 
     # Parse analyst selection from user message
     message_lower = message.lower()
@@ -220,8 +322,8 @@ Example: "market and fundamentals" or "all"
             'waiting_for': 'analyst_selection'
         })
 
-    selected_analysts_choice = analysts
-    waiting_for = 'initial_setup'
+    session.selected_analysts_choice = analysts
+    session.waiting_for = 'initial_setup'
 
     analyst_names = {
         "market": "Market/Technical",
@@ -247,9 +349,8 @@ Example: "Analyze NVDA. I care about long-term growth and profitability."
     })
 
 
-def handle_initial_setup(message):
+def handle_initial_setup(session, message):
     """Handle initial setup"""
-    global waiting_for, current_analyst, selected_analysts_choice, pending_ticker, pending_analysts, pending_user_message
 
     try:
         # Check if user is correcting analyst selection
@@ -266,10 +367,10 @@ def handle_initial_setup(message):
 
         if is_correcting or (has_analyst_names and not has_stock_ticker and not looks_like_preference):
             # User is correcting analyst selection, go back to analyst_selection state
-            waiting_for = 'analyst_selection'
-            return handle_analyst_selection(message)
+            session.waiting_for = 'analyst_selection'
+            return handle_analyst_selection(session, message)
 
-        initialize_components()
+        initialize_components(session)
 
         # Parse ticker(s) from message - detect multiple tickers for portfolio mode
         ticker_matches = re.findall(r'\b([A-Z]{2,5})\b', message)
@@ -280,36 +381,35 @@ def handle_initial_setup(message):
             })
 
         # Check if multiple tickers found - enable portfolio mode
-        global portfolio_mode, portfolio_tickers, current_portfolio_ticker_index, portfolio_trade_date
 
         if len(ticker_matches) > 1:
             # PORTFOLIO MODE: Multiple stocks detected
-            portfolio_mode = True
-            portfolio_tickers = ticker_matches
-            current_portfolio_ticker_index = 0
-            portfolio_trade_date = datetime.now().strftime("%Y-%m-%d")
-            ticker = portfolio_tickers[0]  # Start with first ticker
+            session.portfolio_mode = True
+            session.portfolio_tickers = ticker_matches
+            session.current_portfolio_ticker_index = 0
+            session.portfolio_trade_date = datetime.now().strftime("%Y-%m-%d")
+            ticker = session.portfolio_tickers[0]  # Start with first ticker
 
-            print(f"[PORTFOLIO] Portfolio mode activated: {len(portfolio_tickers)} stocks: {', '.join(portfolio_tickers)}", flush=True)
+            print(f"[PORTFOLIO] Portfolio mode activated: {len(session.portfolio_tickers)} stocks: {', '.join(session.portfolio_tickers)}", flush=True)
         else:
             # Single stock mode
             ticker = ticker_matches[0]
-            portfolio_mode = False
+            session.portfolio_mode = False
 
-        trade_date = portfolio_trade_date if portfolio_mode else datetime.now().strftime("%Y-%m-%d")
+        trade_date = session.portfolio_trade_date if session.portfolio_mode else datetime.now().strftime("%Y-%m-%d")
 
         # Use selected analysts or default to market only
-        selected_analysts = selected_analysts_choice if selected_analysts_choice else ["market", "fundamentals", "news"]
+        selected_analysts = session.selected_analysts_choice if session.selected_analysts_choice else ["market", "fundamentals", "news"]
 
         print(f"[SETUP] Initializing for {ticker} with analysts: {selected_analysts}...", flush=True)
 
         # Check if comprehensive_quantitative is selected - if yes, ask for optimization preferences
         if 'comprehensive_quantitative' in selected_analysts:
             # Store pending data
-            pending_ticker = ticker
-            pending_analysts = selected_analysts
-            pending_user_message = message
-            waiting_for = 'optimization_preference'
+            session.pending_ticker = ticker
+            session.pending_analysts = selected_analysts
+            session.pending_user_message = message
+            session.waiting_for = 'optimization_preference'
 
             print(f"[SETUP] Comprehensive Quantitative analyst selected, asking for optimization preferences...", flush=True)
 
@@ -330,8 +430,8 @@ Before running the Comprehensive Quantitative Analysis, please tell me your inve
 
         # Otherwise continue normally...
 
-        # Initialize workflow
-        controller.initialize(
+        # Initialize workflow (or resume the unfinished session for this ticker and date)
+        resumed = session.controller.initialize(
             company_of_interest=ticker,
             trade_date=trade_date,
             selected_analysts=selected_analysts,
@@ -339,7 +439,7 @@ Before running the Comprehensive Quantitative Analysis, please tell me your inve
         )
 
         # Get preferences summary
-        prefs = controller.workflow_state.user_preferences
+        prefs = session.controller.workflow_state.user_preferences
         prefs_text = ""
         if prefs and (prefs.focus_areas or prefs.principles):
             prefs_text = "\n\nYour preferences:\n"
@@ -349,7 +449,7 @@ Before running the Comprehensive Quantitative Analysis, please tell me your inve
                 prefs_text += f"- Risk tolerance: {prefs.risk_tolerance}\n"
 
         # Get analyst name for display
-        first_analyst = selected_analysts[0]
+        first_analyst = session.controller.workflow_state.get_current_analyst()
         analyst_display_names = {
             "market": "Market/Technical",
             "fundamentals": "Fundamentals",
@@ -362,25 +462,30 @@ Before running the Comprehensive Quantitative Analysis, please tell me your inve
         first_analyst_name = analyst_display_names.get(first_analyst, first_analyst.title())
 
         # Build response - add portfolio mode message if applicable
-        if portfolio_mode:
+        if session.portfolio_mode:
             response = f"""**📊 PORTFOLIO MODE ACTIVATED**
 
-Analyzing {len(portfolio_tickers)} stocks: **{', '.join(portfolio_tickers)}**
+Analyzing {len(session.portfolio_tickers)} stocks: **{', '.join(session.portfolio_tickers)}**
 
-Starting with stock **{current_portfolio_ticker_index + 1} of {len(portfolio_tickers)}: {ticker}**
+Starting with stock **{session.current_portfolio_ticker_index + 1} of {len(session.portfolio_tickers)}: {ticker}**
 
 {prefs_text}
 
 Running {first_analyst_name} Analyst...
 
 """
+        elif resumed:
+            workflow_state = session.controller.workflow_state
+            response = (f"Resumed the unfinished analysis for **{ticker}** "
+                        f"({workflow_state.current_analyst_index}/{len(selected_analysts)} analysts approved){prefs_text}"
+                        f"\n\nContinuing with the {first_analyst_name} Analyst...\n\n")
         else:
             response = f"Analysis started for **{ticker}**{prefs_text}\n\nRunning {first_analyst_name} Analyst...\n\n"
 
         print(f"[ANALYST] Running {first_analyst} analyst...", flush=True)
 
         # Run first analyst
-        result = controller.run_current_analyst()
+        result = session.controller.run_current_analyst()
 
         if "error" in result:
             return jsonify({
@@ -388,10 +493,10 @@ Running {first_analyst_name} Analyst...
                 'waiting_for': None
             })
 
-        current_analyst = result['analyst']
-        current_analyst_display = analyst_display_names.get(current_analyst, current_analyst.title())
+        session.current_analyst = result['analyst']
+        current_analyst_display = analyst_display_names.get(session.current_analyst, session.current_analyst.title())
 
-        print(f"[ANALYST] {current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
+        print(f"[ANALYST] {session.current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
         print(f"[REPORT] Length: {len(result['report'])} chars", flush=True)
 
         analyst_response = f"""---
@@ -409,7 +514,7 @@ Type:
 - **Specific feedback** to request revision (e.g., "Focus more on RSI indicators")
 """
 
-        waiting_for = 'feedback'
+        session.waiting_for = 'feedback'
 
         return jsonify({
             'response': response + analyst_response,
@@ -422,41 +527,40 @@ Type:
         return jsonify({'error': str(e)}), 500
 
 
-def handle_feedback(message):
+def handle_feedback(session, message):
     """Handle user feedback"""
-    global waiting_for, current_analyst
 
     try:
         print(f"[FEEDBACK] Processing feedback: {message[:50]}...", flush=True)
-        print(f"[FEEDBACK] Current analyst index BEFORE: {controller.workflow_state.current_analyst_index}", flush=True)
-        print(f"[FEEDBACK] Total analysts: {len(controller.workflow_state.selected_analysts)}", flush=True)
-        print(f"[FEEDBACK] Selected analysts: {controller.workflow_state.selected_analysts}", flush=True)
+        print(f"[FEEDBACK] Current analyst index BEFORE: {session.controller.workflow_state.current_analyst_index}", flush=True)
+        print(f"[FEEDBACK] Total analysts: {len(session.controller.workflow_state.selected_analysts)}", flush=True)
+        print(f"[FEEDBACK] Selected analysts: {session.controller.workflow_state.selected_analysts}", flush=True)
 
         # Process feedback
-        analysis = controller.process_feedback(message)
+        analysis = session.controller.process_feedback(message)
 
         print(f"[FEEDBACK] Action: {analysis.action.value}", flush=True)
-        print(f"[FEEDBACK] Current analyst index AFTER process_feedback: {controller.workflow_state.current_analyst_index}", flush=True)
+        print(f"[FEEDBACK] Current analyst index AFTER process_feedback: {session.controller.workflow_state.current_analyst_index}", flush=True)
 
         if analysis.action == FeedbackAction.APPROVE:
-            is_complete = controller.workflow_state.is_complete()
+            is_complete = session.controller.workflow_state.is_complete()
             print(f"[FEEDBACK] is_complete() returned: {is_complete}", flush=True)
 
             # Check if complete
             if is_complete:
                 print("[COMPLETE] All analysts done, asking user if they want final decision...", flush=True)
-                waiting_for = "final_decision"
+                session.waiting_for = "final_decision"
 
                 # List completed analysts
-                completed_list = "\n".join([f"✅ {analyst}" for analyst in controller.workflow_state.selected_analysts])
+                completed_list = "\n".join([f"✅ {analyst}" for analyst in session.controller.workflow_state.selected_analysts])
 
                 return jsonify({
                     'response': f"**All Analysts Completed!**\n\n{completed_list}\n\n---\n\n**Would you like to generate the final investment decision and comprehensive report?**\n\nType **'yes'** to generate the final decision, or **'no'** to review individual analyst reports.",
-                    'waiting_for': waiting_for
+                    'waiting_for': session.waiting_for
                 })
 
             # Run next analyst
-            next_analyst = controller.workflow_state.get_current_analyst()
+            next_analyst = session.controller.workflow_state.get_current_analyst()
             analyst_names = {
                 "market": "Market/Technical",
                 "fundamentals": "Fundamentals",
@@ -471,18 +575,18 @@ def handle_feedback(message):
 
             response = f"Approved! Moving to next analyst...\n\n{analyst_names.get(next_analyst, next_analyst)} Analyst running...\n\n"
 
-            result = controller.run_current_analyst()
+            result = session.controller.run_current_analyst()
 
             if "error" in result:
                 return jsonify({'error': result['error']}), 500
 
-            current_analyst = result['analyst']
+            session.current_analyst = result['analyst']
 
-            print(f"[ANALYST] {current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
+            print(f"[ANALYST] {session.current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
 
             analyst_response = f"""---
 
-## {analyst_names.get(current_analyst, current_analyst)} Analyst Report
+## {analyst_names.get(session.current_analyst, session.current_analyst)} Analyst Report
 
 {result['report']}
 
@@ -502,10 +606,10 @@ Type:
 
         elif analysis.action == FeedbackAction.REVISE:
             # REVISE: User wants significant changes - rerun the analyst
-            print(f"[REVISION] Rerunning {current_analyst} with feedback...", flush=True)
+            print(f"[REVISION] Rerunning {session.current_analyst} with feedback...", flush=True)
 
             # Check if user wants to change optimization method (for comprehensive_quantitative)
-            if current_analyst == 'comprehensive_quantitative':
+            if session.current_analyst == 'comprehensive_quantitative':
                 message_lower = message.lower()
 
                 # Detect direct method specification
@@ -536,7 +640,7 @@ Type:
                     }
 
                     # Update the stored optimization choice
-                    controller.workflow_state.agent_state['optimization_method_choice'] = {
+                    session.controller.workflow_state.agent_state['optimization_method_choice'] = {
                         'selected_method': detected_method,
                         'rationale': f'User requested {detected_method} optimization method via feedback',
                         'risk_tolerance': 'moderate',
@@ -546,16 +650,16 @@ Type:
 
                     print(f"[REVISION] Updated optimization_method_choice to: {detected_method}", flush=True)
 
-            response = f"Revision requested\n\nRevision instructions: {analysis.revision_instructions}\n\nRe-running {current_analyst} analyst...\n\n"
+            response = f"Revision requested\n\nRevision instructions: {analysis.revision_instructions}\n\nRe-running {session.current_analyst} analyst...\n\n"
 
-            result = controller.run_current_analyst()
+            result = session.controller.run_current_analyst()
 
             if "error" in result:
                 return jsonify({'error': result['error']}), 500
 
             analyst_response = f"""---
 
-## {current_analyst.title()} Analyst Report (Revised)
+## {session.current_analyst.title()} Analyst Report (Revised)
 
 {result['report']}
 
@@ -578,7 +682,7 @@ Type:
             print(f"[CLARIFY] Answering user question: {message[:50]}...", flush=True)
 
             # Get current report
-            analyst_status = controller.workflow_state.analyst_statuses[current_analyst]
+            analyst_status = session.controller.workflow_state.analyst_statuses[session.current_analyst]
             current_report = analyst_status.report
 
             # Collect all completed analyst reports for cross-analyst questions
@@ -593,8 +697,8 @@ Type:
                 "visualizer": "Visualization Analysis"
             }
 
-            for analyst_type in controller.workflow_state.selected_analysts:
-                status = controller.workflow_state.analyst_statuses[analyst_type]
+            for analyst_type in session.controller.workflow_state.selected_analysts:
+                status = session.controller.workflow_state.analyst_statuses[analyst_type]
                 # Include ANY analyst that has a report, regardless of status (completed, review, etc.)
                 if status.report and status.report.strip():
                     analyst_name = analyst_name_map.get(analyst_type, analyst_type.title())
@@ -603,7 +707,7 @@ Type:
 
             # Use LLM to answer the question based on ALL reports
             try:
-                llm = controller.graph.quick_thinking_llm
+                llm = session.controller.graph.quick_thinking_llm
 
                 answer_prompt = f"""You are a financial analyst assistant. A user is asking a question about the analysis reports.
 
@@ -612,7 +716,7 @@ You have access to ALL completed analyst reports below. The user may be asking a
 **ALL COMPLETED ANALYST REPORTS:**
 {all_reports_text}
 
-**Current Analyst Being Reviewed:** {current_analyst}
+**Current Analyst Being Reviewed:** {session.current_analyst}
 
 **User's Question:**
 {message}
@@ -666,9 +770,8 @@ Type:
         return jsonify({'error': str(e)}), 500
 
 
-def handle_optimization_preference(message):
+def handle_optimization_preference(session, message):
     """Handle user's optimization preference and use LLM to select method"""
-    global waiting_for, current_analyst, pending_ticker, pending_analysts, pending_user_message, portfolio_mode, portfolio_optimization_preference
 
     try:
         print(f"[OPTIMIZATION] Analyzing preferences: {message[:50]}...", flush=True)
@@ -707,7 +810,7 @@ def handle_optimization_preference(message):
             print(f"[OPTIMIZATION] Skipping LLM, using direct method selection", flush=True)
         else:
             # Get the LLM for analysis
-            llm = controller.graph.quick_thinking_llm
+            llm = session.controller.graph.quick_thinking_llm
             print("[OPTIMIZATION] Calling LLM to analyze preferences...", flush=True)
 
             # Create prompt for LLM to analyze preferences and select method
@@ -790,22 +893,21 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
         # Now initialize the controller with pending data
         trade_date = datetime.now().strftime("%Y-%m-%d")
 
-        print(f"[OPTIMIZATION] Initializing controller for {pending_ticker}...", flush=True)
-        controller.initialize(
-            company_of_interest=pending_ticker,
+        print(f"[OPTIMIZATION] Initializing controller for {session.pending_ticker}...", flush=True)
+        resumed = session.controller.initialize(
+            company_of_interest=session.pending_ticker,
             trade_date=trade_date,
-            selected_analysts=pending_analysts,
-            user_preference_text=pending_user_message
+            selected_analysts=session.pending_analysts,
+            user_preference_text=session.pending_user_message
         )
 
         # Store optimization choice in workflow state
-        controller.workflow_state.agent_state['optimization_method_choice'] = choice_data
+        session.controller.workflow_state.agent_state['optimization_method_choice'] = choice_data
         print(f"[OPTIMIZATION] Stored optimization choice: {choice_data}", flush=True)
 
         # PORTFOLIO MODE: Save optimization preference globally for reuse on subsequent stocks
-        global portfolio_optimization_preference
-        if portfolio_mode:
-            portfolio_optimization_preference = choice_data.copy()
+        if session.portfolio_mode:
+            session.portfolio_optimization_preference = choice_data.copy()
             print(f"[PORTFOLIO] Saved optimization preference for portfolio stocks", flush=True)
 
         # Get analyst display names
@@ -819,9 +921,10 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
             "visualizer": "Visualizer"
         }
 
-        # Get first analyst
-        first_analyst = pending_analysts[0]
+        # Get first analyst (the next one to run when an unfinished session was resumed)
+        first_analyst = session.controller.workflow_state.get_current_analyst()
         first_analyst_name = analyst_display_names.get(first_analyst, first_analyst.title())
+        started = "Resumed the unfinished analysis" if resumed else "Analysis started"
 
         # Build response
         method_name_display = {
@@ -842,7 +945,7 @@ IMPORTANT: Return ONLY the JSON object, no other text."""
 
 ---
 
-Analysis started for **{pending_ticker}**
+{started} for **{session.pending_ticker}**
 
 Running {first_analyst_name} Analyst...
 
@@ -851,7 +954,7 @@ Running {first_analyst_name} Analyst...
         print(f"[ANALYST] Running {first_analyst} analyst...", flush=True)
 
         # Run first analyst
-        result = controller.run_current_analyst()
+        result = session.controller.run_current_analyst()
 
         if "error" in result:
             return jsonify({
@@ -859,10 +962,10 @@ Running {first_analyst_name} Analyst...
                 'waiting_for': None
             })
 
-        current_analyst = result['analyst']
-        current_analyst_display = analyst_display_names.get(current_analyst, current_analyst.title())
+        session.current_analyst = result['analyst']
+        current_analyst_display = analyst_display_names.get(session.current_analyst, session.current_analyst.title())
 
-        print(f"[ANALYST] {current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
+        print(f"[ANALYST] {session.current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
         print(f"[REPORT] Length: {len(result['report'])} chars", flush=True)
 
         analyst_response = f"""---
@@ -880,16 +983,16 @@ Type:
 - **Specific feedback** to request revision (e.g., "Focus more on RSI indicators")
 """
 
-        waiting_for = 'feedback'
+        session.waiting_for = 'feedback'
 
         # Clear pending variables
-        pending_ticker = None
-        pending_analysts = None
-        pending_user_message = None
+        session.pending_ticker = None
+        session.pending_analysts = None
+        session.pending_user_message = None
 
         # Check if visualizer analyst returned a chart
         chart_url = None
-        if current_analyst == 'visualizer' and 'chart_data' in result:
+        if session.current_analyst == 'visualizer' and 'chart_data' in result:
             chart_path = result.get('chart_data', {}).get('chart_path', '')
             if chart_path:
                 # Convert Windows path to URL format
@@ -1137,9 +1240,8 @@ def generate_markdown_report(ticker, current_date, market_report, news_report,
     return markdown_path
 
 
-def handle_final_decision_request(message):
+def handle_final_decision_request(session, message):
     """Handle user's response to final decision generation prompt"""
-    global waiting_for, portfolio_mode, portfolio_results, current_portfolio_ticker_index, portfolio_tickers
 
     message_lower = message.lower().strip()
 
@@ -1149,20 +1251,20 @@ def handle_final_decision_request(message):
 
         try:
             # Get final decision
-            final = controller.get_final_decision()
+            final = session.controller.get_final_decision()
 
             # Generate comprehensive reports
             print("[REPORT_GEN] Generating comprehensive reports...", flush=True)
-            report_files = generate_reports(controller)
+            report_files = generate_reports(session.controller)
 
             # CHECK IF PORTFOLIO MODE
-            if portfolio_mode:
+            if session.portfolio_mode:
                 # Save current stock's results
-                current_ticker = portfolio_tickers[current_portfolio_ticker_index]
-                portfolio_results[current_ticker] = {
-                    'state': controller.workflow_state.agent_state.copy(),
+                current_ticker = session.portfolio_tickers[session.current_portfolio_ticker_index]
+                session.portfolio_results[current_ticker] = {
+                    'state': session.controller.workflow_state.agent_state.copy(),
                     'report': final,
-                    'decision': controller.workflow_state.agent_state.get('trader_investment_plan', ''),
+                    'decision': session.controller.workflow_state.agent_state.get('trader_investment_plan', ''),
                     'report_files': report_files
                 }
                 print(f"[PORTFOLIO] Saved results for {current_ticker}", flush=True)
@@ -1170,17 +1272,17 @@ def handle_final_decision_request(message):
                 # CRITICAL FIX: Export CSV data for portfolio optimization
                 try:
                     from tradingagents.portfolio.csv_data_exporter import CSVDataExporter
-                    csv_exporter = CSVDataExporter(current_ticker, portfolio_trade_date)
-                    exported_files = csv_exporter.export_all_data(controller.workflow_state.agent_state)
+                    csv_exporter = CSVDataExporter(current_ticker, session.portfolio_trade_date)
+                    exported_files = csv_exporter.export_all_data(session.controller.workflow_state.agent_state)
                     print(f"[PORTFOLIO] Exported {len(exported_files)} CSV files for {current_ticker}", flush=True)
                 except Exception as e:
                     print(f"[PORTFOLIO] Warning: Failed to export CSV for {current_ticker}: {str(e)}", flush=True)
 
                 # Check if more stocks to analyze
-                if current_portfolio_ticker_index + 1 < len(portfolio_tickers):
+                if session.current_portfolio_ticker_index + 1 < len(session.portfolio_tickers):
                     # More stocks remain - ask user if they want to continue
-                    next_ticker = portfolio_tickers[current_portfolio_ticker_index + 1]
-                    waiting_for = 'next_stock_prompt'
+                    next_ticker = session.portfolio_tickers[session.current_portfolio_ticker_index + 1]
+                    session.waiting_for = 'next_stock_prompt'
 
                     response_text = f"""✅ **{current_ticker} Analysis Complete!**
 
@@ -1192,10 +1294,10 @@ def handle_final_decision_request(message):
 
 ---
 
-**📊 Portfolio Progress: {current_portfolio_ticker_index + 1} of {len(portfolio_tickers)} stocks completed**
+**📊 Portfolio Progress: {session.current_portfolio_ticker_index + 1} of {len(session.portfolio_tickers)} stocks completed**
 
-✅ Completed: {', '.join(portfolio_tickers[:current_portfolio_ticker_index + 1])}
-⏳ Remaining: {', '.join(portfolio_tickers[current_portfolio_ticker_index + 1:])}
+✅ Completed: {', '.join(session.portfolio_tickers[:session.current_portfolio_ticker_index + 1])}
+⏳ Remaining: {', '.join(session.portfolio_tickers[session.current_portfolio_ticker_index + 1:])}
 
 ---
 
@@ -1210,7 +1312,7 @@ Type **'yes'** to continue, or **'no'** to stop and generate portfolio with curr
                     })
                 else:
                     # All stocks complete - show final stock report FIRST, then trigger portfolio
-                    print(f"[PORTFOLIO] All {len(portfolio_tickers)} stocks complete!", flush=True)
+                    print(f"[PORTFOLIO] All {len(session.portfolio_tickers)} stocks complete!", flush=True)
 
                     response_text = f"""✅ **{current_ticker} Analysis Complete!**
 
@@ -1222,9 +1324,9 @@ Type **'yes'** to continue, or **'no'** to stop and generate portfolio with curr
 
 ---
 
-**📊 All {len(portfolio_tickers)} stocks analyzed!**
+**📊 All {len(session.portfolio_tickers)} stocks analyzed!**
 
-✅ Completed: {', '.join(portfolio_tickers)}
+✅ Completed: {', '.join(session.portfolio_tickers)}
 
 """
                     # Add report files info if available
@@ -1247,7 +1349,7 @@ Generating comprehensive multi-stock portfolio analysis...
 
                     # Now trigger portfolio optimization
                     print(f"[PORTFOLIO] Generating portfolio report...", flush=True)
-                    portfolio_response = handle_portfolio_optimization()
+                    portfolio_response = handle_portfolio_optimization(session)
 
                     # Append portfolio report to the response
                     if isinstance(portfolio_response, tuple):
@@ -1263,7 +1365,7 @@ Generating comprehensive multi-stock portfolio analysis...
                     })
             else:
                 # SINGLE STOCK MODE - normal flow
-                waiting_for = None
+                session.waiting_for = None
 
                 # Build response with report download links
                 response_text = f"{final}\n\n---\n\n**Analysis complete!**\n\n"
@@ -1290,7 +1392,7 @@ Generating comprehensive multi-stock portfolio analysis...
             return jsonify({'error': f'Failed to generate final decision: {str(e)}'}), 500
     else:
         print("[FINAL_DECISION] User declined final decision generation", flush=True)
-        waiting_for = None
+        session.waiting_for = None
 
         # List available reports
         analyst_names_map = {
@@ -1303,7 +1405,7 @@ Generating comprehensive multi-stock portfolio analysis...
             'visualizer': 'Visualizer'
         }
 
-        completed_analysts = controller.workflow_state.selected_analysts
+        completed_analysts = session.controller.workflow_state.selected_analysts
         completed_reports = "\n".join([
             f"- {analyst_names_map.get(a, a.title())}"
             for a in completed_analysts
@@ -1315,35 +1417,35 @@ Generating comprehensive multi-stock portfolio analysis...
         })
 
 
-def handle_next_stock_prompt(message):
+def handle_next_stock_prompt(session, message):
     """Handle user's response to continuing with next stock in portfolio"""
-    global waiting_for, current_portfolio_ticker_index, portfolio_tickers, selected_analysts_choice, portfolio_trade_date, portfolio_optimization_preference
 
     message_lower = message.lower().strip()
 
     if message_lower in ['yes', 'y', 'continue', 'ok', '是', '好']:
         # User wants to analyze next stock
-        current_portfolio_ticker_index += 1
-        next_ticker = portfolio_tickers[current_portfolio_ticker_index]
+        session.current_portfolio_ticker_index += 1
+        next_ticker = session.portfolio_tickers[session.current_portfolio_ticker_index]
 
-        print(f"[PORTFOLIO] Starting analysis for stock {current_portfolio_ticker_index + 1}/{len(portfolio_tickers)}: {next_ticker}", flush=True)
+        print(f"[PORTFOLIO] Starting analysis for stock {session.current_portfolio_ticker_index + 1}/{len(session.portfolio_tickers)}: {next_ticker}", flush=True)
 
         # Initialize controller for next stock
-        controller.initialize(
+        resumed = session.controller.initialize(
             company_of_interest=next_ticker,
-            trade_date=portfolio_trade_date,
-            selected_analysts=selected_analysts_choice,
+            trade_date=session.portfolio_trade_date,
+            selected_analysts=session.selected_analysts_choice,
             user_preference_text=f"Portfolio analysis for {next_ticker}"
         )
 
         # CRITICAL: Reset analyst index to 0 for new stock (initialize() doesn't reset this)
-        controller.workflow_state.current_analyst_index = 0
-        print(f"[PORTFOLIO] Reset analyst index to 0 for {next_ticker}", flush=True)
+        if not resumed:
+            session.controller.workflow_state.current_analyst_index = 0
+            print(f"[PORTFOLIO] Reset analyst index to 0 for {next_ticker}", flush=True)
 
         # PORTFOLIO MODE: Inject saved optimization preference to avoid re-asking
-        if portfolio_optimization_preference:
-            controller.workflow_state.agent_state['optimization_method_choice'] = portfolio_optimization_preference.copy()
-            print(f"[PORTFOLIO] Reusing optimization preference from first stock: {portfolio_optimization_preference.get('selected_method', 'unknown')}", flush=True)
+        if session.portfolio_optimization_preference:
+            session.controller.workflow_state.agent_state['optimization_method_choice'] = session.portfolio_optimization_preference.copy()
+            print(f"[PORTFOLIO] Reusing optimization preference from first stock: {session.portfolio_optimization_preference.get('selected_method', 'unknown')}", flush=True)
 
         # Get analyst display names
         analyst_display_names = {
@@ -1356,12 +1458,12 @@ def handle_next_stock_prompt(message):
             "visualizer": "Visualizer"
         }
 
-        first_analyst = selected_analysts_choice[0]
+        first_analyst = session.controller.workflow_state.get_current_analyst()
         first_analyst_name = analyst_display_names.get(first_analyst, first_analyst.title())
 
         response_text = f"""**📊 Continuing Portfolio Analysis**
 
-Stock **{current_portfolio_ticker_index + 1} of {len(portfolio_tickers)}: {next_ticker}**
+Stock **{session.current_portfolio_ticker_index + 1} of {len(session.portfolio_tickers)}: {next_ticker}**
 
 Running {first_analyst_name} Analyst...
 
@@ -1373,7 +1475,7 @@ Running {first_analyst_name} Analyst...
         max_retries = 2
         result = None
         for attempt in range(max_retries):
-            result = controller.run_current_analyst()
+            result = session.controller.run_current_analyst()
 
             if "error" in result:
                 return jsonify({
@@ -1388,16 +1490,16 @@ Running {first_analyst_name} Analyst...
                 if attempt < max_retries - 1:
                     print(f"[PORTFOLIO] Retrying {result['analyst']} (attempt {attempt + 2}/{max_retries})...", flush=True)
                     # Reset analyst to retry
-                    controller.workflow_state.current_analyst_index -= 1
+                    session.controller.workflow_state.current_analyst_index -= 1
                     continue
                 else:
                     print(f"[PORTFOLIO] Max retries reached, using short report", flush=True)
             break
 
-        current_analyst = result['analyst']
-        current_analyst_display = analyst_display_names.get(current_analyst, current_analyst.title())
+        session.current_analyst = result['analyst']
+        current_analyst_display = analyst_display_names.get(session.current_analyst, session.current_analyst.title())
 
-        print(f"[ANALYST] {current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
+        print(f"[ANALYST] {session.current_analyst} completed in {result.get('duration', 0):.1f}s", flush=True)
 
         analyst_response = f"""---
 
@@ -1414,7 +1516,7 @@ Type:
 - **Specific feedback** to request revision
 """
 
-        waiting_for = 'feedback'
+        session.waiting_for = 'feedback'
 
         return jsonify({
             'response': response_text + analyst_response,
@@ -1422,22 +1524,21 @@ Type:
         })
     else:
         # User declined - generate portfolio with current stocks
-        print(f"[PORTFOLIO] User stopped. Generating portfolio with {current_portfolio_ticker_index + 1} stocks...", flush=True)
-        return handle_portfolio_optimization()
+        print(f"[PORTFOLIO] User stopped. Generating portfolio with {session.current_portfolio_ticker_index + 1} stocks...", flush=True)
+        return handle_portfolio_optimization(session)
 
 
-def handle_portfolio_llm_fallback(tickers):
+def handle_portfolio_llm_fallback(session, tickers):
     """Use LLM to generate portfolio analysis when optimization algorithm can't run due to partial data"""
-    global portfolio_mode, portfolio_trade_date, waiting_for, selected_analysts_choice
 
     print(f"[PORTFOLIO_LLM] Generating LLM-based portfolio analysis with partial data...", flush=True)
-    print(f"[PORTFOLIO_LLM] Available analysts: {selected_analysts_choice}", flush=True)
+    print(f"[PORTFOLIO_LLM] Available analysts: {session.selected_analysts_choice}", flush=True)
 
     try:
         # Load available CSV data for each ticker
         stocks_data = {}
         for ticker in tickers:
-            csv_dir = Path(f"results/{ticker}/{portfolio_trade_date}/csv_data")
+            csv_dir = Path(f"results/{ticker}/{session.portfolio_trade_date}/csv_data")
             if not csv_dir.exists():
                 print(f"[PORTFOLIO_LLM] No CSV data for {ticker}", flush=True)
                 continue
@@ -1476,24 +1577,24 @@ def handle_portfolio_llm_fallback(tickers):
             stocks_data[ticker] = ticker_data
 
         if len(stocks_data) < 2:
-            waiting_for = None
-            portfolio_mode = False
+            session.waiting_for = None
+            session.portfolio_mode = False
             return jsonify({
                 'response': f"⚠️ Could not load sufficient data for portfolio analysis. Only {len(stocks_data)} stock(s) have data.",
                 'waiting_for': None
             })
 
         # Build comparative tables
-        comparative_analysis = build_comparative_tables(stocks_data, selected_analysts_choice)
+        comparative_analysis = build_comparative_tables(stocks_data, session.selected_analysts_choice)
 
         # Use LLM to analyze and recommend
         print("[PORTFOLIO_LLM] Using LLM to generate portfolio recommendation...", flush=True)
-        llm_recommendation = generate_llm_portfolio_recommendation(stocks_data, comparative_analysis, portfolio_trade_date)
+        llm_recommendation = generate_llm_portfolio_recommendation(stocks_data, comparative_analysis, session.portfolio_trade_date)
 
         # Save report
-        report_dir = Path(f"portfolio_results/{portfolio_trade_date}")
+        report_dir = Path(f"portfolio_results/{session.portfolio_trade_date}")
         report_dir.mkdir(parents=True, exist_ok=True)
-        report_path = report_dir / f"portfolio_analysis_llm_{portfolio_trade_date}.md"
+        report_path = report_dir / f"portfolio_analysis_llm_{session.portfolio_trade_date}.md"
 
         with open(report_path, 'w', encoding='utf-8') as f:
             f.write(llm_recommendation)
@@ -1501,15 +1602,15 @@ def handle_portfolio_llm_fallback(tickers):
         print(f"[PORTFOLIO_LLM] Report saved to: {report_path}", flush=True)
 
         # Reset portfolio mode
-        portfolio_mode = False
-        waiting_for = None
+        session.portfolio_mode = False
+        session.waiting_for = None
 
         summary_text = f"""✅ **PORTFOLIO ANALYSIS COMPLETE (LLM-Based)**
 
 **Analyzed Stocks**: {', '.join(tickers)} ({len(tickers)} stocks)
 
 **Analysis Method**: LLM-based comparative analysis
-**Available Data**: {', '.join([a.capitalize() for a in selected_analysts_choice or []])}
+**Available Data**: {', '.join([a.capitalize() for a in session.selected_analysts_choice or []])}
 
 **Report Location:** `{report_path}`
 
@@ -1535,8 +1636,8 @@ Portfolio analysis complete! You can start a new analysis by typing 'start over'
         print(f"[ERROR] Portfolio LLM fallback failed: {str(e)}", flush=True)
         import traceback
         traceback.print_exc()
-        waiting_for = None
-        portfolio_mode = False
+        session.waiting_for = None
+        session.portfolio_mode = False
         return jsonify({'error': f'Portfolio LLM analysis failed: {str(e)}'}), 500
 
 
@@ -1753,11 +1854,10 @@ Generate the analysis now:"""
     return report
 
 
-def handle_portfolio_optimization():
+def handle_portfolio_optimization(session):
     """Run portfolio optimization after all stocks analyzed"""
-    global portfolio_mode, portfolio_tickers, portfolio_results, portfolio_trade_date, waiting_for, selected_analysts_choice
 
-    print(f"[PORTFOLIO] Running portfolio optimization for {len(portfolio_results)} stocks...", flush=True)
+    print(f"[PORTFOLIO] Running portfolio optimization for {len(session.portfolio_results)} stocks...", flush=True)
 
     try:
         # Import portfolio components
@@ -1766,21 +1866,21 @@ def handle_portfolio_optimization():
         from tradingagents.portfolio.portfolio_report_generator import PortfolioReportGenerator
 
         # Check if we have enough stocks
-        if len(portfolio_results) < 2:
-            waiting_for = None
-            portfolio_mode = False
+        if len(session.portfolio_results) < 2:
+            session.waiting_for = None
+            session.portfolio_mode = False
             return jsonify({
-                'response': f"⚠️ Portfolio optimization requires at least 2 stocks with complete data. Only {len(portfolio_results)} stock(s) analyzed.",
+                'response': f"⚠️ Portfolio optimization requires at least 2 stocks with complete data. Only {len(session.portfolio_results)} stock(s) analyzed.",
                 'waiting_for': None
             })
 
         # Get ticker list from results
-        completed_tickers = list(portfolio_results.keys())
+        completed_tickers = list(session.portfolio_results.keys())
         print(f"[PORTFOLIO] Completed tickers: {completed_tickers}", flush=True)
-        print(f"[PORTFOLIO] Selected analysts: {selected_analysts_choice}", flush=True)
+        print(f"[PORTFOLIO] Selected analysts: {session.selected_analysts_choice}", flush=True)
 
         # Step 1: Aggregate stock data from CSV files
-        aggregator = StockDataAggregator(portfolio_trade_date)
+        aggregator = StockDataAggregator(session.portfolio_trade_date)
 
         try:
             aggregated_result = aggregator.aggregate_multiple_stocks(completed_tickers)
@@ -1791,18 +1891,18 @@ def handle_portfolio_optimization():
             # If error is due to missing data (e.g., 'risk_metrics'), use LLM fallback
             if "'risk_metrics'" in error_msg or "'metrics'" in error_msg or "KeyError" in str(type(e).__name__):
                 print(f"[PORTFOLIO] Missing data detected. Using LLM fallback for partial analyst data...", flush=True)
-                return handle_portfolio_llm_fallback(completed_tickers)
+                return handle_portfolio_llm_fallback(session, completed_tickers)
 
-            waiting_for = None
-            portfolio_mode = False
+            session.waiting_for = None
+            session.portfolio_mode = False
             return jsonify({
                 'response': f"⚠️ Error loading stock data for portfolio optimization.\n\nError: {error_msg}",
                 'waiting_for': None
             })
 
         if aggregated_result['num_stocks'] < 2:
-            waiting_for = None
-            portfolio_mode = False
+            session.waiting_for = None
+            session.portfolio_mode = False
             return jsonify({
                 'response': f"⚠️ Portfolio optimization requires at least 2 stocks with complete CSV data. Found {aggregated_result['num_stocks']} stock(s).",
                 'waiting_for': None
@@ -1810,26 +1910,20 @@ def handle_portfolio_optimization():
 
         # Step 2: Get returns data for optimization
         print("[PORTFOLIO] Fetching historical price data for optimization...", flush=True)
-        returns_data = {}
-        for ticker in aggregated_result['stocks_data'].keys():
-            try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period="3mo")  # CHANGED: 3 months instead of 6 for faster loading
-                if not hist.empty:
-                    returns_data[ticker] = hist['Close'].pct_change().dropna()
-                    print(f"[PORTFOLIO] Fetched {len(returns_data[ticker])} returns for {ticker}", flush=True)
-            except Exception as e:
-                print(f"[PORTFOLIO] Error fetching {ticker}: {e}", flush=True)
+        # One batched download for all tickers; prices fetched during the per-stock analyses are reused
+        from tradingagents.dataflows.price_loader import get_price_loader
+        returns_df = get_price_loader().load_returns_matrix(
+            list(aggregated_result['stocks_data'].keys()), period="3mo"
+        )
 
-        if len(returns_data) < 2:
-            waiting_for = None
-            portfolio_mode = False
+        if returns_df.shape[1] < 2:
+            session.waiting_for = None
+            session.portfolio_mode = False
             return jsonify({
                 'response': "⚠️ Could not fetch price data for portfolio optimization.",
                 'waiting_for': None
             })
 
-        returns_df = pd.DataFrame(returns_data).dropna()
         print(f"[PORTFOLIO] Combined returns dataframe shape: {returns_df.shape}", flush=True)
 
         # Step 3: Run optimization
@@ -1844,7 +1938,7 @@ def handle_portfolio_optimization():
         report_generator = PortfolioReportGenerator(
             aggregated_result,
             optimization_scenarios,
-            portfolio_trade_date
+            session.portfolio_trade_date
         )
         report_path = report_generator.generate_comprehensive_report()
         print(f"[PORTFOLIO] Report saved to: {report_path}", flush=True)
@@ -1854,7 +1948,7 @@ def handle_portfolio_optimization():
             portfolio_report = f.read()
 
         # Reset portfolio mode
-        portfolio_mode = False
+        session.portfolio_mode = False
         completed_stocks_list = ', '.join(completed_tickers)
         num_scenarios = len(optimization_scenarios)
 
@@ -1882,7 +1976,7 @@ def handle_portfolio_optimization():
 Portfolio analysis complete! You can start a new analysis by typing 'start over' or refreshing the page.
 """
 
-        waiting_for = None
+        session.waiting_for = None
 
         return jsonify({
             'response': summary_text,
@@ -1893,8 +1987,8 @@ Portfolio analysis complete! You can start a new analysis by typing 'start over'
         print(f"[ERROR] Portfolio optimization failed: {str(e)}", flush=True)
         import traceback
         traceback.print_exc()
-        waiting_for = None
-        portfolio_mode = False
+        session.waiting_for = None
+        session.portfolio_mode = False
         return jsonify({'error': f'Portfolio optimization failed: {str(e)}'}), 500
 
 
@@ -1925,4 +2019,4 @@ if __name__ == '__main__':
     print("=" * 70)
     print()
 
-    app.run(host='0.0.0.0', port=7862, debug=False)
+    app.run(host='0.0.0.0', port=7862, debug=False, threaded=True)
@@ -140,7 +140,8 @@ def main():
                     final_state, decision = ta.propagate(ticker, current_date)
                     stock_results[ticker] = {
                         'state': final_state,
-                        'decision': decision
+                        'decision': decision,
+                        'artifacts': ta.artifacts  # Report/CSV files still being written
                     }
                     log_print(f"✅ {ticker} Analysis Complete - Decision: {decision}")
                     log_print("")
@@ -158,6 +159,11 @@ def main():
                 log_print("=" * 80)
                 
                 try:
+                    # The aggregator reads each stock's CSV export: wait for the background writers
+                    for result in stock_results.values():
+                        if result.get('artifacts') is not None:
+                            result['artifacts'].result()
+                    
                     # Aggregate stock data
                     aggregator = StockDataAggregator(current_date)
                     aggregated_result = aggregator.aggregate_multiple_stocks(list(stock_results.keys()))
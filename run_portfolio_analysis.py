@@ -9,7 +9,6 @@ import os
 from datetime import date
 from pathlib import Path
 import pandas as pd
-import yfinance as yf
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,6 +18,7 @@ from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.portfolio.stock_data_aggregator import StockDataAggregator
 from tradingagents.portfolio.multi_scenario_portfolio_optimizer import MultiScenarioPortfolioOptimizer
 from tradingagents.portfolio.portfolio_report_generator import PortfolioReportGenerator
+from tradingagents.dataflows.price_loader import get_price_loader
 
 
 def main():
@@ -97,23 +97,15 @@ def main():
     print("STEP 2: Fetching Price Data for Optimization")
     print("=" * 80)
     
-    returns_data = {}
-    for ticker in aggregated_result['stocks_data'].keys():
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="6mo")
-            if not hist.empty:
-                returns_data[ticker] = hist['Close'].pct_change().dropna()
-                print(f"  {ticker}: {len(returns_data[ticker])} days of data")
-        except Exception as e:
-            print(f"  ERROR {ticker}: {e}")
-    
-    if len(returns_data) < 2:
+    # One batched download for the whole universe, repeats served from the shared cache
+    returns_df = get_price_loader().load_returns_matrix(list(aggregated_result['stocks_data'].keys()), period="6mo")
+    for ticker in returns_df.columns:
+        print(f"  {ticker}: {len(returns_df)} days of data")
+    
+    if returns_df.shape[1] < 2:
         print("\nERROR: Need at least 2 stocks for portfolio optimization")
         return
     
-    # Create returns DataFrame
-    returns_df = pd.DataFrame(returns_data).dropna()
     print(f"\nReturns matrix: {returns_df.shape[0]} days x {returns_df.shape[1]} stocks")
     
     # STEP 4: Run Portfolio Optimization
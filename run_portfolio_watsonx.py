@@ -9,7 +9,6 @@ import os
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
-import yfinance as yf
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,6 +18,7 @@ from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.portfolio.stock_data_aggregator import StockDataAggregator
 from tradingagents.portfolio.multi_scenario_portfolio_optimizer import MultiScenarioPortfolioOptimizer
 from tradingagents.portfolio.portfolio_report_generator import PortfolioReportGenerator
+from tradingagents.dataflows.price_loader import get_price_loader
 
 
 def main():
@@ -83,13 +83,16 @@ def main():
         config=config
     )
 
-    # Analyze each stock
+    # Analyze each stock; report files are written in the background while the next stock runs
+    pending_outputs = []
     for ticker in tickers:
         print(f"\n{'='*80}")
         print(f"🔍 Analyzing {ticker}...")
         print(f"{'='*80}")
         try:
             final_state, decision = ta.propagate(ticker, current_date)
+            if ta.artifacts is not None:
+                pending_outputs.append(ta.artifacts)
             print(f"\n✅ SUCCESS: {ticker} - {decision}")
         except Exception as e:
             print(f"\n❌ ERROR: {ticker} - {e}")
@@ -101,6 +104,10 @@ def main():
     print("STEP 2: Aggregating Stock Analyses")
     print("=" * 80)
 
+    # The aggregator reads each stock's CSV export
+    for artifacts in pending_outputs:
+        artifacts.result()
+
     aggregator = StockDataAggregator(current_date)
     aggregated_result = aggregator.aggregate_multiple_stocks(tickers)
 
@@ -118,23 +125,15 @@ def main():
     print("STEP 3: Fetching Price Data for Optimization")
     print("=" * 80)
 
-    returns_data = {}
-    for ticker in aggregated_result['stocks_data'].keys():
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="6mo")
-            if not hist.empty:
-                returns_data[ticker] = hist['Close'].pct_change().dropna()
-                print(f"  ✅ {ticker}: {len(returns_data[ticker])} days of data")
-        except Exception as e:
-            print(f"  ❌ ERROR {ticker}: {e}")
+    # One batched download for the whole universe, repeats served from the shared cache
+    returns_df = get_price_loader().load_returns_matrix(list(aggregated_result['stocks_data'].keys()), period="6mo")
+    for ticker in returns_df.columns:
+        print(f"  ✅ {ticker}: {len(returns_df)} days of data")
 
-    if len(returns_data) < 2:
+    if returns_df.shape[1] < 2:
         print("\n❌ ERROR: Need at least 2 stocks for portfolio optimization")
         return
 
-    # Create returns DataFrame
-    returns_df = pd.DataFrame(returns_data).dropna()
     print(f"\n📈 Returns matrix: {returns_df.shape[0]} days x {returns_df.shape[1]} stocks")
 
     # STEP 4: Run Portfolio Optimization
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Chart rendering benchmark: time to render the comprehensive trading dashboard per output
+profile, and how long the Document Generator blocks when the render runs in the background.
+Also checks that rebuilding from unchanged data is served by the artifact cache.
+Uses synthetic OHLCV data, so no network access is needed.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.agents.generators import comprehensive_charts as charts
+from tradingagents.agents.utils.artifact_cache import get_artifact_cache
+
+# Per-chart budget for the default "document" profile (the previous 300 dpi render took ~6.5s)
+RENDER_BUDGET_SECONDS = float(os.getenv("CHART_RENDER_BUDGET_SECONDS", "2.0"))
+# Time submit_comprehensive_trading_chart may block the caller (data + metrics, render excluded)
+SUBMIT_BUDGET_SECONDS = float(os.getenv("CHART_SUBMIT_BUDGET_SECONDS", "0.5"))
+# Rebuilding from unchanged data is served by the artifact cache and must not render again
+REBUILD_BUDGET_SECONDS = float(os.getenv("CHART_REBUILD_BUDGET_SECONDS", "0.3"))
+
+
+def synthetic_ohlcv(days: int = 63, seed: int = 0) -> pd.DataFrame:
+    """Three months of random-walk OHLCV bars, shaped like yfinance output"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2024-02-01", periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    open_ = close * (1 + rng.normal(0, 0.01, days))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, days)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, days)))
+    volume = rng.integers(1_000_000, 50_000_000, days).astype(float)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def time_render(profile: str, output_dir: str, repeats: int = 3) -> float:
+    """Best-of-n render time for one profile (warm interpreter)"""
+    stock_data = charts.add_chart_indicators(synthetic_ohlcv())
+    resolved = charts.get_chart_profile(profile)
+    path = os.path.join(output_dir, f"bench_{profile}.{resolved.format}")
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        charts.render_comprehensive_chart(stock_data, "BENCH", "2024-05-01", path, resolved)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _submit(seed: int):
+    """submit_comprehensive_trading_chart on synthetic data (seed picks the price path)"""
+    original_load = charts.load_chart_data
+    charts.load_chart_data = lambda ticker: charts.add_chart_indicators(synthetic_ohlcv(seed=seed))
+    try:
+        return charts.submit_comprehensive_trading_chart("BENCH", "2024-05-01")
+    finally:
+        charts.load_chart_data = original_load
+
+
+def time_submit(output_dir: str):
+    """(seconds submit blocked, seconds until the background render finished)"""
+    cwd = os.getcwd()
+    os.chdir(output_dir)
+    try:
+        # Warm the pool so worker start-up is not counted; a different seed keeps the
+        # measured submit from being served by the artifact cache
+        _, future = _submit(seed=1)
+        future.result()
+
+        start = time.perf_counter()
+        _, future = _submit(seed=2)
+        blocked = time.perf_counter() - start
+        future.result()
+        return blocked, time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+
+
+def time_rebuild(output_dir: str):
+    """(seconds for the first build, seconds for a rebuild from the same data, artifacts reused)"""
+    cwd = os.getcwd()
+    os.chdir(output_dir)
+    try:
+        cache = get_artifact_cache()
+        start = time.perf_counter()
+        _, future = _submit(seed=3)
+        future.result()
+        first = time.perf_counter() - start
+
+        reused_before = cache.stats["reused"]
+        start = time.perf_counter()
+        _, future = _submit(seed=3)
+        future.result()
+        return first, time.perf_counter() - start, cache.stats["reused"] - reused_before
+    finally:
+        os.chdir(cwd)
+
+
+def test_document_profile_render_budget():
+    with tempfile.TemporaryDirectory() as output_dir:
+        seconds = time_render("document", output_dir, repeats=1)
+    assert seconds <= RENDER_BUDGET_SECONDS, (
+        f"Document chart took {seconds:.2f}s (budget {RENDER_BUDGET_SECONDS:.2f}s)"
+    )
+
+
+def test_background_submit_does_not_block():
+    with tempfile.TemporaryDirectory() as output_dir:
+        blocked, _ = time_submit(output_dir)
+    assert blocked <= SUBMIT_BUDGET_SECONDS, (
+        f"submit_comprehensive_trading_chart blocked {blocked:.2f}s (budget {SUBMIT_BUDGET_SECONDS:.2f}s)"
+    )
+
+
+def test_rebuild_reuses_cached_chart():
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, rebuild, reused = time_rebuild(output_dir)
+    assert reused == 1, "Rebuilding from unchanged data rendered the chart again"
+    assert rebuild <= REBUILD_BUDGET_SECONDS, (
+        f"Cached chart rebuild took {rebuild:.2f}s (budget {REBUILD_BUDGET_SECONDS:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("CHART RENDERING BENCHMARK: create_comprehensive_trading_chart")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Warm-up: font cache and first-draw costs
+        time_render("document", output_dir, repeats=1)
+
+        results = {}
+        for name in charts.CHART_PROFILES:
+            results[name] = time_render(name, output_dir)
+            profile = charts.CHART_PROFILES[name]
+            print(f"  {name:<10} {profile.format:<5} {profile.dpi:>4} dpi  {results[name]:6.2f}s")
+
+        blocked, total = time_submit(output_dir)
+        print()
+        print(f"Background render: caller blocked {blocked:.3f}s, render finished after {total:.2f}s")
+
+        first, rebuild, reused = time_rebuild(output_dir)
+        print(f"Rebuild from unchanged data: {first:.2f}s -> {rebuild:.3f}s ({reused} artifact reused)")
+
+    ok = (results["document"] <= RENDER_BUDGET_SECONDS and blocked <= SUBMIT_BUDGET_SECONDS
+          and reused == 1 and rebuild <= REBUILD_BUDGET_SECONDS)
+    print()
+    print("[OK] Chart rendering within budget" if ok else "[FAIL] Chart rendering over budget")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Chat job manager housekeeping: finished jobs expire even while their session stays
+active, a job's event stream starts at its own job_queued event, and an expired
+session wakes and ends the event streams waiting on it.
+"""
+
+import sys
+import threading
+import time
+
+from tradingagents.interactive.chat_jobs import ChatJobManager
+
+
+def reply(session, message):
+    return {"response": f"echo {message}"}, 200
+
+
+def test_finished_jobs_are_pruned_on_submit():
+    jobs = ChatJobManager(max_workers=1, job_ttl=0.05)
+    try:
+        session = jobs.create_session()
+        first = jobs.submit(session, reply, "hello")
+        assert jobs.wait(first, timeout=5)
+        assert jobs.get_job(first.job_id).result == {"response": "echo hello"}
+
+        time.sleep(0.1)
+        second = jobs.submit(session, reply, "again")
+        assert jobs.get_job(first.job_id) is None
+        assert jobs.get_job(second.job_id) is second
+        assert jobs.wait(second, timeout=5)
+    finally:
+        jobs.shutdown()
+
+
+def test_job_events_start_at_its_own_queued_event():
+    jobs = ChatJobManager(max_workers=1)
+    try:
+        session = jobs.create_session()
+        first = jobs.submit(session, reply, "hello")
+        assert jobs.wait(first, timeout=5)
+        second = jobs.submit(session, reply, "again")
+        assert jobs.wait(second, timeout=5)
+
+        events = session.events_since(second.queued_seq - 1)
+        assert events[0].type == "job_queued"
+        assert {event.data["job_id"] for event in events} == {second.job_id}
+    finally:
+        jobs.shutdown()
+
+
+def test_expired_session_ends_waiting_streams():
+    jobs = ChatJobManager(max_workers=1, session_ttl=0.05)
+    try:
+        session = jobs.create_session()
+        returned = []
+        waiter = threading.Thread(target=lambda: returned.append(session.events_since(0, timeout=30)))
+        waiter.start()
+
+        time.sleep(0.1)
+        jobs.create_session()  # Prunes the idle session
+        waiter.join(timeout=5)
+        assert not waiter.is_alive()
+        assert returned == [[]]
+        assert session.closed and jobs.get_session(session.session_id) is None
+    finally:
+        jobs.shutdown()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Checkpoint thread identity: settings that change the graph or what its nodes read
+give a run a different thread, so a failed run never resumes under other settings.
+"""
+
+import sys
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.checkpointing import checkpoint_thread_id
+
+ANALYSTS = ["market", "news"]
+
+
+def thread_for(**overrides) -> str:
+    return checkpoint_thread_id("AAPL", "2024-05-01", {**DEFAULT_CONFIG, **overrides}, ANALYSTS)
+
+
+def test_risk_debate_mode_changes_the_thread():
+    # The parallel graph joins the three risk analysts; a sequential checkpoint cannot feed it
+    assert thread_for(risk_debate_mode="sequential") != thread_for(risk_debate_mode="parallel")
+
+
+def test_state_offload_changes_the_thread():
+    # Checkpoints written with offload hold @report: refs that nodes without it would read raw
+    assert thread_for(state_offload=True) != thread_for(state_offload=False)
+
+
+def test_unrelated_settings_keep_the_thread():
+    assert thread_for(results_dir="/tmp/elsewhere") == thread_for()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
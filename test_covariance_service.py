@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Covariance service checks: cache hits, incremental appends, revised history and a
+changed universe must all agree with sklearn's LedoitWolf / OAS fitted from scratch.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.covariance import OAS, LedoitWolf
+
+from tradingagents.optimization.covariance_service import CovarianceService
+
+ANNUALIZATION = 252
+SKLEARN_ESTIMATORS = {"ledoit_wolf": LedoitWolf, "oas": OAS}
+
+
+def synthetic_returns(days: int = 300, assets: int = 6, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    mixing = rng.normal(size=(assets, assets)) * 0.01
+    values = rng.normal(size=(days, assets)) @ mixing
+    index = pd.bdate_range("2023-01-02", periods=days)
+    return pd.DataFrame(values, index=index, columns=[f"T{i}" for i in range(assets)])
+
+
+def expected(returns: pd.DataFrame, estimator: str, window=None) -> np.ndarray:
+    frame = returns.iloc[-window:] if window else returns
+    return SKLEARN_ESTIMATORS[estimator]().fit(frame.values).covariance_ * ANNUALIZATION
+
+
+def assert_matches(service, returns, estimator, window=None):
+    cov = service.get_covariance(returns, estimator, window=window, annualization=ANNUALIZATION)
+    assert list(cov.columns) == list(returns.columns)
+    np.testing.assert_allclose(cov.values, expected(returns, estimator, window), rtol=1e-7, atol=1e-12)
+
+
+def test_cache_hit_matches_sklearn():
+    returns = synthetic_returns()
+    for estimator in SKLEARN_ESTIMATORS:
+        service = CovarianceService()
+        assert_matches(service, returns, estimator)
+        assert_matches(service, returns, estimator)
+        assert service.stats == {"hits": 1, "incremental_updates": 0, "full_fits": 1}
+
+
+def test_incremental_append_matches_sklearn():
+    returns = synthetic_returns()
+    for estimator in SKLEARN_ESTIMATORS:
+        for window in (None, 120):
+            service = CovarianceService()
+            assert_matches(service, returns.iloc[:200], estimator, window)
+            for end in (201, 230, 300):
+                assert_matches(service, returns.iloc[:end], estimator, window)
+            assert service.stats["full_fits"] == 1
+            assert service.stats["incremental_updates"] == 3
+
+
+def test_revised_history_is_refit():
+    returns = synthetic_returns()
+    for estimator in SKLEARN_ESTIMATORS:
+        for window in (None, 120):
+            service = CovarianceService()
+            assert_matches(service, returns, estimator, window)
+
+            # Same dates, different values: rescaled data and a revised row inside the window
+            assert_matches(service, returns * 2, estimator, window)
+            revised = returns.copy()
+            revised.iloc[-5, 2] += 0.05
+            assert_matches(service, revised, estimator, window)
+
+            # A revision inside the cached window followed by new rows is not an append
+            extended = synthetic_returns(days=310)
+            extended.iloc[:300] = revised.values
+            extended.iloc[-20, 0] -= 0.03
+            assert_matches(service, extended, estimator, window)
+
+            assert service.stats["hits"] == 0
+            assert service.stats["incremental_updates"] == 0
+            assert service.stats["full_fits"] == 4
+
+
+def test_changed_universe_is_refit():
+    returns = synthetic_returns()
+    for estimator in SKLEARN_ESTIMATORS:
+        service = CovarianceService()
+        assert_matches(service, returns, estimator)
+        assert_matches(service, returns[["T0", "T2", "T4"]], estimator)
+        assert_matches(service, returns[list(reversed(returns.columns))], estimator)
+        assert service.stats["full_fits"] == 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
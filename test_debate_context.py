@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Debate context checks: researcher prompts stay within the configured budgets however
+many rounds the debate runs, and the report digest cache stays bounded.
+"""
+
+import sys
+from types import SimpleNamespace
+
+import tradingagents.agents.utils.debate_context as debate_context
+from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+from tradingagents.agents.utils.debate_context import DEFAULT_DEBATE_BUDGETS, digest_report, estimate_tokens
+
+REPORT = "\n".join(
+    f"- Day {i}: close 1{i:02d}.5, RSI {40 + i % 30}, volume 1.{i % 9}x average; analysts stay cautious."
+    for i in range(200)
+)
+SLACK_TOKENS = 16  # " [...]" markers on truncated pieces
+
+
+class RecordingLLM:
+    """Answers with a long argument and records every prompt"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        turn = len(self.prompts)
+        return SimpleNamespace(content=" ".join(
+            f"Point {turn}.{i}: margins expand as revenue grows {i}% while costs stay flat." for i in range(150)
+        ))
+
+
+class NoMemories:
+    def get_memories(self, situation, n_matches=2):
+        return []
+
+
+def debate_state(reports: str) -> dict:
+    return {
+        "company_of_interest": "AAPL",
+        "market_report": reports, "sentiment_report": reports,
+        "news_report": reports, "fundamentals_report": reports,
+        "investment_debate_state": {"history": "", "bull_history": "", "bear_history": "",
+                                    "current_response": "", "summary": "", "count": 0},
+    }
+
+
+def test_prompts_stay_within_budget_as_rounds_increase():
+    budgets = DEFAULT_DEBATE_BUDGETS["researcher"]
+
+    # Prompt size with every input empty: the fixed instructions around the context
+    llm = RecordingLLM()
+    create_bull_researcher(llm, NoMemories())(debate_state(""))
+    template_tokens = estimate_tokens(llm.prompts[0])
+    limit = (template_tokens + 4 * budgets["report_tokens"] + budgets["summary_tokens"]
+             + budgets["last_turn_tokens"] + SLACK_TOKENS)
+
+    llm = RecordingLLM()
+    nodes = [create_bull_researcher(llm, NoMemories()), create_bear_researcher(llm, NoMemories())]
+    state = debate_state(REPORT)
+    for turn in range(40):
+        state.update(nodes[turn % 2](state))
+
+    sizes = [estimate_tokens(prompt) for prompt in llm.prompts]
+    assert max(sizes) <= limit, (max(sizes), limit)
+    # Without the bounds the latest prompt would carry the whole history
+    assert estimate_tokens(state["investment_debate_state"]["history"]) > 10 * limit
+    assert len(state["investment_debate_state"]["summary"]) > 0
+
+
+def test_digest_cache_is_bounded():
+    debate_context._digest_cache.clear()
+    for i in range(debate_context.DIGEST_CACHE_SIZE + 50):
+        digest_report(f"# Report {i}\n{REPORT}", 100)
+    assert len(debate_context._digest_cache) == debate_context.DIGEST_CACHE_SIZE
+
+    # Recently used digests are kept, the oldest are evicted
+    latest = f"# Report {debate_context.DIGEST_CACHE_SIZE + 49}\n{REPORT}"
+    assert digest_report(latest, 100) == next(reversed(debate_context._digest_cache.values()))
+    assert estimate_tokens(digest_report(latest, 100)) <= 100
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Decision extraction regressions: the fast path must return the stated decision or
+nothing (LLM fallback), never a confident wrong answer.
+"""
+
+import sys
+
+from tradingagents.agents.utils.decision_extraction import extract_decision
+from tradingagents.graph.signal_processing import SignalProcessor
+
+
+class _RecordingLLM:
+    """Stands in for the quick-thinking LLM and records when the fallback is used"""
+
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return type("Reply", (), {"content": self.answer})()
+
+
+DECIDED = [
+    ("Analysis...\n\nFINAL TRANSACTION PROPOSAL: **SELL**", "SELL", "final_marker"),
+    ("FINAL INSTITUTIONAL DECISION: ACCUMULATE GRADUALLY over two weeks", "BUY", "final_marker"),
+    ("**Primary Recommendation:** Reduce", "SELL", "recommendation_marker"),
+    # The risk judge quotes the trader's proposal, then concludes differently
+    ("The trader proposed FINAL TRANSACTION PROPOSAL: **BUY** given momentum.\n"
+     "Weighing the drawdown risk, we disagree.\n\nRecommendation: Sell", "SELL", "recommendation_marker"),
+    ("Recommendation: HOLD while earnings settle.\nFINAL DECISION: **BUY**", "BUY", "final_marker"),
+    ("Lots of discussion of risks and catalysts.\n\n**HOLD**", "HOLD", "final_line"),
+]
+
+AMBIGUOUS = [
+    "",
+    # The prompt template echoed back
+    "FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**",
+    "Recommendation: [BUY | HOLD | SELL]",
+    "FINAL TRANSACTION PROPOSAL: **SELL**\n...\nFINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**",
+    # Negated or incidental keywords are not decisions
+    "We would not BUY here.",
+    "Analysts debated whether to BUY the dip; the conclusion follows in the next section.",
+    "SELL pressure eased this week\nand volumes normalized.",
+]
+
+
+def test_decisions_follow_the_last_marker():
+    for text, decision, method in DECIDED:
+        extracted = extract_decision(text)
+        assert (extracted.decision, extracted.method) == (decision, method), (text, extracted)
+
+
+def test_ambiguous_text_is_not_guessed():
+    for text in AMBIGUOUS:
+        extracted = extract_decision(text)
+        assert extracted.decision is None, (text, extracted)
+        assert extracted.method == "ambiguous"
+
+
+def test_signal_processor_falls_back_to_llm_when_ambiguous():
+    llm = _RecordingLLM("HOLD")
+    processor = SignalProcessor(llm)
+    assert processor.process_signal("We would not BUY here.") == "HOLD"
+    assert processor.process_signal("FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**") == "HOLD"
+    assert llm.calls == 2
+    assert processor.process_signal("FINAL TRANSACTION PROPOSAL: **SELL**") == "SELL"
+    assert llm.calls == 2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
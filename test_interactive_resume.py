@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Interactive session resume: after an analyst fails, a new controller (e.g. after a
+server restart) restores the saved session and reruns only that analyst; a finished
+workflow leaves no snapshot behind.
+"""
+
+import sys
+import tempfile
+from types import SimpleNamespace
+
+from tradingagents.graph.checkpointing import SQLiteCheckpointSaver
+from tradingagents.interactive.feedback_analyzer import FeedbackAction, FeedbackAnalysis
+from tradingagents.interactive.interactive_workflow import InteractiveWorkflowController, WorkflowStage
+
+ANALYSTS = ["market", "news", "fundamentals"]
+
+
+class FakeExecutor:
+    """Runs analysts without an LLM, records each run and can fail one analyst"""
+
+    def __init__(self, runs, fail=None):
+        self.runs = runs
+        self.fail = fail
+
+    def create_initial_state(self, company_of_interest, trade_date, user_preferences=None):
+        return {"company_of_interest": company_of_interest, "trade_date": trade_date, "messages": []}
+
+    def execute_analyst_node(self, analyst_type, state, user_context=""):
+        self.runs.append(analyst_type)
+        if analyst_type == self.fail:
+            raise RuntimeError(f"{analyst_type} provider timed out")
+        report = f"{analyst_type} report"
+        return report, {f"{analyst_type}_report": report}
+
+    def merge_state_with_report(self, state, analyst_type, report):
+        return state
+
+
+class ApprovingAnalyzer:
+    def analyze(self, feedback_text, analyst_type, report, context=None):
+        return FeedbackAnalysis(FeedbackAction.APPROVE, [], [], "", 1.0, feedback_text)
+
+
+class NoInstructions:
+    def generate_analyst_instructions(self, preferences, analyst_type):
+        return ""
+
+
+def make_controller(checkpointer, runs, fail=None) -> InteractiveWorkflowController:
+    graph = SimpleNamespace(checkpointer=checkpointer, config={"llm_provider": "openai"})
+    controller = InteractiveWorkflowController(graph, NoInstructions(), ApprovingAnalyzer())
+    controller.executor = FakeExecutor(runs, fail=fail)
+    return controller
+
+
+def start(controller) -> bool:
+    return controller.initialize("AAPL", "2024-05-01", list(ANALYSTS))
+
+
+def test_resume_reruns_only_the_failed_analyst():
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer = SQLiteCheckpointSaver(f"{directory}/checkpoints.sqlite")
+
+        runs = []
+        controller = make_controller(checkpointer, runs, fail="news")
+        assert start(controller) is False
+        assert controller.run_current_analyst()["status"] == "completed"
+        controller.process_feedback("ok")
+        assert controller.run_current_analyst()["status"] == "error"
+        assert runs == ["market", "news"]
+
+        # The process restarts; the same analysis is started again
+        runs = []
+        resumed = make_controller(checkpointer, runs)
+        assert start(resumed) is True
+        assert resumed.workflow_state.get_current_analyst() == "news"
+        assert resumed.workflow_state.analyst_statuses["market"].report == "market report"
+        assert resumed.run_current_analyst()["report"] == "news report"
+        assert runs == ["news"]
+
+        # A report awaiting review when the session stopped is shown again, not rerun
+        runs = []
+        reviewing = make_controller(checkpointer, runs)
+        assert start(reviewing) is True
+        assert reviewing.run_current_analyst()["report"] == "news report"
+        assert runs == []
+
+        reviewing.process_feedback("ok")
+        reviewing.run_current_analyst()
+        reviewing.process_feedback("ok")
+        assert runs == ["fundamentals"]
+        assert reviewing.workflow_state.is_complete()
+        checkpointer.close()
+
+
+def test_completed_workflow_deletes_its_snapshot():
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer = SQLiteCheckpointSaver(f"{directory}/checkpoints.sqlite")
+        controller = make_controller(checkpointer, [])
+        start(controller)
+        key = controller._session_key()
+        for _ in ANALYSTS:
+            controller.run_current_analyst()
+            controller.process_feedback("ok")
+        assert checkpointer.get_snapshot(key) is not None
+
+        # No LLM on the fake graph: synthesis takes the fallback path, which also completes the workflow
+        controller.get_final_decision()
+        assert controller.workflow_state.stage == WorkflowStage.COMPLETED
+        assert checkpointer.get_snapshot(key) is None
+
+        # Starting the same analysis again begins a new session
+        runs = []
+        fresh = make_controller(checkpointer, runs)
+        assert start(fresh) is False
+        assert fresh.workflow_state.get_current_analyst() == "market"
+        checkpointer.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Memory index checks against a fake OpenAI embeddings endpoint: transient failures are
+retried, and a failed request never moves an index holding remote vectors to local
+embeddings (its collection stays the same and unsaved records are kept).
+"""
+
+import json
+import os
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import tradingagents.dataflows.transport as transport_module
+from tradingagents.agents.utils.memory import HashingEmbedder, SharedMemoryIndex
+from tradingagents.dataflows.transport import Transport
+
+_EMBEDDER = HashingEmbedder(dim=64)
+
+
+class _FakeEmbeddings(BaseHTTPRequestHandler):
+    """/v1/embeddings answering with hashing vectors; fail_next holds statuses to return first"""
+
+    protocol_version = "HTTP/1.1"
+    fail_next = []
+    requests_seen = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _FakeEmbeddings.requests_seen += 1
+        if _FakeEmbeddings.fail_next:
+            status = _FakeEmbeddings.fail_next.pop(0)
+            reply = json.dumps({"error": {"message": f"fake {status}", "type": "server_error"}}).encode()
+        else:
+            status = 200
+            vectors = _EMBEDDER.embed(body["input"])
+            reply = json.dumps({
+                "object": "list", "model": body["model"],
+                "data": [{"object": "embedding", "index": i, "embedding": v} for i, v in enumerate(vectors)],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+
+class _Environment:
+    """Fake endpoint plus a fast-retrying process transport, restored on exit"""
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeEmbeddings)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        _FakeEmbeddings.fail_next = []
+        _FakeEmbeddings.requests_seen = 0
+        os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+        self.previous_transport = transport_module._transport
+        transport_module._transport = Transport({
+            "retry_policy": {"max_attempts": 3, "backoff_base": 0.01, "jitter": 0.0},
+            "circuit_breaker": {"failure_threshold": 100},
+        })
+        self.config = {
+            "llm_provider": "openai",
+            "embedding_provider": "auto",
+            "backend_url": f"http://127.0.0.1:{self.server.server_address[1]}/v1",
+            "persist_memory": False,
+        }
+        return self
+
+    def index(self) -> SharedMemoryIndex:
+        return SharedMemoryIndex(self.config, collection_name=f"test-{uuid.uuid4().hex[:8]}")
+
+    def __exit__(self, *exc):
+        transport_module._transport = self.previous_transport
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_transient_failure_is_retried():
+    with _Environment() as env:
+        index = env.index()
+        _FakeEmbeddings.fail_next = [503]
+        index.add("bull_memory", [("rates rising, tech selling off", "trim growth exposure")])
+        assert index.embedding_backend == "openai"
+        assert index.count("bull_memory") == 1
+        assert _FakeEmbeddings.requests_seen == 2
+
+
+def test_failure_after_remote_vectors_keeps_the_collection():
+    with _Environment() as env:
+        index = env.index()
+        index.add("bull_memory", [("rates rising, tech selling off", "trim growth exposure")])
+        collection = index.collection.name
+
+        # The provider is down for the next requests (retries included)
+        _FakeEmbeddings.fail_next = [503] * 6
+        assert index.search("tech sells off as rates rise", roles=["bull_memory"]) == {"bull_memory": []}
+        index.add("bear_memory", [("strong dollar, emerging markets weak", "hedge currency exposure")])
+        assert index.embedding_backend == "openai" and index.collection.name == collection
+        assert index.count() == 1
+
+        # Once it recovers, the kept record is stored with the next add
+        index.add("bear_memory", [("oil spikes on supply cuts", "favour energy producers")])
+        assert index.count("bear_memory") == 2
+        matches = index.search("tech sells off as rates rise", roles=["bull_memory"])["bull_memory"]
+        assert matches[0]["recommendation"] == "trim growth exposure"
+
+
+def test_unreachable_provider_on_an_empty_index_switches_to_local():
+    with _Environment() as env:
+        index = env.index()
+        _FakeEmbeddings.fail_next = [400]
+        index.add("bull_memory", [("rates rising, tech selling off", "trim growth exposure")])
+        assert index.embedding_backend == "local"
+        assert index.count("bull_memory") == 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo risk engine checks: GBM VaR/CVaR against the lognormal closed form,
+bootstrap and GARCH VaR/CVaR against brute-force enumeration of every path, results
+independent of chunking and workers for a fixed seed, and metric keys that follow
+the configured confidence levels.
+"""
+
+import itertools
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from tradingagents.risk.monte_carlo_engine import (
+    MonteCarloRiskEngine, SimulationConfig, level_label, reported_level,
+)
+
+HISTORY = pd.DataFrame({
+    "AAPL": [0.012, -0.021, 0.004, 0.017, -0.035, 0.008, -0.006, 0.026],
+    "MSFT": [0.009, -0.014, 0.011, -0.003, -0.028, 0.015, 0.002, 0.019],
+})
+WEIGHTS = np.array([[0.6, 0.4]])
+
+
+def exact_var_cvar(outcomes: np.ndarray, probabilities: np.ndarray, level: float):
+    """Lower (1 - level) quantile of a discrete distribution and the mean at or below it"""
+    order = np.argsort(outcomes)
+    outcomes, probabilities = outcomes[order], probabilities[order]
+    var = outcomes[np.searchsorted(np.cumsum(probabilities), 1 - level)]
+    tail = outcomes <= var
+    return var, np.sum(outcomes[tail] * probabilities[tail]) / probabilities[tail].sum()
+
+
+def terminal(path_returns: np.ndarray) -> float:
+    """Terminal return of the weighted, daily-rebalanced portfolio over rows of asset returns"""
+    return np.prod(1 + path_returns @ WEIGHTS[0]) - 1
+
+
+def test_gbm_matches_lognormal_closed_form():
+    returns = HISTORY[["AAPL"]]
+    horizon = 10
+    engine = MonteCarloRiskEngine(returns, SimulationConfig(
+        method="gbm", n_paths=200_000, horizon=horizon, confidence_levels=[0.95, 0.99]))
+    metrics = engine.evaluate(np.array([[1.0]])).iloc[0]
+
+    log_returns = np.log1p(returns["AAPL"].values)
+    m = horizon * log_returns.mean()
+    s = np.sqrt(horizon * log_returns.var(ddof=1))
+    for level in (0.95, 0.99):
+        z = norm.ppf(1 - level)
+        var = np.expm1(m + s * z)
+        cvar = np.exp(m + s ** 2 / 2) * norm.cdf(z - s) / (1 - level) - 1
+        label = level_label(level)
+        np.testing.assert_allclose(metrics[f"var_{label}"], var, rtol=0.02)
+        np.testing.assert_allclose(metrics[f"cvar_{label}"], cvar, rtol=0.02)
+
+
+def test_bootstrap_matches_enumerated_paths():
+    values = HISTORY.values
+    n_obs = len(values)
+    for block_size in (1, 2):
+        engine = MonteCarloRiskEngine(HISTORY, SimulationConfig(
+            method="bootstrap", n_paths=200_000, horizon=2, block_size=block_size))
+        metrics = engine.evaluate(WEIGHTS).iloc[0]
+
+        if block_size == 1:
+            # Two independent draws: every ordered pair of days
+            paths = [values[[i, j]] for i, j in itertools.product(range(n_obs), repeat=2)]
+        else:
+            # One circular block: consecutive days from any start
+            paths = [values[[i, (i + 1) % n_obs]] for i in range(n_obs)]
+        outcomes = np.array([terminal(path) for path in paths])
+        probabilities = np.full(len(outcomes), 1 / len(outcomes))
+
+        var, cvar = exact_var_cvar(outcomes, probabilities, 0.95)
+        assert metrics["var_95"] == var, (block_size, metrics["var_95"], var)
+        np.testing.assert_allclose(metrics["cvar_95"], cvar, rtol=0.02)
+
+
+def test_garch_matches_enumerated_paths():
+    engine = MonteCarloRiskEngine(HISTORY, SimulationConfig(
+        method="garch", n_paths=200_000, horizon=2, block_size=1))
+    metrics = engine.evaluate(WEIGHTS).iloc[0]
+
+    model = engine._build_model()
+    mu, omega, alpha, beta = model["garch_params"].T
+    residuals = model["std_residuals"]
+    outcomes = []
+    for i, j in itertools.product(range(len(residuals)), repeat=2):
+        variance = model["next_variance"]
+        path = []
+        for z in (residuals[i], residuals[j]):
+            eps = np.sqrt(variance) * z
+            path.append(mu + eps)
+            variance = omega + alpha * eps ** 2 + beta * variance
+        outcomes.append(terminal(np.array(path)))
+    outcomes = np.array(outcomes)
+    probabilities = np.full(len(outcomes), 1 / len(outcomes))
+
+    for level in (0.95, 0.99):
+        var, cvar = exact_var_cvar(outcomes, probabilities, level)
+        label = level_label(level)
+        np.testing.assert_allclose(metrics[f"var_{label}"], var, rtol=1e-12)
+        np.testing.assert_allclose(metrics[f"cvar_{label}"], cvar, rtol=0.02)
+
+
+def test_chunking_and_workers_do_not_change_results():
+    for method in ("gbm", "bootstrap", "garch"):
+        baseline = None
+        for chunk_size, n_jobs in ((2300, 1), (1000, 1), (700, 1), (100, 1), (1000, 2)):
+            engine = MonteCarloRiskEngine(HISTORY, SimulationConfig(
+                method=method, n_paths=2300, horizon=15, chunk_size=chunk_size, n_jobs=n_jobs, seed=7))
+            _, terminal_returns, drawdowns = engine.simulate(np.vstack([WEIGHTS, [[0.2, 0.8]]]))
+            if baseline is None:
+                baseline = terminal_returns, drawdowns
+                continue
+            np.testing.assert_allclose(terminal_returns, baseline[0], rtol=1e-12, err_msg=f"{method} {chunk_size}")
+            np.testing.assert_allclose(drawdowns, baseline[1], rtol=1e-12, err_msg=f"{method} {chunk_size}")
+
+
+def test_metric_keys_follow_confidence_levels():
+    engine = MonteCarloRiskEngine(HISTORY, SimulationConfig(
+        n_paths=1000, confidence_levels=[0.9, 0.975]))
+    result = engine.evaluate({"balanced": {"AAPL": 0.5, "MSFT": 0.5}})
+    for key in ("var_90", "cvar_90", "max_drawdown_90", "var_97_5", "cvar_97_5", "max_drawdown_97_5"):
+        assert key in result.columns
+    assert "var_95" not in result.columns
+    assert result.attrs["confidence_levels"] == [0.9, 0.975]
+
+    assert reported_level({"confidence_levels": [0.9, 0.975]}) == 0.9
+    assert reported_level({"confidence_levels": [0.99, 0.95]}) == 0.95
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
@@ -0,0 +1,799 @@
+#!/usr/bin/env python3
+"""
+Pipeline benchmark: end-to-end throughput of the analysis workflows with a stub LLM and
+synthetic market data (no API keys or network access needed).
+
+Stages, each run in a fresh process so peak RSS is per stage:
+- propagate:   TradingAgentsGraph.propagate for every ticker (reports are written, so
+               the portfolio stage has analyses to aggregate)
+- interactive: InteractiveWorkflowController, every analyst approved, then the final decision
+- portfolio:   StockDataAggregator -> MultiScenarioPortfolioOptimizer -> PortfolioReportGenerator
+- flask:       the web chat endpoints (/api/welcome, /api/chat, /api/jobs/<id>) through
+               Flask's test client
+
+Per stage: wall-clock, CPU, peak RSS, LLM calls, tool calls and data calls. Results are
+appended to <results_dir>/benchmarks/pipeline_history.jsonl (with the git commit) and
+compared with the previous run, so performance work has a baseline.
+
+Usage:
+    python test_pipeline_benchmark.py [--stages propagate,portfolio] [--tickers AAPL,MSFT]
+                                      [--llm-latency 0.05] [--compare results.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+import numpy as np
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+STAGES = ["propagate", "interactive", "portfolio", "flask"]
+DEFAULT_TICKERS = ["AAPL", "MSFT", "NVDA"]
+# comprehensive_quantitative produces the optimization and risk metrics the portfolio stage aggregates
+DEFAULT_ANALYSTS = ["market", "news", "fundamentals", "comprehensive_quantitative"]
+DEFAULT_TRADE_DATE = "2024-05-10"
+
+# A stage regresses when it is this much slower (wall-clock) than the baseline
+REGRESSION_TOLERANCE = float(os.getenv("PIPELINE_REGRESSION_TOLERANCE", "0.25"))
+
+
+# ----------------------------------------------------------------------
+# Stub LLM
+# ----------------------------------------------------------------------
+
+_llm_counts = Counter()
+_llm_counts_lock = threading.Lock()
+
+_DECISIONS = ["BUY", "HOLD", "SELL"]
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic chat model with a configurable latency
+
+    With tools bound, the first turn calls every tool once (arguments are derived from
+    the tool schema and the ticker and date in the prompt); once tool results are in,
+    it answers with a report that ends in a FINAL TRANSACTION PROPOSAL. Prompts asking
+    for JSON (preference parsing, feedback analysis) get a JSON block that approves.
+    """
+
+    latency: float = 0.0
+    response_chars: int = 1500
+    default_ticker: str = DEFAULT_TICKERS[0]
+    default_date: str = DEFAULT_TRADE_DATE
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = "\n".join(str(message.content) for message in messages)
+        ticker, trade_date = self._context(prompt)
+
+        if tools and not isinstance(messages[-1], ToolMessage):
+            tool_calls = [
+                {
+                    "name": tool["function"]["name"],
+                    "args": self._tool_args(tool["function"].get("parameters", {}), ticker, trade_date),
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                }
+                for tool in tools
+            ]
+            message = AIMessage(content="", tool_calls=tool_calls)
+        elif "json" in prompt.lower():
+            message = AIMessage(content=self._json_reply())
+        else:
+            message = AIMessage(content=self._report(ticker, trade_date, prompt))
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(message.content) // 4
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        with _llm_counts_lock:
+            _llm_counts["llm_calls"] += 1
+            _llm_counts["prompt_tokens"] += prompt_tokens
+            _llm_counts["completion_tokens"] += completion_tokens
+            _llm_counts["tool_calls"] += len(message.tool_calls)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _context(self, prompt: str):
+        ticker = re.search(r"company we want to look at is ([A-Z.\-]{1,10})", prompt)
+        trade_date = re.search(r"current date is (\d{4}-\d{2}-\d{2})", prompt)
+        return (ticker.group(1) if ticker else self.default_ticker,
+                trade_date.group(1) if trade_date else self.default_date)
+
+    @staticmethod
+    def _tool_args(schema: Dict[str, Any], ticker: str, trade_date: str) -> Dict[str, Any]:
+        args = {}
+        for name, spec in schema.get("properties", {}).items():
+            lowered = name.lower()
+            if spec.get("type") == "boolean":
+                args[name] = True
+            elif spec.get("type") == "integer" or "days" in lowered:
+                args[name] = 30
+            elif "ticker" in lowered or "symbol" in lowered or "company" in lowered:
+                args[name] = ticker
+            elif "start" in lowered:
+                args[name] = (pd.Timestamp(trade_date) - pd.DateOffset(days=90)).strftime("%Y-%m-%d")
+            elif "date" in lowered:
+                args[name] = trade_date
+            elif "indicator" in lowered:
+                args[name] = "rsi"
+            elif "freq" in lowered:
+                args[name] = "quarterly"
+            elif "query" in lowered:
+                args[name] = f"{ticker} stock"
+            else:
+                args[name] = ticker
+        return args
+
+    @staticmethod
+    def _json_reply() -> str:
+        payload = {
+            "action": "approve",
+            "focus_points": [],
+            "questions": [],
+            "revision_instructions": "",
+            "confidence": 0.9,
+            "focus_areas": ["growth"],
+            "principles": [],
+            "constraints": [],
+            "risk_tolerance": "moderate",
+            "investment_horizon": "medium-term",
+            "custom_instructions": "",
+            "selected_method": "max_sharpe",
+            "rationale": "Balanced preferences",
+        }
+        return "```json\n" + json.dumps(payload, indent=2) + "\n```"
+
+    def _report(self, ticker: str, trade_date: str, prompt: str) -> str:
+        seed = zlib.crc32(f"{ticker}|{trade_date}|{len(prompt) // 1000}".encode())
+        decision = _DECISIONS[seed % len(_DECISIONS)]
+        rng = np.random.default_rng(seed)
+        rows = "\n".join(
+            f"| {name} | {value:.2f} | {signal} |"
+            for name, value, signal in zip(
+                ["RSI", "MACD", "50 SMA", "200 SMA", "ATR", "Volume Ratio"],
+                rng.uniform(10, 250, 6),
+                rng.choice(["Bullish", "Neutral", "Bearish"], 6),
+            )
+        )
+        report = (
+            f"## Analysis of {ticker} as of {trade_date}\n\n"
+            "| Metric | Value | Signal |\n|---|---|---|\n" + rows + "\n\n"
+        )
+        filler = (f"{ticker} shows a mixed picture: momentum and valuation point in different "
+                  "directions, so position size should stay moderate. ")
+        report += filler * max(1, (self.response_chars - len(report)) // len(filler))
+        return report + f"\n\nFINAL TRANSACTION PROPOSAL: **{decision}**"
+
+
+def _stub_factory(model, config):
+    return StubChatModel(**config.get("stub_llm", {}))
+
+
+# ----------------------------------------------------------------------
+# Synthetic market data
+# ----------------------------------------------------------------------
+
+_data_counts = Counter()
+
+
+class SyntheticMarket:
+    """Deterministic daily OHLCV (geometric Brownian motion seeded by ticker), statements and info"""
+
+    EPOCH = "2009-01-01"
+
+    def __init__(self, seed: int = 7):
+        self.seed = seed
+        self._series: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def prices(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        ticker = ticker.upper()
+        with self._lock:
+            data = self._series.get(ticker)
+            if data is None:
+                data = self._generate(ticker)
+                self._series[ticker] = data
+        start = pd.Timestamp(start) if start is not None else data.index[0]
+        end = pd.Timestamp(end) if end is not None else data.index[-1]
+        return data.loc[start:end].copy()
+
+    def _generate(self, ticker: str) -> pd.DataFrame:
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()) ^ self.seed)
+        index = pd.bdate_range(self.EPOCH, pd.Timestamp.today().normalize() + pd.Timedelta(days=7))
+        drift, vol = rng.uniform(0.0001, 0.0008), rng.uniform(0.01, 0.03)
+        close = rng.uniform(20, 400) * np.exp(np.cumsum(rng.normal(drift, vol, len(index))))
+        spread = close * rng.uniform(0.002, 0.02, len(index))
+        open_ = close * (1 + rng.normal(0, vol / 3, len(index)))
+        return pd.DataFrame(
+            {
+                "Open": open_,
+                "High": np.maximum(open_, close) + spread,
+                "Low": np.minimum(open_, close) - spread,
+                "Close": close,
+                "Volume": rng.integers(1_000_000, 50_000_000, len(index)),
+            },
+            index=pd.DatetimeIndex(index, name="Date"),
+        )
+
+    def statement(self, ticker: str, items: List[str], periods: int, freq: str) -> pd.DataFrame:
+        rng = np.random.default_rng(zlib.crc32(f"{ticker}|{freq}".encode()) ^ self.seed)
+        step = pd.DateOffset(months=3 if freq == "quarterly" else 12)
+        columns = [pd.Timestamp("2023-12-31") - step * i for i in range(periods)]
+        return pd.DataFrame(rng.uniform(1e8, 5e10, (len(items), periods)), index=items, columns=columns)
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        close = float(self.prices(ticker)["Close"].iloc[-1])
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        return {
+            "symbol": ticker, "shortName": f"{ticker} Corp", "sector": "Technology",
+            "currentPrice": close, "marketCap": close * 1e9, "trailingPE": float(rng.uniform(10, 40)),
+            "forwardPE": float(rng.uniform(10, 35)), "beta": float(rng.uniform(0.6, 1.8)),
+            "totalRevenue": float(rng.uniform(1e10, 4e11)), "netIncomeToCommon": float(rng.uniform(1e9, 9e10)),
+            "profitMargins": float(rng.uniform(0.05, 0.35)), "returnOnEquity": float(rng.uniform(0.05, 0.5)),
+            "debtToEquity": float(rng.uniform(10, 200)), "dividendYield": float(rng.uniform(0, 0.03)),
+        }
+
+
+class SyntheticPriceProvider:
+    """BulkPriceLoader provider backed by SyntheticMarket"""
+
+    def __init__(self, market: SyntheticMarket):
+        self.market = market
+
+    def download(self, tickers, start, end):
+        _data_counts["price_downloads"] += 1
+        return {t: self.market.prices(t, start, end) for t in tickers}
+
+    def fetch_one(self, ticker, start, end):
+        _data_counts["price_downloads"] += 1
+        return self.market.prices(ticker, start, end)
+
+
+class SyntheticTicker:
+    """The parts of yf.Ticker the workflows use"""
+
+    _BALANCE = ["Total Assets", "Current Assets", "Cash And Cash Equivalents",
+                "Total Liabilities Net Minority Interest", "Current Liabilities", "Total Debt",
+                "Stockholders Equity", "Retained Earnings"]
+    _CASHFLOW = ["Operating Cash Flow", "Investing Cash Flow", "Financing Cash Flow",
+                 "Free Cash Flow", "Capital Expenditure"]
+    _INCOME = ["Total Revenue", "Gross Profit", "Operating Income", "Net Income", "EBITDA", "Basic EPS"]
+
+    def __init__(self, market: SyntheticMarket, symbol: str):
+        self.market = market
+        self.ticker = symbol.upper()
+
+    def history(self, period: str = "1mo", start=None, end=None, **kwargs) -> pd.DataFrame:
+        _data_counts["yf_history"] += 1
+        if start is None:
+            from tradingagents.dataflows.price_loader import period_to_start
+
+            end_ts = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize()
+            start = period_to_start(period, end_ts)
+        if end is not None:
+            end = pd.Timestamp(end) - pd.Timedelta(days=1)  # end is exclusive in yfinance
+        return self.market.prices(self.ticker, start, end)
+
+    @property
+    def info(self):
+        return self.market.info(self.ticker)
+
+    def _statement(self, items, freq):
+        _data_counts["yf_statements"] += 1
+        return self.market.statement(self.ticker, items, 4, freq)
+
+    balance_sheet = property(lambda self: self._statement(self._BALANCE, "annual"))
+    quarterly_balance_sheet = property(lambda self: self._statement(self._BALANCE, "quarterly"))
+    cashflow = property(lambda self: self._statement(self._CASHFLOW, "annual"))
+    quarterly_cashflow = property(lambda self: self._statement(self._CASHFLOW, "quarterly"))
+    financials = property(lambda self: self._statement(self._INCOME, "annual"))
+    quarterly_financials = property(lambda self: self._statement(self._INCOME, "quarterly"))
+    income_stmt = financials
+
+
+def _synthetic_text(name: str, market: SyntheticMarket):
+    """Stand-in for an interface function that reads local datasets or news APIs"""
+
+    def fetch(*args, **kwargs):
+        subject = next((a for a in args if isinstance(a, str) and a.isupper()), "the market")
+        rng = np.random.default_rng(zlib.crc32(f"{name}|{args}".encode()))
+        lines = [f"## {name.replace('_', ' ')} for {subject}"]
+        for i in range(8):
+            lines.append(f"- Item {i + 1}: sentiment {rng.uniform(-1, 1):+.2f}, "
+                         f"relevance {rng.uniform(0, 1):.2f}. {subject} coverage remains active.")
+        return "\n".join(lines)
+
+    fetch.__name__ = name
+    return fetch
+
+
+# Interface functions backed by local datasets (data_dir) or news/OpenAI APIs; the price,
+# indicator and statement functions keep their real implementations over synthetic data
+_TEXT_FUNCTIONS = [
+    "get_finnhub_news", "get_finnhub_company_insider_sentiment", "get_finnhub_company_insider_transactions",
+    "get_simfin_balance_sheet", "get_simfin_cashflow", "get_simfin_income_statements", "get_google_news",
+    "get_reddit_global_news", "get_reddit_company_news", "get_stock_news_openai", "get_global_news_openai",
+    "get_fundamentals_openai",
+]
+
+
+def _counted(name, fn):
+    def wrapper(*args, **kwargs):
+        _data_counts[name] += 1
+        return fn(*args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+def install_synthetic_market(config: Dict[str, Any], market: Optional[SyntheticMarket] = None):
+    """
+    Route every data source the workflows use to SyntheticMarket
+
+    BulkPriceLoader gets a synthetic provider, the shared transport hands out synthetic
+    tickers, the stockstats download cache is pre-seeded, and the dataset/news interface
+    functions return synthetic text. Calls are counted per function.
+    """
+    import tradingagents.dataflows.interface as interface
+    from tradingagents.dataflows.price_loader import get_price_loader
+    from tradingagents.dataflows.transport import get_transport
+
+    market = market or SyntheticMarket()
+
+    get_price_loader().provider = SyntheticPriceProvider(market)
+    get_transport(config).yf_ticker = lambda symbol: SyntheticTicker(market, symbol)
+
+    for name in _TEXT_FUNCTIONS:
+        setattr(interface, name, _synthetic_text(name, market))
+    for name in [n for n in dir(interface) if n.startswith("get_") and callable(getattr(interface, n))]:
+        if name not in ("get_config", "get_price_loader", "get_transport"):
+            setattr(interface, name, _counted(name, getattr(interface, name)))
+
+    # StockstatsUtils caches a 15-year download per symbol and day; seeding it keeps the real
+    # indicator code path while skipping the download
+    _seed_stockstats_cache(config, market)
+    return market
+
+
+def _seed_stockstats_cache(config, market, tickers=None):
+    today = pd.Timestamp.today()
+    start = (today - pd.DateOffset(years=15)).strftime("%Y-%m-%d")
+    end = today.strftime("%Y-%m-%d")
+    os.makedirs(config["data_cache_dir"], exist_ok=True)
+    for ticker in tickers or config["benchmark_tickers"]:
+        path = os.path.join(config["data_cache_dir"], f"{ticker}-YFin-data-{start}-{end}.csv")
+        if not os.path.exists(path):
+            market.prices(ticker, start, end).reset_index().to_csv(path, index=False)
+
+
+# ----------------------------------------------------------------------
+# Stages
+# ----------------------------------------------------------------------
+
+def benchmark_config(workdir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    from tradingagents.default_config import DEFAULT_CONFIG
+
+    config = DEFAULT_CONFIG.copy()
+    cache_dir = os.path.join(workdir, "data_cache")
+    config.update({
+        "results_dir": os.path.join(workdir, "results"),
+        "data_cache_dir": cache_dir,
+        "memory_dir": os.path.join(cache_dir, "memory"),
+        "checkpoint_dir": os.path.join(cache_dir, "checkpoints"),
+        "llm_provider": "stub",
+        "deep_think_llm": "stub-deep",
+        "quick_think_llm": "stub-quick",
+        "embedding_provider": "local",
+        "data_mode": "live",
+        "online_tools": True,
+        "stub_llm": {"latency": options["llm_latency"], "response_chars": options["response_chars"],
+                     "default_ticker": options["tickers"][0], "default_date": options["trade_date"]},
+        "benchmark_tickers": options["tickers"],
+    })
+    return config
+
+
+def _build_graph(config, analysts):
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    return TradingAgentsGraph(selected_analysts=analysts, config=config)
+
+
+def stage_propagate(config, options) -> Dict[str, Any]:
+    graph = _build_graph(config, options["analysts"])
+    per_ticker = {}
+    for ticker in options["tickers"]:
+        start = time.perf_counter()
+        _, decision = graph.propagate(ticker, options["trade_date"])
+        if graph.artifacts is not None:
+            graph.artifacts.result(timeout=600)  # The portfolio stage reads these reports
+        per_ticker[ticker] = {"seconds": round(time.perf_counter() - start, 3), "decision": decision}
+    return {"per_ticker": per_ticker}
+
+
+def stage_interactive(config, options) -> Dict[str, Any]:
+    from tradingagents.interactive.interactive_workflow import InteractiveWorkflowController
+    from tradingagents.interactive.feedback_analyzer import create_feedback_analyzer
+    from tradingagents.interactive.user_preference_parser import create_preference_parser
+
+    graph = _build_graph(config, options["analysts"])
+    controller = InteractiveWorkflowController(
+        graph=graph,
+        preference_parser=create_preference_parser(graph.quick_thinking_llm),
+        feedback_analyzer=create_feedback_analyzer(graph.quick_thinking_llm),
+    )
+    ticker = options["tickers"][0]
+    controller.initialize(ticker, options["trade_date"], list(options["analysts"]),
+                          "I prefer long-term growth with moderate risk")
+    analyst_seconds = {}
+    while not controller.workflow_state.is_complete():
+        result = controller.run_current_analyst()
+        if "error" in result:
+            raise RuntimeError(f"{result.get('analyst')}: {result['error']}")
+        analyst_seconds[result["analyst"]] = round(result.get("duration") or 0.0, 3)
+        controller.process_feedback("approved")
+    final_report = controller.get_final_decision()
+    return {"ticker": ticker, "analyst_seconds": analyst_seconds, "final_report_chars": len(final_report)}
+
+
+def stage_portfolio(config, options) -> Dict[str, Any]:
+    from tradingagents.dataflows.price_loader import get_price_loader
+    from tradingagents.portfolio.multi_scenario_portfolio_optimizer import MultiScenarioPortfolioOptimizer
+    from tradingagents.portfolio.portfolio_report_generator import PortfolioReportGenerator
+    from tradingagents.portfolio.stock_data_aggregator import StockDataAggregator
+
+    timings = {}
+    start = time.perf_counter()
+    aggregator = StockDataAggregator(options["trade_date"])
+    aggregated = aggregator.aggregate_multiple_stocks(options["tickers"])
+    if aggregated["num_stocks"] < 2:
+        raise RuntimeError(f"Only {aggregated['num_stocks']} analyses to aggregate; run the propagate stage first")
+    timings["aggregate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    returns = get_price_loader().load_returns_matrix(list(aggregated["stocks_data"]), period="6mo")
+    metrics = {t: d["metrics"] for t, d in aggregated["stocks_data"].items() if t in returns.columns}
+    scenarios = MultiScenarioPortfolioOptimizer(returns, metrics).optimize_all_scenarios()
+    timings["optimize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report_path = PortfolioReportGenerator(aggregated, scenarios, options["trade_date"]).generate_comprehensive_report()
+    timings["report"] = time.perf_counter() - start
+    return {
+        "step_seconds": {k: round(v, 3) for k, v in timings.items()},
+        "scenarios": len(scenarios),
+        "report": os.path.basename(str(report_path)),
+    }
+
+
+def stage_flask(config, options) -> Dict[str, Any]:
+    import flask_chat_app
+
+    # The app builds its graph from its WatsonX config on first use; hand it a stub-backed one
+    flask_chat_app.graph = _build_graph(config, ["market", "fundamentals", "news", "social", "quantitative",
+                                                 "comprehensive_quantitative", "visualizer"])
+    client = flask_chat_app.app.test_client()
+    latencies: Dict[str, List[float]] = {}
+
+    def request(method, url, **kwargs):
+        start = time.perf_counter()
+        response = getattr(client, method)(url, **kwargs)
+        route = re.sub(r"/[0-9a-f\-]{8,}", "/<id>", url.split("?")[0])
+        latencies.setdefault(f"{method.upper()} {route}", []).append(time.perf_counter() - start)
+        return response
+
+    session_id = request("get", "/api/welcome").get_json()["session_id"]
+    analyst_words = " and ".join(options["analysts"])
+    messages = [analyst_words, f"Analyze {options['tickers'][0]}. I care about long-term growth."]
+    turns, waiting_for = 0, None
+    while messages and turns < 20:
+        turns += 1
+        response = request("post", "/api/chat", json={"session_id": session_id, "message": messages.pop(0)})
+        payload = response.get_json()
+        if response.status_code == 202:
+            job = payload
+            while job.get("status") not in ("completed", "failed"):
+                job = request("get", f"/api/jobs/{job['job_id']}?wait=25").get_json()
+            payload = job.get("result") or {}
+            if job["status"] != "completed":
+                raise RuntimeError(f"Chat job failed ({job.get('http_status')}): {payload.get('error')}")
+        elif response.status_code >= 400:
+            raise RuntimeError(f"/api/chat returned {response.status_code}: {payload}")
+        waiting_for = payload.get("waiting_for")
+        if waiting_for == "feedback":
+            messages.append("approved")
+        elif waiting_for == "optimization_preference":
+            messages.append("I prefer balanced risk with steady growth over 2-3 years")
+        elif waiting_for == "final_decision":
+            messages.append("yes")
+
+    return {
+        "turns": turns,
+        "final_state": waiting_for,
+        "requests": {route: {"count": len(values), "p50_ms": round(1000 * float(np.median(values)), 1),
+                             "max_ms": round(1000 * max(values), 1)}
+                     for route, values in latencies.items()},
+    }
+
+
+STAGE_FUNCTIONS = {
+    "propagate": stage_propagate,
+    "interactive": stage_interactive,
+    "portfolio": stage_portfolio,
+    "flask": stage_flask,
+}
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_stage(stage: str, workdir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one stage in this process and measure it (called in a fresh worker process)"""
+    os.chdir(workdir)  # Reports and portfolio caches use paths relative to the working directory
+    sys.path.insert(0, PROJECT_ROOT)
+    result = {"stage": stage, "status": "ok"}
+
+    setup_start = time.perf_counter()
+    try:
+        from tradingagents.dataflows.config import set_config
+        from tradingagents.graph.llm_providers import register_llm_provider
+
+        config = benchmark_config(workdir, options)
+        set_config(config)
+        register_llm_provider("stub", _stub_factory)
+        install_synthetic_market(config)
+    except ImportError as e:
+        return {**result, "status": "skipped", "error": f"{type(e).__name__}: {e}"}
+    result["setup_seconds"] = round(time.perf_counter() - setup_start, 3)
+
+    _llm_counts.clear()
+    _data_counts.clear()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        result["details"] = STAGE_FUNCTIONS[stage](config, options)
+    except ImportError as e:
+        result.update(status="skipped", error=f"{type(e).__name__}: {e}")
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc()[-3000:])
+    finally:
+        from tradingagents.agents.generators.comprehensive_charts import shutdown_chart_pool
+
+        shutdown_chart_pool()
+    result.update({
+        "wall_seconds": round(time.perf_counter() - wall_start, 3),
+        "cpu_seconds": round(time.process_time() - cpu_start, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+        "llm_calls": _llm_counts["llm_calls"],
+        "prompt_tokens": _llm_counts["prompt_tokens"],
+        "completion_tokens": _llm_counts["completion_tokens"],
+        "tool_calls": _llm_counts["tool_calls"],
+        "data_calls": dict(sorted(_data_counts.items())),
+    })
+    return result
+
+
+def run_benchmark(stages: List[str], options: Dict[str, Any], workdir: Optional[str] = None,
+                  keep_workdir: bool = False) -> Dict[str, Any]:
+    """
+    Run the stages in order, each in a fresh process sharing one working directory
+
+    Returns:
+        Run record: commit, options, environment and one result per stage
+    """
+    own_workdir = workdir is None
+    workdir = os.path.abspath(workdir or tempfile.mkdtemp(prefix="tradingagents-bench-"))
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+    try:
+        for stage in stages:
+            print(f"[BENCH] {stage}...", flush=True)
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(run_stage, stage, workdir, options).result()
+            results.append(result)
+            print(f"[BENCH] {format_result(result)}", flush=True)
+    finally:
+        if own_workdir and not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "options": options,
+        "stages": results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=PROJECT_ROOT, timeout=10).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, cwd=PROJECT_ROOT, timeout=30).stdout.strip()
+        return f"{commit}-dirty" if commit and dirty else commit or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    if result["status"] != "ok":
+        return f"{result['stage']:<12} {result['status'].upper()}: {result.get('error')}"
+    rss = f"{result['peak_rss_mb']:.0f} MB" if result.get("peak_rss_mb") is not None else "n/a"
+    return (f"{result['stage']:<12} wall {result['wall_seconds']:>7.2f}s  cpu {result['cpu_seconds']:>7.2f}s  "
+            f"peak RSS {rss:>7}  llm {result['llm_calls']:>3}  tools {result['tool_calls']:>3}  "
+            f"data {sum(result['data_calls'].values()):>3}")
+
+
+def save_run(run: Dict[str, Any], output_dir: str) -> str:
+    """Write the run as JSON and append it to pipeline_history.jsonl"""
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = run["timestamp"].replace(":", "").replace("-", "")
+    path = os.path.join(output_dir, f"pipeline_{stamp}_{run['commit'] or 'nogit'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2, default=str)
+    with open(os.path.join(output_dir, "pipeline_history.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, default=str) + "\n")
+    return path
+
+
+def load_baseline(output_dir: str, compare: Optional[str] = None,
+                  options: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """The run to compare against: --compare file, else the last run in pipeline_history.jsonl with the same options"""
+    if compare:
+        with open(compare, encoding="utf-8") as f:
+            return json.load(f)
+    history = os.path.join(output_dir, "pipeline_history.jsonl")
+    if not os.path.exists(history):
+        return None
+    last = None
+    with open(history, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            run = json.loads(line)
+            if options is None or run.get("options") == options:
+                last = run
+    return last
+
+
+def compare_runs(run: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Print per-stage deltas; returns the stages whose wall-clock regressed past the tolerance"""
+    before = {r["stage"]: r for r in baseline.get("stages", []) if r.get("status") == "ok"}
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for result in run["stages"]:
+        old = before.get(result["stage"])
+        if result["status"] != "ok" or old is None:
+            continue
+        deltas = []
+        for key in ("wall_seconds", "cpu_seconds", "peak_rss_mb", "llm_calls", "tool_calls"):
+            if result.get(key) is None or old.get(key) is None:
+                continue
+            change = (result[key] - old[key]) / old[key] if old[key] else 0.0
+            deltas.append(f"{key.split('_')[0]} {old[key]:g} -> {result[key]:g} ({change:+.0%})")
+        print(f"  {result['stage']:<12} " + ", ".join(deltas))
+        if old["wall_seconds"] and result["wall_seconds"] > old["wall_seconds"] * (1 + REGRESSION_TOLERANCE):
+            regressions.append(result["stage"])
+    return regressions
+
+
+def default_options(**overrides) -> Dict[str, Any]:
+    options = {
+        "tickers": DEFAULT_TICKERS,
+        "analysts": DEFAULT_ANALYSTS,
+        "trade_date": DEFAULT_TRADE_DATE,
+        "llm_latency": 0.0,
+        "response_chars": 1500,
+    }
+    options.update(overrides)
+    return options
+
+
+def test_propagate_and_portfolio_run_offline():
+    run = run_benchmark(["propagate", "portfolio"],
+                        default_options(tickers=["AAPL", "MSFT"], analysts=["market", "comprehensive_quantitative"]))
+    propagate, portfolio = run["stages"]
+    assert propagate["status"] == "ok", propagate.get("traceback") or propagate.get("error")
+    assert propagate["llm_calls"] > 0 and propagate["tool_calls"] > 0
+    assert portfolio["status"] == "ok", portfolio.get("traceback") or portfolio.get("error")
+    assert portfolio["details"]["scenarios"] > 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated, from {STAGES}")
+    parser.add_argument("--tickers", default=",".join(DEFAULT_TICKERS))
+    parser.add_argument("--analysts", default=",".join(DEFAULT_ANALYSTS))
+    parser.add_argument("--trade-date", default=DEFAULT_TRADE_DATE)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the stub LLM sleeps per call")
+    parser.add_argument("--response-chars", type=int, default=1500, help="Length of stub LLM reports")
+    parser.add_argument("--output-dir", default=None, help="Default: <results_dir>/benchmarks")
+    parser.add_argument("--compare", default=None, help="Run JSON to compare with (default: previous run)")
+    parser.add_argument("--workdir", default=None, help="Keep generated reports here instead of a temp dir")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGE_FUNCTIONS]
+    if unknown:
+        parser.error(f"Unknown stages: {unknown}")
+    options = default_options(
+        tickers=[t.strip().upper() for t in args.tickers.split(",") if t.strip()],
+        analysts=[a.strip() for a in args.analysts.split(",") if a.strip()],
+        trade_date=args.trade_date,
+        llm_latency=args.llm_latency,
+        response_chars=args.response_chars,
+    )
+
+    from tradingagents.default_config import DEFAULT_CONFIG
+
+    output_dir = args.output_dir or os.path.join(PROJECT_ROOT, DEFAULT_CONFIG["results_dir"], "benchmarks")
+
+    print("=" * 80)
+    print("PIPELINE BENCHMARK: stub LLM, synthetic market data")
+    print("=" * 80)
+    baseline = load_baseline(output_dir, args.compare, options)
+    run = run_benchmark(stages, options, workdir=args.workdir)
+    path = save_run(run, output_dir)
+
+    print()
+    for result in run["stages"]:
+        print(format_result(result))
+    regressions = compare_runs(run, baseline) if baseline else []
+    print(f"\nSaved to {path}")
+
+    failed = [r["stage"] for r in run["stages"] if r["status"] == "error"]
+    if failed or regressions:
+        print(f"[FAIL] Errors: {failed or 'none'}; slower than baseline by >{REGRESSION_TOLERANCE:.0%}: "
+              f"{regressions or 'none'}")
+        return 1
+    print("[OK] Pipeline benchmark complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
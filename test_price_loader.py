@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Bulk price loader checks against a fake provider: batched download with per-ticker
+fallback, calendar alignment, float32 returns, cache hits (memory and disk), partial
+cache reuse, coverage over non-trading days and today's unfinished bar, and the
+time to load a 50-ticker universe.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import tradingagents.dataflows.price_loader as price_loader
+from tradingagents.dataflows.price_loader import BulkPriceLoader
+
+START, END = "2024-01-02", "2024-03-29"
+# Dates the "HK" ticker's exchange was closed while the others traded
+HK_HOLIDAYS = pd.to_datetime(["2024-02-12", "2024-02-13", "2024-03-29"])
+
+
+def ohlcv(ticker: str, start: str, end_exclusive: str) -> pd.DataFrame:
+    """Deterministic daily OHLCV for [start, end_exclusive)"""
+    dates = pd.bdate_range(start, pd.Timestamp(end_exclusive) - pd.Timedelta(days=1))
+    if ticker == "HK":
+        dates = dates.difference(HK_HOLIDAYS)
+    seed = sum(ord(c) for c in ticker)
+    day = np.asarray((dates - pd.Timestamp("2024-01-01")).days, dtype=float)
+    close = 100 + seed % 50 + np.sin(day / 7 + seed) * 5 + day * 0.1
+    return pd.DataFrame({
+        "Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close,
+        "Volume": 1_000_000 + day * 100,
+    }, index=dates)
+
+
+class FakeProvider:
+    """Records calls; the batched download can skip tickers, fail outright or be slow"""
+
+    def __init__(self, batch_skips=(), batch_fails=False, latency=0.0):
+        self.batch_skips = set(batch_skips)
+        self.batch_fails = batch_fails
+        self.latency = latency
+        self.downloads = []
+        self.single_fetches = []
+        self._lock = threading.Lock()
+
+    def download(self, tickers, start, end):
+        time.sleep(self.latency)
+        with self._lock:
+            self.downloads.append((list(tickers), start, end))
+        if self.batch_fails:
+            raise ConnectionError("batch endpoint unavailable")
+        return {t: ohlcv(t, start, end) for t in tickers if t not in self.batch_skips}
+
+    def fetch_one(self, ticker, start, end):
+        time.sleep(self.latency)
+        with self._lock:
+            self.single_fetches.append((ticker, start, end))
+        return ohlcv(ticker, start, end)
+
+
+def expected_close(ticker: str, start: str = START, end: str = END) -> pd.Series:
+    return ohlcv(ticker, start, (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))["Close"]
+
+
+def test_batched_download_with_per_ticker_fallback():
+    provider = FakeProvider(batch_skips={"MSFT"})
+    loader = BulkPriceLoader(provider, use_disk_cache=False)
+    prices = loader.load_prices(["aapl", "MSFT", "NVDA"], start=START, end=END)
+
+    assert sorted(prices) == ["AAPL", "MSFT", "NVDA"]
+    assert provider.downloads == [(["AAPL", "MSFT", "NVDA"], START, "2024-03-30")]
+    assert provider.single_fetches == [("MSFT", START, "2024-03-30")]
+    for ticker, data in prices.items():
+        pd.testing.assert_series_equal(data["Close"], expected_close(ticker), check_names=False, check_freq=False)
+    assert loader.stats == {"cache_hits": 0, "partial_hits": 0, "batched_downloads": 1, "fallback_downloads": 1}
+
+
+def test_failed_batch_falls_back_to_thread_pool():
+    provider = FakeProvider(batch_fails=True)
+    loader = BulkPriceLoader(provider, use_disk_cache=False)
+    prices = loader.load_prices(["AAPL", "MSFT", "NVDA"], start=START, end=END)
+    assert sorted(prices) == ["AAPL", "MSFT", "NVDA"]
+    assert sorted(t for t, _, _ in provider.single_fetches) == ["AAPL", "MSFT", "NVDA"]
+    assert loader.stats["batched_downloads"] == 0 and loader.stats["fallback_downloads"] == 3
+
+
+def test_calendars_align_and_returns_are_float32():
+    loader = BulkPriceLoader(FakeProvider(), use_disk_cache=False)
+    panel = loader.load_panel(["AAPL", "HK"], start=START, end=END)
+
+    # Union of calendars; HK's closed days carry its last price but not its volume
+    assert panel.index.equals(pd.bdate_range(START, END))
+    for holiday in HK_HOLIDAYS:
+        previous = panel.index[panel.index.get_loc(holiday) - 1]
+        assert panel.loc[holiday, ("Close", "HK")] == panel.loc[previous, ("Close", "HK")]
+        assert np.isnan(panel.loc[holiday, ("Volume", "HK")])
+    assert not panel["Volume"]["AAPL"].isna().any()
+
+    returns = loader.load_returns_matrix(["AAPL", "HK"], start=START, end=END, dtype=np.float32)
+    assert all(dtype == np.float32 for dtype in returns.dtypes)
+    assert not returns.isna().any().any()
+    assert returns.index.equals(pd.bdate_range(START, END)[1:])
+    expected = expected_close("AAPL").pct_change().dropna().astype(np.float32)
+    np.testing.assert_allclose(returns["AAPL"].values, expected.values, rtol=1e-6)
+
+
+def test_cache_hits_in_memory_and_on_disk():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        provider = FakeProvider()
+        loader = BulkPriceLoader(provider, cache_dir=cache_dir)
+        loader.load_prices(["AAPL", "MSFT"], start=START, end=END)
+        loader.load_prices(["AAPL", "MSFT"], start="2024-02-01", end="2024-02-29")
+        assert len(provider.downloads) == 1
+        assert loader.stats["cache_hits"] == 2
+
+        # A new loader (e.g. the next process) reads the disk cache
+        reloaded = BulkPriceLoader(provider, cache_dir=cache_dir)
+        prices = reloaded.load_prices(["AAPL", "MSFT"], start=START, end=END)
+        assert len(provider.downloads) == 1 and reloaded.stats["cache_hits"] == 2
+        np.testing.assert_allclose(prices["MSFT"]["Close"].values, expected_close("MSFT").values)
+        assert not [name for name in os.listdir(cache_dir) if ".tmp" in name]
+
+
+def test_partial_overlap_fetches_only_the_missing_tail():
+    provider = FakeProvider()
+    loader = BulkPriceLoader(provider, use_disk_cache=False)
+    # Seeded by single-stock analysis up to mid-March
+    loader.register_prices("AAPL", ohlcv("AAPL", START, "2024-03-16"), start=START, end="2024-03-15")
+
+    prices = loader.load_prices(["AAPL"], start=START, end=END)
+    assert provider.downloads == [(["AAPL"], "2024-03-15", "2024-03-30")]
+    pd.testing.assert_series_equal(prices["AAPL"]["Close"], expected_close("AAPL"), check_names=False, check_freq=False)
+    assert loader.stats["partial_hits"] == 1
+
+    # The merged range is now fully cached, head included
+    loader.load_prices(["AAPL"], start="2024-01-10", end=END)
+    assert len(provider.downloads) == 1
+    loader.load_prices(["AAPL"], start="2023-12-01", end="2024-02-01")
+    assert provider.downloads[-1] == (["AAPL"], "2023-12-01", "2024-01-03")
+
+
+def test_empty_tail_over_non_trading_days_is_covered():
+    provider = FakeProvider()
+    loader = BulkPriceLoader(provider, use_disk_cache=False)
+    loader.load_prices(["AAPL"], start=START, end="2024-03-30")  # Ends on a Saturday
+
+    # Sunday loads: the Saturday-Sunday tail has no rows; it is confirmed once, then cached
+    for _ in range(3):
+        prices = loader.load_prices(["AAPL"], start=START, end="2024-03-31")
+    assert provider.downloads[1:] == [(["AAPL"], "2024-03-30", "2024-04-01")]
+    assert provider.single_fetches == [("AAPL", "2024-03-30", "2024-04-01")]
+    assert loader._coverage["AAPL"] == (START, "2024-03-31")
+    assert prices["AAPL"].index[-1] == pd.Timestamp("2024-03-29")
+
+
+def test_todays_bar_is_not_marked_covered():
+    original_today = price_loader._today
+    try:
+        provider = FakeProvider()
+        loader = BulkPriceLoader(provider, use_disk_cache=False)
+
+        # Intraday on a Wednesday: coverage stops at Tuesday, so today is fetched again
+        price_loader._today = lambda: pd.Timestamp("2024-03-27")
+        loader.load_prices(["AAPL"], start=START)
+        assert loader._coverage["AAPL"][1] == "2024-03-26"
+        loader.load_prices(["AAPL"], start=START)
+        assert provider.downloads[-1] == (["AAPL"], "2024-03-26", "2024-03-28")
+
+        # On a Saturday nothing is still forming
+        price_loader._today = lambda: pd.Timestamp("2024-03-30")
+        loader.load_prices(["AAPL"], start=START)
+        downloads = len(provider.downloads)
+        loader.load_prices(["AAPL"], start=START)
+        assert len(provider.downloads) == downloads
+        assert loader._coverage["AAPL"] == (START, "2024-03-30")
+    finally:
+        price_loader._today = original_today
+
+
+def test_concurrent_index_writes():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        loader = BulkPriceLoader(FakeProvider(), cache_dir=cache_dir)
+        tickers = [f"T{i:02d}" for i in range(16)]
+        threads = [threading.Thread(target=loader.load_prices, args=([t],), kwargs={"start": START, "end": END})
+                   for t in tickers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        reloaded = BulkPriceLoader(FakeProvider(batch_fails=True), cache_dir=cache_dir)
+        assert sorted(reloaded.load_prices(tickers, start=START, end=END)) == tickers
+        assert reloaded.stats["cache_hits"] == len(tickers)
+
+
+def test_fifty_ticker_universe_timing():
+    tickers = [f"T{i:02d}" for i in range(50)]
+    latency = 0.05  # Per provider request
+
+    provider = FakeProvider(latency=latency)
+    loader = BulkPriceLoader(provider, use_disk_cache=False)
+    began = time.perf_counter()
+    assert len(loader.load_returns_matrix(tickers, start=START, end=END).columns) == 50
+    batched = time.perf_counter() - began
+    assert len(provider.downloads) == 1 and not provider.single_fetches
+
+    # Per-ticker fallback runs on the pool instead of one request after another
+    provider = FakeProvider(batch_fails=True, latency=latency)
+    loader = BulkPriceLoader(provider, use_disk_cache=False, max_workers=8)
+    began = time.perf_counter()
+    assert len(loader.load_returns_matrix(tickers, start=START, end=END).columns) == 50
+    fallback = time.perf_counter() - began
+
+    print(f"50 tickers: batched {batched:.2f}s, per-ticker fallback {fallback:.2f}s "
+          f"(sequential requests would take {51 * latency:.2f}s)")
+    assert batched < 10 * latency + 1.0
+    assert fallback < 51 * latency / 2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
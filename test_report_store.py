@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Report store round trip through checkpoints: values offloaded by a run that failed
+part-way survive pruning while its checkpoint exists, and the resumed run hydrates
+them; a checkpoint whose values are gone is detected instead of failing on resume.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.agents.utils.report_store import ReportStore, get_report_store, is_ref
+from tradingagents.graph.checkpointing import get_checkpointer
+
+REPORT = "RSI 71, MACD crossing up, volume 1.4x the 20-day average. " * 80
+
+
+class State(TypedDict, total=False):
+    company_of_interest: str
+    market_report: str
+    investment_plan: str
+
+
+def build_graph(holder, checkpointer):
+    """Analyst offloads its report; the planner (which can fail) reads it back"""
+
+    def analyst(state):
+        return holder["store"].offload_update({"market_report": REPORT}, min_chars=100)
+
+    def planner(state):
+        if holder.get("fail"):
+            raise RuntimeError("planner LLM timed out")
+        report = holder["store"].hydrate(state)["market_report"]
+        return {"investment_plan": f"Plan based on {len(report)} chars of analysis"}
+
+    builder = StateGraph(State)
+    builder.add_node("analyst", analyst)
+    builder.add_node("planner", planner)
+    builder.add_edge(START, "analyst")
+    builder.add_edge("analyst", "planner")
+    builder.add_edge("planner", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def age_files(directory: str, days: float):
+    old = time.time() - days * 86400
+    for root, _, files in os.walk(directory):
+        for name in files:
+            os.utime(os.path.join(root, name), (old, old))
+
+
+def test_offload_checkpoint_prune_resume_hydrate():
+    with tempfile.TemporaryDirectory() as directory:
+        config = {
+            "data_cache_dir": directory,
+            "checkpoint_dir": os.path.join(directory, "checkpoints"),
+            "checkpointing": True,
+            "report_store_max_age_days": 7,
+        }
+        store_dir = os.path.join(directory, "report_store")
+        checkpointer = get_checkpointer(config)
+        run = {"configurable": {"thread_id": "AAPL:2024-05-01:test"}}
+
+        holder = {"store": ReportStore(store_dir, max_age_days=None), "fail": True}
+        graph = build_graph(holder, checkpointer)
+        try:
+            graph.invoke({"company_of_interest": "AAPL"}, run)
+        except RuntimeError:
+            pass
+        snapshot = graph.get_state(run)
+        assert snapshot.next == ("planner",)
+        ref = snapshot.values["market_report"]
+        assert is_ref(ref)
+        unreferenced = holder["store"].put("an old report nobody needs " * 100)
+
+        # More than max_age_days later a new process opens the store and prunes
+        age_files(store_dir, days=10)
+        store = get_report_store(config)
+        assert store.has(ref)
+        assert not store.has(unreferenced)
+        assert store.missing_refs(snapshot.values) == []
+
+        # The resumed run hydrates the offloaded report
+        holder.update(store=store, fail=False)
+        final = graph.invoke(None, run)
+        assert final["investment_plan"] == f"Plan based on {len(REPORT)} chars of analysis"
+        assert store.hydrate(final)["market_report"] == REPORT
+
+        # Once the run's checkpoints are dropped its values may be pruned
+        checkpointer.delete_thread(run["configurable"]["thread_id"])
+        age_files(store_dir, days=10)
+        assert ReportStore(store_dir, max_age_days=7).missing_refs({"market_report": ref}) == [ref]
+
+
+def test_checkpoint_with_missing_values_is_detected():
+    with tempfile.TemporaryDirectory() as directory:
+        store = ReportStore(os.path.join(directory, "report_store"), max_age_days=None)
+        state = store.offload_update({"market_report": REPORT, "investment_plan": "short"}, min_chars=100)
+        ref = state["market_report"]
+        assert store.missing_refs(state) == []
+
+        # Removed behind the store's back (another process pruned with different settings)
+        os.remove(store._path(ref[len("@report:"):]))
+        reopened = ReportStore(store.store_dir, max_age_days=None)
+        assert reopened.missing_refs(state) == [ref]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
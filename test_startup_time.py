@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import cost of the trading graph, measured with python -X importtime
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+# Wall-clock budget for `import tradingagents.graph.trading_graph` in a fresh interpreter
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "4.0"))
+TARGET_MODULE = "tradingagents.graph.trading_graph"
+
+# Loaded only when the provider or analyst that needs them is used
+LAZY_MODULES = [
+    "langchain_anthropic",
+    "langchain_google_genai",
+    "langchain_ibm",
+    "cvxpy",
+    "arch",
+    "statsmodels",
+    "sklearn",
+    "matplotlib",
+    "docx",
+    "chromadb",
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_import(module: str = TARGET_MODULE):
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Returns:
+        (total seconds, list of (cumulative seconds, module) sorted descending, loaded lazy modules)
+    """
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2)) / 1e6
+        name = match.group(4)
+        if len(match.group(3)) == 1:  # Top-level import
+            total += cumulative
+        timings.append((cumulative, name))
+
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return total, sorted(timings, reverse=True), loaded
+
+
+def test_trading_graph_import_budget():
+    total, _, _ = measure_import()
+    assert total <= STARTUP_BUDGET_SECONDS, (
+        f"Importing {TARGET_MODULE} took {total:.2f}s (budget {STARTUP_BUDGET_SECONDS:.2f}s)"
+    )
+
+
+def test_heavy_modules_stay_lazy():
+    _, _, loaded = measure_import()
+    assert not loaded, f"Heavy modules loaded at import time: {loaded}"
+
+
+if __name__ == "__main__":
+    total, timings, loaded = measure_import()
+
+    print("=" * 80)
+    print(f"STARTUP BENCHMARK: import {TARGET_MODULE}")
+    print("=" * 80)
+    print(f"Total import time: {total:.2f}s (budget {STARTUP_BUDGET_SECONDS:.2f}s)")
+    print(f"Heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+    print()
+    print("Slowest modules (cumulative):")
+    for cumulative, name in timings[:20]:
+        print(f"  {cumulative:7.3f}s  {name}")
+
+    ok = total <= STARTUP_BUDGET_SECONDS and not loaded
+    print()
+    print("[OK] Startup within budget" if ok else "[FAIL] Startup over budget or heavy modules loaded eagerly")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+State log checks: records round trip through the offset index (one gzip member or
+JSON line each), a rerun date resolves to its latest record, half-written index
+lines are skipped, dates logged by the old full_states_log files stay readable, and
+regenerate_csv_data rebuilds the CSV exports from the log.
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from tradingagents.agents.generators.report_outputs import regenerate_csv_data
+from tradingagents.agents.utils.state_log import DATA_FILE, StateLog, get_state_log, state_record
+from tradingagents.dataflows.config import get_config, set_config
+
+
+def final_state(trade_date: str, decision: str = "BUY") -> dict:
+    return {
+        "company_of_interest": "AAPL",
+        "trade_date": trade_date,
+        "market_report": f"Market on {trade_date}: RSI 58, price above the 50-day average.",
+        "news_report": "Services revenue beat estimates.",
+        "fundamentals_report": "P/E 29, net margin 25%.",
+        "optimization_results": {"weights": np.array([0.6, 0.4])},
+        "final_trade_decision": f"FINAL TRANSACTION PROPOSAL: **{decision}**",
+        "investment_debate_state": {"bull_history": "Bull: growth", "judge_decision": "Buy"},
+        "risk_debate_state": {"history": "Risky: size up", "judge_decision": decision},
+        "trader_investment_plan": "Accumulate on dips",
+        "messages": ["not logged"],
+    }
+
+
+def test_records_round_trip_through_the_index():
+    with tempfile.TemporaryDirectory() as directory:
+        for compress in (True, False):
+            path = os.path.join(directory, "gz" if compress else "plain")
+            log = StateLog(path, compress=compress)
+            dates = ["2024-05-01", "2024-05-02", "2024-05-03"]
+            entries = [log.append(final_state(date)) for date in dates]
+
+            assert [entry["offset"] for entry in entries] == sorted(entry["offset"] for entry in entries)
+            assert log.dates() == dates
+            record = log.read("2024-05-02")
+            assert record == json.loads(json.dumps(state_record(final_state("2024-05-02")), default=list))
+            assert record["optimization_results"] == {"weights": [0.6, 0.4]}
+            assert "messages" not in record
+            assert log.read("2024-06-01") is None
+
+            # Each record is one gzip member (or line); the whole file still reads as JSON lines
+            data_path = os.path.join(path, DATA_FILE + (".gz" if compress else ""))
+            opener = gzip.open if compress else open
+            with opener(data_path, "rt", encoding="utf-8") as f:
+                assert [json.loads(line)["trade_date"] for line in f] == dates
+
+
+def test_rerun_date_reads_the_latest_record():
+    with tempfile.TemporaryDirectory() as directory:
+        log = StateLog(directory)
+        log.append(final_state("2024-05-01", "BUY"))
+        log.append(final_state("2024-05-02", "HOLD"))
+        log.append(final_state("2024-05-01", "SELL"))
+
+        assert log.dates() == ["2024-05-01", "2024-05-02"]
+        assert "SELL" in log.read("2024-05-01")["final_trade_decision"]
+        assert [r["final_trade_decision"][-6:] for r in log.records()] == ["SELL**", "HOLD**"]
+
+        # A new reader (another process) resolves the same latest record from the index
+        assert "SELL" in StateLog(directory).read("2024-05-01")["final_trade_decision"]
+
+
+def test_half_written_index_line_is_skipped():
+    with tempfile.TemporaryDirectory() as directory:
+        log = StateLog(directory)
+        log.append(final_state("2024-05-01"))
+        reader = StateLog(directory)
+        assert reader.dates() == ["2024-05-01"]
+
+        # A writer has appended the record and part of its index line
+        writer = StateLog(directory)
+        entry = writer.append(final_state("2024-05-02"))
+        with open(log.index_path, "rb") as f:
+            lines = f.read().splitlines(keepends=True)
+        with open(log.index_path, "wb") as f:
+            f.write(lines[0] + lines[1][:20])
+        assert StateLog(directory).dates() == ["2024-05-01"]
+
+        with open(log.index_path, "ab") as f:
+            f.write(lines[1][20:])
+        assert StateLog(directory).read("2024-05-02")["trade_date"] == entry["trade_date"]
+
+
+def test_legacy_full_states_log_is_read():
+    with tempfile.TemporaryDirectory() as directory:
+        record = state_record(final_state("2023-12-29", "HOLD"))
+        record["optimization_results"] = {"weights": [0.6, 0.4]}
+        with open(os.path.join(directory, "full_states_log_2023-12-29.json"), "w", encoding="utf-8") as f:
+            json.dump({"2023-12-29": record}, f)
+
+        log = StateLog(directory)
+        log.append(final_state("2024-05-01"))
+        assert log.read("2023-12-29") == record
+        assert log.dates() == ["2024-05-01"]
+
+
+def test_regenerate_csv_data_from_the_log():
+    previous_dir = get_config().get("state_log_dir")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            set_config({"state_log_dir": os.path.join(directory, "eval_results")})
+            os.chdir(directory)  # CSV exports go to ./results/<ticker>/<date>/csv_data
+            assert regenerate_csv_data("AAPL", "2024-05-01") == {}
+
+            # Without market or fundamentals reports the exporter needs no price or financials lookups
+            state = final_state("2024-05-01")
+            del state["market_report"], state["fundamentals_report"]
+            get_state_log("AAPL").append(state)
+            exported = regenerate_csv_data("AAPL", "2024-05-01")
+            for name in ("risk", "news", "summary"):
+                assert os.path.exists(os.path.join(directory, exported[name]))
+            with open(os.path.join(directory, exported["summary"]), encoding="utf-8") as f:
+                assert "AAPL,2024-05-01," in f.read()
+        finally:
+            os.chdir(cwd)
+            set_config({"state_log_dir": previous_dir})
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
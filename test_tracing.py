@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tracing checks: LLM spans carry token counts for streamed and non-streamed calls,
+roots that never end are released, and the run summary is only printed on request.
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from tradingagents.dataflows.tracing import Tracer, TracingCallbackHandler, _token_usage
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.llm_providers import create_llm
+from tradingagents.graph.streaming import TokenStreamHandler
+
+USAGE = {"prompt_tokens": 11, "completion_tokens": 3, "total_tokens": 14}
+
+
+class _FakeOpenAI(BaseHTTPRequestHandler):
+    """Minimal /v1/chat/completions: SSE chunks when streaming, usage only if asked for"""
+
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def _chunk(self, model, **fields):
+        chunk = {"id": "c1", "object": "chat.completion.chunk", "created": 0, "model": model, **fields}
+        return f"data: {json.dumps(chunk)}\n\n".encode()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _FakeOpenAI.requests_seen.append(body)
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for piece in ["Hel", "lo", "!"]:
+                delta = {"index": 0, "delta": {"content": piece}, "finish_reason": None}
+                self.wfile.write(self._chunk(body["model"], choices=[delta]))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                self.wfile.write(self._chunk(body["model"], choices=[], usage=USAGE))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        reply = json.dumps({
+            "id": "c1", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "Hello!"}, "finish_reason": "stop"}],
+            "usage": USAGE,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+
+def _traced_llm_span(stream: bool):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    try:
+        config = {**DEFAULT_CONFIG, "llm_provider": "openai",
+                  "backend_url": f"http://127.0.0.1:{server.server_address[1]}/v1"}
+        llm = create_llm("gpt-4o-mini", config)
+        tracer = Tracer()
+        root = tracer.start_span("run", root=True)
+        handlers = [TracingCallbackHandler(tracer, root=root)]
+        if stream:
+            # The token stream handler makes the model take its streaming path
+            handlers.append(TokenStreamHandler())
+        _FakeOpenAI.requests_seen.clear()
+        assert llm.invoke("hi", config={"callbacks": handlers}).content == "Hello!"
+        assert bool(_FakeOpenAI.requests_seen[-1].get("stream")) == stream
+        tracer.end_span(root)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return tracer.summaries[root.span_id]
+
+
+def test_streamed_llm_call_records_tokens():
+    for stream in (True, False):
+        summary = _traced_llm_span(stream)
+        assert summary["by_kind"]["llm"]["count"] == 1
+        assert summary["llm_tokens"] == {"input": 11, "output": 3}, (stream, summary)
+
+
+def test_token_usage_falls_back_to_provider_output():
+    # No usage metadata on the message: counts come from llm_output
+    response = LLMResult(
+        generations=[[ChatGeneration(message=AIMessage(content="x"))]],
+        llm_output={"token_usage": USAGE},
+    )
+    assert _token_usage(response) == {"input_tokens": 11, "output_tokens": 3}
+
+    # Empty usage metadata and no llm_output: counts from the message's response metadata
+    message = AIMessage(
+        content="x",
+        usage_metadata={"input_tokens": 0, "output_tokens": 0, "total_tokens": 0},
+        response_metadata={"token_usage": {"input_token_count": 7, "generated_token_count": 2}},
+    )
+    response = LLMResult(generations=[[ChatGeneration(message=message)]])
+    assert _token_usage(response) == {"input_tokens": 7, "output_tokens": 2}
+
+
+def test_roots_that_never_end_are_released():
+    tracer = Tracer(max_age=0.05)
+    abandoned = tracer.start_span("abandoned", root=True)
+    tracer.end_span(tracer.start_span("child", parent=abandoned))
+    time.sleep(0.1)
+    current = tracer.start_span("current", root=True)
+    assert abandoned.trace_id not in tracer._traces
+    assert current.trace_id in tracer._traces
+    assert tracer.abandoned == 1
+
+    # Ending the released root later neither fails nor produces a summary
+    tracer.end_span(abandoned)
+    tracer.end_span(current)
+    assert list(tracer.summaries) == [current.span_id]
+    assert tracer._traces == {} and tracer._roots == {}
+
+
+def test_summary_is_printed_only_when_enabled():
+    for print_summary in (False, True):
+        tracer = Tracer(print_summary=print_summary)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            with tracer.span("run"):
+                with tracer.span("node", kind="node"):
+                    pass
+        assert bool(output.getvalue()) == print_summary
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
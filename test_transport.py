@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Transport benchmark: connection reuse, HTTP revalidation, tail latency under provider
+hiccups and circuit breaking, against a local HTTP server (no network access needed),
+and chat models of SDKs without an httpx client retried through the same policy.
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+import tradingagents.dataflows.transport as transport_module
+from tradingagents.dataflows.transport import CircuitOpenError, Transport
+from tradingagents.graph.llm_providers import transport_routed
+
+# p99 of a flaky endpoint (1 in 10 requests hangs for HANG_SECONDS) must stay below this
+TAIL_BUDGET_SECONDS = float(os.getenv("TRANSPORT_TAIL_BUDGET_SECONDS", "2.0"))
+HANG_SECONDS = 5.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True
+    connections = set()
+    counter = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"ok", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # Drain a request body so the next request on the connection parses
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with _Handler.lock:
+            _Handler.connections.add(self.client_address)
+            _Handler.counter += 1
+            count = _Handler.counter
+        if self.path.startswith("/etag"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._reply(304, b"")
+            else:
+                self._reply(200, b"x" * 10000, {"ETag": '"v1"', "Cache-Control": "no-cache"})
+        elif self.path.startswith("/hang"):
+            if count % 10 == 0:
+                time.sleep(HANG_SECONDS)
+            self._reply(200)
+        elif self.path.startswith("/flaky"):
+            self._reply(502 if count % 3 else 200)
+        elif self.path.startswith("/down"):
+            self._reply(503)
+        else:
+            self._reply(200)
+
+    do_POST = do_GET
+
+
+class FlakyChatModel(BaseChatModel):
+    """Drops the connection on the first `failures` requests"""
+    failures: int = 2
+    requests_made: int = 0
+
+    @property
+    def _llm_type(self):
+        return "flaky"
+
+    def _request(self):
+        self.requests_made += 1
+        if self.requests_made <= self.failures:
+            raise ConnectionError("Connection reset by peer")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self._request()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="hold"))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self._request()
+        for token in ("ho", "ld"):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_transport(**overrides) -> Transport:
+    config = {
+        "retry_policy": {"max_attempts": 3, "backoff_base": 0.05, "backoff_max": 0.2, "deadline": 5.0},
+        "circuit_breaker": {"failure_threshold": 3, "reset_timeout": 30.0},
+        "http_timeout": (1, 0.5),
+    }
+    config.update(overrides)
+    return Transport(config)
+
+
+def connections_used(base_url, pooled: bool, requests_count: int = 50):
+    """(new TCP connections, seconds) for sequential GETs"""
+    _Handler.connections = set()
+    transport = make_transport()
+    start = time.perf_counter()
+    for i in range(requests_count):
+        if pooled:
+            transport.get(f"{base_url}/ok?i={i}", cache=False)
+        else:
+            requests.get(f"{base_url}/ok?i={i}")
+    return len(_Handler.connections), time.perf_counter() - start
+
+
+def tail_latency(base_url, requests_count: int = 40):
+    """p50/p99 seconds of /hang through the transport (read timeout + retry)"""
+    transport = make_transport()
+    _Handler.counter = 0
+    latencies = []
+    for i in range(requests_count):
+        start = time.perf_counter()
+        transport.get(f"{base_url}/hang?i={i}", cache=False)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.99 * (len(latencies) - 1))], transport
+
+
+def test_pooled_sessions_reuse_connections():
+    server, base_url = start_server()
+    try:
+        connections, _ = connections_used(base_url, pooled=True)
+    finally:
+        server.shutdown()
+    assert connections == 1, f"Pooled GETs opened {connections} connections"
+
+
+def test_etag_revalidation_serves_cached_body():
+    server, base_url = start_server()
+    try:
+        transport = make_transport()
+        first = transport.get(f"{base_url}/etag")
+        second = transport.get(f"{base_url}/etag")
+    finally:
+        server.shutdown()
+    assert second.content == first.content
+    assert transport.stats["127.0.0.1:" + base_url.rsplit(":", 1)[1]].cache_hits == 1
+
+
+def test_hangs_are_bounded_by_timeout_and_retry():
+    server, base_url = start_server()
+    try:
+        _, p99, _ = tail_latency(base_url)
+    finally:
+        server.shutdown()
+    assert p99 <= TAIL_BUDGET_SECONDS, f"p99 {p99:.2f}s (budget {TAIL_BUDGET_SECONDS:.2f}s)"
+
+
+def test_breaker_fails_fast_and_llm_client_retries():
+    server, base_url = start_server()
+    try:
+        transport = make_transport()
+        for _ in range(3):
+            try:
+                transport.get(f"{base_url}/down", service="down")
+            except Exception:
+                pass
+        start = time.perf_counter()
+        try:
+            transport.get(f"{base_url}/down", service="down")
+            raise AssertionError("Open circuit did not short-circuit")
+        except CircuitOpenError:
+            pass
+        assert time.perf_counter() - start < 0.05
+
+        _Handler.counter = 0
+        response = transport.llm_http_client().post(f"{base_url}/flaky", content=b"{}")
+    finally:
+        server.shutdown()
+    assert response.status_code == 200
+
+
+def test_routed_chat_model_retries_invoke_and_stream():
+    previous = transport_module._transport
+    transport_module._transport = make_transport()
+    try:
+        llm = transport_routed(FlakyChatModel, "llm:flaky")()
+        assert llm.invoke("decision?").content == "hold"
+        assert llm.requests_made == 3
+
+        llm.requests_made = 0
+        assert "".join(chunk.content for chunk in llm.stream("decision?")) == "hold"
+        assert llm.requests_made == 3
+        assert transport_module._transport.stats["llm:flaky"].retries == 4
+
+        # Out of attempts: the provider's error surfaces
+        llm = transport_routed(FlakyChatModel, "llm:flaky")(failures=5)
+        try:
+            llm.invoke("decision?")
+            raise AssertionError("Exhausted retries did not raise")
+        except ConnectionError:
+            pass
+        assert llm.requests_made == 3
+    finally:
+        transport_module._transport = previous
+
+
+if __name__ == "__main__":
+    print("=" * 80)
+    print("TRANSPORT BENCHMARK: pooling, revalidation, tail latency, circuit breaking")
+    print("=" * 80)
+    server, base_url = start_server()
+    try:
+        fresh, fresh_seconds = connections_used(base_url, pooled=False)
+        pooled, pooled_seconds = connections_used(base_url, pooled=True)
+        print(f"50 GETs: requests.get {fresh} connections {fresh_seconds:.3f}s | "
+              f"pooled {pooled} connection(s) {pooled_seconds:.3f}s")
+
+        p50, p99, transport = tail_latency(base_url)
+        print(f"/hang (1 in 10 hangs {HANG_SECONDS:.0f}s): p50 {p50:.3f}s p99 {p99:.3f}s "
+              f"(without a timeout p99 would be {HANG_SECONDS:.1f}s)")
+        print(transport.summary())
+
+        transport = make_transport()
+        _Handler.counter = 0
+        response = transport.llm_http_client().post(f"{base_url}/flaky", content=b"{}")
+        print(f"LLM client on a 2-in-3 502 endpoint: HTTP {response.status_code}, "
+              f"{transport.report()['llm:127.0.0.1']['retries']} retries")
+    finally:
+        server.shutdown()
+
+    ok = pooled == 1 and p99 <= TAIL_BUDGET_SECONDS and response.status_code == 200
+    print()
+    print("[OK] Transport within budget" if ok else "[FAIL] Transport over budget")
+    sys.exit(0 if ok else 1)
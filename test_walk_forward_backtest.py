@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Walk-forward backtest checks: signals never look ahead (changing or dropping future
+prices leaves every earlier position unchanged), the default consensus votes the same
+models as the live analyzer, and directional accuracy is scored only on days the
+strategy holds a position.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.optimization.walk_forward_backtest import BacktestConfig, WalkForwardBacktester
+
+
+def synthetic_prices(n_days: int = 600, seed: int = 3) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.015, n_days)
+    return pd.Series(100 * np.cumprod(1 + returns), index=pd.bdate_range("2021-01-04", periods=n_days))
+
+
+def test_future_prices_do_not_change_past_positions():
+    prices = synthetic_prices()
+    cutoff = 420
+    backtester = WalkForwardBacktester(BacktestConfig(garch_refit_every=42))
+    baseline = backtester.compute_signals(prices)
+
+    # A crash after the cutoff, and the history simply ending there
+    shocked = prices.copy()
+    shocked.iloc[cutoff + 1:] *= np.linspace(0.95, 0.4, len(prices) - cutoff - 1)
+    for future in (shocked, prices.iloc[:cutoff + 1]):
+        signals = backtester.compute_signals(future)
+        pd.testing.assert_series_equal(signals['position'].iloc[:cutoff + 1], baseline['position'].iloc[:cutoff + 1])
+        pd.testing.assert_series_equal(signals['consensus_action'].iloc[:cutoff + 1],
+                                       baseline['consensus_action'].iloc[:cutoff + 1])
+
+    # The position held on the day after the cutoff was decided before the shock
+    daily, _ = backtester.backtest_ticker(shocked)
+    baseline_daily, _ = backtester.backtest_ticker(prices)
+    pd.testing.assert_series_equal(daily['position'].iloc[:cutoff + 2], baseline_daily['position'].iloc[:cutoff + 2])
+    assert daily['position'].iloc[cutoff + 1] == baseline['position'].iloc[cutoff]
+
+
+def test_default_consensus_uses_the_live_voters():
+    signals = WalkForwardBacktester(BacktestConfig(garch_refit_every=42)).compute_signals(synthetic_prices())
+    live = signals[['forecast_action', 'optimization_action', 'kelly_action', 'technical_action']].values
+    for votes, consensus in zip(live, signals['consensus_action']):
+        counts = {action: list(votes).count(action) for action in set(votes)}
+        assert counts.get(consensus, 0) == max(counts.values())
+
+
+def test_directional_accuracy_ignores_flat_days():
+    daily = pd.DataFrame({
+        'position': [0.0, 0.0, 1.0, 1.0, 0.5, 0.0],
+        'asset_return': [0.01, -0.02, 0.02, -0.01, 0.01, 0.0],
+        'strategy_return': [0.0, 0.0, 0.02, -0.01, 0.005, 0.0],
+        'turnover': [0.0, 0.0, 1.0, 0.0, 0.5, 0.5],
+    })
+    summary = WalkForwardBacktester()._summarize(daily)
+    assert summary['directional_accuracy'] == 2 / 3
+
+    flat = daily.assign(position=0.0, strategy_return=0.0)
+    assert WalkForwardBacktester()._summarize(flat)['directional_accuracy'] == 0.0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
+    sys.exit(0)
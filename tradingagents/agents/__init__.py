@@ -1,27 +1,44 @@
-from .utils.agent_utils import Toolkit, create_msg_delete
-from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
-from .utils.memory import FinancialSituationMemory
+# Exports are resolved on first access (PEP 562) so importing one agent does not
+# load every analyst and its numeric/plotting dependencies.
+import importlib
 
-from .analysts.fundamentals_analyst import create_fundamentals_analyst
-from .analysts.market_analyst import create_market_analyst
-from .analysts.news_analyst import create_news_analyst
-from .analysts.social_media_analyst import create_social_media_analyst
-from .analysts.comprehensive_quantitative_analyst import create_comprehensive_quantitative_analyst
-from .analysts.portfolio_analyst import create_portfolio_analyst
+_EXPORTS = {
+    "Toolkit": ".utils.agent_utils",
+    "create_msg_delete": ".utils.agent_utils",
+    "AgentState": ".utils.agent_states",
+    "InvestDebateState": ".utils.agent_states",
+    "RiskDebateState": ".utils.agent_states",
+    "FinancialSituationMemory": ".utils.memory",
+    "create_fundamentals_analyst": ".analysts.fundamentals_analyst",
+    "create_market_analyst": ".analysts.market_analyst",
+    "create_news_analyst": ".analysts.news_analyst",
+    "create_social_media_analyst": ".analysts.social_media_analyst",
+    "create_comprehensive_quantitative_analyst": ".analysts.comprehensive_quantitative_analyst",
+    "create_portfolio_analyst": ".analysts.portfolio_analyst",
+    "create_bear_researcher": ".researchers.bear_researcher",
+    "create_bull_researcher": ".researchers.bull_researcher",
+    "create_risky_debator": ".risk_mgmt.aggresive_debator",
+    "create_safe_debator": ".risk_mgmt.conservative_debator",
+    "create_neutral_debator": ".risk_mgmt.neutral_debator",
+    "create_research_manager": ".managers.research_manager",
+    "create_risk_manager": ".managers.risk_manager",
+    "create_trader": ".trader.trader",
+    "create_enhanced_quantitative_document_generator": ".generators.enhanced_quantitative_document_generator",
+}
 
-from .researchers.bear_researcher import create_bear_researcher
-from .researchers.bull_researcher import create_bull_researcher
 
-from .risk_mgmt.aggresive_debator import create_risky_debator
-from .risk_mgmt.conservative_debator import create_safe_debator
-from .risk_mgmt.neutral_debator import create_neutral_debator
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-from .managers.research_manager import create_research_manager
-from .managers.risk_manager import create_risk_manager
 
-from .trader.trader import create_trader
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
 
-from .generators.enhanced_quantitative_document_generator import create_enhanced_quantitative_document_generator
 
 __all__ = [
     "FinancialSituationMemory",
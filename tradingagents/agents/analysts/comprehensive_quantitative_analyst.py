@@ -11,6 +11,8 @@ from typing import Dict, Any, List
 import warnings
 warnings.filterwarnings('ignore')
 
+from tradingagents.dataflows.price_loader import get_price_loader
+
 
 def create_comprehensive_quantitative_analyst(llm, toolkit):
     """Create comprehensive quantitative analyst with single-stock optimization."""
@@ -91,10 +93,10 @@ def create_comprehensive_quantitative_analyst(llm, toolkit):
 def get_enhanced_price_data(ticker: str, period: str = "2y") -> pd.Series:
     """Get enhanced price data with error handling"""
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
+        # Shared loader keeps the history cached for the portfolio optimization step
+        hist = get_price_loader().load_prices([ticker], period=period).get(ticker.upper())
         
-        if hist.empty:
+        if hist is None or hist.empty:
             return None
         
         return hist['Close']
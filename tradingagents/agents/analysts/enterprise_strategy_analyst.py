@@ -9,6 +9,11 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 import json
+import re
+
+from tradingagents.agents.utils.decision_extraction import extract_score, normalize_decision
+
+OVERALL_POSITION = re.compile(r'Overall Position:.*?(ACCUMULATE|REDUCE|HOLD|AVOID)', re.IGNORECASE)
 
 
 def format_optimization_results(optimization_results: Dict) -> str:
@@ -288,32 +293,11 @@ Remember: This strategy will be executed with real money. Make it institutional-
 
 def extract_confidence_level(strategy_content: str) -> float:
     """Extract confidence level from strategy content"""
-    try:
-        # Look for confidence level in the content
-        import re
-        confidence_match = re.search(r'Confidence Level:.*?(\d+(?:\.\d+)?)', strategy_content, re.IGNORECASE)
-        if confidence_match:
-            return float(confidence_match.group(1)) / 10.0  # Convert to 0-1 scale
-        return 0.7  # Default moderate confidence
-    except:
-        return 0.7
+    return extract_score(strategy_content, "Confidence Level")
 
 
 def extract_recommendation(strategy_content: str) -> str:
     """Extract the main recommendation from strategy content"""
-    try:
-        import re
-        # Look for strategic recommendation
-        rec_match = re.search(r'Overall Position:.*?(ACCUMULATE|REDUCE|HOLD|AVOID)', strategy_content, re.IGNORECASE)
-        if rec_match:
-            action = rec_match.group(1).upper()
-            # Convert to standard format
-            if action == "ACCUMULATE":
-                return "BUY"
-            elif action == "REDUCE":
-                return "SELL"
-            elif action in ["HOLD", "AVOID"]:
-                return "HOLD"
-        return "HOLD"  # Default
-    except:
-        return "HOLD"
+    # Look for strategic recommendation (ACCUMULATE -> BUY, REDUCE -> SELL, HOLD/AVOID -> HOLD)
+    match = OVERALL_POSITION.search(strategy_content or "")
+    return normalize_decision(match.group(1)) if match else "HOLD"
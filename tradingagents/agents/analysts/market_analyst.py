@@ -1,7 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-import time
 import json
 
+from tradingagents.dataflows.transport import get_transport
+
 
 def create_market_analyst(llm, toolkit):
 
@@ -113,28 +114,8 @@ Create a markdown table with all 12 indicators and their signals (Bullish/Bearis
 
         chain = prompt | llm.bind_tools(tools)
 
-        # Add retry logic for WatsonX connection issues
-        max_retries = 3
-        retry_count = 0
-        result = None
-
-        while retry_count < max_retries:
-            try:
-                result = chain.invoke(state["messages"])
-                break  # Success, exit retry loop
-            except Exception as e:
-                retry_count += 1
-                error_msg = str(e)
-                if "Server disconnected" in error_msg or "502 Bad Gateway" in error_msg or "RemoteProtocolError" in error_msg:
-                    if retry_count < max_retries:
-                        print(f"[RETRY] WatsonX connection error (attempt {retry_count}/{max_retries}), retrying in 3 seconds...", flush=True)
-                        time.sleep(3)
-                    else:
-                        print(f"[ERROR] WatsonX connection failed after {max_retries} attempts", flush=True)
-                        raise
-                else:
-                    # Other errors, don't retry
-                    raise
+        # Transient provider errors (e.g. WatsonX disconnects, 502s) are retried by the shared policy
+        result = get_transport().call(lambda: chain.invoke(state["messages"]), service="llm")
 
         report = ""
 
@@ -5,7 +5,7 @@ Clean implementation for testing different risk preferences
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
+from tradingagents.dataflows.transport import get_transport
 
 
 def create_multi_scenario_optimizer(llm, toolkit):
@@ -20,8 +20,8 @@ def create_multi_scenario_optimizer(llm, toolkit):
         try:
             # Get price data
             if toolkit.config.get("online_tools", False):
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period="1y")
+                stock = get_transport().yf_ticker(ticker)
+                hist = get_transport().call(lambda: stock.history(period="1y"), service="yfinance")
                 price_data = hist['Close']
             else:
                 # Fallback
@@ -1,45 +1,39 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import json
 from typing import List, Dict, Any
 
+from tradingagents.dataflows.price_loader import get_price_loader
+
 
 def create_portfolio_analyst(llm, toolkit):
     """Create a portfolio analyst that compares multiple stocks and provides portfolio recommendations."""
     
     def portfolio_analyst_node(state):
         current_date = state["trade_date"]
-        primary_ticker = state["company_of_interest"]
+        primary_ticker = state["company_of_interest"].upper()
         
         # Define comparison tickers based on primary ticker
         comparison_tickers = get_comparison_tickers(primary_ticker)
         all_tickers = [primary_ticker] + comparison_tickers
         
         try:
-            # Fetch data for all tickers
-            portfolio_data = {}
-            for ticker in all_tickers:
-                try:
-                    stock_data = yf.download(ticker, period="1y", progress=False)
-                    if not stock_data.empty:
-                        portfolio_data[ticker] = analyze_stock_metrics(stock_data, ticker)
-                except:
-                    continue
+            # One batched fetch for the whole peer group; every window is sliced from it
+            panel = build_peer_panel(all_tickers, period="1y")
             
-            if len(portfolio_data) < 2:
+            if panel.empty or panel['Close'].shape[1] < 2:
                 return {
                     "messages": [],
                     "portfolio_report": "Insufficient data for portfolio comparison analysis."
                 }
             
             # Perform comparative analysis
-            comparison_df = pd.DataFrame(portfolio_data).T
+            comparison_df = analyze_panel_metrics(panel)
             
             # Calculate portfolio metrics
-            portfolio_analysis = perform_portfolio_analysis(portfolio_data, all_tickers)
+            portfolio_analysis = perform_portfolio_analysis(panel, comparison_df)
             
             # Generate recommendations
             recommendations = generate_portfolio_recommendations(comparison_df, primary_ticker)
@@ -107,37 +101,44 @@ def get_comparison_tickers(primary_ticker):
     return ticker_groups.get(primary_ticker.upper(), ['SPY', 'QQQ', 'IWM', 'VTI'])[:4]
 
 
-def analyze_stock_metrics(stock_data, ticker):
-    """Analyze key metrics for a single stock."""
+def build_peer_panel(tickers, period="1y", end_date=None):
+    """Load the peer group as one aligned OHLCV panel ((field, ticker) columns) through the shared price cache."""
+    return get_price_loader().load_panel(tickers, end=end_date, period=period)
+
+
+def analyze_panel_metrics(panel):
+    """Analyze key metrics for every ticker in the panel at once (one row per ticker)."""
+    
+    close, high, low, volume = panel['Close'], panel['High'], panel['Low'], panel['Volume']
     
     # Calculate returns
-    returns = stock_data['Close'].pct_change().dropna()
+    returns = close.pct_change(fill_method=None)
     
     # Calculate metrics
-    current_price = stock_data['Close'].iloc[-1]
-    price_52w_high = stock_data['High'].rolling(252).max().iloc[-1]
-    price_52w_low = stock_data['Low'].rolling(252).min().iloc[-1]
+    current_price = close.iloc[-1]
+    price_52w_high = high.tail(252).max()
+    price_52w_low = low.tail(252).min()
     
     # Performance metrics
-    ytd_return = (current_price / stock_data['Close'].iloc[0] - 1) * 100
+    ytd_return = (current_price / close.bfill().iloc[0] - 1) * 100
     monthly_return = returns.tail(21).sum() * 100
     weekly_return = returns.tail(5).sum() * 100
     
     # Risk metrics
     volatility = returns.std() * np.sqrt(252) * 100  # Annualized volatility
-    max_drawdown = calculate_max_drawdown(stock_data['Close']) * 100
+    max_drawdown = calculate_max_drawdown(close) * 100
     
     # Technical indicators
-    sma_20 = stock_data['Close'].rolling(20).mean().iloc[-1]
-    sma_50 = stock_data['Close'].rolling(50).mean().iloc[-1]
-    rsi = calculate_rsi(stock_data['Close']).iloc[-1]
+    sma_20 = close.rolling(20).mean().iloc[-1]
+    sma_50 = close.rolling(50).mean().iloc[-1]
+    rsi = calculate_rsi(close).iloc[-1]
     
     # Volume analysis
-    avg_volume = stock_data['Volume'].rolling(20).mean().iloc[-1]
-    current_volume = stock_data['Volume'].iloc[-1]
-    volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
+    avg_volume = volume.rolling(20).mean().iloc[-1]
+    current_volume = volume.iloc[-1]
+    volume_ratio = (current_volume / avg_volume.where(avg_volume > 0)).fillna(1)
     
-    return {
+    return pd.DataFrame({
         'current_price': current_price,
         'ytd_return': ytd_return,
         'monthly_return': monthly_return,
@@ -151,7 +152,7 @@ def analyze_stock_metrics(stock_data, ticker):
         'rsi': rsi,
         'volume_ratio': volume_ratio,
         'sharpe_ratio': calculate_sharpe_ratio(returns)
-    }
+    })
 
 
 def calculate_max_drawdown(prices):
@@ -171,27 +172,23 @@ def calculate_rsi(prices, window=14):
 
 
 def calculate_sharpe_ratio(returns, risk_free_rate=0.02):
-    """Calculate Sharpe ratio."""
+    """Calculate Sharpe ratio (per column for a returns frame)."""
     excess_returns = returns - risk_free_rate/252
-    return excess_returns.mean() / excess_returns.std() * np.sqrt(252) if excess_returns.std() > 0 else 0
+    std = excess_returns.std()
+    return (excess_returns.mean() / std.where(std > 0) * np.sqrt(252)).fillna(0)
 
 
-def perform_portfolio_analysis(portfolio_data, tickers):
+def perform_portfolio_analysis(panel, comparison_df):
     """Perform portfolio-level analysis."""
     
-    # Create correlation matrix
+    # Correlation matrix over the most recent 6 months of the panel
     try:
-        price_data = {}
-        for ticker in tickers:
-            stock_data = yf.download(ticker, period="6m", progress=False)
-            if not stock_data.empty:
-                price_data[ticker] = stock_data['Close'].pct_change().dropna()
-        
-        if len(price_data) > 1:
-            correlation_df = pd.DataFrame(price_data).corr()
-        else:
+        close = panel['Close']
+        recent = close.loc[close.index[-1] - pd.DateOffset(months=6):]
+        correlation_df = recent.pct_change(fill_method=None).dropna(how='all').corr()
+        if len(correlation_df) < 2:
             correlation_df = pd.DataFrame()
-    except:
+    except Exception:
         correlation_df = pd.DataFrame()
     
     # Portfolio diversification score
@@ -204,7 +201,7 @@ def perform_portfolio_analysis(portfolio_data, tickers):
     return {
         'correlation_matrix': correlation_df,
         'diversification_score': diversification_score,
-        'portfolio_size': len(portfolio_data)
+        'portfolio_size': len(comparison_df)
     }
 
 
@@ -15,13 +15,14 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
 # Import the existing comprehensive chart generator
 from tradingagents.agents.generators.comprehensive_charts import create_comprehensive_trading_chart
+from tradingagents.agents.utils.artifact_cache import data_fingerprint, get_artifact_cache
+from tradingagents.dataflows.price_loader import get_price_loader
 
 
 def create_visualizer_analyst(llm, toolkit):
@@ -106,7 +107,8 @@ If the request is unclear or just says "visualize" or "chart", default to "dashb
 
             if chart_type == "dashboard" or chart_type not in ["price", "rsi", "macd", "bollinger", "volume", "returns", "volatility", "atr", "risk_metrics"]:
                 # Generate comprehensive dashboard (default)
-                chart_path = create_comprehensive_trading_chart(company_of_interest, trade_date)
+                chart_metrics = create_comprehensive_trading_chart(company_of_interest, trade_date)
+                chart_path = chart_metrics.get("chart_path") if chart_metrics else None
                 report = generate_dashboard_report(company_of_interest, trade_date, chart_path)
 
             else:
@@ -246,59 +248,38 @@ The dashboard provides a holistic view of technical indicators, risk metrics, an
 
 
 def generate_custom_chart(ticker, date, chart_type, config):
-    """Generate a custom chart based on specific request"""
+    """Generate a custom chart based on specific request (reused from the artifact cache when the data is unchanged)"""
 
     results_dir = Path(f"results/{ticker}/{date}")
     results_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        # Fetch data
+        # Fetch data (shared price cache)
         print(f"[VISUALIZER] Fetching data for {ticker}...", flush=True)
         time_period = config.get("time_period", "6mo")
-        stock_data = yf.download(ticker, period=time_period, progress=False, timeout=15)
+        stock_data = get_price_loader().load_prices([ticker], period=time_period).get(ticker.upper())
 
-        if stock_data.empty:
+        if stock_data is None or stock_data.empty:
             return None
 
-        # Handle MultiIndex columns
-        if isinstance(stock_data.columns, pd.MultiIndex):
-            stock_data.columns = [col[0] for col in stock_data.columns]
-
-        # Create figure
-        fig, ax = plt.subplots(figsize=(14, 8))
-        fig.suptitle(f'{ticker} - {chart_type.upper()} Analysis - {date}',
-                    fontsize=16, fontweight='bold')
-
-        # Generate specific chart based on type
-        if chart_type == "price":
-            plot_price_chart(ax, stock_data, ticker)
-        elif chart_type == "rsi":
-            plot_rsi_chart(ax, stock_data, ticker)
-        elif chart_type == "macd":
-            plot_macd_chart(ax, stock_data, ticker)
-        elif chart_type == "bollinger":
-            plot_bollinger_chart(ax, stock_data, ticker)
-        elif chart_type == "volume":
-            plot_volume_chart(ax, stock_data, ticker)
-        elif chart_type == "returns":
-            plot_returns_chart(ax, stock_data, ticker)
-        elif chart_type == "volatility":
-            plot_volatility_chart(ax, stock_data, ticker)
-        elif chart_type == "atr":
-            plot_atr_chart(ax, stock_data, ticker)
-        else:
-            # Default to price
-            plot_price_chart(ax, stock_data, ticker)
-
-        # Save
         chart_filename = f"{ticker}_{chart_type}_chart_{date}.png"
         chart_path = results_dir / chart_filename
-        plt.tight_layout()
-        plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-        plt.close()
+
+        cache = get_artifact_cache()
+        cache_key = cache.artifact_key(
+            f"custom_chart:{chart_type}", ticker, data_fingerprint(stock_data),
+            CUSTOM_CHART_PROFILE, date=str(date),
+        )
+        chart_path = cache.get_or_render(
+            cache_key,
+            chart_path,
+            lambda: render_custom_chart(stock_data.copy(), ticker, date, chart_type, chart_path),
+            f"custom_chart:{chart_type}",
+            ticker,
+        )
 
         print(f"[VISUALIZER] Custom chart saved: {chart_path}", flush=True)
-        return chart_path
+        return Path(chart_path) if chart_path else None
 
     except Exception as e:
         print(f"[VISUALIZER] Custom chart generation failed: {e}", flush=True)
@@ -307,6 +288,46 @@ def generate_custom_chart(ticker, date, chart_type, config):
         return None
 
 
+# Output settings of custom charts; part of their artifact cache key
+CUSTOM_CHART_PROFILE = {"figsize": (14, 8), "dpi": 150, "format": "png"}
+
+
+def render_custom_chart(stock_data, ticker, date, chart_type, chart_path):
+    """Draw one custom chart type and save it to chart_path"""
+
+    # Create figure
+    fig, ax = plt.subplots(figsize=CUSTOM_CHART_PROFILE["figsize"])
+    fig.suptitle(f'{ticker} - {chart_type.upper()} Analysis - {date}',
+                fontsize=16, fontweight='bold')
+
+    # Generate specific chart based on type
+    if chart_type == "price":
+        plot_price_chart(ax, stock_data, ticker)
+    elif chart_type == "rsi":
+        plot_rsi_chart(ax, stock_data, ticker)
+    elif chart_type == "macd":
+        plot_macd_chart(ax, stock_data, ticker)
+    elif chart_type == "bollinger":
+        plot_bollinger_chart(ax, stock_data, ticker)
+    elif chart_type == "volume":
+        plot_volume_chart(ax, stock_data, ticker)
+    elif chart_type == "returns":
+        plot_returns_chart(ax, stock_data, ticker)
+    elif chart_type == "volatility":
+        plot_volatility_chart(ax, stock_data, ticker)
+    elif chart_type == "atr":
+        plot_atr_chart(ax, stock_data, ticker)
+    else:
+        # Default to price
+        plot_price_chart(ax, stock_data, ticker)
+
+    # Save
+    plt.tight_layout()
+    plt.savefig(chart_path, dpi=CUSTOM_CHART_PROFILE["dpi"], bbox_inches='tight')
+    plt.close(fig)
+    return chart_path
+
+
 def plot_price_chart(ax, data, ticker):
     """Plot price with moving averages"""
     ax.plot(data.index, data['Close'], label='Close Price', linewidth=2, color='#2C3E50')
@@ -1,18 +1,81 @@
 """
 Comprehensive Chart Generation for Trading Analysis
 Creates a single comprehensive visualization with multiple panels
+
+Data and metrics are computed in-process (the document prompt needs them); the figure
+itself is drawn with matplotlib collections and can be rendered in a background
+process pool so the Document Generator does not block on it. Rendered charts are
+kept in the artifact cache, so rebuilding a report from unchanged data skips rendering.
 """
 
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.artist import setp
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
 import pandas as pd
 import numpy as np
-import yfinance as yf
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple, Union
+import multiprocessing
+import os
+import threading
 import warnings
+
+from tradingagents.agents.utils.artifact_cache import data_fingerprint, get_artifact_cache
+from tradingagents.dataflows.price_loader import get_price_loader
 warnings.filterwarnings('ignore')
 
+UP_COLOR = '#27AE60'
+DOWN_COLOR = '#E74C3C'
+
+
+@dataclass(frozen=True)
+class ChartProfile:
+    """Output settings for a rendered chart"""
+    name: str
+    dpi: int
+    format: str  # Any matplotlib savefig format: 'png', 'jpg', 'webp', 'svg', 'pdf'
+    figsize: Tuple[float, float] = (26, 20)
+
+
+CHART_PROFILES = {
+    # The 26x20in figure is embedded 7in wide in the Word report: 72 dpi gives 1872px (~270 ppi there)
+    "document": ChartProfile("document", dpi=72, format="png"),
+    # Previous output settings (7800px wide), for print-quality exports
+    "print": ChartProfile("print", dpi=300, format="png"),
+    # Web UI: small raster or vector output
+    "web": ChartProfile("web", dpi=50, format="webp"),
+    "svg": ChartProfile("svg", dpi=72, format="svg"),
+}
+
+
+def get_chart_profile(profile: Union[str, ChartProfile, Dict, None] = None) -> ChartProfile:
+    """
+    Resolve a profile name, ChartProfile or dict of overrides (e.g. {"dpi": 150, "format": "jpg"})
+
+    Dict overrides start from the "document" profile unless they name another base profile.
+    """
+    if isinstance(profile, ChartProfile):
+        return profile
+    if profile is None:
+        return CHART_PROFILES["document"]
+    if isinstance(profile, str):
+        if profile not in CHART_PROFILES:
+            raise ValueError(f"Unknown chart profile: {profile}. Available: {list(CHART_PROFILES)}")
+        return CHART_PROFILES[profile]
+
+    overrides = dict(profile)
+    base = get_chart_profile(overrides.pop("name", "document"))
+    return ChartProfile(
+        name=base.name,
+        dpi=int(overrides.get("dpi", base.dpi)),
+        format=overrides.get("format", base.format),
+        figsize=tuple(overrides.get("figsize", base.figsize)),
+    )
+
 
 def calculate_rsi(prices, period=14):
     """Calculate RSI indicator"""
@@ -43,7 +106,487 @@ def calculate_bollinger_bands(prices, window=20):
     return sma, upper_band, lower_band
 
 
-def create_comprehensive_trading_chart(ticker, current_date):
+def add_chart_indicators(stock_data: pd.DataFrame) -> pd.DataFrame:
+    """Add every indicator the dashboard plots to an OHLCV frame (in place)"""
+    stock_data['SMA_20'] = stock_data['Close'].rolling(window=20).mean()
+    stock_data['SMA_50'] = stock_data['Close'].rolling(window=50).mean()
+    stock_data['EMA_12'] = stock_data['Close'].ewm(span=12).mean()
+    stock_data['RSI'] = calculate_rsi(stock_data['Close'])
+    stock_data['MACD'], stock_data['MACD_Signal'], stock_data['MACD_Hist'] = calculate_macd(stock_data['Close'])
+    stock_data['BB_SMA'], stock_data['BB_Upper'], stock_data['BB_Lower'] = calculate_bollinger_bands(stock_data['Close'])
+    stock_data['Returns'] = stock_data['Close'].pct_change()
+    stock_data['Cum_Returns'] = (1 + stock_data['Returns']).cumprod() - 1
+    stock_data['Volatility'] = stock_data['Returns'].rolling(window=20).std() * np.sqrt(252) * 100
+
+    # Calculate ATR
+    stock_data['High_Low'] = stock_data['High'] - stock_data['Low']
+    stock_data['High_Close'] = abs(stock_data['High'] - stock_data['Close'].shift(1))
+    stock_data['Low_Close'] = abs(stock_data['Low'] - stock_data['Close'].shift(1))
+    stock_data['True_Range'] = stock_data[['High_Low', 'High_Close', 'Low_Close']].max(axis=1)
+    stock_data['ATR'] = stock_data['True_Range'].rolling(window=14).mean()
+
+    # Support and resistance
+    stock_data['Resistance_20D'] = stock_data['High'].rolling(window=20).max()
+    stock_data['Support_20D'] = stock_data['Low'].rolling(window=20).min()
+    return stock_data
+
+
+def load_chart_data(ticker: str) -> Optional[pd.DataFrame]:
+    """Load three months of OHLCV data (shared price cache) and compute the dashboard indicators"""
+    print(f"📊 Fetching comprehensive data for {ticker}...")
+    stock_data = get_price_loader().load_prices([ticker], period="3mo").get(ticker.upper())  # 3 months for faster loading
+
+    if stock_data is None or stock_data.empty:
+        return None
+
+    return add_chart_indicators(stock_data.copy())
+
+
+def calculate_chart_metrics(stock_data: pd.DataFrame) -> Dict:
+    """Key technical levels and risk metrics used by the trading plan and the risk panel"""
+    returns_clean = stock_data['Returns'].dropna()
+    current_rsi = stock_data['RSI'].iloc[-1]
+
+    # VaR and CVaR calculation
+    var_cutoff = np.percentile(returns_clean, 5)
+    var_95 = var_cutoff * 100
+    cvar_95 = returns_clean[returns_clean <= var_cutoff].mean() * 100
+
+    # Maximum drawdown
+    cummax = stock_data['Close'].cummax()
+    drawdown = (stock_data['Close'] - cummax) / cummax * 100
+    max_drawdown = drawdown.min()
+
+    # Sharpe and Sortino ratios
+    mean_return = returns_clean.mean() * 252
+    std_return = returns_clean.std() * np.sqrt(252)
+    sharpe_ratio = mean_return / std_return if std_return > 0 else 0
+
+    downside_returns = returns_clean[returns_clean < 0]
+    downside_std = downside_returns.std() * np.sqrt(252) if len(downside_returns) > 0 else std_return
+    sortino_ratio = mean_return / downside_std if downside_std > 0 else 0
+
+    # Beta (simplified - assume market return)
+    beta = 1.0 + (returns_clean.std() - 0.01) * 10  # Simplified beta estimate
+
+    return {
+        'current_price': float(stock_data['Close'].iloc[-1]),
+        'sma_20': stock_data['SMA_20'].iloc[-1],
+        'sma_50': stock_data['SMA_50'].iloc[-1],
+        'resistance_20d': stock_data['Resistance_20D'].iloc[-1],
+        'support_20d': stock_data['Support_20D'].iloc[-1],
+        'rsi': float(current_rsi) if not pd.isna(current_rsi) else 50.0,
+        'atr': stock_data['ATR'].iloc[-1],
+        'volatility': stock_data['Volatility'].iloc[-1],
+        'var_95': var_95,
+        'cvar_95': cvar_95,
+        'max_drawdown': max_drawdown,
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'beta': beta,
+        'annual_return': mean_return,
+    }
+
+
+def chart_output_path(ticker: str, current_date: str, profile: ChartProfile) -> Path:
+    results_dir = Path(f"results/{ticker}/{current_date}")
+    results_dir.mkdir(parents=True, exist_ok=True)
+    return results_dir / f"{ticker}_comprehensive_analysis_{current_date}.{profile.format}"
+
+
+def _bar_polys(x: np.ndarray, bottom: np.ndarray, top: np.ndarray, width: float) -> np.ndarray:
+    """Rectangle vertices (n, 4, 2) for bars centred on x"""
+    half = width / 2
+    return np.stack([
+        np.column_stack([x - half, bottom]),
+        np.column_stack([x - half, top]),
+        np.column_stack([x + half, top]),
+        np.column_stack([x + half, bottom]),
+    ], axis=1)
+
+
+def _add_bars(ax, x, bottom, top, width, colors, alpha=1.0):
+    """Draw bars as one PolyCollection (one artist instead of one patch per bar)"""
+    bars = PolyCollection(_bar_polys(x, bottom, top, width), facecolors=colors, edgecolors='none', alpha=alpha)
+    ax.add_collection(bars)
+    finite = np.isfinite(bottom) & np.isfinite(top)
+    ax.update_datalim(np.column_stack([
+        np.r_[x[finite] - width / 2, x[finite] + width / 2],
+        np.r_[bottom[finite], top[finite]],
+    ]))
+    ax.autoscale_view()
+    return bars
+
+
+def render_comprehensive_chart(
+    stock_data: pd.DataFrame,
+    ticker: str,
+    current_date: str,
+    chart_path: str,
+    profile: Union[str, ChartProfile, Dict, None] = None,
+    metrics: Optional[Dict] = None,
+) -> str:
+    """
+    Draw the dashboard for precomputed indicator data and save it to chart_path.
+
+    Pure function of its (picklable) arguments so it can run in a worker process.
+    Candlesticks and volume/MACD bars are matplotlib collections rather than one
+    artist per bar, and the Figure is created without pyplot (no global state).
+
+    Returns:
+        chart_path
+    """
+    profile = get_chart_profile(profile)
+    metrics = metrics or calculate_chart_metrics(stock_data)
+
+    index = stock_data.index
+    x = mdates.date2num(index.to_pydatetime())
+    open_ = stock_data['Open'].to_numpy(dtype=float)
+    close = stock_data['Close'].to_numpy(dtype=float)
+    high = stock_data['High'].to_numpy(dtype=float)
+    low = stock_data['Low'].to_numpy(dtype=float)
+    volume_m = stock_data['Volume'].to_numpy(dtype=float) / 1e6
+    up = close >= open_
+    candle_colors = np.where(up, UP_COLOR, DOWN_COLOR)
+    bar_width = 0.6 * (np.median(np.diff(x)) if len(x) > 1 else 1.0)
+
+    # Create figure with 4x3 grid
+    fig = Figure(figsize=profile.figsize)
+    fig.suptitle(f'{ticker} - Comprehensive Trading Analysis Dashboard - {current_date}',
+                 fontsize=22, fontweight='bold', y=0.995)
+
+    # Fixed margins instead of tight_layout/bbox_inches='tight', which each cost an extra layout pass
+    gs = fig.add_gridspec(4, 3, hspace=0.35, wspace=0.3, left=0.04, right=0.96, bottom=0.04, top=0.95)
+
+    # 1. CANDLESTICK Chart with Moving Averages & Volume
+    ax1 = fig.add_subplot(gs[0, :2])
+    ax1_vol = ax1.twinx()
+
+    wicks = LineCollection(
+        np.stack([np.column_stack([x, low]), np.column_stack([x, high])], axis=1),
+        colors=candle_colors, linewidths=0.5, alpha=0.6,
+    )
+    ax1.add_collection(wicks)
+    _add_bars(ax1, x, np.minimum(open_, close), np.maximum(open_, close), bar_width, candle_colors)
+    ax1.xaxis_date()
+
+    # Add moving averages
+    ax1.plot(index, stock_data['SMA_20'], label='SMA 20', alpha=0.9, color='#3498DB', linestyle='--', linewidth=2)
+    ax1.plot(index, stock_data['SMA_50'], label='SMA 50', alpha=0.9, color='#E67E22', linestyle='--', linewidth=2)
+    ax1.plot(index, stock_data['EMA_12'], label='EMA 12', alpha=0.7, color='#9B59B6', linestyle=':', linewidth=1.5)
+    ax1.set_ylim(np.nanmin(low) * 0.98, np.nanmax(high) * 1.02)
+
+    # Volume bars
+    _add_bars(ax1_vol, x, np.zeros_like(volume_m), volume_m, bar_width, candle_colors, alpha=0.3)
+    ax1_vol.set_ylim(0, np.nanmax(volume_m) * 1.05)
+
+    ax1.set_title('📊 Candlestick Chart with Moving Averages & Volume', fontsize=13, fontweight='bold', y=1.0)
+    ax1.set_ylabel('Price ($)', fontsize=11, fontweight='bold')
+    ax1_vol.set_ylabel('Volume (M)', fontsize=11, fontweight='bold')
+    ax1.legend(loc='upper left', fontsize=9, framealpha=0.9)
+    ax1.grid(True, alpha=0.3, linestyle=':', linewidth=0.5)
+    ax1.set_facecolor('#FAFAFA')
+
+    # 2. RSI
+    ax2 = fig.add_subplot(gs[0, 2])
+    ax2.plot(index, stock_data['RSI'], linewidth=2, color='#8E44AD')
+    ax2.axhline(y=70, color='#E74C3C', linestyle='--', alpha=0.7, label='Overbought (70)')
+    ax2.axhline(y=30, color='#27AE60', linestyle='--', alpha=0.7, label='Oversold (30)')
+    ax2.axhspan(30, 70, alpha=0.1, color='#95A5A6')
+    ax2.set_title('📊 RSI Indicator', fontsize=12, fontweight='bold', y=1.0)
+    ax2.set_ylabel('RSI', fontsize=10)
+    ax2.set_ylim(0, 100)
+    ax2.legend(fontsize=8, loc='upper left')
+    ax2.grid(True, alpha=0.3)
+    ax2.set_facecolor('#F8F9FA')
+
+    # 3. MACD
+    ax3 = fig.add_subplot(gs[1, 0])
+    ax3.plot(index, stock_data['MACD'], label='MACD', linewidth=2, color='#3498DB')
+    ax3.plot(index, stock_data['MACD_Signal'], label='Signal', linewidth=2, color='#E74C3C')
+    macd_hist = stock_data['MACD_Hist'].to_numpy(dtype=float)
+    _add_bars(ax3, x, np.zeros_like(macd_hist), macd_hist, bar_width, '#95A5A6', alpha=0.3).set_label('Histogram')
+    ax3.set_title('📉 MACD Indicator', fontsize=12, fontweight='bold', y=1.0)
+    ax3.set_ylabel('MACD', fontsize=10)
+    ax3.legend(fontsize=8, loc='upper left')
+    ax3.grid(True, alpha=0.3)
+    ax3.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+    ax3.set_facecolor('#F8F9FA')
+
+    # 4. Bollinger Bands
+    ax4 = fig.add_subplot(gs[1, 1])
+    ax4.plot(index, stock_data['Close'], label='Close', linewidth=2, color='black')
+    ax4.plot(index, stock_data['BB_SMA'], label='SMA', linewidth=1.5, color='#3498DB', linestyle='--')
+    ax4.plot(index, stock_data['BB_Upper'], label='Upper Band', linewidth=1, color='#E74C3C', alpha=0.7)
+    ax4.plot(index, stock_data['BB_Lower'], label='Lower Band', linewidth=1, color='#27AE60', alpha=0.7)
+    ax4.fill_between(index, stock_data['BB_Lower'], stock_data['BB_Upper'], alpha=0.1, color='#3498DB')
+    ax4.set_title('📊 Bollinger Bands', fontsize=12, fontweight='bold', y=1.0)
+    ax4.set_ylabel('Price ($)', fontsize=10)
+    ax4.legend(fontsize=8, loc='upper left')
+    ax4.grid(True, alpha=0.3)
+    ax4.set_facecolor('#F8F9FA')
+
+    # 5. Daily Returns Distribution with Confidence Intervals
+    ax5 = fig.add_subplot(gs[1, 2])
+    returns_clean = stock_data['Returns'].dropna() * 100
+    ax5.hist(returns_clean, bins=40, alpha=0.7, color='#3498DB', edgecolor='black')
+
+    # Add statistical measures
+    mean_ret = returns_clean.mean()
+    median_ret = returns_clean.median()
+    std_ret = returns_clean.std()
+    ci_95_lower = mean_ret - 1.96 * std_ret
+    ci_95_upper = mean_ret + 1.96 * std_ret
+
+    ax5.axvline(mean_ret, color='#E74C3C', linestyle='--', linewidth=2.5, label=f'Mean: {mean_ret:.2f}%')
+    ax5.axvline(median_ret, color='#27AE60', linestyle='--', linewidth=2.5, label=f'Median: {median_ret:.2f}%')
+    ax5.axvline(ci_95_lower, color='#E74C3C', linestyle=':', linewidth=1.5, alpha=0.7, label=f'95% CI Lower: {ci_95_lower:.2f}%')
+    ax5.axvline(ci_95_upper, color='#27AE60', linestyle=':', linewidth=1.5, alpha=0.7, label=f'95% CI Upper: {ci_95_upper:.2f}%')
+    ax5.axvspan(ci_95_lower, ci_95_upper, alpha=0.1, color='#95A5A6')
+
+    ax5.set_title('📊 Returns Distribution with 95% CI', fontsize=12, fontweight='bold', y=1.0)
+    ax5.set_xlabel('Daily Return (%)', fontsize=10)
+    ax5.set_ylabel('Frequency', fontsize=10)
+    ax5.legend(fontsize=7, loc='upper right')
+    ax5.grid(True, alpha=0.3, axis='y')
+    ax5.set_facecolor('#F8F9FA')
+
+    # 6. Rolling Volatility with Forecast Bands
+    ax6 = fig.add_subplot(gs[2, 0])
+    ax6.plot(index, stock_data['Volatility'], linewidth=2.5, color='#E67E22', label='Realized Vol')
+    ax6.fill_between(index, stock_data['Volatility'], alpha=0.2, color='#E67E22')
+
+    # Calculate confidence bands for volatility
+    avg_vol = stock_data['Volatility'].mean()
+    std_vol = stock_data['Volatility'].std()
+    upper_vol_band = avg_vol + std_vol
+    lower_vol_band = max(0, avg_vol - std_vol)
+
+    ax6.axhline(y=avg_vol, color='#2C3E50', linestyle='-', linewidth=2, label=f'Mean: {avg_vol:.2f}%', alpha=0.8)
+    ax6.axhline(y=upper_vol_band, color='#E74C3C', linestyle=':', linewidth=1.5, label=f'Upper Band: {upper_vol_band:.2f}%', alpha=0.7)
+    ax6.axhline(y=lower_vol_band, color='#27AE60', linestyle=':', linewidth=1.5, label=f'Lower Band: {lower_vol_band:.2f}%', alpha=0.7)
+    ax6.axhspan(lower_vol_band, upper_vol_band, alpha=0.1, color='#95A5A6')
+
+    ax6.set_title('📊 Volatility with Confidence Bands', fontsize=12, fontweight='bold', y=1.0)
+    ax6.set_ylabel('Volatility (%)', fontsize=10)
+    ax6.legend(fontsize=7, loc='upper left')
+    ax6.grid(True, alpha=0.3)
+    ax6.set_facecolor('#F8F9FA')
+
+    # 7. Volume Analysis
+    ax7 = fig.add_subplot(gs[2, 1])
+    volume_ma_m = stock_data['Volume'].rolling(window=20).mean().to_numpy(dtype=float) / 1e6
+    volume_colors = np.where(volume_m > volume_ma_m, UP_COLOR, DOWN_COLOR)  # NaN MA compares False, as before
+    _add_bars(ax7, x, np.zeros_like(volume_m), volume_m, bar_width, volume_colors, alpha=0.6)
+    ax7.plot(index, volume_ma_m, linewidth=2, color='#3498DB', label='20-Day MA')
+    ax7.set_title('📊 Volume Analysis', fontsize=12, fontweight='bold', y=1.0)
+    ax7.set_ylabel('Volume (Millions)', fontsize=10)
+    ax7.legend(fontsize=8, loc='upper left')
+    ax7.grid(True, alpha=0.3, axis='y')
+    ax7.set_facecolor('#F8F9FA')
+
+    # 8. Support & Resistance
+    ax8 = fig.add_subplot(gs[2, 2])
+    ax8.plot(index, stock_data['Close'], linewidth=2, color='#2E86DE', label='Close')
+    ax8.plot(index, stock_data['Resistance_20D'], linewidth=1.5, color='#E74C3C', linestyle='--', alpha=0.7, label='Resistance (20D High)')
+    ax8.plot(index, stock_data['Support_20D'], linewidth=1.5, color='#27AE60', linestyle='--', alpha=0.7, label='Support (20D Low)')
+    ax8.fill_between(index, stock_data['Support_20D'], stock_data['Resistance_20D'], alpha=0.1, color='#95A5A6')
+    ax8.set_title('📊 Support & Resistance Levels', fontsize=12, fontweight='bold', y=1.0)
+    ax8.set_ylabel('Price ($)', fontsize=10)
+    ax8.legend(fontsize=8, loc='upper left')
+    ax8.grid(True, alpha=0.3)
+    ax8.set_facecolor('#F8F9FA')
+
+    # 9. Cumulative Returns
+    ax9 = fig.add_subplot(gs[3, 0])
+    ax9.plot(index, stock_data['Cum_Returns'] * 100, linewidth=2.5, color='#27AE60')
+    ax9.fill_between(index, 0, stock_data['Cum_Returns'] * 100, alpha=0.3, color='#27AE60')
+    ax9.axhline(y=0, color='black', linestyle='-', linewidth=1)
+    ax9.set_title('📈 Cumulative Returns', fontsize=12, fontweight='bold', y=1.0)
+    ax9.set_ylabel('Return (%)', fontsize=10)
+    ax9.grid(True, alpha=0.3)
+    ax9.set_facecolor('#F8F9FA')
+
+    # 10. ATR (Average True Range)
+    ax10 = fig.add_subplot(gs[3, 1])
+    ax10.plot(index, stock_data['ATR'], linewidth=2, color='#9B59B6')
+    ax10.fill_between(index, stock_data['ATR'], alpha=0.3, color='#9B59B6')
+    avg_atr = stock_data['ATR'].mean()
+    ax10.axhline(y=avg_atr, color='#E74C3C', linestyle='--', linewidth=2, label=f'Avg ATR: ${avg_atr:.2f}')
+    ax10.set_title('📊 Average True Range (ATR)', fontsize=12, fontweight='bold', y=1.0)
+    ax10.set_ylabel('ATR ($)', fontsize=10)
+    ax10.legend(fontsize=8, loc='upper left')
+    ax10.grid(True, alpha=0.3)
+    ax10.set_facecolor('#F8F9FA')
+
+    # 11. Risk Metrics Dashboard
+    ax11 = fig.add_subplot(gs[3, 2])
+    ax11.axis('off')
+
+    var_95 = metrics['var_95']
+    max_drawdown = metrics['max_drawdown']
+    risk_text = f"""
+    ⚠️ RISK METRICS DASHBOARD
+    {'='*32}
+
+    95% VaR (Daily): {var_95:.2f}%
+    95% CVaR (Daily): {metrics['cvar_95']:.2f}%
+    Max Drawdown: {max_drawdown:.2f}%
+
+    Sharpe Ratio: {metrics['sharpe_ratio']:.3f}
+    Sortino Ratio: {metrics['sortino_ratio']:.3f}
+    Beta (Est.): {metrics['beta']:.2f}
+
+    Ann. Return: {metrics['annual_return']*100:.2f}%
+    Ann. Volatility: {metrics['volatility']:.2f}%
+        """
+
+    # Color code based on risk levels
+    bg_color = '#FFF3CD' if abs(var_95) > 3 or abs(max_drawdown) > 20 else '#D1F2EB'
+    edge_color = '#E67E22' if abs(var_95) > 3 else '#27AE60'
+
+    ax11.text(0.05, 0.95, risk_text, transform=ax11.transAxes,
+              fontsize=10, verticalalignment='top', fontfamily='monospace',
+              bbox=dict(boxstyle='round', facecolor=bg_color, alpha=0.9,
+                        edgecolor=edge_color, linewidth=3))
+
+    # Five value ticks per panel: each tick is several artists and dominates draw time
+    for ax in [ax1, ax1_vol, ax2, ax3, ax4, ax5, ax6, ax7, ax8, ax9, ax10]:
+        ax.yaxis.set_major_locator(MaxNLocator(nbins=5))
+
+    # Format x-axes
+    for ax in [ax1, ax3, ax4, ax6, ax7, ax8, ax9, ax10]:
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+        ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=3))
+        setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+    # Save chart (fast zlib level for PNG: the default level costs more than the drawing)
+    save_kwargs = {'pil_kwargs': {'compress_level': 1}} if profile.format == 'png' else {}
+    fig.savefig(chart_path, dpi=profile.dpi, format=profile.format, facecolor='white', **save_kwargs)
+    return str(chart_path)
+
+
+_chart_pool: Optional[ProcessPoolExecutor] = None
+_chart_pool_lock = threading.Lock()
+
+
+def get_chart_pool(max_workers: int = 2) -> ProcessPoolExecutor:
+    """Process-wide pool for chart rendering (matplotlib is CPU-bound and holds the GIL)"""
+    global _chart_pool
+    with _chart_pool_lock:
+        if _chart_pool is None:
+            # Forking a process with live threads (Flask, chat jobs) can copy locks held by
+            # other threads into the worker and deadlock it
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _chart_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
+        return _chart_pool
+
+
+def shutdown_chart_pool(wait: bool = True):
+    """
+    Stop the chart pool's worker processes
+
+    Needed when this process is itself a multiprocessing worker: those exit without the
+    interpreter's executor cleanup and would wait forever on the idle chart workers.
+    """
+    global _chart_pool
+    with _chart_pool_lock:
+        pool, _chart_pool = _chart_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def _render_inline(stock_data, ticker, current_date, chart_path, profile, metrics) -> Future:
+    future = Future()
+    try:
+        future.set_result(render_comprehensive_chart(stock_data, ticker, current_date, chart_path, profile, metrics))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _cache_rendered_chart(render_future: Future, cache, cache_key: str, ticker: str) -> Future:
+    """Future that resolves once the rendered chart has also been stored in the artifact cache"""
+    future = Future()
+
+    def on_rendered(done: Future):
+        try:
+            chart_path = done.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        try:
+            cache.store(cache_key, chart_path, "comprehensive_chart", ticker)
+        except Exception as e:
+            print(f"⚠️  Could not cache chart {chart_path}: {e}")
+        future.set_result(chart_path)
+
+    render_future.add_done_callback(on_rendered)
+    return future
+
+
+def submit_comprehensive_trading_chart(
+    ticker,
+    current_date,
+    profile: Union[str, ChartProfile, Dict, None] = None,
+    background: bool = True,
+) -> Tuple[Optional[Dict], Optional[Future]]:
+    """
+    Compute chart data and metrics now, and render the figure in the background.
+
+    Args:
+        ticker: Stock ticker
+        current_date: Analysis date (used in the title and output path)
+        profile: Output profile name ("document", "print", "web", "svg"), ChartProfile or dict of overrides
+        background: Render in the chart process pool; False renders before returning
+
+    Returns:
+        (metrics dict including the planned 'chart_path', Future resolving to the saved path),
+        or (None, None) if no data is available
+    """
+    global _chart_pool
+    profile = get_chart_profile(profile)
+
+    stock_data = load_chart_data(ticker)
+    if stock_data is None:
+        return None, None
+
+    metrics = calculate_chart_metrics(stock_data)
+    chart_path = chart_output_path(ticker, current_date, profile)
+    metrics['chart_path'] = str(chart_path)
+
+    # Same data, profile and date as an earlier render: reuse the cached file
+    cache = get_artifact_cache()
+    cache_key = cache.artifact_key(
+        "comprehensive_chart", ticker, data_fingerprint(stock_data), profile, date=str(current_date)
+    )
+    if cache.fetch(cache_key, chart_path):
+        future = Future()
+        future.set_result(str(chart_path))
+        return metrics, future
+    if chart_path.exists():
+        # May be a copy of another cached artifact; render to a fresh file
+        os.remove(chart_path)
+
+    if not background:
+        future = _render_inline(stock_data, ticker, current_date, chart_path, profile, metrics)
+        return metrics, _cache_rendered_chart(future, cache, cache_key, ticker)
+
+    try:
+        # Absolute path: pool workers keep the working directory they were started in
+        future = get_chart_pool().submit(
+            render_comprehensive_chart, stock_data, ticker, current_date, os.path.abspath(chart_path), profile, metrics
+        )
+    except Exception as e:
+        # Broken or shut-down pool: render in this process instead
+        print(f"⚠️  Chart process pool unavailable ({e}), rendering inline")
+        with _chart_pool_lock:
+            _chart_pool = None
+        future = _render_inline(stock_data, ticker, current_date, chart_path, profile, metrics)
+    return metrics, _cache_rendered_chart(future, cache, cache_key, ticker)
+
+
+def create_comprehensive_trading_chart(ticker, current_date, profile: Union[str, ChartProfile, Dict, None] = None):
     """
     Create a comprehensive single-window chart with advanced visualizations:
     1. Candlestick Chart with Moving Averages & Volume
@@ -58,312 +601,22 @@ def create_comprehensive_trading_chart(ticker, current_date):
     10. ATR (Average True Range)
     11. Risk Metrics Dashboard (VaR, CVaR, Sharpe)
     12. Trading Signals & Entry/Exit Levels
+
+    Renders synchronously; use submit_comprehensive_trading_chart to render in the background.
+
+    Returns:
+        Metrics dict with 'chart_path' and key technical levels, or None on failure
     """
-    
-    results_dir = Path(f"results/{ticker}/{current_date}")
-    results_dir.mkdir(parents=True, exist_ok=True)
-    
     try:
-        # Fetch data
-        print(f"📊 Fetching comprehensive data for {ticker}...")
-        stock_data = yf.download(ticker, period="3mo", progress=False, timeout=15)  # CHANGED: 3 months for faster loading
-        
-        if stock_data.empty:
+        metrics, future = submit_comprehensive_trading_chart(ticker, current_date, profile, background=False)
+        if metrics is None:
             return None
-        
-        # Handle MultiIndex columns
-        if isinstance(stock_data.columns, pd.MultiIndex):
-            stock_data.columns = [col[0] for col in stock_data.columns]
-        
-        # Calculate all technical indicators
-        stock_data['SMA_20'] = stock_data['Close'].rolling(window=20).mean()
-        stock_data['SMA_50'] = stock_data['Close'].rolling(window=50).mean()
-        stock_data['EMA_12'] = stock_data['Close'].ewm(span=12).mean()
-        stock_data['RSI'] = calculate_rsi(stock_data['Close'])
-        stock_data['MACD'], stock_data['MACD_Signal'], stock_data['MACD_Hist'] = calculate_macd(stock_data['Close'])
-        stock_data['BB_SMA'], stock_data['BB_Upper'], stock_data['BB_Lower'] = calculate_bollinger_bands(stock_data['Close'])
-        stock_data['Returns'] = stock_data['Close'].pct_change()
-        stock_data['Cum_Returns'] = (1 + stock_data['Returns']).cumprod() - 1
-        stock_data['Volatility'] = stock_data['Returns'].rolling(window=20).std() * np.sqrt(252) * 100
-        
-        # Calculate ATR
-        stock_data['High_Low'] = stock_data['High'] - stock_data['Low']
-        stock_data['High_Close'] = abs(stock_data['High'] - stock_data['Close'].shift(1))
-        stock_data['Low_Close'] = abs(stock_data['Low'] - stock_data['Close'].shift(1))
-        stock_data['True_Range'] = stock_data[['High_Low', 'High_Close', 'Low_Close']].max(axis=1)
-        stock_data['ATR'] = stock_data['True_Range'].rolling(window=14).mean()
-        
-        # Calculate support and resistance
-        recent_high = stock_data['High'].rolling(window=20).max()
-        recent_low = stock_data['Low'].rolling(window=20).min()
-        
-        # Get current values for metrics
-        current_price = float(stock_data['Close'].iloc[-1])
-        current_rsi = float(stock_data['RSI'].iloc[-1]) if not pd.isna(stock_data['RSI'].iloc[-1]) else 50.0
-        
-        # Create figure with 4x3 grid
-        fig = plt.figure(figsize=(26, 20))
-        fig.suptitle(f'{ticker} - Comprehensive Trading Analysis Dashboard - {current_date}', 
-                    fontsize=22, fontweight='bold', y=0.995)
-        
-        gs = fig.add_gridspec(4, 3, hspace=0.35, wspace=0.3)
-        
-        # 1. CANDLESTICK Chart with Moving Averages & Volume
-        ax1 = fig.add_subplot(gs[0, :2])
-        ax1_vol = ax1.twinx()
-        
-        # Plot candlesticks (simplified as OHLC)
-        for idx in range(len(stock_data)):
-            date = stock_data.index[idx]
-            open_price = stock_data['Open'].iloc[idx]
-            close_price = stock_data['Close'].iloc[idx]
-            high_price = stock_data['High'].iloc[idx]
-            low_price = stock_data['Low'].iloc[idx]
-            
-            color = '#27AE60' if close_price >= open_price else '#E74C3C'
-            ax1.plot([date, date], [low_price, high_price], color=color, linewidth=0.5, alpha=0.6)
-            ax1.plot([date, date], [open_price, close_price], color=color, linewidth=3)
-        
-        # Add moving averages
-        ax1.plot(stock_data.index, stock_data['SMA_20'], label='SMA 20', alpha=0.9, color='#3498DB', linestyle='--', linewidth=2)
-        ax1.plot(stock_data.index, stock_data['SMA_50'], label='SMA 50', alpha=0.9, color='#E67E22', linestyle='--', linewidth=2)
-        ax1.plot(stock_data.index, stock_data['EMA_12'], label='EMA 12', alpha=0.7, color='#9B59B6', linestyle=':', linewidth=1.5)
-        
-        # Volume bars
-        colors_vol = ['#27AE60' if stock_data['Close'].iloc[i] >= stock_data['Open'].iloc[i] else '#E74C3C' 
-                      for i in range(len(stock_data))]
-        ax1_vol.bar(stock_data.index, stock_data['Volume']/1e6, alpha=0.3, color=colors_vol)
-        
-        ax1.set_title('📊 Candlestick Chart with Moving Averages & Volume', fontsize=13, fontweight='bold')
-        ax1.set_ylabel('Price ($)', fontsize=11, fontweight='bold')
-        ax1_vol.set_ylabel('Volume (M)', fontsize=11, fontweight='bold')
-        ax1.legend(loc='upper left', fontsize=9, framealpha=0.9)
-        ax1.grid(True, alpha=0.3, linestyle=':', linewidth=0.5)
-        ax1.set_facecolor('#FAFAFA')
-        
-        # 2. RSI
-        ax2 = fig.add_subplot(gs[0, 2])
-        ax2.plot(stock_data.index, stock_data['RSI'], linewidth=2, color='#8E44AD')
-        ax2.axhline(y=70, color='#E74C3C', linestyle='--', alpha=0.7, label='Overbought (70)')
-        ax2.axhline(y=30, color='#27AE60', linestyle='--', alpha=0.7, label='Oversold (30)')
-        ax2.fill_between(stock_data.index, 30, 70, alpha=0.1, color='#95A5A6')
-        ax2.set_title('📊 RSI Indicator', fontsize=12, fontweight='bold')
-        ax2.set_ylabel('RSI', fontsize=10)
-        ax2.set_ylim(0, 100)
-        ax2.legend(fontsize=8)
-        ax2.grid(True, alpha=0.3)
-        ax2.set_facecolor('#F8F9FA')
-        
-        # 3. MACD
-        ax3 = fig.add_subplot(gs[1, 0])
-        ax3.plot(stock_data.index, stock_data['MACD'], label='MACD', linewidth=2, color='#3498DB')
-        ax3.plot(stock_data.index, stock_data['MACD_Signal'], label='Signal', linewidth=2, color='#E74C3C')
-        ax3.bar(stock_data.index, stock_data['MACD_Hist'], label='Histogram', alpha=0.3, color='#95A5A6')
-        ax3.set_title('📉 MACD Indicator', fontsize=12, fontweight='bold')
-        ax3.set_ylabel('MACD', fontsize=10)
-        ax3.legend(fontsize=8)
-        ax3.grid(True, alpha=0.3)
-        ax3.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-        ax3.set_facecolor('#F8F9FA')
-        
-        # 4. Bollinger Bands
-        ax4 = fig.add_subplot(gs[1, 1])
-        ax4.plot(stock_data.index, stock_data['Close'], label='Close', linewidth=2, color='black')
-        ax4.plot(stock_data.index, stock_data['BB_SMA'], label='SMA', linewidth=1.5, color='#3498DB', linestyle='--')
-        ax4.plot(stock_data.index, stock_data['BB_Upper'], label='Upper Band', linewidth=1, color='#E74C3C', alpha=0.7)
-        ax4.plot(stock_data.index, stock_data['BB_Lower'], label='Lower Band', linewidth=1, color='#27AE60', alpha=0.7)
-        ax4.fill_between(stock_data.index, stock_data['BB_Lower'], stock_data['BB_Upper'], alpha=0.1, color='#3498DB')
-        ax4.set_title('📊 Bollinger Bands', fontsize=12, fontweight='bold')
-        ax4.set_ylabel('Price ($)', fontsize=10)
-        ax4.legend(fontsize=8)
-        ax4.grid(True, alpha=0.3)
-        ax4.set_facecolor('#F8F9FA')
-        
-        # 5. Daily Returns Distribution with Confidence Intervals
-        ax5 = fig.add_subplot(gs[1, 2])
-        returns_clean = stock_data['Returns'].dropna() * 100
-        ax5.hist(returns_clean, bins=40, alpha=0.7, color='#3498DB', edgecolor='black')
-        
-        # Add statistical measures
-        mean_ret = returns_clean.mean()
-        median_ret = returns_clean.median()
-        std_ret = returns_clean.std()
-        ci_95_lower = mean_ret - 1.96 * std_ret
-        ci_95_upper = mean_ret + 1.96 * std_ret
-        
-        ax5.axvline(mean_ret, color='#E74C3C', linestyle='--', linewidth=2.5, label=f'Mean: {mean_ret:.2f}%')
-        ax5.axvline(median_ret, color='#27AE60', linestyle='--', linewidth=2.5, label=f'Median: {median_ret:.2f}%')
-        ax5.axvline(ci_95_lower, color='#E74C3C', linestyle=':', linewidth=1.5, alpha=0.7, label=f'95% CI Lower: {ci_95_lower:.2f}%')
-        ax5.axvline(ci_95_upper, color='#27AE60', linestyle=':', linewidth=1.5, alpha=0.7, label=f'95% CI Upper: {ci_95_upper:.2f}%')
-        ax5.fill_betweenx([0, ax5.get_ylim()[1]], ci_95_lower, ci_95_upper, alpha=0.1, color='#95A5A6')
-        
-        ax5.set_title('📊 Returns Distribution with 95% CI', fontsize=12, fontweight='bold')
-        ax5.set_xlabel('Daily Return (%)', fontsize=10)
-        ax5.set_ylabel('Frequency', fontsize=10)
-        ax5.legend(fontsize=7, loc='upper right')
-        ax5.grid(True, alpha=0.3, axis='y')
-        ax5.set_facecolor('#F8F9FA')
-        
-        # 6. Rolling Volatility with Forecast Bands
-        ax6 = fig.add_subplot(gs[2, 0])
-        ax6.plot(stock_data.index, stock_data['Volatility'], linewidth=2.5, color='#E67E22', label='Realized Vol')
-        ax6.fill_between(stock_data.index, stock_data['Volatility'], alpha=0.2, color='#E67E22')
-        
-        # Calculate confidence bands for volatility
-        avg_vol = stock_data['Volatility'].mean()
-        std_vol = stock_data['Volatility'].std()
-        upper_vol_band = avg_vol + std_vol
-        lower_vol_band = max(0, avg_vol - std_vol)
-        
-        ax6.axhline(y=avg_vol, color='#2C3E50', linestyle='-', linewidth=2, label=f'Mean: {avg_vol:.2f}%', alpha=0.8)
-        ax6.axhline(y=upper_vol_band, color='#E74C3C', linestyle=':', linewidth=1.5, label=f'Upper Band: {upper_vol_band:.2f}%', alpha=0.7)
-        ax6.axhline(y=lower_vol_band, color='#27AE60', linestyle=':', linewidth=1.5, label=f'Lower Band: {lower_vol_band:.2f}%', alpha=0.7)
-        ax6.fill_between(stock_data.index, lower_vol_band, upper_vol_band, alpha=0.1, color='#95A5A6')
-        
-        ax6.set_title('📊 Volatility with Confidence Bands', fontsize=12, fontweight='bold')
-        ax6.set_ylabel('Volatility (%)', fontsize=10)
-        ax6.legend(fontsize=7)
-        ax6.grid(True, alpha=0.3)
-        ax6.set_facecolor('#F8F9FA')
-        
-        # 7. Volume Analysis
-        ax7 = fig.add_subplot(gs[2, 1])
-        volume_ma = stock_data['Volume'].rolling(window=20).mean()
-        colors = ['#27AE60' if v > vm else '#E74C3C' for v, vm in zip(stock_data['Volume'], volume_ma)]
-        ax7.bar(stock_data.index, stock_data['Volume']/1e6, alpha=0.6, color=colors)
-        ax7.plot(stock_data.index, volume_ma/1e6, linewidth=2, color='#3498DB', label='20-Day MA')
-        ax7.set_title('📊 Volume Analysis', fontsize=12, fontweight='bold')
-        ax7.set_ylabel('Volume (Millions)', fontsize=10)
-        ax7.legend(fontsize=8)
-        ax7.grid(True, alpha=0.3, axis='y')
-        ax7.set_facecolor('#F8F9FA')
-        
-        # 8. Support & Resistance
-        ax8 = fig.add_subplot(gs[2, 2])
-        ax8.plot(stock_data.index, stock_data['Close'], linewidth=2, color='#2E86DE', label='Close')
-        ax8.plot(stock_data.index, recent_high, linewidth=1.5, color='#E74C3C', linestyle='--', alpha=0.7, label='Resistance (20D High)')
-        ax8.plot(stock_data.index, recent_low, linewidth=1.5, color='#27AE60', linestyle='--', alpha=0.7, label='Support (20D Low)')
-        ax8.fill_between(stock_data.index, recent_low, recent_high, alpha=0.1, color='#95A5A6')
-        ax8.set_title('📊 Support & Resistance Levels', fontsize=12, fontweight='bold')
-        ax8.set_ylabel('Price ($)', fontsize=10)
-        ax8.legend(fontsize=8)
-        ax8.grid(True, alpha=0.3)
-        ax8.set_facecolor('#F8F9FA')
-        
-        # 9. Cumulative Returns
-        ax9 = fig.add_subplot(gs[3, 0])
-        ax9.plot(stock_data.index, stock_data['Cum_Returns'] * 100, linewidth=2.5, color='#27AE60')
-        ax9.fill_between(stock_data.index, 0, stock_data['Cum_Returns'] * 100, alpha=0.3, color='#27AE60')
-        ax9.axhline(y=0, color='black', linestyle='-', linewidth=1)
-        ax9.set_title('📈 Cumulative Returns', fontsize=12, fontweight='bold')
-        ax9.set_ylabel('Return (%)', fontsize=10)
-        ax9.grid(True, alpha=0.3)
-        ax9.set_facecolor('#F8F9FA')
-        
-        # 10. ATR (Average True Range)
-        ax10 = fig.add_subplot(gs[3, 1])
-        ax10.plot(stock_data.index, stock_data['ATR'], linewidth=2, color='#9B59B6')
-        ax10.fill_between(stock_data.index, stock_data['ATR'], alpha=0.3, color='#9B59B6')
-        avg_atr = stock_data['ATR'].mean()
-        ax10.axhline(y=avg_atr, color='#E74C3C', linestyle='--', linewidth=2, label=f'Avg ATR: ${avg_atr:.2f}')
-        ax10.set_title('📊 Average True Range (ATR)', fontsize=12, fontweight='bold')
-        ax10.set_ylabel('ATR ($)', fontsize=10)
-        ax10.legend(fontsize=8)
-        ax10.grid(True, alpha=0.3)
-        ax10.set_facecolor('#F8F9FA')
-        
-        # 11. Risk Metrics Dashboard
-        ax11 = fig.add_subplot(gs[3, 2])
-        ax11.axis('off')
-        
-        # Calculate risk metrics
-        returns_clean = stock_data['Returns'].dropna()
-        
-        # VaR and CVaR calculation
-        var_95 = np.percentile(returns_clean, 5) * 100
-        cvar_95 = returns_clean[returns_clean <= np.percentile(returns_clean, 5)].mean() * 100
-        
-        # Maximum drawdown
-        cummax = stock_data['Close'].cummax()
-        drawdown = (stock_data['Close'] - cummax) / cummax * 100
-        max_drawdown = drawdown.min()
-        
-        # Sharpe and Sortino ratios
-        mean_return = returns_clean.mean() * 252
-        std_return = returns_clean.std() * np.sqrt(252)
-        sharpe_ratio = mean_return / std_return if std_return > 0 else 0
-        
-        downside_returns = returns_clean[returns_clean < 0]
-        downside_std = downside_returns.std() * np.sqrt(252) if len(downside_returns) > 0 else std_return
-        sortino_ratio = mean_return / downside_std if downside_std > 0 else 0
-        
-        # Beta (simplified - assume market return)
-        beta = 1.0 + (returns_clean.std() - 0.01) * 10  # Simplified beta estimate
-        
-        risk_text = f"""
-    ⚠️ RISK METRICS DASHBOARD
-    {'='*32}
-    
-    95% VaR (Daily): {var_95:.2f}%
-    95% CVaR (Daily): {cvar_95:.2f}%
-    Max Drawdown: {max_drawdown:.2f}%
-    
-    Sharpe Ratio: {sharpe_ratio:.3f}
-    Sortino Ratio: {sortino_ratio:.3f}
-    Beta (Est.): {beta:.2f}
-    
-    Ann. Return: {mean_return*100:.2f}%
-    Ann. Volatility: {stock_data['Volatility'].iloc[-1]:.2f}%
-        """
-        
-        # Color code based on risk levels
-        bg_color = '#FFF3CD' if abs(var_95) > 3 or abs(max_drawdown) > 20 else '#D1F2EB'
-        edge_color = '#E67E22' if abs(var_95) > 3 else '#27AE60'
-        
-        ax11.text(0.05, 0.95, risk_text, transform=ax11.transAxes,
-                 fontsize=10, verticalalignment='top', fontfamily='monospace',
-                 bbox=dict(boxstyle='round', facecolor=bg_color, alpha=0.9, 
-                          edgecolor=edge_color, linewidth=3))
-        
-        # Format x-axes
-        for ax in [ax1, ax3, ax4, ax6, ax7, ax8, ax9, ax10]:
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-            ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=3))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
-        plt.tight_layout()
-        
-        # Save chart
-        chart_path = results_dir / f"{ticker}_comprehensive_analysis_{current_date}.png"
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
-        print(f"✅ Comprehensive chart saved: {chart_path}")
-        
-        # Return chart path AND key technical levels for trading plan
-        metrics = {
-            'chart_path': str(chart_path),
-            'current_price': current_price,
-            'sma_20': stock_data['SMA_20'].iloc[-1],
-            'sma_50': stock_data['SMA_50'].iloc[-1],
-            'resistance_20d': recent_high.iloc[-1],
-            'support_20d': recent_low.iloc[-1],
-            'rsi': current_rsi,
-            'atr': stock_data['ATR'].iloc[-1],
-            'volatility': stock_data['Volatility'].iloc[-1],
-            'var_95': var_95,
-            'cvar_95': cvar_95,
-            'max_drawdown': max_drawdown,
-            'sharpe_ratio': sharpe_ratio,
-            'sortino_ratio': sortino_ratio,
-            'beta': beta
-        }
-        
+        future.result()
+        print(f"✅ Comprehensive chart saved: {metrics['chart_path']}")
         return metrics
-        
+
     except Exception as e:
         print(f"❌ Error creating comprehensive chart: {e}")
         import traceback
         traceback.print_exc()
         return None
-
@@ -4,89 +4,13 @@ Integrates optimization results with comprehensive quantitative analysis and new
 """
 
 from langchain_core.prompts import ChatPromptTemplate
-from pathlib import Path
 import json
-from tradingagents.portfolio.csv_data_exporter import CSVDataExporter
+from tradingagents.dataflows.config import get_config
+from tradingagents.agents.generators.report_outputs import submit_report_outputs
 import time
 from typing import Dict, List, Any
 
 
-def create_formatted_table(doc, table_lines):
-    """Create a formatted Word table from markdown table lines"""
-    from docx.shared import Pt, RGBColor, Inches
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.oxml.ns import qn
-    from docx.oxml import OxmlElement
-    
-    # Parse table
-    rows = [line for line in table_lines if line.strip() and not line.startswith('|-')]
-    if len(rows) < 2:
-        return
-    
-    # Split cells
-    parsed_rows = []
-    for row in rows:
-        cells = [cell.strip() for cell in row.split('|')]
-        cells = [c for c in cells if c]  # Remove empty cells
-        if cells:
-            parsed_rows.append(cells)
-    
-    if len(parsed_rows) < 2:
-        return
-    
-    # Create table
-    num_cols = len(parsed_rows[0])
-    table = doc.add_table(rows=len(parsed_rows), cols=num_cols)
-    table.style = 'Light Grid Accent 1'
-    table.alignment = WD_ALIGN_PARAGRAPH.CENTER  # Center the table
-    
-    # Format header row
-    for i, cell_text in enumerate(parsed_rows[0]):
-        cell = table.rows[0].cells[i]
-        cell.text = cell_text
-        # Header formatting
-        for paragraph in cell.paragraphs:
-            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            for run in paragraph.runs:
-                run.font.bold = True
-                run.font.size = Pt(11)
-                run.font.color.rgb = RGBColor(255, 255, 255)
-        # Header background color
-        shading_elm = OxmlElement('w:shd')
-        shading_elm.set(qn('w:fill'), '2E86DE')  # Blue background
-        cell._element.get_or_add_tcPr().append(shading_elm)
-    
-    # Format data rows
-    for row_idx in range(1, len(parsed_rows)):
-        for col_idx, cell_text in enumerate(parsed_rows[row_idx]):
-            cell = table.rows[row_idx].cells[col_idx]
-            cell.text = cell_text
-            # Data formatting
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.font.size = Pt(10)
-                    # Color code signals
-                    if '🟢' in cell_text or 'Good' in cell_text or 'Bullish' in cell_text:
-                        run.font.color.rgb = RGBColor(39, 174, 96)
-                    elif '🔴' in cell_text or 'Bad' in cell_text or 'Bearish' in cell_text:
-                        run.font.color.rgb = RGBColor(231, 76, 60)
-                    elif '🟡' in cell_text or 'Neutral' in cell_text:
-                        run.font.color.rgb = RGBColor(241, 196, 15)
-            
-            # Alternate row shading
-            if row_idx % 2 == 0:
-                shading_elm = OxmlElement('w:shd')
-                shading_elm.set(qn('w:fill'), 'F0F8FF')  # Light blue
-                cell._element.get_or_add_tcPr().append(shading_elm)
-    
-    # Set column widths
-    for row in table.rows:
-        for cell in row.cells:
-            cell.width = Inches(7.0 / num_cols)
-    
-    doc.add_paragraph()  # Add spacing after table
-
-
 def create_enhanced_quantitative_document_generator(llm, toolkit):
     """Create enhanced document generator with full quantitative integration."""
     
@@ -129,12 +53,19 @@ def create_enhanced_quantitative_document_generator(llm, toolkit):
         # Generate enhanced quantitative metrics
         quant_metrics = generate_quantitative_metrics(optimization_results, state)
         
-        # Generate comprehensive visualization chart FIRST to get technical levels
+        # Compute chart metrics FIRST to get technical levels; the figure renders in a
+        # background process while the report is being written
         chart_metrics = None
+        chart_future = None
         try:
-            from tradingagents.agents.generators.comprehensive_charts import create_comprehensive_trading_chart
+            from tradingagents.agents.generators.comprehensive_charts import get_chart_profile, submit_comprehensive_trading_chart
             print(f"📊 Creating comprehensive visualization chart...")
-            chart_result = create_comprehensive_trading_chart(ticker, current_date)
+            chart_profile = get_chart_profile(get_config().get("chart_profile", "document"))
+            if chart_profile.format not in ("png", "jpg", "jpeg"):
+                # The Word report can only embed raster images
+                print(f"⚠️  Chart format '{chart_profile.format}' cannot be embedded in Word, using the document profile")
+                chart_profile = get_chart_profile("document")
+            chart_result, chart_future = submit_comprehensive_trading_chart(ticker, current_date, chart_profile)
             if chart_result and isinstance(chart_result, dict):
                 chart_metrics = chart_result
                 print(f"✅ Chart metrics calculated for trading plan")
@@ -635,205 +566,23 @@ Generate ONLY Section 7 as a concise, actionable executive summary.""")
         
         analysis_document = '\n'.join(cleaned_lines)
         
-        # Create results directory
-        results_dir = Path(f"results/{ticker}/{current_date}")
-        results_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Add chart references to the document
-        chart_paths = {
-            'technical': results_dir / f"{ticker}_technical_analysis_{current_date}.png",
-            'market_summary': results_dir / f"{ticker}_market_summary_{current_date}.png"
-        }
-        
-        # Add chart references in markdown if charts exist
-        chart_section = "\n\n## 📊 TECHNICAL ANALYSIS CHARTS\n\n"
-        charts_added = False
-        
-        if chart_paths['technical'].exists():
-            chart_section += f"### Technical Analysis Chart\n"
-            chart_section += f"![Technical Analysis Chart]({chart_paths['technical'].name})\n\n"
-            charts_added = True
-            
-        if chart_paths['market_summary'].exists():
-            chart_section += f"### Market Summary Chart\n"
-            chart_section += f"![Market Summary Chart]({chart_paths['market_summary'].name})\n\n"
-            charts_added = True
-        
-        # Don't add old charts here - will add comprehensive chart later
-        
-        # Save as markdown file
-        doc_path = results_dir / f"{ticker}_comprehensive_analysis_{current_date}.md"
-        with open(doc_path, 'w', encoding='utf-8') as f:
-            f.write(analysis_document)
-        
-        print(f"📊 Enhanced Quantitative Analysis saved to: {doc_path}")
-        
-        # Export structured data to CSV for portfolio aggregation
-        try:
-            csv_exporter = CSVDataExporter(ticker, current_date)
-            exported_files = csv_exporter.export_all_data(state)
-            print(f"📊 CSV data exported: {len(exported_files)} files for portfolio analysis")
-        except Exception as e:
-            print(f"⚠️  CSV export failed: {e}")
-            # Continue without failing the analysis
-        
-        # Chart was already generated earlier, just get the path
-        comprehensive_chart_path = None
-        if chart_metrics and isinstance(chart_metrics, dict):
-            comprehensive_chart_path = chart_metrics.get('chart_path')
-            
-            if comprehensive_chart_path:
-                # Insert comprehensive chart in Technical Analysis section (Section 3)
-                chart_section_comp = f"\n\n### 📊 COMPREHENSIVE TRADING VISUALIZATION DASHBOARD\n\n"
-                chart_section_comp += f"![Comprehensive Trading Analysis]({ticker}_comprehensive_analysis_{current_date}.png)\n\n"
-                chart_section_comp += "*Dashboard shows: Price Action, RSI, MACD, Bollinger Bands, Returns Distribution, Volatility, Volume Analysis, Support/Resistance, Cumulative Returns, ATR, and Trading Signals*\n\n"
-                
-                # Insert after Technical Analysis section (Section 3)
-                if "## SECTION 4" in analysis_document or "BULL & BEAR" in analysis_document.upper():
-                    parts = analysis_document.split("## SECTION 4") if "## SECTION 4" in analysis_document else analysis_document.split("## BULL")
-                    if len(parts) == 2:
-                        analysis_document = parts[0] + chart_section_comp + "## SECTION 4" + parts[1] if "## SECTION 4" in analysis_document else parts[0] + chart_section_comp + "## BULL" + parts[1]
-                    else:
-                        analysis_document += chart_section_comp
-                else:
-                    analysis_document += chart_section_comp
-                
-                # Update saved markdown
-                with open(doc_path, 'w', encoding='utf-8') as f:
-                    f.write(analysis_document)
-        
-        # Generate Word document with embedded images and proper table formatting
-        try:
-            from docx import Document
-            from docx.shared import Inches, Pt, RGBColor
-            from docx.enum.text import WD_ALIGN_PARAGRAPH
-            from docx.oxml.ns import qn
-            from docx.oxml import OxmlElement
-            
-            doc = Document()
-            
-            # Add title with styling
-            title = doc.add_heading(f'Comprehensive Trading Analysis Report', 0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            title_run = title.runs[0]
-            title_run.font.color.rgb = RGBColor(46, 134, 222)
-            
-            # Add subtitle
-            subtitle = doc.add_heading(f'{ticker} - {current_date}', level=1)
-            subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            subtitle_run = subtitle.runs[0]
-            subtitle_run.font.color.rgb = RGBColor(52, 73, 94)
-            
-            doc.add_page_break()
-            
-            # Parse markdown and convert to Word with proper formatting
-            lines = analysis_document.split('\n')
-            in_table = False
-            table_lines = []
-            
-            for i, line in enumerate(lines):
-                line = line.strip()
-                
-                # Handle tables
-                if '|' in line and not line.startswith('#'):
-                    if not in_table:
-                        in_table = True
-                        table_lines = [line]
-                    else:
-                        table_lines.append(line)
-                    continue
-                elif in_table:
-                    # End of table, create it
-                    try:
-                        create_formatted_table(doc, table_lines)
-                    except:
-                        pass
-                    in_table = False
-                    table_lines = []
-                
-                # Handle headings
-                if line.startswith('# '):
-                    heading = doc.add_heading(line[2:], 1)
-                    heading.runs[0].font.color.rgb = RGBColor(41, 128, 185)
-                elif line.startswith('## '):
-                    heading = doc.add_heading(line[3:], 2)
-                    heading.runs[0].font.color.rgb = RGBColor(52, 152, 219)
-                elif line.startswith('### '):
-                    heading = doc.add_heading(line[4:], 3)
-                    heading.runs[0].font.color.rgb = RGBColor(93, 173, 226)
-                # Handle images
-                elif line.startswith('![') and '](' in line:
-                    try:
-                        img_name = line.split('](')[1].split(')')[0]
-                        img_path = results_dir / img_name
-                        if img_path.exists():
-                            doc.add_paragraph()  # Add spacing
-                            doc.add_picture(str(img_path), width=Inches(7))
-                            last_paragraph = doc.paragraphs[-1]
-                            last_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            doc.add_paragraph()  # Add spacing after
-                    except Exception as e:
-                        print(f"Could not embed image: {e}")
-                # Handle bullet points
-                elif line.startswith('- ') or line.startswith('* '):
-                    p = doc.add_paragraph(line[2:], style='List Bullet')
-                    p.paragraph_format.left_indent = Inches(0.25)
-                # Handle numbered lists
-                elif len(line) > 2 and line[0].isdigit() and line[1] == '.':
-                    p = doc.add_paragraph(line[3:], style='List Number')
-                    p.paragraph_format.left_indent = Inches(0.25)
-                # Regular paragraphs
-                elif line:
-                    # Add signal indicators as colored text
-                    p = doc.add_paragraph()
-                    if '🟢' in line or '🔴' in line or '🟡' in line:
-                        # Parse and color the signals
-                        parts = line.split()
-                        for part in parts:
-                            run = p.add_run(part + ' ')
-                            if '🟢' in part:
-                                run.font.color.rgb = RGBColor(39, 174, 96)
-                                run.font.bold = True
-                            elif '🔴' in part:
-                                run.font.color.rgb = RGBColor(231, 76, 60)
-                                run.font.bold = True
-                            elif '🟡' in part:
-                                run.font.color.rgb = RGBColor(241, 196, 15)
-                                run.font.bold = True
-                    else:
-                        p.add_run(line)
-            
-            # Handle any remaining table
-            if in_table and table_lines:
-                try:
-                    create_formatted_table(doc, table_lines)
-                except:
-                    pass
-            
-            # Save Word document with fallback for permission errors
-            docx_path = results_dir / f"{ticker}_comprehensive_analysis_{current_date}.docx"
-            try:
-                doc.save(str(docx_path))
-                print(f"📄 Word document with formatted tables and charts saved to: {docx_path}")
-            except PermissionError:
-                # File is open, save with timestamp
-                import datetime
-                timestamp = datetime.datetime.now().strftime("%H%M%S")
-                docx_path = results_dir / f"{ticker}_comprehensive_analysis_{current_date}_{timestamp}.docx"
-                doc.save(str(docx_path))
-                print(f"📄 Word document saved (with timestamp due to file lock): {docx_path}")
-            
-        except Exception as e:
-            print(f"⚠️  Could not generate Word document: {e}")
-            import traceback
-            traceback.print_exc()
-            docx_path = None
+        # Markdown, Word and CSV outputs are written concurrently in the background from one
+        # in-memory model; the graph finishes without waiting for them (report_outputs.py)
+        artifacts = submit_report_outputs(
+            ticker,
+            current_date,
+            analysis_document,
+            state,
+            chart_path=chart_metrics.get('chart_path') if chart_metrics else None,
+            chart_future=chart_future,
+        )
+        print(f"📦 Report outputs for {ticker} are being written in the background")
         
         return {
             "messages": [],
             "enhanced_quantitative_document": analysis_document,
-            "enhanced_document_path": str(doc_path),
-            "enhanced_docx_path": str(docx_path) if docx_path else None
+            "enhanced_document_path": str(artifacts.paths["markdown"]),
+            "enhanced_docx_path": str(artifacts.paths["docx"]),
         }
     
     return enhanced_quantitative_document_generator_node
@@ -0,0 +1,474 @@
+"""
+Report Output Pipeline
+Writes the Markdown, Word and CSV outputs of the Document Generator in the background
+
+The Document Generator builds the report text once; the sinks below consume that
+in-memory model concurrently on a small thread pool, and each writes its file once
+(to a temporary name that is renamed into place). The graph moves on as soon as the
+outputs are submitted; callers that need the files wait on the ReportArtifacts handle.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from tradingagents.agents.utils.artifact_cache import get_artifact_cache
+from tradingagents.dataflows.tracing import get_tracer, trace_span
+from tradingagents.dataflows.utils import atomic_write_path
+from tradingagents.portfolio.csv_data_exporter import CSVDataExporter
+
+# Seconds to wait for the background chart render before writing the report without it
+CHART_RENDER_TIMEOUT = 120
+# Output handles kept for get_report_artifacts; older finished ones are dropped
+MAX_TRACKED_REPORTS = 64
+
+
+def create_formatted_table(doc, table_lines):
+    """Create a formatted Word table from markdown table lines"""
+    from docx.shared import Pt, RGBColor, Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml.ns import qn
+    from docx.oxml import OxmlElement
+
+    # Parse table
+    rows = [line for line in table_lines if line.strip() and not line.startswith('|-')]
+    if len(rows) < 2:
+        return
+
+    # Split cells
+    parsed_rows = []
+    for row in rows:
+        cells = [cell.strip() for cell in row.split('|')]
+        cells = [c for c in cells if c]  # Remove empty cells
+        if cells:
+            parsed_rows.append(cells)
+
+    if len(parsed_rows) < 2:
+        return
+
+    # Create table
+    num_cols = len(parsed_rows[0])
+    table = doc.add_table(rows=len(parsed_rows), cols=num_cols)
+    table.style = 'Light Grid Accent 1'
+    table.alignment = WD_ALIGN_PARAGRAPH.CENTER  # Center the table
+
+    # Format header row
+    for i, cell_text in enumerate(parsed_rows[0]):
+        cell = table.rows[0].cells[i]
+        cell.text = cell_text
+        # Header formatting
+        for paragraph in cell.paragraphs:
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            for run in paragraph.runs:
+                run.font.bold = True
+                run.font.size = Pt(11)
+                run.font.color.rgb = RGBColor(255, 255, 255)
+        # Header background color
+        shading_elm = OxmlElement('w:shd')
+        shading_elm.set(qn('w:fill'), '2E86DE')  # Blue background
+        cell._element.get_or_add_tcPr().append(shading_elm)
+
+    # Format data rows
+    for row_idx in range(1, len(parsed_rows)):
+        for col_idx, cell_text in enumerate(parsed_rows[row_idx]):
+            cell = table.rows[row_idx].cells[col_idx]
+            cell.text = cell_text
+            # Data formatting
+            for paragraph in cell.paragraphs:
+                for run in paragraph.runs:
+                    run.font.size = Pt(10)
+                    # Color code signals
+                    if '🟢' in cell_text or 'Good' in cell_text or 'Bullish' in cell_text:
+                        run.font.color.rgb = RGBColor(39, 174, 96)
+                    elif '🔴' in cell_text or 'Bad' in cell_text or 'Bearish' in cell_text:
+                        run.font.color.rgb = RGBColor(231, 76, 60)
+                    elif '🟡' in cell_text or 'Neutral' in cell_text:
+                        run.font.color.rgb = RGBColor(241, 196, 15)
+
+            # Alternate row shading
+            if row_idx % 2 == 0:
+                shading_elm = OxmlElement('w:shd')
+                shading_elm.set(qn('w:fill'), 'F0F8FF')  # Light blue
+                cell._element.get_or_add_tcPr().append(shading_elm)
+
+    # Set column widths
+    for row in table.rows:
+        for cell in row.cells:
+            cell.width = Inches(7.0 / num_cols)
+
+    doc.add_paragraph()  # Add spacing after table
+
+
+def insert_chart_section(analysis_document: str, chart_path: Optional[str]) -> str:
+    """Insert the comprehensive chart after the Technical Analysis section (Section 3)"""
+    if not chart_path:
+        return analysis_document
+
+    chart_section_comp = "\n\n### 📊 COMPREHENSIVE TRADING VISUALIZATION DASHBOARD\n\n"
+    chart_section_comp += f"![Comprehensive Trading Analysis]({Path(chart_path).name})\n\n"
+    chart_section_comp += "*Dashboard shows: Price Action, RSI, MACD, Bollinger Bands, Returns Distribution, Volatility, Volume Analysis, Support/Resistance, Cumulative Returns, ATR, and Trading Signals*\n\n"
+
+    if "## SECTION 4" in analysis_document or "BULL & BEAR" in analysis_document.upper():
+        parts = analysis_document.split("## SECTION 4") if "## SECTION 4" in analysis_document else analysis_document.split("## BULL")
+        if len(parts) == 2:
+            return parts[0] + chart_section_comp + "## SECTION 4" + parts[1] if "## SECTION 4" in analysis_document else parts[0] + chart_section_comp + "## BULL" + parts[1]
+    return analysis_document + chart_section_comp
+
+
+@dataclass
+class ReportModel:
+    """The rendered report every output sink consumes"""
+    ticker: str
+    current_date: str
+    results_dir: Path
+    document: str  # Final Markdown, including the chart section when the chart rendered
+    chart_path: Optional[str] = None
+
+    @property
+    def markdown_path(self) -> Path:
+        return report_paths(self.ticker, self.current_date, self.results_dir)["markdown"]
+
+    @property
+    def docx_path(self) -> Path:
+        return report_paths(self.ticker, self.current_date, self.results_dir)["docx"]
+
+
+def report_paths(ticker: str, current_date: str, results_dir: Path) -> Dict[str, Path]:
+    """Where each sink writes its output"""
+    return {
+        "markdown": results_dir / f"{ticker}_comprehensive_analysis_{current_date}.md",
+        "docx": results_dir / f"{ticker}_comprehensive_analysis_{current_date}.docx",
+        "csv": results_dir / "csv_data",
+    }
+
+
+def build_word_document(model: ReportModel):
+    """Convert the report Markdown to a python-docx Document with formatted tables and embedded images"""
+    from docx import Document
+    from docx.shared import Inches, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    doc = Document()
+
+    # Add title with styling
+    title = doc.add_heading('Comprehensive Trading Analysis Report', 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_run = title.runs[0]
+    title_run.font.color.rgb = RGBColor(46, 134, 222)
+
+    # Add subtitle
+    subtitle = doc.add_heading(f'{model.ticker} - {model.current_date}', level=1)
+    subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    subtitle_run = subtitle.runs[0]
+    subtitle_run.font.color.rgb = RGBColor(52, 73, 94)
+
+    doc.add_page_break()
+
+    # Parse markdown and convert to Word with proper formatting
+    lines = model.document.split('\n')
+    in_table = False
+    table_lines = []
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+
+        # Handle tables
+        if '|' in line and not line.startswith('#'):
+            if not in_table:
+                in_table = True
+                table_lines = [line]
+            else:
+                table_lines.append(line)
+            continue
+        elif in_table:
+            # End of table, create it
+            try:
+                create_formatted_table(doc, table_lines)
+            except:
+                pass
+            in_table = False
+            table_lines = []
+
+        # Handle headings
+        if line.startswith('# '):
+            heading = doc.add_heading(line[2:], 1)
+            heading.runs[0].font.color.rgb = RGBColor(41, 128, 185)
+        elif line.startswith('## '):
+            heading = doc.add_heading(line[3:], 2)
+            heading.runs[0].font.color.rgb = RGBColor(52, 152, 219)
+        elif line.startswith('### '):
+            heading = doc.add_heading(line[4:], 3)
+            heading.runs[0].font.color.rgb = RGBColor(93, 173, 226)
+        # Handle images
+        elif line.startswith('![') and '](' in line:
+            try:
+                img_name = line.split('](')[1].split(')')[0]
+                img_path = model.results_dir / img_name
+                if img_path.exists():
+                    doc.add_paragraph()  # Add spacing
+                    doc.add_picture(str(img_path), width=Inches(7))
+                    last_paragraph = doc.paragraphs[-1]
+                    last_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                    doc.add_paragraph()  # Add spacing after
+            except Exception as e:
+                print(f"Could not embed image: {e}")
+        # Handle bullet points
+        elif line.startswith('- ') or line.startswith('* '):
+            p = doc.add_paragraph(line[2:], style='List Bullet')
+            p.paragraph_format.left_indent = Inches(0.25)
+        # Handle numbered lists
+        elif len(line) > 2 and line[0].isdigit() and line[1] == '.':
+            p = doc.add_paragraph(line[3:], style='List Number')
+            p.paragraph_format.left_indent = Inches(0.25)
+        # Regular paragraphs
+        elif line:
+            # Add signal indicators as colored text
+            p = doc.add_paragraph()
+            if '🟢' in line or '🔴' in line or '🟡' in line:
+                # Parse and color the signals
+                parts = line.split()
+                for part in parts:
+                    run = p.add_run(part + ' ')
+                    if '🟢' in part:
+                        run.font.color.rgb = RGBColor(39, 174, 96)
+                        run.font.bold = True
+                    elif '🔴' in part:
+                        run.font.color.rgb = RGBColor(231, 76, 60)
+                        run.font.bold = True
+                    elif '🟡' in part:
+                        run.font.color.rgb = RGBColor(241, 196, 15)
+                        run.font.bold = True
+            else:
+                p.add_run(line)
+
+    # Handle any remaining table
+    if in_table and table_lines:
+        try:
+            create_formatted_table(doc, table_lines)
+        except:
+            pass
+
+    return doc
+
+
+# ----------------------------------------------------------------------
+# Sinks: each writes one output from the shared model, atomically
+# ----------------------------------------------------------------------
+
+def write_markdown(model: ReportModel) -> str:
+    with atomic_write_path(model.markdown_path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(model.document)
+    print(f"📊 Enhanced Quantitative Analysis saved to: {model.markdown_path}")
+    return str(model.markdown_path)
+
+
+def write_word(model: ReportModel) -> str:
+    doc = build_word_document(model)
+    docx_path = model.docx_path
+    try:
+        with atomic_write_path(docx_path) as tmp_path:
+            doc.save(tmp_path)
+        print(f"📄 Word document with formatted tables and charts saved to: {docx_path}")
+    except PermissionError:
+        # File is open, save with timestamp
+        import datetime
+        timestamp = datetime.datetime.now().strftime("%H%M%S")
+        docx_path = model.results_dir / f"{model.ticker}_comprehensive_analysis_{model.current_date}_{timestamp}.docx"
+        with atomic_write_path(docx_path) as tmp_path:
+            doc.save(tmp_path)
+        print(f"📄 Word document saved (with timestamp due to file lock): {docx_path}")
+    return str(docx_path)
+
+
+def export_csv(ticker: str, current_date: str, state: Dict[str, Any]) -> Dict[str, str]:
+    """Export structured data to CSV for portfolio aggregation"""
+    exported_files = CSVDataExporter(ticker, current_date).export_all_data(state)
+    print(f"📊 CSV data exported: {len(exported_files)} files for portfolio analysis")
+    return exported_files
+
+
+def regenerate_csv_data(ticker: str, current_date: str) -> Dict[str, str]:
+    """
+    Rebuild results/{ticker}/{date}/csv_data from the state log, without rerunning any agent
+
+    Returns:
+        The exported CSV files, or an empty dict if the date was never logged
+    """
+    from tradingagents.agents.utils.state_log import load_logged_state
+
+    state = load_logged_state(ticker, current_date)
+    if not state:
+        return {}
+    return export_csv(ticker, current_date, state)
+
+
+class _ModelBuilder:
+    """Builds the ReportModel once, after the chart render finishes (or fails)"""
+
+    def __init__(self, ticker, current_date, results_dir, analysis_document, chart_path, chart_future):
+        self._args = (ticker, current_date, results_dir)
+        self._analysis_document = analysis_document
+        self._chart_path = chart_path
+        self._chart_future = chart_future
+        self._model: Optional[ReportModel] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ReportModel:
+        with self._lock:
+            if self._model is None:
+                chart_path = self._chart_path
+                if self._chart_future is not None:
+                    try:
+                        self._chart_future.result(timeout=CHART_RENDER_TIMEOUT)
+                        print(f"✅ Comprehensive chart saved: {chart_path}")
+                    except Exception as e:
+                        print(f"⚠️  Chart rendering failed: {e}")
+                        chart_path = None
+                    print(f"📦 {get_artifact_cache().summary()}")
+                self._model = ReportModel(
+                    *self._args,
+                    document=insert_chart_section(self._analysis_document, chart_path),
+                    chart_path=chart_path,
+                )
+            return self._model
+
+
+class ReportArtifacts:
+    """
+    Handle for the files of one report.
+
+    result() blocks until every sink has finished; the handle can also be awaited
+    from asyncio code. Failed sinks are reported as None (their errors in errors).
+    """
+
+    def __init__(self, ticker: str, current_date: str, futures: Dict[str, Future], model: _ModelBuilder,
+                 paths: Dict[str, Path]):
+        self.ticker = ticker
+        self.current_date = current_date
+        self.futures = futures
+        self.paths = paths  # Planned output locations (the Word report may fall back to a timestamped name)
+        self._model = model
+        self.errors: Dict[str, BaseException] = {}
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures.values())
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for all outputs
+
+        Returns:
+            Dict with 'markdown' and 'docx' paths and 'csv' (dict of exported files)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = {}
+        for name, future in self.futures.items():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                raise
+            except Exception as e:
+                self.errors[name] = e
+                print(f"⚠️  Report output '{name}' failed for {self.ticker}: {e}")
+                results[name] = None
+        return results
+
+    def document(self) -> str:
+        """Final report Markdown (waits for the chart)"""
+        return self._model.get().document
+
+    def __await__(self):
+        return asyncio.get_running_loop().run_in_executor(None, self.result).__await__()
+
+
+_output_pool: Optional[ThreadPoolExecutor] = None
+_output_pool_lock = threading.Lock()
+
+_artifacts: Dict[tuple, ReportArtifacts] = {}
+_artifacts_lock = threading.Lock()
+
+
+def get_output_pool(max_workers: int = 4) -> ThreadPoolExecutor:
+    """
+    Process-wide pool for report sinks.
+
+    Threads rather than processes: the sinks share the model and graph state without
+    pickling, and file I/O and zip compression release the GIL.
+    """
+    global _output_pool
+    with _output_pool_lock:
+        if _output_pool is None:
+            _output_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-output")
+        return _output_pool
+
+
+def submit_report_outputs(
+    ticker: str,
+    current_date: str,
+    analysis_document: str,
+    state: Dict[str, Any],
+    chart_path: Optional[str] = None,
+    chart_future: Optional[Future] = None,
+    sinks: Optional[List[str]] = None,
+) -> ReportArtifacts:
+    """
+    Write the report outputs concurrently in the background
+
+    Args:
+        ticker: Stock ticker
+        current_date: Analysis date
+        analysis_document: Report Markdown without the chart section
+        state: Graph state (CSV export input)
+        chart_path: Planned comprehensive chart path
+        chart_future: Future of the background chart render; the Markdown and Word
+            outputs include the chart only if it succeeds
+        sinks: Subset of ("markdown", "docx", "csv") to write (default: all)
+
+    Returns:
+        ReportArtifacts handle, also available from get_report_artifacts(ticker, current_date)
+    """
+    results_dir = Path(f"results/{ticker}/{current_date}")
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    model = _ModelBuilder(ticker, current_date, results_dir, analysis_document, chart_path, chart_future)
+    sinks = sinks or ["markdown", "docx", "csv"]
+    pool = get_output_pool()
+
+    # Writes run on pool threads: trace them under the span that submitted them
+    tracer = get_tracer()
+    parent_span = tracer.current_span()
+
+    def traced(sink, write):
+        def run():
+            with tracer.activate(parent_span), trace_span(f"write_{sink}", "file_write", ticker=ticker):
+                return write()
+        return run
+
+    state = dict(state)
+    futures: Dict[str, Future] = {}
+    if "csv" in sinks:
+        futures["csv"] = pool.submit(traced("csv", lambda: export_csv(ticker, current_date, state)))
+    if "markdown" in sinks:
+        futures["markdown"] = pool.submit(traced("markdown", lambda: write_markdown(model.get())))
+    if "docx" in sinks:
+        futures["docx"] = pool.submit(traced("docx", lambda: write_word(model.get())))
+
+    artifacts = ReportArtifacts(ticker, current_date, futures, model, report_paths(ticker, current_date, results_dir))
+    with _artifacts_lock:
+        _artifacts[(ticker.upper(), str(current_date))] = artifacts
+        for key in [key for key, handle in _artifacts.items() if handle.done()][:-MAX_TRACKED_REPORTS]:
+            del _artifacts[key]
+    return artifacts
+
+
+def get_report_artifacts(ticker: str, current_date) -> Optional[ReportArtifacts]:
+    """Most recent output handle for a ticker and date in this process"""
+    with _artifacts_lock:
+        return _artifacts.get((ticker.upper(), str(current_date)))
@@ -1,6 +1,8 @@
 import time
 import json
 
+from tradingagents.agents.utils.memory import situation_text
+
 
 def create_research_manager(llm, memory):
     def research_manager_node(state) -> dict:
@@ -18,7 +20,7 @@ def create_research_manager(llm, memory):
 
         investment_debate_state = state["investment_debate_state"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+        curr_situation = situation_text(state)
         past_memories = memory.get_memories(curr_situation, n_matches=2)
 
         past_memory_str = ""
@@ -47,6 +49,7 @@ Debate History:
         new_investment_debate_state = {
             "judge_decision": response.content,
             "history": investment_debate_state.get("history", ""),
+            "summary": investment_debate_state.get("summary", ""),
             "bear_history": investment_debate_state.get("bear_history", ""),
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": response.content,
@@ -1,6 +1,8 @@
 import time
 import json
 
+from tradingagents.agents.utils.memory import situation_text
+
 
 def create_risk_manager(llm, memory):
     def risk_manager_node(state) -> dict:
@@ -20,7 +22,7 @@ def create_risk_manager(llm, memory):
         sentiment_report = escape_braces(state["sentiment_report"])
         trader_plan = escape_braces(state["investment_plan"])
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+        curr_situation = situation_text(state)
         past_memories = memory.get_memories(curr_situation, n_matches=2)
 
         past_memory_str = ""
@@ -38,6 +40,7 @@ Guidelines for Decision-Making:
 Deliverables:
 - A clear and actionable recommendation: Buy, Sell, or Hold.
 - Detailed reasoning anchored in the debate and past reflections.
+- End your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' stating that recommendation.
 
 ---
 
@@ -53,6 +56,7 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
         new_risk_debate_state = {
             "judge_decision": response.content,
             "history": risk_debate_state["history"],
+            "summary": risk_debate_state.get("summary", ""),
             "risky_history": risk_debate_state["risky_history"],
             "safe_history": risk_debate_state["safe_history"],
             "neutral_history": risk_debate_state["neutral_history"],
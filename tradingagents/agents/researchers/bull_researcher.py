@@ -2,11 +2,17 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.debate_context import DebateContextManager
+from tradingagents.agents.utils.memory import situation_text
+
 
 def create_bull_researcher(llm, memory):
+    context = DebateContextManager("researcher")
+
     def bull_node(state) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
+        summary = investment_debate_state.get("summary", "")
         bull_history = investment_debate_state.get("bull_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
@@ -17,19 +23,23 @@ def create_bull_researcher(llm, memory):
                 return text.replace("{", "{{").replace("}", "}}")
             return text
 
-        market_research_report = escape_braces(state["market_report"])
-        sentiment_report = escape_braces(state["sentiment_report"])
-        news_report = escape_braces(state["news_report"])
-        fundamentals_report = escape_braces(state["fundamentals_report"])
+        # Bounded context: report digests, rolling summary of earlier turns, last turn verbatim
+        digests = context.report_digests(state)
+        market_research_report = escape_braces(digests["market_report"])
+        sentiment_report = escape_braces(digests["sentiment_report"])
+        news_report = escape_braces(digests["news_report"])
+        fundamentals_report = escape_braces(digests["fundamentals_report"])
+        debate_summary = summary or "No earlier turns."
+        last_argument = context.last_turn(current_response)
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+        curr_situation = situation_text(state)
 
-        # Temporarily disable memory to avoid WatsonX API connection issues
-        # past_memories = memory.get_memories(curr_situation, n_matches=2)
-        # past_memory_str = ""
-        # for i, rec in enumerate(past_memories, 1):
-        #     past_memory_str += rec["recommendation"] + "\n\n"
-        past_memory_str = "No historical memories available for this analysis."
+        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memory_str = ""
+        for i, rec in enumerate(past_memories, 1):
+            past_memory_str += rec["recommendation"] + "\n\n"
+        if not past_memory_str:
+            past_memory_str = "No historical memories available for this analysis."
 
         prompt = f"""You are a Bull Analyst advocating for investing in the stock. Your task is to build a strong, evidence-based case emphasizing growth potential, competitive advantages, and positive market indicators. Leverage the provided research and data to address concerns and counter bearish arguments effectively.
 
@@ -45,8 +55,8 @@ Market research report: {market_research_report}
 Social media sentiment report: {sentiment_report}
 Latest world affairs news: {news_report}
 Company fundamentals report: {fundamentals_report}
-Conversation history of the debate: {history}
-Last bear argument: {current_response}
+Summary of the earlier debate: {debate_summary}
+Last bear argument: {last_argument}
 Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bull argument, refute the bear's concerns, and engage in a dynamic debate that demonstrates the strengths of the bull position. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
@@ -59,6 +69,7 @@ Use this information to deliver a compelling bull argument, refute the bear's co
             "history": history + "\n" + argument,
             "bull_history": bull_history + "\n" + argument,
             "bear_history": investment_debate_state.get("bear_history", ""),
+            "summary": context.fold_turn(summary, current_response),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
         }
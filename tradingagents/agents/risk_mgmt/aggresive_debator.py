@@ -1,8 +1,12 @@
 import time
 import json
 
+from tradingagents.agents.utils.debate_context import DebateContextManager
+
 
 def create_risky_debator(llm):
+    context = DebateContextManager("risk")
+
     def risky_node(state) -> dict:
         # Escape curly braces to prevent ChatPromptTemplate variable interpretation
         def escape_braces(text):
@@ -12,15 +16,23 @@ def create_risky_debator(llm):
 
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
+        summary = risk_debate_state.get("summary", "")
+        latest_speaker = risk_debate_state.get("latest_speaker", "")
+        previous_turn = risk_debate_state.get(f"current_{latest_speaker.lower()}_response", "") if latest_speaker else ""
         risky_history = risk_debate_state.get("risky_history", "")
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = escape_braces(state["market_report"])
-        sentiment_report = escape_braces(state["sentiment_report"])
-        news_report = escape_braces(state["news_report"])
-        fundamentals_report = escape_braces(state["fundamentals_report"])
+        # Bounded context: report digests, rolling summary of earlier turns, latest turns verbatim
+        digests = context.report_digests(state)
+        market_research_report = escape_braces(digests["market_report"])
+        sentiment_report = escape_braces(digests["sentiment_report"])
+        news_report = escape_braces(digests["news_report"])
+        fundamentals_report = escape_braces(digests["fundamentals_report"])
+        debate_summary = summary or "No earlier turns."
+        current_safe_response = context.last_turn(current_safe_response)
+        current_neutral_response = context.last_turn(current_neutral_response)
 
         trader_decision = escape_braces(state["trader_investment_plan"])
 
@@ -34,7 +46,7 @@ Market Research Report: {market_research_report}
 Social Media Sentiment Report: {sentiment_report}
 Latest World Affairs Report: {news_report}
 Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here are the last arguments from the conservative analyst: {current_safe_response} Here are the last arguments from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+Here is a summary of the earlier conversation: {debate_summary} Here are the last arguments from the conservative analyst: {current_safe_response} Here are the last arguments from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage actively by addressing any specific concerns raised, refuting the weaknesses in their logic, and asserting the benefits of risk-taking to outpace market norms. Maintain a focus on debating and persuading, not just presenting data. Challenge each counterpoint to underscore why a high-risk approach is optimal. Output conversationally as if you are speaking without any special formatting."""
 
@@ -44,6 +56,7 @@ Engage actively by addressing any specific concerns raised, refuting the weaknes
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
+            "summary": context.fold_turn(summary, previous_turn),
             "risky_history": risky_history + "\n" + argument,
             "safe_history": risk_debate_state.get("safe_history", ""),
             "neutral_history": risk_debate_state.get("neutral_history", ""),
@@ -2,8 +2,12 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.debate_context import DebateContextManager
+
 
 def create_safe_debator(llm):
+    context = DebateContextManager("risk")
+
     def safe_node(state) -> dict:
         # Escape curly braces to prevent ChatPromptTemplate variable interpretation
         def escape_braces(text):
@@ -13,15 +17,23 @@ def create_safe_debator(llm):
 
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
+        summary = risk_debate_state.get("summary", "")
+        latest_speaker = risk_debate_state.get("latest_speaker", "")
+        previous_turn = risk_debate_state.get(f"current_{latest_speaker.lower()}_response", "") if latest_speaker else ""
         safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = escape_braces(state["market_report"])
-        sentiment_report = escape_braces(state["sentiment_report"])
-        news_report = escape_braces(state["news_report"])
-        fundamentals_report = escape_braces(state["fundamentals_report"])
+        # Bounded context: report digests, rolling summary of earlier turns, latest turns verbatim
+        digests = context.report_digests(state)
+        market_research_report = escape_braces(digests["market_report"])
+        sentiment_report = escape_braces(digests["sentiment_report"])
+        news_report = escape_braces(digests["news_report"])
+        fundamentals_report = escape_braces(digests["fundamentals_report"])
+        debate_summary = summary or "No earlier turns."
+        current_risky_response = context.last_turn(current_risky_response)
+        current_neutral_response = context.last_turn(current_neutral_response)
 
         trader_decision = escape_braces(state["trader_investment_plan"])
 
@@ -35,7 +47,7 @@ Market Research Report: {market_research_report}
 Social Media Sentiment Report: {sentiment_report}
 Latest World Affairs Report: {news_report}
 Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+Here is a summary of the earlier conversation: {debate_summary} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the neutral analyst: {current_neutral_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage by questioning their optimism and emphasizing the potential downsides they may have overlooked. Address each of their counterpoints to showcase why a conservative stance is ultimately the safest path for the firm's assets. Focus on debating and critiquing their arguments to demonstrate the strength of a low-risk strategy over their approaches. Output conversationally as if you are speaking without any special formatting."""
 
@@ -45,6 +57,7 @@ Engage by questioning their optimism and emphasizing the potential downsides the
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
+            "summary": context.fold_turn(summary, previous_turn),
             "risky_history": risk_debate_state.get("risky_history", ""),
             "safe_history": safe_history + "\n" + argument,
             "neutral_history": risk_debate_state.get("neutral_history", ""),
@@ -1,8 +1,12 @@
 import time
 import json
 
+from tradingagents.agents.utils.debate_context import DebateContextManager
+
 
 def create_neutral_debator(llm):
+    context = DebateContextManager("risk")
+
     def neutral_node(state) -> dict:
         # Escape curly braces to prevent ChatPromptTemplate variable interpretation
         def escape_braces(text):
@@ -12,15 +16,23 @@ def create_neutral_debator(llm):
 
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
+        summary = risk_debate_state.get("summary", "")
+        latest_speaker = risk_debate_state.get("latest_speaker", "")
+        previous_turn = risk_debate_state.get(f"current_{latest_speaker.lower()}_response", "") if latest_speaker else ""
         neutral_history = risk_debate_state.get("neutral_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_safe_response = risk_debate_state.get("current_safe_response", "")
 
-        market_research_report = escape_braces(state["market_report"])
-        sentiment_report = escape_braces(state["sentiment_report"])
-        news_report = escape_braces(state["news_report"])
-        fundamentals_report = escape_braces(state["fundamentals_report"])
+        # Bounded context: report digests, rolling summary of earlier turns, latest turns verbatim
+        digests = context.report_digests(state)
+        market_research_report = escape_braces(digests["market_report"])
+        sentiment_report = escape_braces(digests["sentiment_report"])
+        news_report = escape_braces(digests["news_report"])
+        fundamentals_report = escape_braces(digests["fundamentals_report"])
+        debate_summary = summary or "No earlier turns."
+        current_risky_response = context.last_turn(current_risky_response)
+        current_safe_response = context.last_turn(current_safe_response)
 
         trader_decision = escape_braces(state["trader_investment_plan"])
 
@@ -34,7 +46,7 @@ Market Research Report: {market_research_report}
 Social Media Sentiment Report: {sentiment_report}
 Latest World Affairs Report: {news_report}
 Company Fundamentals Report: {fundamentals_report}
-Here is the current conversation history: {history} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the safe analyst: {current_safe_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
+Here is a summary of the earlier conversation: {debate_summary} Here is the last response from the risky analyst: {current_risky_response} Here is the last response from the safe analyst: {current_safe_response}. If there are no responses from the other viewpoints, do not halluncinate and just present your point.
 
 Engage actively by analyzing both sides critically, addressing weaknesses in the risky and conservative arguments to advocate for a more balanced approach. Challenge each of their points to illustrate why a moderate risk strategy might offer the best of both worlds, providing growth potential while safeguarding against extreme volatility. Focus on debating rather than simply presenting data, aiming to show that a balanced view can lead to the most reliable outcomes. Output conversationally as if you are speaking without any special formatting."""
 
@@ -44,6 +56,7 @@ Engage actively by analyzing both sides critically, addressing weaknesses in the
 
         new_risk_debate_state = {
             "history": history + "\n" + argument,
+            "summary": context.fold_turn(summary, previous_turn),
             "risky_history": risk_debate_state.get("risky_history", ""),
             "safe_history": risk_debate_state.get("safe_history", ""),
             "neutral_history": neutral_history + "\n" + argument,
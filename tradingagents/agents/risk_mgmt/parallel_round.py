@@ -0,0 +1,62 @@
+from tradingagents.agents.utils.debate_context import DebateContextManager
+
+# Speaking order within a round; also the order turns are appended to the history
+RISK_SPEAKERS = ("Risky", "Safe", "Neutral")
+
+
+def as_round_contribution(debator_node, speaker):
+    """
+    Wrap a risk debator for the parallel round.
+
+    The three debators of a round run in the same graph step, so instead of each
+    rewriting risk_debate_state they write their argument to risk_round_responses,
+    which merges concurrent updates. The round merger folds them into the debate state.
+    """
+
+    def contribution_node(state) -> dict:
+        result = debator_node(state)
+        argument = result["risk_debate_state"][f"current_{speaker.lower()}_response"]
+        return {"risk_round_responses": {speaker: argument}}
+
+    contribution_node.__name__ = f"{speaker.lower()}_round_node"
+    return contribution_node
+
+
+def create_risk_round_merger():
+    context = DebateContextManager("risk")
+
+    def risk_round_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        responses = state.get("risk_round_responses") or {}
+
+        # The previous round's turns stop being the latest and move into the rolling summary
+        summary = risk_debate_state.get("summary", "")
+        for speaker in RISK_SPEAKERS:
+            summary = context.fold_turn(
+                summary, risk_debate_state.get(f"current_{speaker.lower()}_response", "")
+            )
+
+        new_risk_debate_state = dict(risk_debate_state)
+        history = risk_debate_state.get("history", "")
+        for speaker in RISK_SPEAKERS:
+            argument = responses.get(speaker)
+            if not argument:
+                continue
+            key = speaker.lower()
+            history += "\n" + argument
+            new_risk_debate_state[f"{key}_history"] = risk_debate_state.get(f"{key}_history", "") + "\n" + argument
+            new_risk_debate_state[f"current_{key}_response"] = argument
+
+        new_risk_debate_state.update(
+            {
+                "history": history,
+                "summary": summary,
+                "latest_speaker": RISK_SPEAKERS[-1],
+                "count": risk_debate_state["count"] + len(responses),
+            }
+        )
+
+        # None clears the round buffer for the next round
+        return {"risk_debate_state": new_risk_debate_state, "risk_round_responses": None}
+
+    return risk_round_node
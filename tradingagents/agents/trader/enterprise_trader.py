@@ -8,6 +8,9 @@ import time
 import json
 from typing import Dict, Any
 
+from tradingagents.agents.utils.decision_extraction import extract_score
+from tradingagents.agents.utils.memory import situation_text
+
 
 def create_enterprise_trader(llm, memory):
     """Create an enterprise-level trader with sophisticated decision-making capabilities."""
@@ -29,14 +32,7 @@ def create_enterprise_trader(llm, memory):
         enterprise_strategy = state.get("enterprise_strategy", "")
         
         # Get past memories with current market context
-        curr_situation = f"""
-CURRENT ANALYSIS CONTEXT:
-Market Analysis: {market_research_report}
-Sentiment Analysis: {sentiment_report}
-News Analysis: {news_report}
-Fundamental Analysis: {fundamentals_report}
-Quantitative Analysis: {quantitative_report}
-        """
+        curr_situation = situation_text(state)
         
         past_memories = memory.get_memories(curr_situation, n_matches=3)
         
@@ -261,14 +257,7 @@ CONCLUDE WITH: 'FINAL INSTITUTIONAL DECISION: **[DECISION]**' where [DECISION] i
 
 def extract_decision_confidence(content: str) -> float:
     """Extract confidence level from trading decision"""
-    try:
-        import re
-        confidence_match = re.search(r'CONVICTION LEVEL:.*?(\d+(?:\.\d+)?)', content, re.IGNORECASE)
-        if confidence_match:
-            return float(confidence_match.group(1)) / 10.0
-        return 0.7
-    except:
-        return 0.7
+    return extract_score(content, "CONVICTION LEVEL")
 
 
 def extract_position_size(content: str) -> dict:
@@ -2,6 +2,8 @@ import functools
 import time
 import json
 
+from tradingagents.agents.utils.memory import situation_text
+
 
 def create_trader(llm, memory):
     def trader_node(state, name):
@@ -21,7 +23,7 @@ def create_trader(llm, memory):
         comprehensive_quant_report = escape_braces(state.get("comprehensive_quantitative_report", ""))
         optimization_results = state.get("optimization_results", {})
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}\n\n{quantitative_report}"
+        curr_situation = situation_text(state)
         past_memories = memory.get_memories(curr_situation, n_matches=2)
 
         past_memory_str = ""
@@ -1,10 +1,7 @@
 from typing import Annotated, Sequence
 from datetime import date, timedelta, datetime
 from typing_extensions import TypedDict, Optional
-from langchain_openai import ChatOpenAI
-from tradingagents.agents import *
-from langgraph.prebuilt import ToolNode
-from langgraph.graph import END, StateGraph, START, MessagesState
+from langgraph.graph import MessagesState
 
 
 # Researcher team state
@@ -16,6 +13,7 @@ class InvestDebateState(TypedDict):
         str, "Bearish Conversation history"
     ]  # Bullish Conversation history
     history: Annotated[str, "Conversation history"]  # Conversation history
+    summary: Annotated[str, "Capped rolling summary of all turns but the latest"]
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
@@ -33,6 +31,7 @@ class RiskDebateState(TypedDict):
         str, "Neutral Agent's Conversation history"
     ]  # Conversation history
     history: Annotated[str, "Conversation history"]  # Conversation history
+    summary: Annotated[str, "Capped rolling summary of all turns but the latest"]
     latest_speaker: Annotated[str, "Analyst that spoke last"]
     current_risky_response: Annotated[
         str, "Latest response by the risky analyst"
@@ -47,6 +46,13 @@ class RiskDebateState(TypedDict):
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
 
 
+def merge_round_responses(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer for a parallel debate round: concurrent speakers merge, None resets."""
+    if right is None:
+        return {}
+    return {**(left or {}), **right}
+
+
 class AgentState(MessagesState):
     company_of_interest: Annotated[str, "Company that we are interested in trading"]
     trade_date: Annotated[str, "What date we are trading at"]
@@ -82,8 +88,35 @@ class AgentState(MessagesState):
     risk_debate_state: Annotated[
         RiskDebateState, "Current state of the debate on evaluating risk"
     ]
+    risk_round_responses: Annotated[dict, merge_round_responses]  # Parallel mode: {speaker: argument} for the round in progress
     final_trade_decision: Annotated[str, "Final decision made by the Risk Analysts"]
 
     # document generation
     analysis_document: Annotated[str, "Comprehensive analysis document"]
     document_path: Annotated[str, "Path to saved analysis document"]
+
+
+# Values that may grow large: with state offloading they are replaced by report store
+# references in the graph state (tradingagents/agents/utils/report_store.py)
+OFFLOADED_FIELDS = (
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "quantitative_report",
+    "portfolio_report",
+    "optimization_results",
+    "comprehensive_quantitative_report",
+    "enterprise_strategy_report",
+    "visualizer_report",
+    "investment_plan",
+    "trader_investment_plan",
+    "final_trade_decision",
+    "analysis_document",
+)
+# Debate state fields that accumulate over the debate; the current turn, speaker and count
+# stay inline because the conditional edges read them
+OFFLOADED_DEBATE_FIELDS = {
+    "investment_debate_state": ("history", "bull_history", "bear_history", "judge_decision"),
+    "risk_debate_state": ("history", "risky_history", "safe_history", "neutral_history", "judge_decision"),
+}
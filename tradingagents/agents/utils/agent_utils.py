@@ -7,10 +7,8 @@ from langchain_core.tools import tool
 from datetime import date, timedelta, datetime
 import functools
 import pandas as pd
-import yfinance as yf
 import os
 from dateutil.relativedelta import relativedelta
-from langchain_openai import ChatOpenAI
 import tradingagents.dataflows.interface as interface
 from tradingagents.default_config import DEFAULT_CONFIG
 from langchain_core.messages import HumanMessage
@@ -290,14 +288,8 @@ class Toolkit:
         
         try:
             # Use Yahoo Finance for live data instead of old SimFin CSV files
-            stock = yf.Ticker(ticker)
-            
-            if freq.lower() == "quarterly":
-                balance_sheet = stock.quarterly_balance_sheet
-                freq_label = "Quarterly"
-            else:
-                balance_sheet = stock.balance_sheet
-                freq_label = "Annual"
+            balance_sheet = interface.get_yfinance_statement(ticker, "balance_sheet", freq)
+            freq_label = "Quarterly" if freq.lower() == "quarterly" else "Annual"
             
             if balance_sheet is None or balance_sheet.empty:
                 # Fallback to SimFin if YFinance fails and curr_date is provided
@@ -369,14 +361,8 @@ class Toolkit:
         
         try:
             # Use Yahoo Finance for live data instead of old SimFin CSV files
-            stock = yf.Ticker(ticker)
-            
-            if freq.lower() == "quarterly":
-                cashflow = stock.quarterly_cashflow
-                freq_label = "Quarterly"
-            else:
-                cashflow = stock.cashflow
-                freq_label = "Annual"
+            cashflow = interface.get_yfinance_statement(ticker, "cashflow", freq)
+            freq_label = "Quarterly" if freq.lower() == "quarterly" else "Annual"
             
             if cashflow is None or cashflow.empty:
                 # Fallback to SimFin if YFinance fails and curr_date is provided
@@ -448,14 +434,8 @@ class Toolkit:
         
         try:
             # Use Yahoo Finance for live data instead of old SimFin CSV files
-            stock = yf.Ticker(ticker)
-            
-            if freq.lower() == "quarterly":
-                income_stmt = stock.quarterly_financials
-                freq_label = "Quarterly"
-            else:
-                income_stmt = stock.financials
-                freq_label = "Annual"
+            income_stmt = interface.get_yfinance_statement(ticker, "income_stmt", freq)
+            freq_label = "Quarterly" if freq.lower() == "quarterly" else "Annual"
             
             if income_stmt is None or income_stmt.empty:
                 # Fallback to SimFin if YFinance fails and curr_date is provided
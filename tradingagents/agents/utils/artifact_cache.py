@@ -0,0 +1,290 @@
+"""
+Artifact Cache
+Content-addressed cache for rendered charts and other report artifacts
+
+An artifact is identified by a hash of (artifact type, ticker, data fingerprint,
+render profile, extra render parameters). When a report is rebuilt from unchanged
+data, the cached file is copied to the requested output path instead of being
+rendered again. Cached files live under <results_dir>/.artifact_cache and are
+evicted least-recently-used once the cache exceeds its size bound.
+"""
+
+import dataclasses
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from tradingagents.dataflows.config import get_config
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT PRIMARY KEY,
+    kind TEXT,
+    ticker TEXT,
+    filename TEXT,
+    size INTEGER,
+    created_at REAL,
+    last_used REAL
+);
+"""
+
+
+def data_fingerprint(*frames: Optional[pd.DataFrame]) -> str:
+    """Stable hash of the values, index and columns of one or more DataFrames"""
+    digest = hashlib.sha256()
+    for frame in frames:
+        if frame is None:
+            digest.update(b"<none>")
+            continue
+        digest.update(json.dumps([str(c) for c in frame.columns]).encode("utf-8"))
+        digest.update(json.dumps([str(t) for t in frame.dtypes]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def _profile_dict(profile: Any) -> Any:
+    if dataclasses.is_dataclass(profile):
+        return dataclasses.asdict(profile)
+    return profile
+
+
+class ArtifactCache:
+    """
+    On-disk artifact store indexed in SQLite.
+
+    Safe to share between threads; several processes may use the same directory
+    (SQLite serializes index updates, and files are written atomically).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024, enabled: bool = True):
+        """
+        Args:
+            cache_dir: Directory holding the cached files and index.sqlite
+            max_bytes: Size bound for the cached files; older artifacts are evicted beyond it
+            enabled: False renders every artifact and never reads or writes the cache
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.stats = {"reused": 0, "regenerated": 0, "evicted": 0}
+        self.history: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+        self._conn = None
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(
+                os.path.join(self.cache_dir, "index.sqlite"), timeout=30, check_same_thread=False
+            )
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def artifact_key(kind: str, ticker: str, fingerprint: str, profile: Any = None, **params) -> str:
+        """
+        Content address of an artifact
+
+        Args:
+            kind: Artifact type, e.g. "comprehensive_chart" or "custom_chart:rsi"
+            ticker: Stock ticker (or portfolio name)
+            fingerprint: data_fingerprint() of the data the artifact is drawn from
+            profile: Render profile (ChartProfile, dict or name)
+            **params: Anything else that changes the output, such as the date in the title
+        """
+        payload = json.dumps(
+            {
+                "kind": kind,
+                "ticker": ticker.upper(),
+                "data": fingerprint,
+                "profile": _profile_dict(profile),
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, key: str, filename: str) -> str:
+        suffix = Path(filename).suffix
+        return os.path.join(self.cache_dir, key[:2], f"{key}{suffix}")
+
+    # ------------------------------------------------------------------
+    # Lookup and store
+    # ------------------------------------------------------------------
+
+    def fetch(self, key: str, output_path) -> Optional[str]:
+        """
+        Place a cached artifact at output_path
+
+        Returns:
+            output_path as a string on a hit, None if the artifact is not cached
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, ticker, filename FROM artifacts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            kind, ticker, filename = row
+            blob = self._blob_path(key, filename)
+            if not os.path.exists(blob):
+                # Removed behind our back: forget it and render again
+                self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE artifacts SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        output_path = str(output_path)
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        if not (os.path.exists(output_path) and filecmp.cmp(blob, output_path, shallow=False)):
+            tmp_path = f"{output_path}.{os.getpid()}.tmp"
+            shutil.copyfile(blob, tmp_path)
+            os.replace(tmp_path, output_path)
+
+        self._record("reused", kind, ticker, output_path)
+        return output_path
+
+    def store(self, key: str, path, kind: str = "", ticker: str = "") -> str:
+        """Copy a freshly rendered artifact into the cache and evict beyond max_bytes"""
+        path = str(path)
+        self._record("regenerated", kind, ticker, path)
+        if not self.enabled or not os.path.exists(path):
+            return path
+
+        filename = os.path.basename(path)
+        blob = self._blob_path(key, filename)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        tmp_path = f"{blob}.{os.getpid()}.tmp"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, blob)
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (key, kind, ticker, filename, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, ticker.upper(), filename, os.path.getsize(blob), now, now),
+            )
+            self._conn.commit()
+            self._evict(keep=key)
+        return path
+
+    def get_or_render(self, key: str, output_path, render: Callable[[], Any],
+                      kind: str = "", ticker: str = "") -> Optional[str]:
+        """
+        Return output_path from the cache, or call render() to produce it and cache the result
+
+        Args:
+            key: artifact_key() of the artifact
+            output_path: Where the caller expects the file
+            render: Writes the artifact to output_path; a falsy return value means it failed
+        """
+        cached = self.fetch(key, output_path)
+        if cached:
+            return cached
+        # Never render into the copy of another cached artifact
+        if os.path.exists(str(output_path)):
+            os.remove(str(output_path))
+        if not render():
+            return None
+        return self.store(key, output_path, kind, ticker)
+
+    # ------------------------------------------------------------------
+    # Eviction and reporting
+    # ------------------------------------------------------------------
+
+    def _evict(self, keep: Optional[str] = None):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, filename, size FROM artifacts ORDER BY last_used ASC"
+        ).fetchall()
+        for key, filename, size in rows:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._blob_path(key, filename))
+            except OSError:
+                pass
+            self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            total -= size
+            self.stats["evicted"] += 1
+        self._conn.commit()
+
+    def _record(self, outcome: str, kind: str, ticker: str, path: str):
+        with self._lock:
+            self.stats[outcome] += 1
+            self.history.append({"outcome": outcome, "kind": kind, "ticker": ticker, "path": path})
+        icon = "♻️ " if outcome == "reused" else "🎨"
+        print(f"{icon} [ARTIFACTS] {outcome.capitalize()} {kind or 'artifact'}: {path}")
+
+    def size_bytes(self) -> int:
+        if not self.enabled:
+            return 0
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+
+    def report(self) -> Dict[str, Any]:
+        """Reused vs regenerated artifacts in this process, plus the cache footprint"""
+        with self._lock:
+            return {
+                **self.stats,
+                "cache_bytes": self.size_bytes(),
+                "max_bytes": self.max_bytes,
+                "artifacts": list(self.history),
+            }
+
+    def summary(self) -> str:
+        return (f"Artifacts: {self.stats['reused']} reused, {self.stats['regenerated']} regenerated, "
+                f"{self.stats['evicted']} evicted ({self.size_bytes() / 1e6:.1f} MB cached)")
+
+    def clear(self):
+        """Delete every cached artifact"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM artifacts")
+            self._conn.commit()
+            for entry in os.listdir(self.cache_dir):
+                entry_path = os.path.join(self.cache_dir, entry)
+                if os.path.isdir(entry_path):
+                    shutil.rmtree(entry_path, ignore_errors=True)
+
+
+_caches: Dict[str, ArtifactCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_artifact_cache(config: Optional[Dict[str, Any]] = None) -> ArtifactCache:
+    """Process-wide artifact cache for the configured results directory"""
+    config = config or get_config()
+    enabled = config.get("artifact_cache", True)
+    directory = config.get("artifact_cache_dir") or os.path.join(config.get("results_dir", "./results"), ".artifact_cache")
+    path = os.path.abspath(directory)
+    max_bytes = int(config.get("artifact_cache_max_mb", 512) * 1024 * 1024)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None or cache.enabled != enabled:
+            cache = ArtifactCache(path, max_bytes=max_bytes, enabled=enabled)
+            _caches[path] = cache
+        cache.max_bytes = max_bytes
+        return cache
@@ -0,0 +1,173 @@
+"""
+Debate Context Manager
+Bounded prompt context for the researcher and risk debates: report digests, a capped
+rolling summary of earlier turns and the latest turn verbatim
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from tradingagents.dataflows.config import get_config
+
+
+# Default token budgets per debate node; override with config["debate_context"]
+DEFAULT_DEBATE_BUDGETS = {
+    "researcher": {"report_tokens": 600, "summary_tokens": 800, "last_turn_tokens": 1200},
+    "risk": {"report_tokens": 400, "summary_tokens": 800, "last_turn_tokens": 1000},
+}
+
+CHARS_PER_TOKEN = 4  # Rough average for English prose; good enough for budgeting
+SUMMARY_TURN_SHARE = 4  # Each folded turn may use at most 1/4 of the summary budget
+DIGEST_CACHE_SIZE = 256  # Digests kept (least recently used evicted first); a run needs about 8
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_digest_cache: "OrderedDict[str, str]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count without a tokenizer dependency"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def truncate_to_tokens(text: str, max_tokens: Optional[int]) -> str:
+    """Cut text to a token budget at a sentence boundary where possible"""
+    if not text or max_tokens is None or estimate_tokens(text) <= max_tokens:
+        return text or ""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    cut = text[:max_chars]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary > max_chars // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + " [...]"
+
+
+def _line_priority(line: str) -> int:
+    """Lower is more important: headings, then figures and recommendations, then bullets"""
+    stripped = line.strip()
+    if stripped.startswith("#"):
+        return 0
+    if re.search(r"\b(BUY|SELL|HOLD|recommend)", stripped, re.IGNORECASE):
+        return 1
+    if re.search(r"\d", stripped):
+        return 2
+    if stripped.startswith(("-", "*", "|")) or re.match(r"\d+\.", stripped):
+        return 3
+    return 4
+
+
+def digest_report(report: str, max_tokens: int) -> str:
+    """
+    Extractive digest of an analyst report that fits a token budget.
+
+    Keeps the lines that carry the most signal (headings, recommendations,
+    figures, bullets) in their original order. Digests are cached by content,
+    so every debate node after the first reuses the same pre-computed text.
+    """
+    if not report or estimate_tokens(report) <= max_tokens:
+        return report or ""
+
+    key = hashlib.sha1(f"{max_tokens}:{report}".encode("utf-8")).hexdigest()
+    with _digest_lock:
+        if key in _digest_cache:
+            _digest_cache.move_to_end(key)
+            return _digest_cache[key]
+
+    lines = [line for line in report.splitlines() if line.strip()]
+    ranked = sorted(range(len(lines)), key=lambda i: (_line_priority(lines[i]), i))
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    selected = []
+    for i in ranked:
+        cost = len(lines[i]) + 1
+        if cost > budget:
+            continue
+        selected.append(i)
+        budget -= cost
+
+    digest = "\n".join(lines[i] for i in sorted(selected))
+    if not digest:
+        digest = truncate_to_tokens(report, max_tokens)
+
+    with _digest_lock:
+        _digest_cache[key] = digest
+        while len(_digest_cache) > DIGEST_CACHE_SIZE:
+            _digest_cache.popitem(last=False)
+    return digest
+
+
+def summarize_turn(turn: str, max_tokens: int) -> str:
+    """Compress one debate turn to its speaker label and leading sentences"""
+    turn = " ".join(turn.split())
+    if estimate_tokens(turn) <= max_tokens:
+        return turn
+    kept = []
+    budget = max_tokens * CHARS_PER_TOKEN
+    for sentence in _SENTENCE_SPLIT.split(turn):
+        if len(sentence) + 1 > budget:
+            break
+        kept.append(sentence)
+        budget -= len(sentence) + 1
+    return " ".join(kept) if kept else truncate_to_tokens(turn, max_tokens)
+
+
+class DebateContextManager:
+    """
+    Builds bounded prompt context for one kind of debate node.
+
+    Prompts see pre-computed report digests, a rolling summary of every turn
+    except the latest, and the latest turn(s) verbatim. Each budget is fixed,
+    so a debate's total prompt tokens grow linearly with the number of rounds
+    instead of quadratically. The full history strings are still kept in the
+    debate state for the judges, reflection and logs.
+    """
+
+    def __init__(self, node_type: str, budgets: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            node_type: "researcher" or "risk"
+            budgets: Overrides for report_tokens, summary_tokens and last_turn_tokens
+        """
+        if node_type not in DEFAULT_DEBATE_BUDGETS:
+            raise ValueError(f"Unknown debate node type: {node_type}. Available: {list(DEFAULT_DEBATE_BUDGETS)}")
+        self.node_type = node_type
+        self._budgets = budgets
+
+    @property
+    def budgets(self) -> Dict[str, int]:
+        # Resolved lazily so config set after graph construction still applies
+        budgets = dict(DEFAULT_DEBATE_BUDGETS[self.node_type])
+        budgets.update(get_config().get("debate_context", {}).get(self.node_type, {}))
+        if self._budgets:
+            budgets.update(self._budgets)
+        return budgets
+
+    def report_digests(self, state: Dict) -> Dict[str, str]:
+        """Digests of the four analyst reports the debaters argue from"""
+        max_tokens = self.budgets["report_tokens"]
+        return {
+            name: digest_report(state.get(name, ""), max_tokens)
+            for name in ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+        }
+
+    def last_turn(self, turn: str) -> str:
+        """Latest turn verbatim, capped by the last-turn budget"""
+        return truncate_to_tokens(turn, self.budgets["last_turn_tokens"])
+
+    def fold_turn(self, summary: str, turn: str) -> str:
+        """
+        Add a turn that is no longer the latest to the rolling summary.
+
+        The summary is capped at summary_tokens by dropping the oldest entries.
+        """
+        if not turn:
+            return summary or ""
+        max_tokens = self.budgets["summary_tokens"]
+        entries = [entry for entry in (summary or "").split("\n") if entry]
+        entries.append(summarize_turn(turn, max(1, max_tokens // SUMMARY_TURN_SHARE)))
+        while len(entries) > 1 and estimate_tokens("\n".join(entries)) > max_tokens:
+            entries.pop(0)
+        return "\n".join(entries)
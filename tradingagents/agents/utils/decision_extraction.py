@@ -0,0 +1,107 @@
+"""
+Decision Extraction
+Shared, precompiled parsers for BUY/SELL/HOLD decisions and confidence scores in agent output
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Pattern
+
+
+DECISIONS = ("BUY", "SELL", "HOLD")
+
+# Action vocabulary used across the prompts, mapped onto the three core decisions
+ACTION_ALIASES = {
+    "STRONG BUY": "BUY",
+    "BUY": "BUY",
+    "ACCUMULATE": "BUY",
+    "ACCUMULATE GRADUALLY": "BUY",
+    "ACCUMULATE_GRADUALLY": "BUY",
+    "STRONG SELL": "SELL",
+    "SELL": "SELL",
+    "REDUCE": "SELL",
+    "REDUCE GRADUALLY": "SELL",
+    "REDUCE_GRADUALLY": "SELL",
+    "HOLD": "HOLD",
+    "AVOID": "HOLD",
+}
+
+_ACTION = r"(STRONG[ _]BUY|STRONG[ _]SELL|ACCUMULATE(?:[ _]GRADUALLY)?|REDUCE(?:[ _]GRADUALLY)?|BUY|SELL|HOLD|AVOID)"
+
+# Structured markers the prompts ask for; the last marker in the text wins
+FINAL_MARKER = re.compile(
+    r"FINAL\s+(?:TRANSACTION\s+PROPOSAL|INSTITUTIONAL\s+DECISION|TRADE\s+DECISION|DECISION|RECOMMENDATION)"
+    r"\s*:?\s*[*_`'\"\[\s]*" + _ACTION + r"\b",
+    re.IGNORECASE,
+)
+RECOMMENDATION_MARKER = re.compile(
+    r"(?:PRIMARY\s+RECOMMENDATION|RECOMMENDATION|OVERALL\s+POSITION|DECISION)"
+    r"\s*\**\s*:\s*[*_`'\"\[\s]*" + _ACTION + r"\b",
+    re.IGNORECASE,
+)
+# "BUY/HOLD/SELL" or "BUY | SELL" after a marker is the prompt template echoed back, not a decision
+_ALTERNATIVES = re.compile(r"[\s*_`'\"\]]*[/|]")
+# A bare decision is only trusted as the whole last line of the text (e.g. "**SELL**")
+_FINAL_LINE = re.compile(r"^[\s*_#>`'\"]*(BUY|SELL|HOLD)[\s*_`'\".!]*$")
+
+
+@dataclass
+class ExtractedDecision:
+    """Result of deterministic decision extraction"""
+    decision: Optional[str]  # BUY, SELL or HOLD; None when the text is ambiguous
+    method: str  # "final_marker", "recommendation_marker", "final_line" or "ambiguous"
+    action: Optional[str] = None  # Raw action text that matched (e.g. "ACCUMULATE")
+
+
+def normalize_decision(action: str) -> Optional[str]:
+    """Map an action word (ACCUMULATE, STRONG SELL, ...) to BUY, SELL or HOLD"""
+    if not action:
+        return None
+    key = " ".join(action.upper().replace("_", " ").split())
+    return ACTION_ALIASES.get(key)
+
+
+def extract_decision(text: str) -> ExtractedDecision:
+    """
+    Extract the decision from agent output without an LLM call
+
+    Takes the last FINAL ... or labelled recommendation marker in the text, so a
+    report that quotes an earlier proposal and then concludes differently yields
+    its conclusion. A marker listing several actions (the echoed prompt template)
+    is ambiguous. Without markers, a bare BUY/SELL/HOLD is accepted only as the
+    whole last line; anything else is left to the LLM fallback.
+    """
+    if not text:
+        return ExtractedDecision(None, "ambiguous")
+
+    markers = [
+        (match, method)
+        for pattern, method in ((FINAL_MARKER, "final_marker"), (RECOMMENDATION_MARKER, "recommendation_marker"))
+        for match in pattern.finditer(text)
+    ]
+    if markers:
+        # "FINAL DECISION: BUY" also matches the recommendation pattern; prefer the final marker on a tie
+        match, method = max(markers, key=lambda item: (item[0].end(1), item[1] == "final_marker"))
+        action = match.group(1).upper()
+        if _ALTERNATIVES.match(text, match.end()):
+            return ExtractedDecision(None, "ambiguous", action)
+        return ExtractedDecision(normalize_decision(action), method, action)
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    final_line = _FINAL_LINE.match(lines[-1]) if lines else None
+    if final_line:
+        return ExtractedDecision(final_line.group(1), "final_line", final_line.group(1))
+
+    return ExtractedDecision(None, "ambiguous")
+
+
+@lru_cache(maxsize=None)
+def _score_pattern(label: str) -> Pattern:
+    return re.compile(re.escape(label) + r":.*?(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def extract_score(text: str, label: str, default: float = 0.7, scale: float = 10.0) -> float:
+    """Extract a '<label>: N' score (e.g. 'CONVICTION LEVEL: 8/10') as N / scale"""
+    match = _score_pattern(label).search(text or "")
+    return float(match.group(1)) / scale if match else default
@@ -1,21 +1,172 @@
-import chromadb
-from chromadb.config import Settings
+import hashlib
 import os
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Optional
 
-class FinancialSituationMemory:
-    def __init__(self, name, config):
-        """Initialize memory with support for multiple embedding providers"""
+import numpy as np
+
+from tradingagents.dataflows.transport import get_transport
+
+
+class EmbeddingUnavailableError(RuntimeError):
+    """The embedding provider failed after retries and the index cannot fall back to local vectors"""
+
+
+class HashingEmbedder:
+    """
+    Local, network-free embedder: L2-normalized feature hashing of word unigrams and bigrams.
+
+    Uses a stable hash (crc32) so vectors are identical across processes and survive restarts.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.model_name = f"local-hashing-{dim}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = re.findall(r"[a-z0-9]+(?:\.[0-9]+)?", text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+            vectors[row] = np.sign(vectors[row]) * np.log1p(np.abs(vectors[row]))
+            norm = np.linalg.norm(vectors[row])
+            if norm > 0:
+                vectors[row] /= norm
+        return vectors.tolist()
+
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by (embedding model, content hash)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._memory: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings "
+                    "(model TEXT, hash TEXT, vector BLOB, PRIMARY KEY (model, hash))"
+                )
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        with self._lock:
+            found = {h: self._memory[(model, h)] for h in hashes if (model, h) in self._memory}
+            missing = [h for h in hashes if h not in found]
+            if missing and self.path:
+                with self._connect() as conn:
+                    for start in range(0, len(missing), 500):
+                        batch = missing[start:start + 500]
+                        rows = conn.execute(
+                            f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                            [model] + batch,
+                        ).fetchall()
+                        for h, blob in rows:
+                            vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                            self._memory[(model, h)] = vector
+                            found[h] = vector
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]):
+        with self._lock:
+            for h, vector in items.items():
+                self._memory[(model, h)] = vector
+            if self.path and items:
+                with self._connect() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+                        [(model, h, np.asarray(v, dtype=np.float32).tobytes()) for h, v in items.items()],
+                    )
+
+
+SITUATION_REPORTS = ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+
+
+def situation_text(state) -> str:
+    """
+    Canonical market situation used to store and look up memories.
+
+    Every role (and the reflector) uses this exact text, so one propagate
+    embeds it once and all later lookups hit the embedding cache.
+    """
+    return "\n\n".join(state.get(name, "") or "" for name in SITUATION_REPORTS)
+
+
+class SharedMemoryIndex:
+    """
+    One vector index shared by all agent memories; each record carries a role tag.
+
+    Chroma persists the records; an in-memory, L2-normalized mirror of the
+    vectors answers queries with a single matrix product, so a top-k search for
+    every role costs one embedding (usually a cache hit) and one dot product.
+
+    Remote embedding requests are retried under the shared transport policy. If the
+    provider still fails, the index switches to local embeddings only while its
+    collection has never held remote vectors; afterwards a failure only affects that
+    request (the search finds no matches, added records wait for the next add).
+    """
+
+    def __init__(self, config, collection_name: str = "agent_memory"):
+        """
+        Args:
+            config: Configuration dictionary (llm_provider, embedding_provider, memory_dir, ...)
+            collection_name: Base name of the Chroma collection
+        """
         self.config = config
+        self.collection_name = collection_name
         self.provider = config.get("llm_provider", "openai")
+        self.embedding_provider = config.get("embedding_provider", "auto")
 
         # Initialize embedding client based on provider
-        if self.provider == "watsonx":
+        if self.embedding_provider == "local":
+            self._init_local_embeddings()
+        elif self.provider == "watsonx" or self.embedding_provider == "watsonx":
             self._init_watsonx_embeddings()
         else:
             self._init_openai_embeddings()
 
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+        # Imported here: chromadb is slow to import and only needed once a graph is built
+        import chromadb
+        from chromadb.config import Settings
+
+        memory_dir = config.get("memory_dir")
+        if memory_dir and config.get("persist_memory", True):
+            # Reflections and embeddings survive restarts
+            self.chroma_client = chromadb.PersistentClient(
+                path=os.path.join(memory_dir, "chroma"), settings=Settings(allow_reset=True, anonymized_telemetry=False)
+            )
+            self.embedding_cache = EmbeddingCache(os.path.join(memory_dir, "embedding_cache.sqlite"))
+        else:
+            self.chroma_client = chromadb.Client(Settings(allow_reset=True, anonymized_telemetry=False))
+            self.embedding_cache = EmbeddingCache()
+
+        self._lock = threading.RLock()
+        self._remote_ok = False  # A remote embedding request succeeded in this process
+        self._pending = []  # Records whose embedding failed, retried on the next add
+        self._open_collection()
+
+    def _open_collection(self):
+        """One collection per embedding model, since vectors of different models are not comparable"""
+        model_slug = re.sub(r"[^a-zA-Z0-9_-]+", "_", self.embedding_model)
+        self.collection = self.chroma_client.get_or_create_collection(
+            name=f"{self.collection_name}-{model_slug}"[:63],
+            metadata={"hnsw:space": "cosine", "embedding_model": self.embedding_model},
+        )
+        self._mirror = None
 
     def _init_watsonx_embeddings(self):
         """Initialize WatsonX embeddings"""
@@ -29,7 +180,7 @@ class FinancialSituationMemory:
                 apikey=self.config.get("watsonx_api_key", os.getenv("WATSONX_APIKEY")),
                 project_id=self.config.get("watsonx_project_id", os.getenv("WATSONX_PROJECT_ID")),
             )
-            self.use_langchain_embeddings = True
+            self.embedding_backend = "watsonx"
             print(f"[Memory] Using WatsonX embeddings: {self.embedding_model}")
         except ImportError:
             print("[Memory] WatsonX embeddings not available, falling back to OpenAI")
@@ -40,86 +191,232 @@ class FinancialSituationMemory:
 
     def _init_openai_embeddings(self):
         """Initialize OpenAI embeddings"""
-        from openai import OpenAI
+        try:
+            from openai import OpenAI
 
-        if self.config.get("backend_url") == "http://localhost:11434/v1":
-            self.embedding_model = "nomic-embed-text"
-        else:
-            self.embedding_model = "text-embedding-3-small"
+            if self.config.get("backend_url") == "http://localhost:11434/v1":
+                self.embedding_model = "nomic-embed-text"
+            else:
+                self.embedding_model = "text-embedding-3-small"
 
-        self.client = OpenAI(base_url=self.config.get("backend_url"))
-        self.use_langchain_embeddings = False
-        print(f"[Memory] Using OpenAI embeddings: {self.embedding_model}")
+            # Retried by the shared transport policy; the SDK's own retries are off
+            self.client = OpenAI(base_url=self.config.get("backend_url"), max_retries=0)
+            self.embedding_backend = "openai"
+            print(f"[Memory] Using OpenAI embeddings: {self.embedding_model}")
+        except Exception as e:
+            print(f"[Memory] OpenAI embeddings initialization failed: {e}, falling back to local embeddings")
+            self._init_local_embeddings()
 
-    def get_embedding(self, text):
-        """Get embedding for text using configured provider"""
-        if self.use_langchain_embeddings:
-            # Use LangChain embeddings (WatsonX)
+    def _init_local_embeddings(self):
+        """Initialize the local hashing embedder (no network access)"""
+        self.embeddings = HashingEmbedder()
+        self.embedding_model = self.embeddings.model_name
+        self.embedding_backend = "local"
+        print(f"[Memory] Using local embeddings: {self.embedding_model}")
+
+    def _embed_remote(self, texts):
+        """Embed a batch of texts with the configured provider in a single (retried) request"""
+        if self.embedding_backend == "local":
+            return self.embeddings.embed(texts)
+        if self.embedding_backend == "watsonx":
             # Truncate text to avoid exceeding token limit (512 tokens ≈ 384 chars conservatively)
             # Using 350 chars to have safe margin for the +2 start/end tokens
             max_chars = 350
-            if len(text) > max_chars:
-                original_len = len(text)
-                text = text[:max_chars]
-                print(f"[Memory] Truncated text from {original_len} to {max_chars} characters for embedding")
-
-            return self.embeddings.embed_query(text)
-        else:
-            # Use OpenAI embeddings
-            response = self.client.embeddings.create(
-                model=self.embedding_model, input=text
+            return get_transport(self.config).call(
+                lambda: self.embeddings.embed_documents([text[:max_chars] for text in texts]),
+                service="llm:embeddings",
             )
-            return response.data[0].embedding
+        # OpenAI embedding models accept ~8k tokens per input
+        response = get_transport(self.config).call(
+            lambda: self.client.embeddings.create(model=self.embedding_model, input=[text[:24000] for text in texts]),
+            service="llm:embeddings",
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    def get_embeddings(self, texts):
+        """Get embeddings for several texts, serving repeats from the content-hash cache and batching the rest"""
+        hashes = [EmbeddingCache.content_hash(text) for text in texts]
+        found = self.embedding_cache.get_many(self.embedding_model, list(set(hashes)))
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+        missing = {}
+        for text, h in zip(texts, hashes):
+            if h not in found:
+                missing.setdefault(h, text)
 
-        offset = self.situation_collection.count()
+        if missing:
+            try:
+                vectors = self._embed_remote(list(missing.values()))
+            except Exception as e:
+                if self.embedding_backend == "local":
+                    raise
+                # Local vectors are not comparable with remote ones: only switch while none are stored
+                if self._remote_ok or self.count() > 0:
+                    raise EmbeddingUnavailableError(f"{self.embedding_backend} embedding request failed: {e}") from e
+                print(f"[Memory] {self.embedding_backend} embedding request failed: {e}, switching to local embeddings")
+                with self._lock:
+                    self._init_local_embeddings()
+                    self._open_collection()
+                return self.get_embeddings(texts)
+            if self.embedding_backend != "local":
+                self._remote_ok = True
+            new_vectors = dict(zip(missing.keys(), vectors))
+            self.embedding_cache.put_many(self.embedding_model, new_vectors)
+            found.update(new_vectors)
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        return [found[h] for h in hashes]
 
-        self.situation_collection.add(
-            documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
-            ids=ids,
-        )
+    def _load_mirror(self):
+        if self._mirror is None:
+            records = self.collection.get(include=["embeddings", "documents", "metadatas"])
+            vectors = np.asarray(records["embeddings"], dtype=np.float32)
+            if not len(records["ids"]):
+                vectors = np.zeros((0, 0), dtype=np.float32)
+            self._mirror = {
+                "ids": list(records["ids"]),
+                "documents": list(records["documents"]),
+                "recommendations": [m.get("recommendation", "") for m in records["metadatas"]],
+                "roles": np.array([m.get("role", "") for m in records["metadatas"]], dtype=object),
+                "vectors": self._normalize(vectors),
+            }
+        return self._mirror
 
-    def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
-        query_embedding = self.get_embedding(current_situation)
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
 
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
-        )
+    def count(self, role: Optional[str] = None) -> int:
+        with self._lock:
+            mirror = self._load_mirror()
+            return len(mirror["ids"]) if role is None else int((mirror["roles"] == role).sum())
 
-        matched_results = []
-        for i in range(len(results["documents"][0])):
-            matched_results.append(
-                {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
-                }
-            )
+    def add(self, role: str, situations_and_advice):
+        """Add (situation, recommendation) records under a role tag"""
+        self.add_many([(role, situation, rec) for situation, rec in situations_and_advice])
+
+    def add_many(self, records):
+        """Add (role, situation, recommendation) records for any roles with one batched embedding call"""
+        with self._lock:
+            records = self._pending + list(records)
+            self._pending = []
+        if not records:
+            return
+
+        # Embed first: a provider fallback switches the collection
+        try:
+            embeddings = self.get_embeddings([situation for _, situation, _ in records])
+        except EmbeddingUnavailableError as e:
+            print(f"[Memory] {e}; keeping {len(records)} records for the next add")
+            with self._lock:
+                self._pending = records + self._pending
+            return
+
+        with self._lock:
+            mirror = self._load_mirror()
+            known = set(mirror["ids"])
+            ids, documents, metadatas, vectors = [], [], [], []
+            for (role, situation, rec), vector in zip(records, embeddings):
+                # Content-derived ids make re-adding the same reflection a no-op
+                record_id = hashlib.sha1(f"{role}\0{situation}\0{rec}".encode("utf-8")).hexdigest()
+                if record_id in known:
+                    continue
+                known.add(record_id)
+                ids.append(record_id)
+                documents.append(situation)
+                metadatas.append({"role": role, "recommendation": rec})
+                vectors.append(vector)
+
+            if not ids:
+                return
+            self.collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=vectors)
+
+            mirror["ids"].extend(ids)
+            mirror["documents"].extend(documents)
+            mirror["recommendations"].extend(m["recommendation"] for m in metadatas)
+            mirror["roles"] = np.concatenate([mirror["roles"], np.array([m["role"] for m in metadatas], dtype=object)])
+            new_vectors = self._normalize(np.asarray(vectors, dtype=np.float32))
+            mirror["vectors"] = new_vectors if not len(mirror["vectors"]) else np.vstack([mirror["vectors"], new_vectors])
+
+    def search(self, situation: str, n_matches: int = 1, roles: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Top-k matches for every role in one call
 
-        return matched_results
+        Args:
+            situation: Current market situation text
+            n_matches: Matches to return per role
+            roles: Roles to search (default: every role in the index)
+
+        Returns:
+            Dict of role -> list of {matched_situation, recommendation, similarity_score}
+        """
+        try:
+            query = self._normalize(np.asarray([self.get_embedding(situation)], dtype=np.float32))[0]
+        except EmbeddingUnavailableError as e:
+            print(f"[Memory] {e}; no memories retrieved")
+            with self._lock:
+                return {role: [] for role in (roles if roles is not None else sorted(set(self._load_mirror()["roles"])))}
+
+        with self._lock:
+            mirror = self._load_mirror()
+            if roles is None:
+                roles = sorted(set(mirror["roles"]))
+            results = {role: [] for role in roles}
+            if not len(mirror["ids"]):
+                return results
+
+            similarities = mirror["vectors"] @ query
+            for role in roles:
+                candidates = np.flatnonzero(mirror["roles"] == role)
+                if not len(candidates):
+                    continue
+                k = min(n_matches, len(candidates))
+                top = candidates[np.argpartition(-similarities[candidates], k - 1)[:k]]
+                top = top[np.argsort(-similarities[top])]
+                results[role] = [
+                    {
+                        "matched_situation": mirror["documents"][i],
+                        "recommendation": mirror["recommendations"][i],
+                        "similarity_score": float(similarities[i]),
+                    }
+                    for i in top
+                ]
+        return results
+
+    def get_embedding(self, text):
+        """Get embedding for text using configured provider"""
+        return self.get_embeddings([text])[0]
+
+
+class FinancialSituationMemory:
+    def __init__(self, name, config, index: Optional[SharedMemoryIndex] = None):
+        """
+        Role-scoped view of a memory index
+
+        Args:
+            name: Role tag for this memory (e.g. "bull_memory")
+            config: Configuration dictionary
+            index: Shared index; a private one is created when omitted
+        """
+        self.name = name
+        self.config = config
+        self.index = index or SharedMemoryIndex(config, collection_name=name)
+
+    def get_embedding(self, text):
+        """Get embedding for text using configured provider"""
+        return self.index.get_embedding(text)
+
+    def add_situations(self, situations_and_advice):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        self.index.add(self.name, situations_and_advice)
+
+    def get_memories(self, current_situation, n_matches=1):
+        """Find matching recommendations by embedding similarity"""
+        return self.index.search(current_situation, n_matches=n_matches, roles=[self.name])[self.name]
 
 
 if __name__ == "__main__":
     # Example usage
-    matcher = FinancialSituationMemory()
+    matcher = FinancialSituationMemory("example_memory", {"embedding_provider": "local"})
 
     # Example data
     example_data = [
@@ -9,6 +9,7 @@ from docx.shared import Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.style import WD_STYLE_TYPE
 import matplotlib.pyplot as plt
+from tradingagents.agents.utils.artifact_cache import data_fingerprint, get_artifact_cache
 from datetime import datetime
 import base64
 from io import BytesIO
@@ -173,10 +174,38 @@ def generate_comprehensive_word_report(
     return str(doc_path)
 
 
+# 汇总图表的输出设置，也是产物缓存键的一部分
+SUMMARY_CHART_PROFILE = {"figsize": (16, 12), "dpi": 300, "format": "png"}
+
+
 def create_enhanced_summary_chart(df, ticker, current_date, save_path=None):
-    """创建增强的汇总图表，包含更多指标"""
+    """创建增强的汇总图表，包含更多指标（数据未变化时复用产物缓存中的图表）"""
+    
+    if save_path:
+        chart_path = save_path
+    else:
+        results_dir = Path(f"results/{ticker}/{current_date}")
+        results_dir.mkdir(parents=True, exist_ok=True)
+        chart_path = results_dir / f"{ticker}_enhanced_summary_{current_date}.png"
+    
+    cache = get_artifact_cache()
+    cache_key = cache.artifact_key(
+        "enhanced_summary_chart", ticker, data_fingerprint(df), SUMMARY_CHART_PROFILE, date=str(current_date)
+    )
+    cache.get_or_render(
+        cache_key,
+        chart_path,
+        lambda: _render_enhanced_summary_chart(df, ticker, current_date, chart_path),
+        "enhanced_summary_chart",
+        ticker,
+    )
+    return save_path if save_path else str(chart_path)
+
+
+def _render_enhanced_summary_chart(df, ticker, current_date, chart_path):
+    """绘制汇总图表并保存到 chart_path"""
     
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=SUMMARY_CHART_PROFILE["figsize"])
     fig.suptitle(f'{ticker} - 综合分析汇总 - {current_date}', fontsize=16, fontweight='bold')
     
     # 图1: 价格和移动平均线 (包含150日和200日)
@@ -235,14 +264,6 @@ def create_enhanced_summary_chart(df, ticker, current_date, save_path=None):
     plt.tight_layout()
     
     # 保存图表
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        return save_path
-    else:
-        results_dir = Path(f"results/{ticker}/{current_date}")
-        results_dir.mkdir(parents=True, exist_ok=True)
-        chart_path = results_dir / f"{ticker}_enhanced_summary_{current_date}.png"
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        return str(chart_path)
+    plt.savefig(chart_path, dpi=SUMMARY_CHART_PROFILE["dpi"], bbox_inches='tight')
+    plt.close(fig)
+    return chart_path
@@ -0,0 +1,309 @@
+"""
+Report Store
+Content-addressed store for the large values of the agent state
+
+Analyst reports, debate histories, plans and optimization results grow with every
+node, and LangGraph copies, checkpoints and (with stream_mode="values") re-emits the
+whole state after each step. With state offloading on, graph nodes write those values
+here and the state only carries short references ("@report:<sha256>"); a node gets the
+full values back just for the duration of its call.
+
+Values are stored once per content under <data_cache_dir>/report_store, compressed.
+Recently used values are kept in a memory cache bounded by size; files not written for
+report_store_max_age_days are removed when the store is opened, except values still
+referenced by checkpoints of unfinished runs.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from tradingagents.agents.utils.agent_states import OFFLOADED_DEBATE_FIELDS, OFFLOADED_FIELDS
+from tradingagents.dataflows.config import get_config
+
+
+REF_PREFIX = "@report:"
+_REF_LENGTH = len(REF_PREFIX) + 64
+# A reference inside serialized checkpoint data
+_REF_PATTERN = re.compile(re.escape(REF_PREFIX.encode("ascii")) + rb"([0-9a-f]{64})")
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, str) and len(value) == _REF_LENGTH and value.startswith(REF_PREFIX)
+
+
+class ReportStore:
+    """
+    Content-addressed value store with a size-bounded memory cache.
+
+    Safe to share between threads; several processes may use the same directory
+    (a value's file name is its hash and files are written atomically).
+    """
+
+    def __init__(self, store_dir: str, cache_bytes: int = 32 * 1024 * 1024, max_age_days: Optional[float] = 7,
+                 keep: Iterable[str] = ()):
+        """
+        Args:
+            store_dir: Directory holding the stored values
+            cache_bytes: Size bound (serialized bytes) for values kept in memory
+            max_age_days: Files not written for this long are removed on open; None keeps everything
+            keep: Keys never removed by that pruning (values referenced by unfinished runs)
+        """
+        self.store_dir = os.path.abspath(store_dir)
+        self.cache_bytes = cache_bytes
+        self.stats = {"stored": 0, "deduplicated": 0, "loaded": 0, "cache_hits": 0}
+        self._serde = JsonPlusSerializer(pickle_fallback=True)
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, size)
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.store_dir, exist_ok=True)
+        if max_age_days is not None:
+            self.prune(max_age_days, keep)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.store_dir, key[:2], key)
+
+    def _remember(self, key: str, value: Any, size: int):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return
+            self._cache[key] = (value, size)
+            self._cached_bytes += size
+            while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, (_, evicted_size) = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted_size
+
+    def serialize(self, value: Any) -> bytes:
+        if isinstance(value, str):
+            return b"str\0" + value.encode("utf-8")
+        type_name, blob = self._serde.dumps_typed(value)
+        return type_name.encode("utf-8") + b"\0" + blob
+
+    def _deserialize(self, payload: bytes) -> Any:
+        type_name, blob = payload.split(b"\0", 1)
+        if type_name == b"str":
+            return blob.decode("utf-8")
+        return self._serde.loads_typed((type_name.decode("utf-8"), blob))
+
+    def put(self, value: Any, payload: Optional[bytes] = None) -> str:
+        """Store a value and return its reference"""
+        payload = payload if payload is not None else self.serialize(value)
+        key = hashlib.sha256(payload).hexdigest()
+        path = self._path(key)
+        if os.path.exists(path):
+            # Refresh the age so pruning keeps values that are still in use
+            os.utime(path)
+            self.stats["deduplicated"] += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(payload, 1))
+            os.replace(tmp_path, path)
+            self.stats["stored"] += 1
+        self._remember(key, value, len(payload))
+        return REF_PREFIX + key
+
+    def get(self, ref: str) -> Any:
+        """The value behind a reference (KeyError if it is not in the store)"""
+        key = ref[len(REF_PREFIX):]
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return cached[0]
+        try:
+            with open(self._path(key), "rb") as f:
+                payload = zlib.decompress(f.read())
+        except FileNotFoundError:
+            raise KeyError(f"{ref} is not in the report store {self.store_dir}") from None
+        value = self._deserialize(payload)
+        self.stats["loaded"] += 1
+        self._remember(key, value, len(payload))
+        return value
+
+    def has(self, ref: str) -> bool:
+        key = ref[len(REF_PREFIX):]
+        with self._lock:
+            if key in self._cache:
+                return True
+        return os.path.exists(self._path(key))
+
+    def prune(self, max_age_days: float, keep: Iterable[str] = ()) -> int:
+        """Remove values not written for max_age_days, except the keys in keep; returns the number removed"""
+        cutoff = time.time() - max_age_days * 86400
+        keep = set(keep)
+        removed = 0
+        for root, _, files in os.walk(self.store_dir):
+            for name in files:
+                if name in keep:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    # ------------------------------------------------------------------
+    # State helpers
+    # ------------------------------------------------------------------
+
+    def offload_update(self, update: Dict[str, Any], min_chars: int = 2000) -> Dict[str, Any]:
+        """Replace the large offloadable values of a node's state update with references"""
+        if not isinstance(update, dict):
+            return update
+        result = None
+        for key, value in update.items():
+            if key in OFFLOADED_FIELDS:
+                new_value = self._offload_value(value, min_chars)
+            elif key in OFFLOADED_DEBATE_FIELDS and isinstance(value, dict):
+                new_value = self._offload_fields(value, OFFLOADED_DEBATE_FIELDS[key], min_chars)
+            else:
+                continue
+            if new_value is not value:
+                result = result if result is not None else dict(update)
+                result[key] = new_value
+        return result if result is not None else update
+
+    def _offload_value(self, value: Any, min_chars: int) -> Any:
+        if value is None or is_ref(value):
+            return value
+        if isinstance(value, str):
+            # Cheap length check before encoding; bytes can only exceed characters
+            return self.put(value) if len(value) >= min_chars else value
+        if not value:
+            return value
+        payload = self.serialize(value)
+        return self.put(value, payload) if len(payload) >= min_chars else value
+
+    def _offload_fields(self, value: Dict[str, Any], fields, min_chars: int) -> Dict[str, Any]:
+        result = None
+        for field in fields:
+            if field not in value:
+                continue
+            new_value = self._offload_value(value[field], min_chars)
+            if new_value is not value[field]:
+                result = result if result is not None else dict(value)
+                result[field] = new_value
+        return result if result is not None else value
+
+    def missing_refs(self, state: Dict[str, Any]) -> List[str]:
+        """References in state whose values are no longer in the store"""
+        return [ref for ref in state_refs(state) if not self.has(ref)]
+
+    def hydrate(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of state (or a state update) with every reference replaced by its value"""
+        if not isinstance(state, dict):
+            return state
+        result = None
+        for key in OFFLOADED_FIELDS:
+            if is_ref(state.get(key)):
+                result = result if result is not None else dict(state)
+                result[key] = self.get(state[key])
+        for key, fields in OFFLOADED_DEBATE_FIELDS.items():
+            nested = state.get(key)
+            if not isinstance(nested, dict) or not any(is_ref(nested.get(field)) for field in fields):
+                continue
+            result = result if result is not None else dict(state)
+            result[key] = {
+                name: self.get(value) if name in fields and is_ref(value) else value
+                for name, value in nested.items()
+            }
+        return result if result is not None else state
+
+    def summary(self) -> str:
+        return (f"Report store: {self.stats['stored']} stored, {self.stats['deduplicated']} deduplicated, "
+                f"{self.stats['loaded']} loaded from disk, {self.stats['cache_hits']} cache hits "
+                f"({self._cached_bytes / 1e6:.1f} MB in memory)")
+
+
+def state_refs(state: Dict[str, Any]) -> Iterator[str]:
+    """Report store references held by a state (or a state update)"""
+    if not isinstance(state, dict):
+        return
+    for key in OFFLOADED_FIELDS:
+        if is_ref(state.get(key)):
+            yield state[key]
+    for key, fields in OFFLOADED_DEBATE_FIELDS.items():
+        nested = state.get(key)
+        if isinstance(nested, dict):
+            for field in fields:
+                if is_ref(nested.get(field)):
+                    yield nested[field]
+
+
+def checkpoint_refs(config: Dict[str, Any]) -> Optional[Set[str]]:
+    """Keys of stored values referenced by the checkpoints of unfinished runs (None if unreadable)"""
+    if not config.get("checkpointing", True):
+        return set()
+    # Imported here: the graph package imports this module
+    from tradingagents.graph.checkpointing import get_checkpointer
+
+    try:
+        return get_checkpointer(config).find_references(_REF_PATTERN)
+    except Exception as e:
+        print(f"WARNING: Could not read checkpoint references, skipping report store pruning: {e}")
+        return None
+
+
+_stores: Dict[str, ReportStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_report_store(config: Optional[Dict[str, Any]] = None) -> ReportStore:
+    """Process-wide report store for the configured directory"""
+    config = config or get_config()
+    directory = config.get("report_store_dir") or os.path.join(config["data_cache_dir"], "report_store")
+    path = os.path.abspath(directory)
+    cache_bytes = int(config.get("report_store_cache_mb", 32) * 1024 * 1024)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            max_age_days = config.get("report_store_max_age_days", 7)
+            keep = checkpoint_refs(config) if max_age_days is not None else set()
+            if keep is None:
+                # Unknown which values unfinished runs still need: prune nothing this time
+                max_age_days = None
+            store = ReportStore(path, cache_bytes=cache_bytes, max_age_days=max_age_days, keep=keep or ())
+            _stores[path] = store
+        store.cache_bytes = cache_bytes
+        return store
+
+
+def hydrate_state(state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """State (or a streamed state update) with offloaded values resolved; unchanged if it has no references"""
+    if not isinstance(state, dict):
+        return state
+    has_refs = next(state_refs(state), None) is not None
+    return get_report_store(config).hydrate(state) if has_refs else state
+
+
+def offloaded_node(node: Callable, min_chars: Optional[int] = None) -> Callable:
+    """
+    Wrap a graph node so it sees the full state and its large outputs go to the report store
+
+    Args:
+        node: Graph node taking the state
+        min_chars: Values shorter than this stay in the state (default: config["state_offload_min_chars"])
+    """
+
+    def offloaded(state):
+        config = get_config()
+        store = get_report_store(config)
+        threshold = min_chars if min_chars is not None else config.get("state_offload_min_chars", 2000)
+        return store.offload_update(node(store.hydrate(state)), threshold)
+
+    offloaded.__name__ = getattr(node, "__name__", "node")
+    return offloaded
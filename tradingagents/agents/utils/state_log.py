@@ -0,0 +1,208 @@
+"""
+State Log
+Append-only log of the final agent state, one record per (ticker, trade date)
+
+Each propagate appends a single compact record to
+<state_log_dir>/<TICKER>/TradingAgentsStrategy_logs/states.jsonl.gz (one gzip member
+per record, or plain JSON lines with state_log_compress off) and one line to
+states.index.jsonl giving the record's offset and length. A backtest over N dates
+therefore writes N records once instead of rewriting every earlier date on each run,
+and a reader fetches one date by seeking straight to it. Rerunning a date appends a
+new record; the index resolves the date to the latest one.
+
+Dates logged by earlier versions in full_states_log_<date>.json are still readable.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from tradingagents.dataflows.config import get_config
+
+
+DATA_FILE = "states.jsonl"
+INDEX_FILE = "states.index.jsonl"
+
+# Final state fields kept in the log besides the debate states
+_LOGGED_FIELDS = (
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "quantitative_report",
+    "portfolio_report",
+    "comprehensive_quantitative_report",
+    "enterprise_strategy_report",
+    "visualizer_report",
+    "optimization_results",
+    "investment_plan",
+    "final_trade_decision",
+    "document_path",
+)
+_INVEST_DEBATE_FIELDS = ("bull_history", "bear_history", "history", "current_response", "judge_decision")
+_RISK_DEBATE_FIELDS = ("risky_history", "safe_history", "neutral_history", "history", "judge_decision")
+
+
+def state_record(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """The logged subset of a final state (same layout as the old full_states_log files)"""
+    invest_debate = final_state.get("investment_debate_state") or {}
+    risk_debate = final_state.get("risk_debate_state") or {}
+    record = {
+        "company_of_interest": final_state["company_of_interest"],
+        "trade_date": str(final_state["trade_date"]),
+    }
+    for field in _LOGGED_FIELDS:
+        if field in final_state:
+            record[field] = final_state[field]
+    record["investment_debate_state"] = {field: invest_debate.get(field, "") for field in _INVEST_DEBATE_FIELDS}
+    record["trader_investment_decision"] = final_state.get("trader_investment_plan", "")
+    record["risk_debate_state"] = {field: risk_debate.get(field, "") for field in _RISK_DEBATE_FIELDS}
+    return record
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):  # numpy arrays and scalars
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class StateLog:
+    """
+    Append-only state records for one ticker with an offset index.
+
+    Safe to share between threads. One process should write a ticker's log at a time;
+    any number may read it.
+    """
+
+    def __init__(self, directory: str, compress: bool = True):
+        """
+        Args:
+            directory: The ticker's log directory (.../<TICKER>/TradingAgentsStrategy_logs)
+            compress: Write each record as its own gzip member
+        """
+        self.directory = os.path.abspath(directory)
+        self.compress = compress
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._index_size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _data_file(self, compressed: bool) -> str:
+        return DATA_FILE + (".gz" if compressed else "")
+
+    def _refresh_index(self):
+        """Read index lines appended since the last call (also by other processes)"""
+        try:
+            size = os.path.getsize(self.index_path)
+        except OSError:
+            return
+        if size <= self._index_size:
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_size)
+            chunk = f.read(size - self._index_size)
+        # Only consume complete lines; a line still being written is picked up next time
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                self._index[entry["trade_date"]] = entry
+        self._index_size += len(complete)
+
+    def append(self, final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append the record of a finished run
+
+        Returns:
+            The record's index entry (trade_date, file, offset, length, logged_at)
+        """
+        record = state_record(final_state)
+        payload = (json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=_json_default) + "\n").encode("utf-8")
+        if self.compress:
+            payload = gzip.compress(payload, compresslevel=6)
+        data_file = self._data_file(self.compress)
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, data_file), "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(payload)
+            # The index line goes last, so an index entry always points at a complete record
+            entry = {
+                "trade_date": record["trade_date"],
+                "file": data_file,
+                "offset": offset,
+                "length": len(payload),
+                "logged_at": time.time(),
+            }
+            with open(self.index_path, "ab") as f:
+                f.write((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8"))
+            self._refresh_index()
+        return entry
+
+    def dates(self) -> List[str]:
+        """Logged trade dates, oldest first"""
+        with self._lock:
+            self._refresh_index()
+            return sorted(self._index)
+
+    def read(self, trade_date) -> Optional[Dict[str, Any]]:
+        """The latest record for a trade date, or None if the date was never logged"""
+        trade_date = str(trade_date)
+        with self._lock:
+            self._refresh_index()
+            entry = self._index.get(trade_date)
+        if entry is None:
+            return self._read_legacy(trade_date)
+        with open(os.path.join(self.directory, entry["file"]), "rb") as f:
+            f.seek(entry["offset"])
+            payload = f.read(entry["length"])
+        if entry["file"].endswith(".gz"):
+            payload = gzip.decompress(payload)
+        return json.loads(payload)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Latest record of every logged date, oldest first, one at a time"""
+        for trade_date in self.dates():
+            yield self.read(trade_date)
+
+    def _read_legacy(self, trade_date: str) -> Optional[Dict[str, Any]]:
+        legacy_path = os.path.join(self.directory, f"full_states_log_{trade_date}.json")
+        if not os.path.exists(legacy_path):
+            return None
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            return json.load(f).get(trade_date)
+
+
+_logs: Dict[str, StateLog] = {}
+_logs_lock = threading.Lock()
+
+
+def state_log_directory(ticker: str, config: Optional[Dict[str, Any]] = None) -> str:
+    config = config or get_config()
+    return os.path.join(config.get("state_log_dir") or "eval_results", ticker, "TradingAgentsStrategy_logs")
+
+
+def get_state_log(ticker: str, config: Optional[Dict[str, Any]] = None) -> StateLog:
+    """Process-wide state log for a ticker"""
+    config = config or get_config()
+    path = os.path.abspath(state_log_directory(ticker, config))
+    with _logs_lock:
+        log = _logs.get(path)
+        if log is None:
+            log = StateLog(path, compress=config.get("state_log_compress", True))
+            _logs[path] = log
+        return log
+
+
+def load_logged_state(ticker: str, trade_date, config: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Logged final state of a ticker on a trade date, or None"""
+    return get_state_log(ticker, config).read(trade_date)
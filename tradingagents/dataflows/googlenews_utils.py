@@ -1,34 +1,16 @@
 import json
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import time
 import random
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    retry_if_result,
-)
+from .transport import get_transport
 
 
-def is_rate_limited(response):
-    """Check if the response indicates rate limiting (status code 429)"""
-    return response.status_code == 429
-
-
-@retry(
-    retry=(retry_if_result(is_rate_limited)),
-    wait=wait_exponential(multiplier=1, min=4, max=60),
-    stop=stop_after_attempt(5),
-)
 def make_request(url, headers):
-    """Make a request with retry logic for rate limiting"""
+    """Make a request through the shared transport (pooled session, retries on 429/5xx)"""
     # Random delay before each request to avoid detection
     time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
-    return response
+    return get_transport().get(url, headers=headers, service="google_news")
 
 
 def getNewsData(query, start_date, end_date, max_results=40):
@@ -11,11 +11,14 @@ import json
 import os
 import pandas as pd
 from tqdm import tqdm
-import yfinance as yf
-from openai import OpenAI
 from .config import get_config, set_config, DATA_DIR
+from .price_loader import get_price_loader
+from .tracing import trace_span
+from .transport import get_transport
+from .replay import recordable
 
 
+@recordable
 def get_finnhub_news(
     ticker: Annotated[
         str,
@@ -58,6 +61,7 @@ def get_finnhub_news(
     return f"## {ticker} News, from {before} to {curr_date}:\n" + str(combined_result)
 
 
+@recordable
 def get_finnhub_company_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
     curr_date: Annotated[
@@ -99,6 +103,7 @@ def get_finnhub_company_insider_sentiment(
     )
 
 
+@recordable
 def get_finnhub_company_insider_transactions(
     ticker: Annotated[str, "ticker symbol"],
     curr_date: Annotated[
@@ -141,6 +146,30 @@ def get_finnhub_company_insider_transactions(
     )
 
 
+_YFINANCE_STATEMENTS = {
+    "balance_sheet": ("balance_sheet", "quarterly_balance_sheet"),
+    "cashflow": ("cashflow", "quarterly_cashflow"),
+    "income_stmt": ("financials", "quarterly_financials"),
+}
+
+
+@recordable
+def get_yfinance_statement(
+    ticker: Annotated[str, "ticker symbol"],
+    statement: Annotated[str, "balance_sheet / cashflow / income_stmt"],
+    freq: Annotated[str, "reporting frequency: annual / quarterly"] = "annual",
+) -> pd.DataFrame:
+    """Live financial statement from Yahoo Finance (rows are line items, columns are periods)"""
+    annual, quarterly = _YFINANCE_STATEMENTS[statement]
+    stock = get_transport().yf_ticker(ticker)
+    with trace_span("yfinance_statement", "data_fetch", tickers=ticker, statement=statement, freq=freq):
+        return get_transport().call(
+            lambda: getattr(stock, quarterly if freq.lower() == "quarterly" else annual),
+            service="yfinance",
+        )
+
+
+@recordable
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -188,6 +217,7 @@ def get_simfin_balance_sheet(
     )
 
 
+@recordable
 def get_simfin_cashflow(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -235,6 +265,7 @@ def get_simfin_cashflow(
     )
 
 
+@recordable
 def get_simfin_income_statements(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -282,6 +313,7 @@ def get_simfin_income_statements(
     )
 
 
+@recordable
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -372,6 +404,7 @@ def get_google_news(
     return stats_summary + news_str
 
 
+@recordable
 def get_reddit_global_news(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
@@ -424,6 +457,7 @@ def get_reddit_global_news(
     return f"## Global News Reddit, from {before} to {curr_date}:\n{news_str}"
 
 
+@recordable
 def get_reddit_company_news(
     ticker: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -483,6 +517,7 @@ def get_reddit_company_news(
     return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
 
 
+@recordable
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -619,6 +654,7 @@ def get_stock_stats_indicators_window(
     return result_str
 
 
+@recordable
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -648,6 +684,7 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+@recordable
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -689,6 +726,7 @@ def get_YFin_data_window(
     )
 
 
+@recordable
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -699,10 +737,11 @@ def get_YFin_data_online(
     datetime.strptime(end_date, "%Y-%m-%d")
 
     # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
+    ticker = get_transport().yf_ticker(symbol)
 
     # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+    with trace_span("yfinance_history", "data_fetch", tickers=symbol, start=start_date, end=end_date):
+        data = get_transport().call(lambda: ticker.history(start=start_date, end=end_date), service="yfinance")
 
     # Check if data is empty
     if data.empty:
@@ -710,6 +749,10 @@ def get_YFin_data_online(
             f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
         )
 
+    # Share the download with the portfolio workflows (end is exclusive in history())
+    inclusive_end = (pd.Timestamp(end_date) - pd.DateOffset(days=1)).strftime("%Y-%m-%d")
+    get_price_loader().register_prices(symbol, data, start=start_date, end=inclusive_end)
+
     # Remove timezone info from index for cleaner output
     if data.index.tz is not None:
         data.index = data.index.tz_localize(None)
@@ -731,6 +774,7 @@ def get_YFin_data_online(
     return header + csv_string
 
 
+@recordable
 def get_YFin_data(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -766,7 +810,10 @@ def get_YFin_data(
     return filtered_data
 
 
+@recordable
 def get_stock_news_openai(ticker, curr_date):
+    from openai import OpenAI
+
     config = get_config()
     client = OpenAI(base_url=config["backend_url"])
 
@@ -790,7 +837,10 @@ def get_stock_news_openai(ticker, curr_date):
     return response.choices[0].message.content
 
 
+@recordable
 def get_global_news_openai(curr_date):
+    from openai import OpenAI
+
     config = get_config()
     client = OpenAI(base_url=config["backend_url"])
 
@@ -814,7 +864,10 @@ def get_global_news_openai(curr_date):
     return response.choices[0].message.content
 
 
+@recordable
 def get_fundamentals_openai(ticker, curr_date):
+    from openai import OpenAI
+
     config = get_config()
     client = OpenAI(base_url=config["backend_url"])
 
@@ -0,0 +1,403 @@
+"""
+Bulk Price Loader
+Batched multi-ticker OHLCV download with a shared in-memory and on-disk cache
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .replay import recordable
+from .tracing import get_tracer, trace_span
+from .transport import get_transport
+from .utils import atomic_write_path
+
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+def period_to_start(period: str, end: pd.Timestamp) -> pd.Timestamp:
+    """Convert a yfinance-style period ("5d", "3mo", "1y", "ytd") to a start date"""
+    period = period.lower()
+    if period == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1)
+    if period.endswith("mo"):
+        return end - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("m"):
+        return end - pd.DateOffset(months=int(period[:-1]))
+    if period.endswith("y"):
+        return end - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith("wk"):
+        return end - pd.DateOffset(weeks=int(period[:-2]))
+    if period.endswith("d"):
+        return end - pd.DateOffset(days=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def _today() -> pd.Timestamp:
+    return pd.Timestamp.today().normalize()
+
+
+def _last_settled_day() -> str:
+    """Latest day whose daily bar is final: yesterday on weekdays (today's bar may still be forming)"""
+    today = _today()
+    settled = today if today.dayofweek >= 5 else today - pd.DateOffset(days=1)
+    return settled.strftime("%Y-%m-%d")
+
+
+def _normalize_ohlcv(data: pd.DataFrame) -> pd.DataFrame:
+    """Tz-naive daily index, standard OHLCV columns, no all-NaN rows"""
+    if data is None or data.empty:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    data = data.copy()
+    data.index = pd.to_datetime(data.index)
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.index = data.index.normalize()
+    data.index.name = "Date"
+    data = data[[col for col in OHLCV_COLUMNS if col in data.columns]]
+    data = data.dropna(how="all")
+    return data[~data.index.duplicated(keep="last")].sort_index()
+
+
+class YFinancePriceProvider:
+    """Default provider: one batched yf.download call plus per-ticker history fallback"""
+
+    def download(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        """Download OHLCV for several tickers in one request (end is exclusive)"""
+        import yfinance as yf
+
+        data = get_transport().call(
+            lambda: yf.download(
+                tickers,
+                start=start,
+                end=end,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+            ),
+            service="yfinance",
+        )
+        if data is None or data.empty:
+            return {}
+
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {tickers[0]: data} if len(tickers) == 1 else {}
+
+        return {
+            ticker: data[ticker]
+            for ticker in data.columns.get_level_values(0).unique()
+            if ticker in tickers
+        }
+
+    def fetch_one(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """Download OHLCV for a single ticker (end is exclusive)"""
+        transport = get_transport()
+        stock = transport.yf_ticker(ticker)
+        return transport.call(lambda: stock.history(start=start, end=end, auto_adjust=True), service="yfinance")
+
+
+class BulkPriceLoader:
+    """
+    Load price history for a whole universe with as few network round-trips as possible.
+
+    Tickers already in the cache (including OHLCV registered during single-stock
+    analysis) are served locally; when the cache covers only part of the range,
+    just the missing tail (or head) is downloaded. Everything to fetch is requested
+    in one batched provider call per range, and anything the batch misses is
+    retried per ticker on a bounded thread pool.
+    """
+
+    def __init__(self, provider=None, cache_dir: Optional[str] = None,
+                 max_workers: int = 8, use_disk_cache: bool = True):
+        """
+        Args:
+            provider: Object with download(tickers, start, end) and fetch_one(ticker, start, end)
+            cache_dir: Directory for the on-disk cache (default: <data_cache_dir>/price_panel)
+            max_workers: Maximum concurrent per-ticker fallback downloads
+            use_disk_cache: Persist downloaded prices so later processes can reuse them
+        """
+        self.provider = provider or YFinancePriceProvider()
+        self.max_workers = max_workers
+        self.use_disk_cache = use_disk_cache
+        self.cache_dir = cache_dir or os.path.join(get_config()["data_cache_dir"], "price_panel")
+
+        self._prices: Dict[str, pd.DataFrame] = {}
+        self._coverage: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self.stats = {"cache_hits": 0, "partial_hits": 0, "batched_downloads": 0, "fallback_downloads": 0}
+
+        if self.use_disk_cache:
+            self._load_index()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @recordable
+    def load_prices(self, tickers: Iterable[str], start: Optional[str] = None,
+                    end: Optional[str] = None, period: str = "6mo") -> Dict[str, pd.DataFrame]:
+        """
+        Get OHLCV frames for every ticker over [start, end] (inclusive)
+
+        Args:
+            tickers: Ticker symbols
+            start: Start date YYYY-mm-dd (default: derived from period)
+            end: End date YYYY-mm-dd (default: today)
+            period: Look-back period used when start is not given
+
+        Returns:
+            Dict of ticker -> OHLCV DataFrame; tickers with no data are omitted
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        start, end = self._resolve_range(start, end, period)
+
+        # Group the tickers to download by the range each still needs
+        to_fetch: Dict[Tuple[str, str], List[str]] = {}
+        for ticker in tickers:
+            needed = self._missing_range(ticker, start, end)
+            if needed is None:
+                self.stats["cache_hits"] += 1
+                continue
+            if needed != (start, end):
+                self.stats["partial_hits"] += 1
+            to_fetch.setdefault(needed, []).append(ticker)
+
+        for (fetch_start, fetch_end), missing in to_fetch.items():
+            self._fetch(missing, fetch_start, fetch_end)
+
+        result = {}
+        for ticker in tickers:
+            data = self._prices.get(ticker)
+            if data is None:
+                continue
+            window = data.loc[start:end]
+            if not window.empty:
+                result[ticker] = window
+        return result
+
+    def load_panel(self, tickers: Iterable[str], start: Optional[str] = None,
+                   end: Optional[str] = None, period: str = "6mo",
+                   fields: Iterable[str] = OHLCV_COLUMNS) -> pd.DataFrame:
+        """
+        Aligned OHLCV panel for several tickers from a single (batched) load
+
+        Returns:
+            DataFrame indexed by date with (field, ticker) column MultiIndex, so
+            panel["Close"] is a wide dates x tickers frame; tickers with no data are omitted
+        """
+        prices = self.load_prices(tickers, start=start, end=end, period=period)
+        fields = list(fields)
+        if not prices:
+            return pd.DataFrame(columns=pd.MultiIndex.from_product([fields, []]))
+
+        panel = pd.concat(
+            {field: pd.DataFrame({ticker: data[field] for ticker, data in prices.items() if field in data})
+             for field in fields},
+            axis=1,
+        )
+        panel = panel.sort_index()
+        # Carry prices across calendar mismatches (e.g. foreign holidays), not across gaps at the start;
+        # volume is left missing on days a ticker did not trade
+        price_columns = [col for col in panel.columns if col[0] in PRICE_COLUMNS]
+        if price_columns:
+            panel[price_columns] = panel[price_columns].ffill(limit=3)
+        return panel
+
+    def load_price_matrix(self, tickers: Iterable[str], start: Optional[str] = None,
+                          end: Optional[str] = None, period: str = "6mo",
+                          field: str = "Close", dtype=np.float64) -> pd.DataFrame:
+        """Wide price matrix (dates x tickers) aligned on the union of trading calendars"""
+        panel = self.load_panel(tickers, start=start, end=end, period=period, fields=[field])
+        if panel.empty:
+            return pd.DataFrame(dtype=dtype)
+        return panel[field].astype(dtype)
+
+    def load_returns_matrix(self, tickers: Iterable[str], start: Optional[str] = None,
+                            end: Optional[str] = None, period: str = "6mo",
+                            field: str = "Close", dtype=np.float64) -> pd.DataFrame:
+        """
+        Wide daily returns matrix (dates x tickers) ready for the portfolio optimizers
+
+        Rows where any ticker has no return are dropped so every column shares one calendar.
+        Pass dtype=np.float32 to halve memory for large universes.
+        """
+        matrix = self.load_price_matrix(tickers, start=start, end=end, period=period,
+                                        field=field, dtype=np.float64)
+        if matrix.empty:
+            return matrix.astype(dtype)
+        returns = matrix.pct_change(fill_method=None).dropna(how="any")
+        return returns.astype(dtype)
+
+    def register_prices(self, ticker: str, data: pd.DataFrame, start: Optional[str] = None,
+                        end: Optional[str] = None):
+        """Seed the cache with OHLCV already fetched elsewhere (e.g. during single-stock analysis)"""
+        data = _normalize_ohlcv(data)
+        if data.empty:
+            return
+        start = start or data.index[0].strftime("%Y-%m-%d")
+        end = end or data.index[-1].strftime("%Y-%m-%d")
+        self._store(ticker.upper(), data, start, end)
+        if self.use_disk_cache:
+            self._save_index()
+
+    def clear(self):
+        """Drop the in-memory cache (the on-disk cache is left untouched)"""
+        with self._lock:
+            self._prices.clear()
+            self._coverage.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _resolve_range(start: Optional[str], end: Optional[str], period: str) -> Tuple[str, str]:
+        end_ts = pd.Timestamp(end) if end else _today()
+        start_ts = pd.Timestamp(start) if start else period_to_start(period, end_ts)
+        return start_ts.strftime("%Y-%m-%d"), end_ts.strftime("%Y-%m-%d")
+
+    def _missing_range(self, ticker: str, start: str, end: str) -> Optional[Tuple[str, str]]:
+        """
+        Range still to download for [start, end]: None if cached, only the uncovered
+        tail (or head) when the cache overlaps one end, else the whole range
+        """
+        with self._lock:
+            coverage = self._coverage.get(ticker)
+            if coverage is None:
+                return start, end
+            if ticker not in self._prices and not self._load_from_disk(ticker):
+                return start, end
+        covered_start, covered_end = coverage
+        if covered_start <= start and end <= covered_end:
+            return None
+        # The missing piece shares its boundary day with the cache so the two merge
+        if covered_start <= start <= covered_end:
+            return covered_end, end
+        if covered_start <= end <= covered_end:
+            return start, covered_start
+        return start, end
+
+    def _is_covered(self, ticker: str, start: str, end: str) -> bool:
+        return self._missing_range(ticker, start, end) is None
+
+    def _fetch(self, tickers: List[str], start: str, end: str):
+        # Providers treat end as exclusive; our ranges are inclusive
+        provider_end = (pd.Timestamp(end) + pd.DateOffset(days=1)).strftime("%Y-%m-%d")
+
+        fetched: Dict[str, pd.DataFrame] = {}
+        try:
+            with trace_span("price_download", "data_fetch", tickers=",".join(tickers), start=start, end=end):
+                fetched = self.provider.download(tickers, start, provider_end) or {}
+            self.stats["batched_downloads"] += 1
+        except Exception as e:
+            print(f"WARNING: Batched price download failed ({e}), falling back to per-ticker requests")
+
+        for ticker, data in fetched.items():
+            data = _normalize_ohlcv(data)
+            if not data.empty:
+                self._store(ticker.upper(), data, start, end)
+
+        remaining = [t for t in tickers if t not in self._prices or not self._is_covered(t, start, end)]
+        if remaining:
+            tracer = get_tracer()
+            parent_span = tracer.current_span()
+
+            def fetch(ticker):
+                try:
+                    with tracer.activate(parent_span), trace_span("price_download", "data_fetch", tickers=ticker, start=start, end=end):
+                        return ticker, self.provider.fetch_one(ticker, start, provider_end)
+                except Exception as e:
+                    print(f"ERROR: Price download failed for {ticker}: {e}")
+                    return ticker, None
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(remaining))) as executor:
+                for ticker, data in executor.map(fetch, remaining):
+                    self.stats["fallback_downloads"] += 1
+                    if data is not None:
+                        # Stored even when empty: a tail over non-trading days still extends coverage
+                        self._store(ticker, _normalize_ohlcv(data), start, end)
+
+        if self.use_disk_cache:
+            self._save_index()
+
+    def _store(self, ticker: str, data: pd.DataFrame, start: str, end: str):
+        """
+        Cache data downloaded for [start, end]. Coverage stops at the last settled day,
+        so a still-forming bar for today is fetched again later.
+        """
+        covered_end = min(end, _last_settled_day())
+        with self._lock:
+            existing = self._prices.get(ticker)
+            coverage = self._coverage.get(ticker)
+            if existing is not None and coverage is not None and coverage[0] <= end and start <= coverage[1]:
+                # Overlapping ranges: merge, preferring the fresh download
+                data = pd.concat([existing, data]) if not data.empty else existing
+                data = data[~data.index.duplicated(keep="last")].sort_index()
+                start, covered_end = min(start, coverage[0]), max(covered_end, coverage[1])
+            elif data.empty:
+                return
+
+            self._prices[ticker] = data
+            if start <= covered_end:
+                self._coverage[ticker] = (start, covered_end)
+            else:
+                self._coverage.pop(ticker, None)
+
+            if self.use_disk_cache:
+                with atomic_write_path(self._cache_path(ticker)) as tmp_path:
+                    data.to_csv(tmp_path)
+
+    def _cache_path(self, ticker: str) -> str:
+        return os.path.join(self.cache_dir, f"{ticker}.csv")
+
+    def _load_from_disk(self, ticker: str) -> bool:
+        if not self.use_disk_cache:
+            return False
+        path = self._cache_path(ticker)
+        if not os.path.exists(path):
+            self._coverage.pop(ticker, None)
+            return False
+        self._prices[ticker] = pd.read_csv(path, index_col="Date", parse_dates=True)
+        return True
+
+    def _load_index(self):
+        index_path = os.path.join(self.cache_dir, "index.json")
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, "r") as f:
+                    self._coverage = {t: tuple(r) for t, r in json.load(f).items()}
+            except (OSError, ValueError):
+                self._coverage = {}
+
+    def _save_index(self):
+        index_path = os.path.join(self.cache_dir, "index.json")
+        # Serialized so a stale snapshot never replaces a newer one
+        with self._index_lock:
+            with self._lock:
+                coverage = {t: list(r) for t, r in self._coverage.items()}
+            with atomic_write_path(index_path) as tmp_path:
+                with open(tmp_path, "w") as f:
+                    json.dump(coverage, f)
+
+
+_default_loader: Optional[BulkPriceLoader] = None
+_default_loader_lock = threading.Lock()
+
+
+def get_price_loader() -> BulkPriceLoader:
+    """Process-wide price loader shared by the analysts and portfolio workflows"""
+    global _default_loader
+    with _default_loader_lock:
+        if _default_loader is None:
+            _default_loader = BulkPriceLoader()
+    return _default_loader
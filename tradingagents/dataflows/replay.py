@@ -0,0 +1,259 @@
+"""
+Replay
+Record/replay of data source responses for deterministic, network-free runs
+
+With config["data_mode"] = "record", every call to a recordable data function
+(the interface.* tools and the bulk price loader) is run live and its result is
+captured in a local bundle. With "replay", the same calls are answered from the
+bundle and nothing goes to the network: a call the bundle does not contain raises
+ReplayMissError, and the shared transport refuses live data requests.
+
+Calls are keyed by function name and arguments as passed (defaults filled in), so
+a replayed run asks exactly the questions the recorded run asked. Only the
+outermost recordable call is captured; data functions called from inside it are
+not stored separately. The bundle is a gzip-compressed JSON file, by default
+<data_cache_dir>/replay/bundle.json.gz.
+"""
+
+import atexit
+import gzip
+import hashlib
+import inspect
+import io
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from .config import get_config
+from .utils import atomic_write_path
+
+BUNDLE_VERSION = 1
+
+# Inside a recordable call (nested data calls are neither recorded nor replayed separately)
+_in_recordable: ContextVar[bool] = ContextVar("in_recordable", default=False)
+
+
+class ReplayMissError(LookupError):
+    """A replayed run made a data call that was not recorded"""
+
+
+class OfflineError(RuntimeError):
+    """A live data request was attempted while replaying"""
+
+
+def data_mode(config: Optional[Dict[str, Any]] = None) -> str:
+    """ "live", "record" or "replay" """
+    return (config or get_config()).get("data_mode", "live")
+
+
+def is_offline() -> bool:
+    return data_mode() == "replay"
+
+
+# ----------------------------------------------------------------------
+# Value encoding
+# ----------------------------------------------------------------------
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, pd.DataFrame):
+        return {
+            "__frame__": value.to_json(orient="split", date_format="iso", date_unit="ns"),
+            "dtypes": {str(col): str(dtype) for col, dtype in value.dtypes.items()},
+            "datetime_index": isinstance(value.index, pd.DatetimeIndex),
+            "index_name": value.index.name,
+        }
+    if isinstance(value, pd.Series):
+        return {"__series__": _encode(value.to_frame(name=value.name if value.name is not None else 0))}
+    if isinstance(value, dict):
+        return {"__dict__": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return {"__list__": [_encode(v) for v in value], "tuple": isinstance(value, tuple)}
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    return str(value)
+
+
+def _decode(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if "__frame__" in value:
+        frame = pd.read_json(io.StringIO(value["__frame__"]), orient="split", convert_dates=False)
+        if value.get("datetime_index"):
+            frame.index = pd.to_datetime(frame.index)
+        frame.index.name = value.get("index_name")
+        for column, dtype in value.get("dtypes", {}).items():
+            if column in frame.columns and str(frame[column].dtype) != dtype:
+                try:
+                    frame[column] = frame[column].astype(dtype)
+                except (TypeError, ValueError):
+                    pass
+        return frame
+    if "__series__" in value:
+        frame = _decode(value["__series__"])
+        series = frame.iloc[:, 0]
+        return series.rename(None) if series.name == 0 else series
+    if "__dict__" in value:
+        return {_decode(k): _decode(v) for k, v in value["__dict__"]}
+    if "__list__" in value:
+        items = [_decode(v) for v in value["__list__"]]
+        return tuple(items) if value.get("tuple") else items
+    return value
+
+
+def call_key(name: str, arguments: Dict[str, Any]) -> str:
+    payload = json.dumps({"fn": name, "args": arguments}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Bundle
+# ----------------------------------------------------------------------
+
+class ReplayBundle:
+    """Recorded data calls: key -> {fn, args, result}, loaded from and saved to one file"""
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(self.path):
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != BUNDLE_VERSION:
+                raise ValueError(f"Unsupported replay bundle version in {self.path}: {payload.get('version')}")
+            self.entries = payload.get("entries", {})
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.entries.get(key)
+
+    def put(self, key: str, name: str, arguments: Dict[str, Any], result: Any):
+        entry = {"fn": name, "args": json.loads(json.dumps(arguments, default=str)),
+                 "result": _encode(result), "recorded_at": time.time()}
+        with self._lock:
+            self.entries[key] = entry
+            self.stats["recorded"] += 1
+            self._dirty = True
+
+    def save(self) -> Optional[str]:
+        """Write the bundle atomically if anything was recorded since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return None
+            payload = {"version": BUNDLE_VERSION, "saved_at": time.time(), "entries": self.entries}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with atomic_write_path(self.path) as tmp_path:
+                with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                    json.dump(payload, f, separators=(",", ":"))
+            self._dirty = False
+        print(f"[REPLAY] Saved {len(self.entries)} recorded data calls to {self.path}")
+        return self.path
+
+    def summary(self) -> str:
+        counts: Dict[str, int] = {}
+        for entry in self.entries.values():
+            counts[entry["fn"]] = counts.get(entry["fn"], 0) + 1
+        return ", ".join(f"{fn}: {count}" for fn, count in sorted(counts.items()))
+
+
+_bundles: Dict[str, ReplayBundle] = {}
+_bundles_lock = threading.Lock()
+
+
+def bundle_path(config: Optional[Dict[str, Any]] = None) -> str:
+    config = config or get_config()
+    return os.path.abspath(
+        config.get("replay_bundle") or os.path.join(config["data_cache_dir"], "replay", "bundle.json.gz")
+    )
+
+
+def get_replay_bundle(config: Optional[Dict[str, Any]] = None) -> ReplayBundle:
+    """Process-wide bundle for the configured path"""
+    path = bundle_path(config)
+    with _bundles_lock:
+        bundle = _bundles.get(path)
+        if bundle is None:
+            bundle = ReplayBundle(path)
+            _bundles[path] = bundle
+        return bundle
+
+
+def save_replay_bundles():
+    """Persist every bundle with unsaved recordings (called after each run and at exit)"""
+    with _bundles_lock:
+        bundles = list(_bundles.values())
+    for bundle in bundles:
+        try:
+            bundle.save()
+        except Exception as e:
+            print(f"WARNING: Could not save replay bundle {bundle.path}: {e}")
+
+
+atexit.register(save_replay_bundles)
+
+
+# ----------------------------------------------------------------------
+# Decorator
+# ----------------------------------------------------------------------
+
+def recordable(func: Callable = None, *, name: Optional[str] = None):
+    """
+    Make a data function recordable and replayable
+
+    Methods are keyed without `self`, so any instance replays the same recordings.
+    """
+    if func is None:
+        return lambda f: recordable(f, name=name)
+
+    signature = inspect.signature(func)
+    call_name = name or func.__qualname__
+    skip_self = next(iter(signature.parameters), None) == "self"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        mode = data_mode()
+        if mode == "live" or _in_recordable.get():
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        for param, value in bound.arguments.items():
+            # One-shot iterables (generators, dict views) are materialized so they can be keyed and still passed on
+            if not isinstance(value, (str, bytes, dict, list, tuple, pd.DataFrame, pd.Series)) and hasattr(value, "__iter__"):
+                bound.arguments[param] = list(value)
+        arguments = dict(bound.arguments)
+        if skip_self:
+            arguments.pop("self", None)
+        key = call_key(call_name, arguments)
+        bundle = get_replay_bundle()
+
+        if mode == "replay":
+            entry = bundle.get(key)
+            if entry is None:
+                bundle.stats["missed"] += 1
+                raise ReplayMissError(
+                    f"{call_name}({', '.join(f'{k}={v!r}' for k, v in arguments.items())}) "
+                    f"is not in the replay bundle {bundle.path}"
+                )
+            bundle.stats["replayed"] += 1
+            return _decode(entry["result"])
+
+        token = _in_recordable.set(True)
+        try:
+            result = func(*bound.args, **bound.kwargs)
+        finally:
+            _in_recordable.reset(token)
+        bundle.put(key, call_name, arguments, result)
+        return result
+
+    return wrapper
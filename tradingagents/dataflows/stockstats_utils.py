@@ -4,6 +4,8 @@ from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config
+from .tracing import trace_span
+from .transport import get_transport
 
 
 class StockstatsUtils:
@@ -62,14 +64,18 @@ class StockstatsUtils:
                 data = pd.read_csv(data_file)
                 data["Date"] = pd.to_datetime(data["Date"])
             else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
+                with trace_span("yfinance_download", "data_fetch", tickers=symbol, start=start_date, end=end_date):
+                    data = get_transport().call(
+                        lambda: yf.download(
+                            symbol,
+                            start=start_date,
+                            end=end_date,
+                            multi_level_index=False,
+                            progress=False,
+                            auto_adjust=True,
+                        ),
+                        service="yfinance",
+                    )
                 data = data.reset_index()
                 data.to_csv(data_file, index=False)
 
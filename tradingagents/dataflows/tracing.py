@@ -0,0 +1,597 @@
+"""
+Tracing
+Low-overhead spans for graph nodes, tool calls, data fetches, LLM calls and file writes
+
+Each propagate is one trace: a root span with a child span per graph node, and
+below those the LLM calls (with token counts), tool calls, data downloads and
+report writes they made. Finished spans are handed to a background exporter that
+appends them to <results_dir>/traces as JSON lines (one span per line, or
+OTLP/JSON export requests with trace_format="otlp"). When the root span ends, a
+summary with the run's critical path and the time per span kind is appended to
+summaries.jsonl (and printed with trace_print_summary). Traces whose root never
+ends are dropped from memory after trace_max_age seconds.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .config import get_config
+
+
+# Span handed to code running in another thread (see Tracer.activate)
+_active_span: ContextVar[Optional["Span"]] = ContextVar("trace_span", default=None)
+
+# OTLP SpanKind values
+_OTLP_KINDS = {"llm": 3, "tool": 1, "data_fetch": 3, "file_write": 1}
+
+
+@dataclass
+class Span:
+    """A timed operation; kind is one of run, node, llm, tool, data_fetch, file_write, internal"""
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    thread_id: int = field(default_factory=threading.get_ident)
+
+    @property
+    def duration(self) -> float:
+        """Seconds, or the time so far for a span that has not ended"""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_s": round(self.duration, 6),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _OTLP_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute("tradingagents.kind", self.kind)]
+            + [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class JsonlSpanExporter:
+    """
+    Appends finished spans to a JSONL file from a background thread.
+
+    export() only puts the span on a bounded queue, so traced code never waits on disk;
+    if the queue is full the span is dropped and counted. Spans are written in batches,
+    with one flush per batch.
+    """
+
+    def __init__(self, directory: str, fmt: str = "jsonl", flush_interval: float = 1.0, max_queue: int = 10000):
+        """
+        Args:
+            directory: Where spans-YYYYMMDD.jsonl and summaries.jsonl are written
+            fmt: "jsonl" (one span per line) or "otlp" (one OTLP/JSON ExportTraceServiceRequest per batch)
+            flush_interval: Maximum seconds a span waits before being written
+            max_queue: Spans held in memory before new ones are dropped
+        """
+        if fmt not in ("jsonl", "otlp"):
+            raise ValueError(f"Unknown trace format: {fmt}")
+        self.directory = os.path.abspath(directory)
+        self.fmt = fmt
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def export(self, span: Span):
+        self._put(("span", span))
+
+    def export_summary(self, summary: Dict[str, Any]):
+        self._put(("summary", summary))
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything exported so far is on disk"""
+        done = threading.Event()
+        self._put(("flush", done))
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or items[-1][0] == "flush":
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(items)
+            except Exception as e:
+                print(f"WARNING: Trace export failed: {e}")
+            for kind, payload in items:
+                if kind == "flush":
+                    payload.set()
+
+    def _write(self, items):
+        spans = [payload for kind, payload in items if kind == "span"]
+        summaries = [payload for kind, payload in items if kind == "summary"]
+        if not spans and not summaries:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if spans:
+            path = os.path.join(self.directory, f"spans-{time.strftime('%Y%m%d')}.jsonl")
+            with open(path, "a", encoding="utf-8") as f:
+                if self.fmt == "otlp":
+                    request = {"resourceSpans": [{
+                        "resource": {"attributes": [_otlp_attribute("service.name", "tradingagents")]},
+                        "scopeSpans": [{"scope": {"name": "tradingagents"}, "spans": [s.to_otlp() for s in spans]}],
+                    }]}
+                    f.write(json.dumps(request, default=str) + "\n")
+                else:
+                    f.writelines(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        if summaries:
+            with open(os.path.join(self.directory, "summaries.jsonl"), "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(s, default=str) + "\n" for s in summaries)
+
+
+class Tracer:
+    """
+    Creates spans and tracks the current span per thread.
+
+    Spans of a trace are kept in memory until its root span ends, then summarized and
+    released; spans that finish later (e.g. background report writes) are only exported.
+    A trace whose root has not ended after max_age seconds (a run abandoned without
+    end_span) is released without a summary when the next trace starts.
+    A disabled tracer returns None from every span call and records nothing.
+    """
+
+    def __init__(self, exporter: Optional[JsonlSpanExporter] = None, enabled: bool = True,
+                 print_summary: bool = False, max_age: Optional[float] = 4 * 3600):
+        self.exporter = exporter
+        self.enabled = enabled
+        self.print_summary = print_summary
+        self.max_age = max_age
+        self.summaries: Dict[str, Dict[str, Any]] = {}  # root span id -> summary of the last runs
+        self.abandoned = 0  # Traces released because their root never ended
+        self._lock = threading.Lock()
+        self._stacks: Dict[int, List[Span]] = defaultdict(list)
+        self._traces: Dict[str, List[Span]] = {}
+        self._roots: Dict[str, Span] = {}  # trace id -> root span of the traces in _traces
+
+    # ------------------------------------------------------------------
+    # Span lifecycle
+    # ------------------------------------------------------------------
+
+    def current_span(self) -> Optional[Span]:
+        """Innermost open span on this thread, else the span activated for this context"""
+        stack = self._stacks.get(threading.get_ident())
+        if stack:
+            return stack[-1]
+        return _active_span.get()
+
+    def start_span(self, name: str, kind: str = "internal", parent: Optional[Span] = None,
+                   root: bool = False, **attributes) -> Optional[Span]:
+        """
+        Start a span without making it current
+
+        Args:
+            name: Span name, e.g. a node or tool name
+            kind: Span kind (see Span)
+            parent: Parent span; defaults to current_span()
+            root: Start a new trace even if a span is current
+            **attributes: Extra attributes (ticker, model, path, ...)
+        """
+        if not self.enabled:
+            return None
+        if parent is None and not root:
+            parent = self.current_span()
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes,
+        )
+        if parent is None:
+            with self._lock:
+                self._evict_abandoned()
+                self._traces[span.trace_id] = []
+                self._roots[span.trace_id] = span
+        return span
+
+    def _evict_abandoned(self):
+        """Release traces whose root started more than max_age seconds ago (caller holds the lock)"""
+        if self.max_age is None:
+            return
+        cutoff = time.time_ns() - int(self.max_age * 1e9)
+        for trace_id in [t for t, root in self._roots.items() if root.start_ns < cutoff]:
+            self._traces.pop(trace_id, None)
+            self._roots.pop(trace_id, None)
+            self.abandoned += 1
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None):
+        if span is None or span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self._pop(span)
+
+        finished_trace = None
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is not None:
+                spans.append(span)
+                if span.parent_id is None:
+                    finished_trace = self._traces.pop(span.trace_id)
+                    self._roots.pop(span.trace_id, None)
+        if self.exporter is not None:
+            self.exporter.export(span)
+        if finished_trace is not None:
+            self._summarize(span, finished_trace)
+
+    def _push(self, span: Span):
+        with self._lock:
+            self._stacks[span.thread_id].append(span)
+
+    def _pop(self, span: Span):
+        with self._lock:
+            stack = self._stacks.get(span.thread_id)
+            if stack and span in stack:
+                stack.remove(span)
+                if not stack:
+                    del self._stacks[span.thread_id]
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes) -> Iterator[Optional[Span]]:
+        """Trace the enclosed block as a child of the current span"""
+        span = self.start_span(name, kind, **attributes)
+        if span is None:
+            yield None
+            return
+        self._push(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=e)
+            raise
+        self.end_span(span)
+
+    @contextmanager
+    def activate(self, span: Optional[Span]):
+        """Make `span` the parent for spans started in this context (e.g. a worker thread)"""
+        token = _active_span.set(span)
+        try:
+            yield
+        finally:
+            _active_span.reset(token)
+
+    # ------------------------------------------------------------------
+    # Summaries
+    # ------------------------------------------------------------------
+
+    def _summarize(self, root: Span, spans: List[Span]):
+        try:
+            summary = summarize_trace(root, spans)
+        except Exception as e:
+            print(f"WARNING: Trace summary failed: {e}")
+            return
+        with self._lock:
+            self.summaries[root.span_id] = summary
+            while len(self.summaries) > 32:
+                self.summaries.pop(next(iter(self.summaries)))
+        if self.exporter is not None:
+            self.exporter.export_summary(summary)
+        if self.print_summary:
+            print(format_summary(summary))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        return self.exporter.flush(timeout) if self.exporter is not None else True
+
+
+def critical_path(root: Span, spans: List[Span]) -> List[Dict[str, Any]]:
+    """
+    Chain of spans that determined the root's end time
+
+    Walking back from a span's end, the child that finished last is on the critical path,
+    then the child that finished last before that one started, and so on; the walk
+    recurses into each chosen child. Returns entries with depth 1 for the root's children.
+    """
+    children: Dict[str, List[Span]] = defaultdict(list)
+    for span in spans:
+        if span.parent_id and span.end_ns is not None:
+            children[span.parent_id].append(span)
+
+    path: List[Dict[str, Any]] = []
+
+    def walk(span: Span, depth: int):
+        chosen = []
+        cursor = span.end_ns
+        for child in sorted(children.get(span.span_id, []), key=lambda s: s.end_ns, reverse=True):
+            if child.end_ns <= cursor:
+                chosen.append(child)
+                cursor = child.start_ns
+        for child in reversed(chosen):
+            path.append({
+                "name": child.name,
+                "kind": child.kind,
+                "depth": depth,
+                "duration_s": round(child.duration, 3),
+            })
+            walk(child, depth + 1)
+
+    walk(root, 1)
+    return path
+
+
+def summarize_trace(root: Span, spans: List[Span]) -> Dict[str, Any]:
+    """Per-run totals: time and count per span kind, slowest nodes, LLM tokens and the critical path"""
+    by_kind: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+    nodes: Dict[str, float] = defaultdict(float)
+    tokens = {"input": 0, "output": 0}
+    errors = []
+    for span in spans:
+        if span is root:
+            continue
+        by_kind[span.kind]["count"] += 1
+        by_kind[span.kind]["seconds"] += span.duration
+        if span.kind == "node":
+            nodes[span.name] += span.duration
+        if span.kind == "llm":
+            tokens["input"] += span.attributes.get("input_tokens", 0) or 0
+            tokens["output"] += span.attributes.get("output_tokens", 0) or 0
+        if span.error:
+            errors.append({"name": span.name, "kind": span.kind, "error": span.error})
+
+    return {
+        "trace_id": root.trace_id,
+        "name": root.name,
+        "attributes": root.attributes,
+        "started_at": root.start_ns / 1e9,
+        "duration_s": round(root.duration, 3),
+        "error": root.error,
+        "by_kind": {kind: {"count": v["count"], "seconds": round(v["seconds"], 3)} for kind, v in by_kind.items()},
+        "slowest_nodes": [
+            {"name": name, "seconds": round(seconds, 3)}
+            for name, seconds in sorted(nodes.items(), key=lambda item: item[1], reverse=True)[:10]
+        ],
+        "llm_tokens": tokens,
+        "critical_path": critical_path(root, spans),
+        "errors": errors,
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Console rendering of summarize_trace()"""
+    label = " ".join(str(v) for v in summary["attributes"].values()) or summary["name"]
+    lines = [f"⏱️ [TRACE] {label}: {summary['duration_s']:.1f}s"
+             + (f" (failed: {summary['error']})" if summary["error"] else "")]
+    top = [entry for entry in summary["critical_path"] if entry["depth"] == 1]
+    if top:
+        lines.append("   Critical path: " + " → ".join(f"{e['name']} {e['duration_s']:.1f}s" for e in top))
+    kinds = ", ".join(
+        f"{kind} {v['seconds']:.1f}s/{v['count']}" for kind, v in sorted(summary["by_kind"].items())
+    )
+    if kinds:
+        lines.append(f"   Time by kind (seconds/spans): {kinds}")
+    tokens = summary["llm_tokens"]
+    if tokens["input"] or tokens["output"]:
+        lines.append(f"   LLM tokens: {tokens['input']} in, {tokens['output']} out")
+    return "\n".join(lines)
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Records LangChain runs as spans: LangGraph nodes, tool calls and LLM calls.
+
+    Passed in the graph's invoke/stream config, so every run inside the graph reports
+    to it. Intermediate runnables (prompt templates, sequences) are not spanned; their
+    children attach to the nearest spanned ancestor, or to `root` at the top.
+    """
+
+    def __init__(self, tracer: "Tracer", root: Optional[Span] = None):
+        self.tracer = tracer
+        self.root = root
+        self._spans: Dict[UUID, Span] = {}
+        self._scopes: Dict[UUID, Optional[Span]] = {}  # run_id -> nearest spanned ancestor
+        self._lock = threading.Lock()
+
+    def _parent(self, parent_run_id: Optional[UUID]) -> Optional[Span]:
+        with self._lock:
+            if parent_run_id in self._scopes:
+                return self._scopes[parent_run_id]
+        return self.root or self.tracer.current_span()
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, kind: str, **attributes):
+        span = self.tracer.start_span(name, kind, parent=self._parent(parent_run_id), **attributes)
+        if span is None:
+            return
+        self.tracer._push(span)
+        with self._lock:
+            self._spans[run_id] = span
+            self._scopes[run_id] = span
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attributes):
+        with self._lock:
+            span = self._spans.pop(run_id, None)
+            self._scopes.pop(run_id, None)
+        if span is not None:
+            span.attributes.update(attributes)
+            self.tracer.end_span(span, error=error)
+
+    # Chains: only LangGraph node runs become spans
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node:
+            self._start(run_id, parent_run_id, node, "node", step=(metadata or {}).get("langgraph_step"))
+        else:
+            parent = self._parent(parent_run_id)
+            with self._lock:
+                self._scopes[run_id] = parent
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, parent_run_id, name, "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._llm_start(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._llm_start(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def _llm_start(self, serialized, run_id, parent_run_id, metadata, kwargs):
+        metadata = metadata or {}
+        params = kwargs.get("invocation_params") or {}
+        model = metadata.get("ls_model_name") or params.get("model") or params.get("model_name") or "llm"
+        attributes = {"model": model}
+        if metadata.get("langgraph_node"):
+            attributes["node"] = metadata["langgraph_node"]
+        self._start(run_id, parent_run_id, f"llm:{model}", "llm", **attributes)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id, **_token_usage(response))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+
+def _provider_counts(token_usage: Dict[str, Any]) -> Dict[str, int]:
+    """Token counts from a provider usage dict (OpenAI-style or watsonx key names)"""
+    return {
+        "input_tokens": token_usage.get("prompt_tokens") or token_usage.get("input_token_count")
+        or token_usage.get("input_tokens") or 0,
+        "output_tokens": token_usage.get("completion_tokens") or token_usage.get("generated_token_count")
+        or token_usage.get("output_tokens") or 0,
+    }
+
+
+def _token_usage(response) -> Dict[str, int]:
+    """
+    Input/output token counts from an LLMResult
+
+    Uses the messages' usage_metadata; when that is missing or empty (e.g. a streamed
+    response from a provider that did not report usage) falls back to the provider's
+    llm_output["token_usage"], then to each message's response_metadata["token_usage"].
+    """
+    usage = {"input_tokens": 0, "output_tokens": 0}
+    messages = [
+        getattr(generation, "message", None)
+        for generations in getattr(response, "generations", None) or []
+        for generation in generations
+    ]
+    for message in messages:
+        metadata = getattr(message, "usage_metadata", None) or {}
+        usage["input_tokens"] += metadata.get("input_tokens", 0)
+        usage["output_tokens"] += metadata.get("output_tokens", 0)
+    if usage["input_tokens"] or usage["output_tokens"]:
+        return usage
+
+    token_usage = (getattr(response, "llm_output", None) or {}).get("token_usage")
+    if token_usage:
+        return _provider_counts(token_usage)
+    for message in messages:
+        counts = _provider_counts((getattr(message, "response_metadata", None) or {}).get("token_usage") or {})
+        usage["input_tokens"] += counts["input_tokens"]
+        usage["output_tokens"] += counts["output_tokens"]
+    return usage
+
+
+_tracers: Dict[str, Tracer] = {}
+_tracers_lock = threading.Lock()
+_disabled_tracer = Tracer(enabled=False)
+
+
+def get_tracer(config: Optional[Dict[str, Any]] = None) -> Tracer:
+    """Process-wide tracer for the configured trace directory (a no-op tracer if tracing is off)"""
+    config = config or get_config()
+    if not config.get("tracing", True):
+        return _disabled_tracer
+    directory = os.path.abspath(
+        config.get("trace_dir") or os.path.join(config.get("results_dir", "./results"), "traces")
+    )
+    fmt = config.get("trace_format", "jsonl")
+    with _tracers_lock:
+        tracer = _tracers.get(directory)
+        if tracer is None or tracer.exporter.fmt != fmt:
+            tracer = Tracer(JsonlSpanExporter(directory, fmt=fmt))
+            _tracers[directory] = tracer
+        tracer.print_summary = config.get("trace_print_summary", False)
+        tracer.max_age = config.get("trace_max_age", 4 * 3600)
+        return tracer
+
+
+@contextmanager
+def trace_span(name: str, kind: str = "internal", **attributes) -> Iterator[Optional[Span]]:
+    """Trace a block with the configured tracer; records nothing unless a trace is in progress"""
+    tracer = get_tracer()
+    if not tracer.enabled or tracer.current_span() is None:
+        yield None
+        return
+    with tracer.span(name, kind, **attributes) as span:
+        yield span
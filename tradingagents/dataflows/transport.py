@@ -0,0 +1,515 @@
+"""
+Transport
+Shared connection pooling, HTTP caching and retry policy for data sources and LLM calls
+
+Every outbound call goes through one Transport:
+- call(fn, service) applies the retry policy (exponential backoff with jitter,
+  Retry-After, an overall deadline) and a per-service circuit breaker that fails
+  fast while a provider is down
+- get(url) uses a keep-alive requests.Session per host and honours ETag,
+  Last-Modified and Cache-Control max-age
+- yf_ticker(symbol) shares yfinance Ticker objects, so the statements and info
+  they cache are fetched once per process (within yf_ticker_ttl)
+- llm_http_client() is a pooled httpx client for OpenAI-compatible chat models
+  whose requests are retried under the same policy; the other providers' chat
+  models run each completion under call() (llm_providers.transport_routed)
+
+While replaying a recorded bundle (data_mode "replay"), call() refuses every
+service except the LLM ones and yf_ticker() refuses outright, so a run cannot
+reach a data source by accident.
+
+Latency percentiles, retries and breaker trips per service are kept in
+Transport.report(), so tail latency under provider hiccups can be measured.
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import get_config
+from .replay import OfflineError, is_offline
+from .tracing import trace_span
+
+
+# Exception class names (from requests, httpx, openai, anthropic, google, ibm) worth retrying;
+# matched by name so provider SDKs are not imported here
+_TRANSIENT_EXCEPTIONS = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "ChunkedEncodingError",
+    "ConnectError", "ReadError", "WriteError", "RemoteProtocolError", "PoolTimeout", "TimeoutException",
+    "APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError", "ServiceUnavailableError",
+    "OverloadedError", "ServiceUnavailable", "ResourceExhausted", "DeadlineExceeded", "RetryableStatusError",
+}
+_TRANSIENT_MESSAGES = (
+    "Server disconnected", "502 Bad Gateway", "503 Service Unavailable", "504 Gateway",
+    "429", "rate limit", "timed out", "Connection reset", "RemoteProtocolError",
+)
+
+# Outermost call() in progress in this context; nested calls do not multiply retries
+_active_call: ContextVar[Optional["_CallState"]] = ContextVar("transport_call", default=None)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its circuit breaker is open"""
+
+
+class RetryableStatusError(RuntimeError):
+    """An HTTP response whose status the retry policy retries (429, 5xx)"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None, response: Any = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.response = response
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether an error is worth retrying (connection problems, timeouts, 429 and 5xx)"""
+    for cls in type(error).__mro__:
+        if cls.__name__ in _TRANSIENT_EXCEPTIONS:
+            return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return True
+    message = str(error)
+    return any(marker.lower() in message.lower() for marker in _TRANSIENT_MESSAGES)
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or an HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long a call is retried"""
+    max_attempts: int = 3
+    backoff_base: float = 1.0  # Delay before the first retry; doubles per attempt
+    backoff_max: float = 20.0
+    jitter: float = 0.5  # Fraction of the delay randomized, so parallel callers do not retry in lockstep
+    deadline: float = 120.0  # No retry is started past this many seconds since the first attempt
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay *= 1 - self.jitter + random.random() * self.jitter * 2
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Per-service breaker: after failure_threshold consecutive failures, calls fail fast
+    for reset_timeout seconds; then one trial call decides whether it closes again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(
+                        f"{self.name} is failing; retrying after {self.reset_timeout:.0f}s "
+                        f"(circuit opened after {self.failures} consecutive failures)"
+                    )
+                self.state = "half_open"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> bool:
+        """Returns True if this failure opened the breaker"""
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+@dataclass
+class ServiceStats:
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+    breaker_trips: int = 0
+    cache_hits: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=2000))
+
+    def percentiles(self) -> Dict[str, float]:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return {}
+
+        def pick(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 3)}
+
+
+@dataclass
+class _CallState:
+    exhausted: bool = False  # A nested call already spent its retries
+
+
+@dataclass
+class _CachedResponse:
+    response: requests.Response
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+
+class Transport:
+    """Process-wide pooled sessions, HTTP cache, retry policy and circuit breakers"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or get_config()
+        self.policy = RetryPolicy(**_known_fields(RetryPolicy, config.get("retry_policy") or {}))
+        self.policy_overrides = config.get("retry_policy_overrides") or {}
+        self.breaker_settings = config.get("circuit_breaker") or {}
+        self.pool_size = config.get("http_pool_size", 10)
+        self.timeout = tuple(config.get("http_timeout", (5, 30)))
+        self.llm_timeout = config.get("llm_timeout", 180)
+        self.cache_entries = config.get("http_cache_entries", 256)
+        self.yf_ticker_ttl = config.get("yf_ticker_ttl", 300)
+
+        self.stats: Dict[str, ServiceStats] = defaultdict(ServiceStats)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._http_cache: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._tickers: Dict[str, Tuple[Any, float]] = {}
+        self._llm_client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Retry policy and circuit breakers
+    # ------------------------------------------------------------------
+
+    def policy_for(self, service: str) -> RetryPolicy:
+        """The default policy with retry_policy_overrides[<service prefix>] applied"""
+        override = self.policy_overrides.get(service) or self.policy_overrides.get(service.split(":")[0])
+        return replace(self.policy, **_known_fields(RetryPolicy, override)) if override else self.policy
+
+    def breaker(self, service: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(service)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    service,
+                    failure_threshold=self.breaker_settings.get("failure_threshold", 5),
+                    reset_timeout=self.breaker_settings.get("reset_timeout", 60.0),
+                )
+                self._breakers[service] = breaker
+            return breaker
+
+    def call(self, fn: Callable[[], Any], service: str, policy: Optional[RetryPolicy] = None,
+             retry_on: Callable[[BaseException], bool] = is_transient) -> Any:
+        """
+        Run fn() under the retry policy and circuit breaker of `service`
+
+        Args:
+            fn: The call; raising an error for which retry_on() is true triggers a retry
+            service: Breaker and stats key, e.g. "llm", "yfinance" or an HTTP host
+            policy: Overrides policy_for(service)
+            retry_on: Decides whether an error is transient
+
+        Raises:
+            CircuitOpenError: The service's breaker is open
+            OfflineError: A data service was called while replaying a bundle
+            The last error from fn() once retries or the deadline are exhausted
+        """
+        if not service.startswith("llm") and is_offline():
+            raise OfflineError(f"Live {service} request attempted while replaying recorded data")
+        policy = policy or self.policy_for(service)
+        breaker = self.breaker(service)
+        stats = self.stats[service]
+        outer = _active_call.get()
+        state = _CallState()
+        token = _active_call.set(state)
+        start = time.monotonic()
+        stats.calls += 1
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    breaker.before_call()
+                except CircuitOpenError:
+                    stats.short_circuited += 1
+                    raise
+                stats.attempts += 1
+                attempt_start = time.monotonic()
+                try:
+                    result = fn()
+                except Exception as e:
+                    stats.latencies.append(time.monotonic() - attempt_start)
+                    if not retry_on(e):
+                        raise
+                    if breaker.record_failure():
+                        stats.breaker_trips += 1
+                        print(f"WARNING: {service} circuit opened after {breaker.failures} consecutive failures")
+                    delay = policy.delay(attempt, getattr(e, "retry_after", None))
+                    out_of_budget = (
+                        attempt >= policy.max_attempts
+                        or time.monotonic() - start + delay > policy.deadline
+                        or state.exhausted
+                    )
+                    if out_of_budget:
+                        stats.failures += 1
+                        if outer is not None:
+                            outer.exhausted = True
+                        print(f"[ERROR] {service} failed after {attempt} attempts: {e}", flush=True)
+                        raise
+                    stats.retries += 1
+                    print(f"[RETRY] {service} {type(e).__name__} (attempt {attempt}/{policy.max_attempts}), "
+                          f"retrying in {delay:.1f} seconds...", flush=True)
+                    time.sleep(delay)
+                    continue
+                stats.latencies.append(time.monotonic() - attempt_start)
+                breaker.record_success()
+                return result
+        finally:
+            _active_call.reset(token)
+
+    # ------------------------------------------------------------------
+    # HTTP (data sources)
+    # ------------------------------------------------------------------
+
+    def session(self, host: str) -> requests.Session:
+        """Keep-alive session for a host"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None,
+            timeout=None, service: Optional[str] = None, cache: bool = True) -> requests.Response:
+        """
+        GET through the host's pooled session with retries and HTTP caching
+
+        A cached response that is still fresh (Cache-Control max-age) is returned without a
+        request; a stale one is revalidated with If-None-Match / If-Modified-Since.
+
+        Raises:
+            RetryableStatusError: 429/5xx responses persisted past the retry policy
+        """
+        host = urlparse(url).netloc
+        service = service or host
+        key = url + ("?" + urlencode(sorted(params.items())) if params else "")
+        headers = dict(headers or {})
+
+        cached = self._cache_get(key) if cache else None
+        if cached is not None:
+            if time.time() < cached.expires_at:
+                self.stats[service].cache_hits += 1
+                return cached.response
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        session = self.session(host)
+        policy = self.policy_for(service)
+
+        def attempt():
+            with trace_span("http_get", "data_fetch", host=host):
+                response = session.get(url, headers=headers, params=params, timeout=timeout or self.timeout)
+            if response.status_code in policy.retry_statuses:
+                raise RetryableStatusError(
+                    response.status_code, _retry_after_seconds(response.headers.get("Retry-After")), response
+                )
+            return response
+
+        response = self.call(attempt, service, policy)
+        if response.status_code == 304 and cached is not None:
+            self.stats[service].cache_hits += 1
+            cached.expires_at = _expires_at(response) or cached.expires_at
+            return cached.response
+        if cache and response.status_code == 200:
+            self._cache_put(key, response)
+        return response
+
+    def _cache_get(self, key: str) -> Optional[_CachedResponse]:
+        with self._lock:
+            entry = self._http_cache.get(key)
+            if entry is not None:
+                self._http_cache.move_to_end(key)
+            return entry
+
+    def _cache_put(self, key: str, response: requests.Response):
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        expires_at = _expires_at(response)
+        if "no-store" in cache_control or not (etag or last_modified or expires_at):
+            return
+        if len(response.content) > 2 * 1024 * 1024:
+            return
+        with self._lock:
+            self._http_cache[key] = _CachedResponse(response, etag, last_modified, expires_at or 0.0)
+            self._http_cache.move_to_end(key)
+            while len(self._http_cache) > self.cache_entries:
+                self._http_cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # yfinance
+    # ------------------------------------------------------------------
+
+    def yf_ticker(self, symbol: str):
+        """Shared yf.Ticker for a symbol; its cached statements and info live for yf_ticker_ttl seconds"""
+        import yfinance as yf
+
+        # Ticker properties (info, statements) fetch outside call(), so refuse them up front
+        if is_offline():
+            raise OfflineError(f"Live yfinance request for {symbol} attempted while replaying recorded data")
+        symbol = symbol.upper()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tickers.get(symbol)
+            if entry is not None and now - entry[1] < self.yf_ticker_ttl:
+                return entry[0]
+            ticker = yf.Ticker(symbol)
+            self._tickers[symbol] = (ticker, now)
+            return ticker
+
+    # ------------------------------------------------------------------
+    # LLM providers
+    # ------------------------------------------------------------------
+
+    def llm_http_client(self) -> httpx.Client:
+        """Pooled keep-alive httpx client whose requests are retried under the "llm" policy"""
+        with self._lock:
+            if self._llm_client is None:
+                self._llm_client = httpx.Client(
+                    transport=_RetryingHTTPTransport(self, limits=httpx.Limits(max_keepalive_connections=self.pool_size)),
+                    timeout=self.llm_timeout,
+                )
+            return self._llm_client
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per service: calls, attempts, retries, failures, breaker state and latency percentiles"""
+        report = {}
+        for service, stats in list(self.stats.items()):
+            breaker = self._breakers.get(service)
+            report[service] = {
+                "calls": stats.calls,
+                "attempts": stats.attempts,
+                "retries": stats.retries,
+                "failures": stats.failures,
+                "short_circuited": stats.short_circuited,
+                "breaker_trips": stats.breaker_trips,
+                "breaker_state": breaker.state if breaker else "closed",
+                "cache_hits": stats.cache_hits,
+                "latency_s": stats.percentiles(),
+            }
+        return report
+
+    def summary(self) -> str:
+        lines = []
+        for service, entry in sorted(self.report().items()):
+            latency = entry["latency_s"]
+            lines.append(
+                f"{service}: {entry['calls']} calls, {entry['retries']} retries, {entry['failures']} failed, "
+                f"{entry['short_circuited']} short-circuited"
+                + (f", p50 {latency['p50']}s p99 {latency['p99']}s" if latency else "")
+            )
+        return "\n".join(lines)
+
+
+class _RetryingHTTPTransport(httpx.HTTPTransport):
+    """httpx transport that sends each request through Transport.call"""
+
+    def __init__(self, transport: Transport, **kwargs):
+        super().__init__(**kwargs)
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        service = f"llm:{request.url.host}"
+        policy = self._transport.policy_for(service)
+
+        def attempt():
+            response = super(_RetryingHTTPTransport, self).handle_request(request)
+            if response.status_code in policy.retry_statuses:
+                # Read the body so the caller can still report the provider's error message
+                response.read()
+                raise RetryableStatusError(
+                    response.status_code, _retry_after_seconds(response.headers.get("retry-after")), response
+                )
+            return response
+
+        try:
+            return self._transport.call(attempt, service, policy)
+        except RetryableStatusError as e:
+            # Out of retries: hand the error response to the SDK so it raises its usual exception
+            return e.response
+
+
+def _expires_at(response) -> Optional[float]:
+    for directive in response.headers.get("Cache-Control", "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "no-cache" and not value:
+            return None
+        if name == "max-age" and value.isdigit():
+            return time.time() + int(value) if int(value) > 0 else None
+    return None
+
+
+def _known_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+    names = {f.name for f in fields(cls)}
+    return {key: (tuple(value) if isinstance(value, list) else value) for key, value in values.items() if key in names}
+
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport(config: Optional[Dict[str, Any]] = None) -> Transport:
+    """Process-wide transport; created from the config on first use"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport(config)
+        return _transport
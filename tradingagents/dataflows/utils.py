@@ -1,6 +1,8 @@
 import os
 import json
+import threading
 import pandas as pd
+from contextlib import contextmanager
 from datetime import date, timedelta, datetime
 from typing import Annotated
 
@@ -12,6 +14,27 @@ def save_output(data: pd.DataFrame, tag: str, save_path: SavePathType = None) ->
         print(f"{tag} saved to {save_path}")
 
 
+@contextmanager
+def atomic_write_path(path):
+    """
+    Yield a temporary path next to path; it replaces path only if the block succeeds,
+    so readers never see a partially written file.
+    """
+    path = str(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    root, ext = os.path.splitext(path)
+    # Unique per process and thread; keep the extension: some writers pick the format from it
+    tmp_path = f"{root}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 def get_current_date():
     return date.today().strftime("%Y-%m-%d")
 
@@ -1,20 +1,20 @@
 # gets data/stats
 
-import yfinance as yf
 from typing import Annotated, Callable, Any, Optional
 from pandas import DataFrame
 import pandas as pd
 from functools import wraps
 
+from .transport import get_transport
 from .utils import save_output, SavePathType, decorate_all_methods
 
 
 def init_ticker(func: Callable) -> Callable:
-    """Decorator to initialize yf.Ticker and pass it to the function."""
+    """Decorator to look up the shared yf.Ticker and pass it to the function."""
 
     @wraps(func)
     def wrapper(symbol: Annotated[str, "ticker symbol"], *args, **kwargs) -> Any:
-        ticker = yf.Ticker(symbol)
+        ticker = get_transport().yf_ticker(symbol)
         return func(ticker, *args, **kwargs)
 
     return wrapper
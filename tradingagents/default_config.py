@@ -3,7 +3,7 @@ import os
 DEFAULT_CONFIG = {
     "project_dir": os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
     "results_dir": os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results"),
-    "data_dir": "/Users/yluo/Documents/Code/ScAI/FR1-data",
+    "data_dir": os.getenv("TRADINGAGENTS_DATA_DIR", "/Users/yluo/Documents/Code/ScAI/FR1-data"),
     "data_cache_dir": os.path.join(
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
@@ -13,10 +13,76 @@ DEFAULT_CONFIG = {
     "deep_think_llm": "gpt-4o",
     "quick_think_llm": "gpt-4o",
     "backend_url": "https://api.laozhang.ai/v1",
+    # Stream LLM tokens from graph nodes to the event bus (tradingagents/graph/streaming.py).
+    # Off for batch runs: while on, every LLM call uses the provider's streaming API; the UIs turn it on
+    "stream_tokens": False,
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # "sequential": Risky -> Safe -> Neutral turns; "parallel": all three answer the previous round at once
+    "risk_debate_mode": "sequential",
+    # Per-node overrides of the debate prompt budgets in agents/utils/debate_context.py,
+    # e.g. {"risk": {"summary_tokens": 1200}}
+    "debate_context": {},
+    # Memory settings: "auto" follows llm_provider and falls back to local hashing embeddings
+    "embedding_provider": "auto",
+    "memory_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/memory",
+    ),
+    "persist_memory": True,
+    # Checkpointing: save each graph step to SQLite so propagate() resumes a failed run
+    # from the last completed node (tradingagents/graph/checkpointing.py)
+    "checkpointing": True,
+    "checkpoint_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/checkpoints",
+    ),
+    "checkpoint_retries": 1,  # In-process resumes after a failed node before propagate() raises
+    # Comprehensive chart output profile: "document", "print" (300 dpi) or a dict such as
+    # {"dpi": 100, "format": "jpg"} (tradingagents/agents/generators/comprehensive_charts.py)
+    "chart_profile": "document",
+    # Artifact cache: rendered charts keyed by (type, ticker, data hash, profile) and reused when a
+    # report is rebuilt from unchanged data (tradingagents/agents/utils/artifact_cache.py)
+    "artifact_cache": True,
+    "artifact_cache_dir": None,  # Default: <results_dir>/.artifact_cache
+    "artifact_cache_max_mb": 512,
+    # Tracing: spans for graph nodes, tool calls, LLM calls (with token counts), data fetches and
+    # report writes, exported in the background to <results_dir>/traces, plus a critical-path
+    # summary per run in summaries.jsonl (tradingagents/dataflows/tracing.py)
+    "tracing": True,
+    "trace_dir": None,  # Default: <results_dir>/traces
+    "trace_format": "jsonl",  # "jsonl": one span per line; "otlp": OTLP/JSON export requests
+    "trace_print_summary": False,  # Also print each run's critical path and time per kind
+    "trace_max_age": 4 * 3600,  # Seconds before a run whose root span never ended is dropped from memory
+    # Transport: pooled keep-alive sessions, HTTP caching and one retry/circuit-breaker policy for
+    # data sources and LLM calls (tradingagents/dataflows/transport.py)
+    "retry_policy": {"max_attempts": 3, "backoff_base": 1.0, "backoff_max": 20.0, "deadline": 120.0},
+    "retry_policy_overrides": {"llm": {"backoff_base": 3.0, "deadline": 600.0}},  # Keyed by service prefix
+    "circuit_breaker": {"failure_threshold": 5, "reset_timeout": 60.0},
+    "http_pool_size": 10,  # Keep-alive connections per host
+    "http_timeout": (5, 30),  # (connect, read) seconds for data source requests
+    "http_cache_entries": 256,
+    "llm_timeout": 180,  # Seconds per LLM request
+    "yf_ticker_ttl": 300,  # Seconds a shared yf.Ticker (and the data it cached) is reused
+    # Record/replay of data tool responses (tradingagents/dataflows/replay.py): "live" fetches as usual,
+    # "record" also saves every response to the bundle, "replay" answers from the bundle with no network
+    "data_mode": os.getenv("TRADINGAGENTS_DATA_MODE", "live"),
+    "replay_bundle": os.getenv("TRADINGAGENTS_REPLAY_BUNDLE"),  # Default: <data_cache_dir>/replay/bundle.json.gz
+    # State offloading: reports, debate histories, plans and optimization results above the size
+    # threshold are kept in a content-addressed store and the graph state carries references, so
+    # checkpoints and streamed states stay small (tradingagents/agents/utils/report_store.py)
+    "state_offload": True,
+    "state_offload_min_chars": 2000,
+    "report_store_dir": None,  # Default: <data_cache_dir>/report_store
+    "report_store_cache_mb": 32,  # Memory cache for recently used values
+    "report_store_max_age_days": 7,
+    # State log: the final state of each (ticker, trade date) appended once to
+    # <state_log_dir>/<TICKER>/TradingAgentsStrategy_logs with an offset index for random access
+    # (tradingagents/agents/utils/state_log.py)
+    "state_log_dir": "eval_results",
+    "state_log_compress": True,
     # Tool settings
     "online_tools": True,
 }
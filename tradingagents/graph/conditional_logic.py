@@ -1,5 +1,7 @@
 # TradingAgents/graph/conditional_logic.py
 
+from typing import List, Union
+
 from tradingagents.agents.utils.agent_states import AgentState
 
 
@@ -105,3 +107,9 @@ class ConditionalLogic:
         if state["risk_debate_state"]["latest_speaker"].startswith("Safe"):
             return "Neutral Analyst"
         return "Risky Analyst"
+
+    def should_continue_risk_round(self, state: AgentState) -> Union[str, List[str]]:
+        """Parallel mode: start another round with all three debators, or hand off to the judge."""
+        if state["risk_debate_state"]["count"] >= 3 * self.max_risk_discuss_rounds:
+            return "Risk Judge"
+        return ["Risky Analyst", "Safe Analyst", "Neutral Analyst"]
@@ -0,0 +1,126 @@
+# TradingAgents/graph/llm_providers.py
+
+import functools
+import os
+from typing import Any, Callable, Dict, Iterable, Union
+
+# Provider name -> factory(model, config) -> chat model. Factories import their
+# provider SDK on first use, so only the selected provider is ever loaded.
+_PROVIDERS: Dict[str, Callable[[str, Dict[str, Any]], Any]] = {}
+
+
+def register_llm_provider(names: Union[str, Iterable[str]], factory: Callable[[str, Dict[str, Any]], Any]):
+    """Register a chat model factory under one or more provider names (case-insensitive)."""
+    for name in [names] if isinstance(names, str) else names:
+        _PROVIDERS[name.lower()] = factory
+
+
+def available_llm_providers():
+    return sorted(_PROVIDERS)
+
+
+def create_llm(model: str, config: Dict[str, Any]):
+    """Build a chat model for config["llm_provider"]."""
+    provider = config["llm_provider"].lower()
+    factory = _PROVIDERS.get(provider)
+    if factory is None:
+        raise ValueError(f"Unsupported LLM provider: {config['llm_provider']}")
+    return factory(model, config)
+
+
+@functools.lru_cache(maxsize=None)
+def transport_routed(chat_model_cls, service: str = "llm"):
+    """
+    Subclass of a LangChain chat model class whose completions run under Transport.call
+
+    For provider SDKs that cannot take the pooled httpx client (the OpenAI one is routed at
+    the HTTP level by llm_http_client()), so the same retry policy and circuit breaker cover
+    every LLM call. A streamed completion is retried only until its first chunk arrives,
+    so no token reaches the stream handlers twice.
+
+    Args:
+        chat_model_cls: A BaseChatModel subclass, e.g. ChatAnthropic
+        service: Transport service key; "llm:<provider>" picks up retry_policy_overrides["llm"]
+    """
+    from tradingagents.dataflows.transport import get_transport
+
+    class TransportRouted(chat_model_cls):
+        def _generate(self, *args, **kwargs):
+            return get_transport().call(lambda: super(TransportRouted, self)._generate(*args, **kwargs), service)
+
+        def _stream(self, *args, **kwargs):
+            def open_stream():
+                chunks = super(TransportRouted, self)._stream(*args, **kwargs)
+                return chunks, next(chunks, None)
+
+            chunks, first = get_transport().call(open_stream, service)
+            if first is not None:
+                yield first
+                yield from chunks
+
+    TransportRouted.__name__ = TransportRouted.__qualname__ = chat_model_cls.__name__
+    return TransportRouted
+
+
+def _openai_factory(model, config):
+    from langchain_openai import ChatOpenAI
+    from tradingagents.dataflows.transport import get_transport
+
+    # Pooled client retried by the shared policy; the SDK's own retries are off so there is one retry layer
+    return ChatOpenAI(
+        model=model,
+        base_url=config["backend_url"],
+        http_client=get_transport(config).llm_http_client(),
+        max_retries=0,
+        timeout=config.get("llm_timeout", 180),
+        # Streamed responses (token streaming to the UIs) only carry token usage when asked for it
+        stream_usage=True,
+    )
+
+
+def _anthropic_factory(model, config):
+    from langchain_anthropic import ChatAnthropic
+
+    # Retried by the shared policy instead of the SDK, as for OpenAI
+    return transport_routed(ChatAnthropic, "llm:anthropic")(model=model, base_url=config["backend_url"], max_retries=0)
+
+
+def _google_factory(model, config):
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return transport_routed(ChatGoogleGenerativeAI, "llm:google")(model=model, max_retries=0)
+
+
+def _watsonx_factory(model, config):
+    try:
+        from langchain_ibm import ChatWatsonx
+    except ImportError:
+        raise ImportError(
+            "langchain-ibm is not installed. Please install it with: "
+            "uv pip install langchain-ibm ibm-watsonx-ai"
+        )
+
+    # Initialize WatsonX LLMs with required parameters
+    watsonx_params = {
+        "url": os.getenv("WATSONX_URL", config.get("watsonx_url", "https://us-south.ml.cloud.ibm.com")),
+        "project_id": os.getenv("WATSONX_PROJECT_ID", config.get("watsonx_project_id")),
+    }
+
+    # Use API key authentication
+    api_key = os.getenv("WATSONX_API_KEY", config.get("watsonx_api_key"))
+    if api_key:
+        watsonx_params["apikey"] = api_key
+
+    # Model parameters for generation
+    generation_params = {
+        "max_new_tokens": config.get("max_tokens", 4096),
+        "temperature": config.get("temperature", 0.7),
+    }
+
+    return transport_routed(ChatWatsonx, "llm:watsonx")(model_id=model, params=generation_params, **watsonx_params)
+
+
+register_llm_provider(["openai", "ollama", "openrouter", "laozhang gpt-4o (custom)"], _openai_factory)
+register_llm_provider("anthropic", _anthropic_factory)
+register_llm_provider("google", _google_factory)
+register_llm_provider("watsonx", _watsonx_factory)
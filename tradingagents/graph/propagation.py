@@ -1,6 +1,6 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -24,11 +24,12 @@ class Propagator:
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {"history": "", "summary": "", "current_response": "", "count": 0}
             ),
             "risk_debate_state": RiskDebateState(
                 {
                     "history": "",
+                    "summary": "",
                     "current_risky_response": "",
                     "current_safe_response": "",
                     "current_neutral_response": "",
@@ -45,9 +46,17 @@ class Propagator:
             "document_path": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, stream_mode: str = "values", thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            stream_mode: "values" yields the full state after each step, "updates" only each node's delta
+            thread_id: Checkpoint thread, required when the graph was compiled with a checkpointer
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if thread_id:
+            config["configurable"] = {"thread_id": thread_id}
         return {
-            "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "stream_mode": stream_mode,
+            "config": config,
         }
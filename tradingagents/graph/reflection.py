@@ -1,13 +1,27 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+from tradingagents.agents.utils.memory import situation_text
+
+
+# Component name -> (label, output extractor); names match the memory roles without "_memory"
+REFLECTION_COMPONENTS = {
+    "bull": ("BULL", lambda state: state["investment_debate_state"]["bull_history"]),
+    "bear": ("BEAR", lambda state: state["investment_debate_state"]["bear_history"]),
+    "trader": ("TRADER", lambda state: state["trader_investment_plan"]),
+    "invest_judge": ("INVEST JUDGE", lambda state: state["investment_debate_state"]["judge_decision"]),
+    "risk_manager": ("RISK JUDGE", lambda state: state["risk_debate_state"]["judge_decision"]),
+}
 
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
+    def __init__(self, quick_thinking_llm: "ChatOpenAI"):
         """Initialize the reflector with an LLM."""
         self.quick_thinking_llm = quick_thinking_llm
         self.reflection_system_prompt = self._get_reflection_prompt()
@@ -48,18 +62,12 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
 
     def _extract_current_situation(self, current_state: Dict[str, Any]) -> str:
         """Extract the current market situation from the state."""
-        curr_market_report = current_state["market_report"]
-        curr_sentiment_report = current_state["sentiment_report"]
-        curr_news_report = current_state["news_report"]
-        curr_fundamentals_report = current_state["fundamentals_report"]
+        # Same text the agents query with, so stored and queried situations are comparable
+        return situation_text(current_state)
 
-        return f"{curr_market_report}\n\n{curr_sentiment_report}\n\n{curr_news_report}\n\n{curr_fundamentals_report}"
-
-    def _reflect_on_component(
-        self, component_type: str, report: str, situation: str, returns_losses
-    ) -> str:
-        """Generate reflection for a component."""
-        messages = [
+    def _reflection_messages(self, report: str, situation: str, returns_losses) -> list:
+        """Build the reflection prompt for one component's output."""
+        return [
             ("system", self.reflection_system_prompt),
             (
                 "human",
@@ -67,9 +75,74 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
+    def _reflect_on_component(
+        self, component_type: str, report: str, situation: str, returns_losses
+    ) -> str:
+        """Generate reflection for a component."""
+        messages = self._reflection_messages(report, situation, returns_losses)
         result = self.quick_thinking_llm.invoke(messages).content
         return result
 
+    def reflect_batch(
+        self,
+        states_and_returns: List[Tuple[Dict[str, Any], Any]],
+        memories: Dict[str, Any],
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, str]]:
+        """Reflect on every component of one or more trade dates at once.
+
+        All reflection prompts go out as one concurrent LLM batch and the
+        results are written with one batched add per memory index, so nightly
+        reflection over many tickers and dates is bounded by concurrency
+        rather than serial LLM latency.
+
+        Args:
+            states_and_returns: (final state, returns_losses) pairs
+            memories: Component name ("bull", "bear", "trader", "invest_judge",
+                "risk_manager") -> FinancialSituationMemory
+            max_concurrency: Maximum concurrent LLM requests
+
+        Returns:
+            One dict of component name -> reflection text per input pair
+        """
+        jobs = []
+        for state_index, (current_state, returns_losses) in enumerate(states_and_returns):
+            situation = self._extract_current_situation(current_state)
+            for name, (component_type, get_report) in REFLECTION_COMPONENTS.items():
+                if name in memories:
+                    messages = self._reflection_messages(get_report(current_state), situation, returns_losses)
+                    jobs.append((state_index, name, situation, messages))
+
+        if not jobs:
+            return [{} for _ in states_and_returns]
+
+        responses = self.quick_thinking_llm.batch(
+            [messages for _, _, _, messages in jobs],
+            config={"max_concurrency": max_concurrency},
+        )
+
+        results = [{} for _ in states_and_returns]
+        writes = {}
+        for (state_index, name, situation, _), response in zip(jobs, responses):
+            results[state_index][name] = response.content
+            memory = memories[name]
+            # Memories sharing an index are written together with one batched embedding call
+            target = getattr(memory, "index", memory)
+            writes.setdefault(id(target), (target, []))[1].append((memory, situation, response.content))
+
+        for target, records in writes.values():
+            if hasattr(target, "add_many"):
+                target.add_many([(memory.name, situation, result) for memory, situation, result in records])
+            else:
+                for memory, situation, result in records:
+                    memory.add_situations([(situation, result)])
+
+        return results
+
+    def reflect_all(self, current_state, returns_losses, memories: Dict[str, Any]) -> Dict[str, str]:
+        """Reflect on all components of one trade date concurrently and update memories."""
+        return self.reflect_batch([(current_state, returns_losses)], memories, max_concurrency=len(REFLECTION_COMPONENTS))[0]
+
     def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
         """Reflect on bull researcher's analysis and update memory."""
         situation = self._extract_current_situation(current_state)
@@ -1,29 +1,68 @@
 # TradingAgents/graph/setup.py
 
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+import importlib
+from typing import TYPE_CHECKING, Dict, Any
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
 
-from tradingagents.agents import *
-from tradingagents.agents.analysts.comprehensive_quantitative_analyst import create_comprehensive_quantitative_analyst
-from tradingagents.agents.analysts.multi_scenario_optimizer import create_multi_scenario_optimizer
-from tradingagents.agents.analysts.portfolio_analyst import create_portfolio_analyst
-from tradingagents.agents.analysts.visualizer_analyst import create_visualizer_analyst
-from tradingagents.agents.generators.enhanced_quantitative_document_generator import create_enhanced_quantitative_document_generator
 from tradingagents.agents.utils.agent_states import AgentState
-from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.agent_utils import Toolkit, create_msg_delete
+from tradingagents.agents.utils.report_store import offloaded_node
+from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+from tradingagents.agents.managers.research_manager import create_research_manager
+from tradingagents.agents.managers.risk_manager import create_risk_manager
+from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator
+from tradingagents.agents.risk_mgmt.conservative_debator import create_safe_debator
+from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator
+from tradingagents.agents.risk_mgmt.parallel_round import as_round_contribution, create_risk_round_merger
+from tradingagents.agents.trader.trader import create_trader
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 from .conditional_logic import ConditionalLogic
 
 
+# Analyst type -> (module, factory). These modules pull in the heavy numeric and
+# document stacks, so they are imported the first time their node runs.
+LAZY_NODE_FACTORIES = {
+    "market": ("tradingagents.agents.analysts.market_analyst", "create_market_analyst"),
+    "social": ("tradingagents.agents.analysts.social_media_analyst", "create_social_media_analyst"),
+    "news": ("tradingagents.agents.analysts.news_analyst", "create_news_analyst"),
+    "fundamentals": ("tradingagents.agents.analysts.fundamentals_analyst", "create_fundamentals_analyst"),
+    "quantitative": ("tradingagents.agents.analysts.comprehensive_quantitative_analyst", "create_comprehensive_quantitative_analyst"),
+    "comprehensive_quantitative": ("tradingagents.agents.analysts.multi_scenario_optimizer", "create_multi_scenario_optimizer"),
+    "portfolio": ("tradingagents.agents.analysts.portfolio_analyst", "create_portfolio_analyst"),
+    "enterprise_strategy": ("tradingagents.agents.analysts.enterprise_strategy_analyst", "create_enterprise_strategy_analyst"),
+    "visualizer": ("tradingagents.agents.analysts.visualizer_analyst", "create_visualizer_analyst"),
+    "document_generator": ("tradingagents.agents.generators.enhanced_quantitative_document_generator", "create_enhanced_quantitative_document_generator"),
+}
+
+
+def create_lazy_node(node_type: str, *factory_args):
+    """Graph node that imports and builds the real node on its first call."""
+    module_name, factory_name = LAZY_NODE_FACTORIES[node_type]
+    node = None
+
+    def lazy_node(state):
+        nonlocal node
+        if node is None:
+            factory = getattr(importlib.import_module(module_name), factory_name)
+            node = factory(*factory_args)
+        return node(state)
+
+    lazy_node.__name__ = f"{node_type}_node"
+    return lazy_node
+
+
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
     def __init__(
         self,
-        quick_thinking_llm: ChatOpenAI,
-        deep_thinking_llm: ChatOpenAI,
+        quick_thinking_llm: "ChatOpenAI",
+        deep_thinking_llm: "ChatOpenAI",
         toolkit: Toolkit,
         tool_nodes: Dict[str, ToolNode],
         bull_memory,
@@ -32,8 +71,18 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        risk_debate_mode: str = "sequential",
+        state_offload: bool = False,
     ):
-        """Initialize with required components."""
+        """Initialize with required components.
+
+        Args:
+            risk_debate_mode: "sequential" (Risky -> Safe -> Neutral turns) or "parallel"
+                (all three answer the previous round at once, then merge)
+            state_offload: Keep large state values in the report store and only references in the state
+        """
+        if risk_debate_mode not in ("sequential", "parallel"):
+            raise ValueError(f"Unknown risk_debate_mode: {risk_debate_mode}. Available: ['sequential', 'parallel']")
         self.quick_thinking_llm = quick_thinking_llm
         self.deep_thinking_llm = deep_thinking_llm
         self.toolkit = toolkit
@@ -44,9 +93,13 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.risk_debate_mode = risk_debate_mode
+        self.state_offload = state_offload
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals", "quantitative", "portfolio"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals", "quantitative", "portfolio"],
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -71,65 +124,64 @@ class GraphSetup:
         tool_nodes = {}
 
         if "market" in selected_analysts:
-            analyst_nodes["market"] = create_market_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["market"] = create_lazy_node(
+                "market", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["market"] = create_msg_delete()
             tool_nodes["market"] = self.tool_nodes["market"]
 
         if "social" in selected_analysts:
-            analyst_nodes["social"] = create_social_media_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["social"] = create_lazy_node(
+                "social", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["social"] = create_msg_delete()
             tool_nodes["social"] = self.tool_nodes["social"]
 
         if "news" in selected_analysts:
-            analyst_nodes["news"] = create_news_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["news"] = create_lazy_node(
+                "news", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["news"] = create_msg_delete()
             tool_nodes["news"] = self.tool_nodes["news"]
 
         if "fundamentals" in selected_analysts:
-            analyst_nodes["fundamentals"] = create_fundamentals_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["fundamentals"] = create_lazy_node(
+                "fundamentals", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
         if "quantitative" in selected_analysts:
-            analyst_nodes["quantitative"] = create_comprehensive_quantitative_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["quantitative"] = create_lazy_node(
+                "quantitative", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["quantitative"] = create_msg_delete()
             tool_nodes["quantitative"] = self.tool_nodes.get("quantitative", self.tool_nodes["market"])
 
         if "comprehensive_quantitative" in selected_analysts:
-            analyst_nodes["comprehensive_quantitative"] = create_multi_scenario_optimizer(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["comprehensive_quantitative"] = create_lazy_node(
+                "comprehensive_quantitative", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["comprehensive_quantitative"] = create_msg_delete()
             tool_nodes["comprehensive_quantitative"] = self.tool_nodes.get("comprehensive_quantitative", self.tool_nodes["market"])
 
         if "portfolio" in selected_analysts:
-            analyst_nodes["portfolio"] = create_portfolio_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["portfolio"] = create_lazy_node(
+                "portfolio", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["portfolio"] = create_msg_delete()
             tool_nodes["portfolio"] = self.tool_nodes.get("portfolio", self.tool_nodes["market"])
 
         if "enterprise_strategy" in selected_analysts:
-            from tradingagents.agents.analysts.enterprise_strategy_analyst import create_enterprise_strategy_analyst
-            analyst_nodes["enterprise_strategy"] = create_enterprise_strategy_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["enterprise_strategy"] = create_lazy_node(
+                "enterprise_strategy", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["enterprise_strategy"] = create_msg_delete()
             tool_nodes["enterprise_strategy"] = self.tool_nodes.get("enterprise_strategy", self.tool_nodes["market"])
 
         if "visualizer" in selected_analysts:
-            analyst_nodes["visualizer"] = create_visualizer_analyst(
-                self.quick_thinking_llm, self.toolkit
+            analyst_nodes["visualizer"] = create_lazy_node(
+                "visualizer", self.quick_thinking_llm, self.toolkit
             )
             delete_nodes["visualizer"] = create_msg_delete()
             tool_nodes["visualizer"] = self.tool_nodes.get("visualizer", self.tool_nodes["market"])
@@ -153,33 +205,43 @@ class GraphSetup:
         risk_manager_node = create_risk_manager(
             self.deep_thinking_llm, self.risk_manager_memory
         )
+        if self.risk_debate_mode == "parallel":
+            risky_analyst = as_round_contribution(risky_analyst, "Risky")
+            safe_analyst = as_round_contribution(safe_analyst, "Safe")
+            neutral_analyst = as_round_contribution(neutral_analyst, "Neutral")
 
         # Create document generator (always use enhanced version)
-        document_generator_node = create_enhanced_quantitative_document_generator(
-            self.deep_thinking_llm, self.toolkit
+        document_generator_node = create_lazy_node(
+            "document_generator", self.deep_thinking_llm, self.toolkit
         )
 
         # Create workflow
         workflow = StateGraph(AgentState)
 
+        def add_agent_node(name, node):
+            # Agent nodes read and write the reports; message-only and tool nodes never see them
+            workflow.add_node(name, offloaded_node(node) if self.state_offload else node)
+
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+            add_agent_node(f"{analyst_type.capitalize()} Analyst", node)
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
             )
             workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
-        workflow.add_node("Bull Researcher", bull_researcher_node)
-        workflow.add_node("Bear Researcher", bear_researcher_node)
-        workflow.add_node("Research Manager", research_manager_node)
-        workflow.add_node("Trader", trader_node)
-        workflow.add_node("Risky Analyst", risky_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Safe Analyst", safe_analyst)
-        workflow.add_node("Risk Judge", risk_manager_node)
-        workflow.add_node("Document Generator", document_generator_node)
+        add_agent_node("Bull Researcher", bull_researcher_node)
+        add_agent_node("Bear Researcher", bear_researcher_node)
+        add_agent_node("Research Manager", research_manager_node)
+        add_agent_node("Trader", trader_node)
+        add_agent_node("Risky Analyst", risky_analyst)
+        add_agent_node("Neutral Analyst", neutral_analyst)
+        add_agent_node("Safe Analyst", safe_analyst)
+        add_agent_node("Risk Judge", risk_manager_node)
+        if self.risk_debate_mode == "parallel":
+            add_agent_node("Risk Round", create_risk_round_merger())
+        add_agent_node("Document Generator", document_generator_node)
 
         # Define edges
         # Start with the first analyst
@@ -225,34 +287,46 @@ class GraphSetup:
             },
         )
         workflow.add_edge("Research Manager", "Trader")
-        workflow.add_edge("Trader", "Risky Analyst")
-        workflow.add_conditional_edges(
-            "Risky Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Safe Analyst": "Safe Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
-        workflow.add_conditional_edges(
-            "Safe Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Neutral Analyst": "Neutral Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
-        workflow.add_conditional_edges(
-            "Neutral Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Risky Analyst": "Risky Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
+        risk_debators = ["Risky Analyst", "Safe Analyst", "Neutral Analyst"]
+        if self.risk_debate_mode == "parallel":
+            # Each round runs the three debators in one step; the round latency is the slowest debator
+            for debator in risk_debators:
+                workflow.add_edge("Trader", debator)
+            workflow.add_edge(risk_debators, "Risk Round")
+            workflow.add_conditional_edges(
+                "Risk Round",
+                self.conditional_logic.should_continue_risk_round,
+                risk_debators + ["Risk Judge"],
+            )
+        else:
+            workflow.add_edge("Trader", "Risky Analyst")
+            workflow.add_conditional_edges(
+                "Risky Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Safe Analyst": "Safe Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+            workflow.add_conditional_edges(
+                "Safe Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Neutral Analyst": "Neutral Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+            workflow.add_conditional_edges(
+                "Neutral Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Risky Analyst": "Risky Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
 
         workflow.add_edge("Risk Judge", "Document Generator")
         workflow.add_edge("Document Generator", END)
 
-        # Compile and return
-        return workflow.compile()
+        # Compile and return; with a checkpointer every step is saved so a failed run can resume
+        return workflow.compile(checkpointer=checkpointer)
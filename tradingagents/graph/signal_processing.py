@@ -1,14 +1,31 @@
 # TradingAgents/graph/signal_processing.py
 
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+from tradingagents.agents.utils.decision_extraction import extract_decision
 
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(self, quick_thinking_llm: "ChatOpenAI", use_fast_path: bool = True):
+        """Initialize with an LLM for processing.
+
+        Args:
+            quick_thinking_llm: LLM used when the signal has no unambiguous decision marker
+            use_fast_path: Parse structured markers before falling back to the LLM
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.use_fast_path = use_fast_path
+        self.stats = {"signals": 0, "fast_path": 0, "llm_fallback": 0}
+
+    @property
+    def fallback_rate(self) -> float:
+        """Share of processed signals that needed the LLM."""
+        return self.stats["llm_fallback"] / self.stats["signals"] if self.stats["signals"] else 0.0
 
     def process_signal(self, full_signal: str) -> str:
         """
@@ -20,6 +37,21 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
+        self.stats["signals"] += 1
+
+        if self.use_fast_path:
+            extracted = extract_decision(full_signal)
+            if extracted.decision:
+                self.stats["fast_path"] += 1
+                return extracted.decision
+
+        self.stats["llm_fallback"] += 1
+        if self.use_fast_path:
+            print(
+                f"[SignalProcessor] No unambiguous decision marker, using LLM "
+                f"(fallback rate {self.fallback_rate:.0%} of {self.stats['signals']} signals)"
+            )
+
         messages = [
             (
                 "system",
@@ -0,0 +1,175 @@
+# TradingAgents/graph/streaming.py
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Node label for LLM calls made outside LangGraph (interactive workflow), and the
+# channel (e.g. a web session) that events from this context belong to
+_current_node: ContextVar[Optional[str]] = ContextVar("stream_node", default=None)
+_current_channel: ContextVar[Optional[str]] = ContextVar("stream_channel", default=None)
+
+
+@dataclass
+class StreamEvent:
+    """A per-node streaming event: 'llm_start', 'token' (delta text) or 'llm_end'"""
+    type: str
+    node: str
+    delta: str = ""
+    run_id: Optional[str] = None
+    channel: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "node": self.node,
+            "delta": self.delta,
+            "run_id": self.run_id,
+            "timestamp": self.timestamp,
+        }
+
+
+class EventBus:
+    """In-process publish/subscribe for stream events; callbacks run on the publishing thread."""
+
+    def __init__(self):
+        self._subscribers: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        callback: Callable[[StreamEvent], None],
+        channel: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+    ) -> Callable[[], None]:
+        """Register a callback, optionally filtered by channel and event type. Returns an unsubscribe function."""
+        entry = (callback, channel, set(event_types) if event_types else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def publish(self, event: StreamEvent):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, channel, event_types in subscribers:
+            if channel is not None and channel != event.channel:
+                continue
+            if event_types is not None and event.type not in event_types:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"WARNING: Stream subscriber failed: {e}")
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Process-wide event bus shared by the graph and the UIs"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
+
+
+@contextmanager
+def streaming_node(node: str):
+    """Attribute LLM tokens in this context to `node` (for nodes run outside LangGraph)"""
+    token = _current_node.set(node)
+    try:
+        yield
+    finally:
+        _current_node.reset(token)
+
+
+def with_streaming_node(func: Callable, node: str) -> Callable:
+    """Wrap a node function so the LLM tokens it produces are attributed to `node`"""
+    def wrapper(*args, **kwargs):
+        with streaming_node(node):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def stream_scope(channel: str):
+    """Tag events published in this context with `channel` so subscribers can filter per session"""
+    token = _current_channel.set(channel)
+    try:
+        yield
+    finally:
+        _current_channel.reset(token)
+
+
+def _token_text(token: Any, chunk: Any) -> str:
+    if isinstance(token, str) and token:
+        return token
+    # Providers that stream content blocks (e.g. Anthropic) put the text in the chunk
+    content = getattr(getattr(chunk, "message", None), "content", None)
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content if isinstance(content, str) else ""
+
+
+class TokenStreamHandler(BaseCallbackHandler):
+    """
+    Publishes LLM tokens as per-node delta events.
+
+    Attached to the graph's chat models. LLM calls inside LangGraph nodes are attributed via
+    the `langgraph_node` run metadata, other calls via `streaming_node`; unattributed calls
+    (reflection, signal processing) are not published. Implementing tap_output_iter/aiter
+    makes chat models take their streaming code path while this handler is attached, so
+    tokens arrive as they are generated instead of with the full completion; that is why
+    it is only attached when config["stream_tokens"] is on (the chat UIs and the CLI).
+    """
+
+    def __init__(self, bus: Optional[EventBus] = None):
+        self.bus = bus or get_event_bus()
+        self._runs: Dict[UUID, tuple] = {}  # run_id -> (node, channel)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node") or _current_node.get()
+        if node is None or not self.bus.has_subscribers:
+            return
+        channel = _current_channel.get()
+        self._runs[run_id] = (node, channel)
+        self.bus.publish(StreamEvent("llm_start", node, run_id=str(run_id), channel=channel))
+
+    def on_llm_new_token(self, token, *, chunk=None, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run is None:
+            return
+        text = _token_text(token, chunk)
+        if text:
+            self.bus.publish(StreamEvent("token", run[0], delta=text, run_id=str(run_id), channel=run[1]))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            self.bus.publish(StreamEvent("llm_end", run[0], run_id=str(run_id), channel=run[1]))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self.on_llm_end(None, run_id=run_id)
+
+    def tap_output_iter(self, run_id, output):
+        return output
+
+    def tap_output_aiter(self, run_id, output):
+        return output
@@ -1,39 +1,33 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
-from pathlib import Path
-import json
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-try:
-    from langchain_ibm import ChatWatsonx
-    WATSONX_AVAILABLE = True
-except ImportError:
-    WATSONX_AVAILABLE = False
-    print("Warning: langchain-ibm not installed. WatsonX support disabled.")
-
 from langgraph.prebuilt import ToolNode
 
-from tradingagents.agents import *
+from tradingagents.agents.utils.agent_utils import Toolkit
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory import FinancialSituationMemory, SharedMemoryIndex
+from tradingagents.agents.utils.report_store import get_report_store, hydrate_state
+from tradingagents.agents.utils.state_log import get_state_log
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.replay import save_replay_bundles
+from tradingagents.dataflows.tracing import TracingCallbackHandler, get_tracer
 
+from .checkpointing import checkpoint_thread_id, get_checkpointer
 from .conditional_logic import ConditionalLogic
+from .llm_providers import create_llm
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .streaming import TokenStreamHandler, get_event_bus
 
 
 class TradingAgentsGraph:
@@ -54,6 +48,7 @@ class TradingAgentsGraph:
         """
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
+        self.selected_analysts = list(selected_analysts)
 
         # Update the interface's config
         set_config(self.config)
@@ -64,61 +59,27 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
-        if self.config["llm_provider"].lower() in ["openai", "ollama", "openrouter", "laozhang gpt-4o (custom)"]:
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
-        elif self.config["llm_provider"].lower() == "watsonx":
-            if not WATSONX_AVAILABLE:
-                raise ImportError(
-                    "langchain-ibm is not installed. Please install it with: "
-                    "uv pip install langchain-ibm ibm-watsonx-ai"
-                )
-
-            # Initialize WatsonX LLMs with required parameters
-            watsonx_params = {
-                "url": os.getenv("WATSONX_URL", self.config.get("watsonx_url", "https://us-south.ml.cloud.ibm.com")),
-                "project_id": os.getenv("WATSONX_PROJECT_ID", self.config.get("watsonx_project_id")),
-            }
-
-            # Use API key authentication
-            api_key = os.getenv("WATSONX_API_KEY", self.config.get("watsonx_api_key"))
-            if api_key:
-                watsonx_params["apikey"] = api_key
-
-            # Model parameters for generation
-            generation_params = {
-                "max_new_tokens": self.config.get("max_tokens", 4096),
-                "temperature": self.config.get("temperature", 0.7),
-            }
-
-            self.deep_thinking_llm = ChatWatsonx(
-                model_id=self.config["deep_think_llm"],
-                params=generation_params,
-                **watsonx_params
-            )
-            self.quick_thinking_llm = ChatWatsonx(
-                model_id=self.config["quick_think_llm"],
-                params=generation_params,
-                **watsonx_params
-            )
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
+        # Initialize LLMs (provider SDKs are imported on demand by the registry)
+        self.deep_thinking_llm = create_llm(self.config["deep_think_llm"], self.config)
+        self.quick_thinking_llm = create_llm(self.config["quick_think_llm"], self.config)
+
+        # Token streaming: node LLM calls publish per-node deltas that the UIs subscribe to
+        self.event_bus = get_event_bus()
+        self.token_stream = None
+        if self.config.get("stream_tokens", False):
+            self.token_stream = TokenStreamHandler(self.event_bus)
+            for llm in (self.deep_thinking_llm, self.quick_thinking_llm):
+                llm.callbacks = [*(llm.callbacks or []), self.token_stream]
+
         self.toolkit = Toolkit(config=self.config)
 
-        # Initialize memories
-        self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-        self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-        self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        # Initialize memories: role-tagged views of one shared index, so a propagate embeds its situation once
+        self.memory_index = SharedMemoryIndex(self.config)
+        self.bull_memory = FinancialSituationMemory("bull_memory", self.config, self.memory_index)
+        self.bear_memory = FinancialSituationMemory("bear_memory", self.config, self.memory_index)
+        self.trader_memory = FinancialSituationMemory("trader_memory", self.config, self.memory_index)
+        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config, self.memory_index)
+        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config, self.memory_index)
 
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
@@ -136,6 +97,8 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            risk_debate_mode=self.config.get("risk_debate_mode", "sequential"),
+            state_offload=self.config.get("state_offload", False),
         )
 
         self.propagator = Propagator()
@@ -145,10 +108,18 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.artifacts = None  # ReportArtifacts of the last run (Markdown/Word/CSV written in the background)
+
+        # Tracing: one trace per run with spans for nodes, tools, LLM calls, data fetches and file writes
+        self.tracer = get_tracer(self.config)
+        self.run_span = None
+        self.trace_summary = None  # Critical path and time per span kind of the last run
+
+        # Checkpointing: every graph step is saved so a failed propagate resumes where it stopped
+        self.checkpointer = get_checkpointer(self.config) if self.config.get("checkpointing", True) else None
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(selected_analysts, checkpointer=self.checkpointer)
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -186,57 +157,108 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def checkpoint_thread_id(self, company_name, trade_date) -> str:
+        """Checkpoint thread for a run, keyed by (ticker, trade_date, config hash)."""
+        return checkpoint_thread_id(company_name, trade_date, self.config, self.selected_analysts)
 
-        self.ticker = company_name
+    def prepare_run(self, company_name, trade_date, stream_mode="values", resume=True):
+        """Get the graph input and arguments for a run.
 
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
+        If checkpointing is enabled and an earlier run for the same ticker, date and config
+        stopped part-way, the input is None so LangGraph resumes from its last completed node.
+        Otherwise any stale checkpoints are cleared and the run starts from the initial state.
+
+        Returns:
+            (graph input or None, graph args)
+        """
+        thread_id = self.checkpoint_thread_id(company_name, trade_date) if self.checkpointer else None
+        args = self.propagator.get_graph_args(stream_mode=stream_mode, thread_id=thread_id)
+        init_agent_state = self.propagator.create_initial_state(company_name, trade_date)
+
+        # A run that failed without finish_run is closed here so its trace is still reported
+        self.tracer.end_span(self.run_span, error=RuntimeError("run did not finish"))
+        self.run_span = self.tracer.start_span(
+            "propagate", "run", root=True, ticker=company_name, trade_date=str(trade_date)
         )
-        args = self.propagator.get_graph_args()
+        if self.run_span is not None:
+            args["config"]["callbacks"] = [TracingCallbackHandler(self.tracer, self.run_span)]
 
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    # 输出到控制台
-                    chunk["messages"][-1].pretty_print()
-                    
-                    # 同时写入日志文件
-                    try:
-                        log_file = "realtime_output.log"
-                        message = chunk["messages"][-1]
-                        
-                        # 写入消息内容到日志文件
-                        with open(log_file, 'a', encoding='utf-8') as f:
-                            if hasattr(message, 'content'):
-                                f.write("================================== Ai Message ==================================\n")
-                                f.write(str(message.content) + "\n")
-                            
-                            # 如果有工具调用，也写入日志
-                            if hasattr(message, 'tool_calls') and message.tool_calls:
-                                f.write("Tool Calls:\n")
-                                for tool_call in message.tool_calls:
-                                    f.write(f"  {tool_call.name} ({tool_call.id})\n")
-                                    f.write(f"  Args:\n")
-                                    for key, value in tool_call.args.items():
-                                        f.write(f"    {key}: {value}\n")
-                                f.write("================================= Tool Message =================================\n")
-                    except Exception as e:
-                        # 如果写入失败，继续执行，不影响主程序
-                        pass
-                    
-                    trace.append(chunk)
+        if self.checkpointer is None:
+            return init_agent_state, args
+
+        snapshot = self.graph.get_state(args["config"])
+        if resume and snapshot.next:
+            missing = get_report_store(self.config).missing_refs(snapshot.values)
+            if not missing:
+                print(f"[Checkpoint] Resuming {thread_id} at {', '.join(snapshot.next)}")
+                return None, args
+            print(f"WARNING: {len(missing)} offloaded values of {thread_id} are no longer stored, starting over")
+
+        self.checkpointer.delete_thread(thread_id)
+        return init_agent_state, args
+
+    def finish_run(self, args, final_state=None):
+        """Return the completed run's full state and drop its checkpoints.
+
+        Offloaded report store references are resolved, so callers get the full reports.
+        Also picks up the run's report outputs handle (self.artifacts): the Markdown,
+        Word and CSV files may still be being written when the decision is returned.
+        """
+        if self.checkpointer is not None:
+            config = args["config"]
+            final_state = self.graph.get_state(config).values
+            self.checkpointer.delete_thread(config["configurable"]["thread_id"])
+        final_state = hydrate_state(final_state, self.config)
+
+        from tradingagents.agents.generators.report_outputs import get_report_artifacts
+        self.artifacts = get_report_artifacts(final_state["company_of_interest"], final_state["trade_date"])
+
+        self.end_run_trace()
+        if self.config.get("data_mode") == "record":
+            save_replay_bundles()
+        return final_state
+
+    def end_run_trace(self, error=None):
+        """End the run's root span; its summary (critical path, time per kind) becomes self.trace_summary."""
+        span, self.run_span = self.run_span, None
+        if span is None:
+            return
+        self.tracer.end_span(span, error=error)
+        self.trace_summary = self.tracer.summaries.get(span.span_id)
+
+    def propagate(self, company_name, trade_date, resume=True):
+        """Run the trading agents graph for a company on a specific date.
+
+        Args:
+            company_name: Ticker to analyze
+            trade_date: Analysis date
+            resume: Continue an interrupted run for the same ticker, date and config
+        """
+
+        self.ticker = company_name
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        # Initialize state (None when resuming from a checkpoint)
+        graph_input, args = self.prepare_run(company_name, trade_date, resume=resume)
+
+        # With checkpoints, a retry after a transient failure only redoes the failing node
+        attempts = 1 + (self.config.get("checkpoint_retries", 0) if self.checkpointer else 0)
+        for attempt in range(attempts):
+            try:
+                final_state = self._run_graph(graph_input, args)
+                break
+            except Exception as e:
+                if attempt + 1 >= attempts:
+                    self.end_run_trace(error=e)
+                    if self.checkpointer:
+                        print(
+                            f"[Checkpoint] Run {args['config']['configurable']['thread_id']} failed; "
+                            f"propagate() again resumes from the last completed node"
+                        )
+                    raise
+                print(f"WARNING: Graph run failed ({e}), resuming from the last completed node")
+                graph_input = None
+
+        final_state = self.finish_run(args, final_state)
 
         # Store current state for reflection
         self.curr_state = final_state
@@ -247,66 +269,93 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
-    def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
-            "company_of_interest": final_state["company_of_interest"],
-            "trade_date": final_state["trade_date"],
-            "market_report": final_state["market_report"],
-            "sentiment_report": final_state["sentiment_report"],
-            "news_report": final_state["news_report"],
-            "fundamentals_report": final_state["fundamentals_report"],
-            "investment_debate_state": {
-                "bull_history": final_state["investment_debate_state"]["bull_history"],
-                "bear_history": final_state["investment_debate_state"]["bear_history"],
-                "history": final_state["investment_debate_state"]["history"],
-                "current_response": final_state["investment_debate_state"][
-                    "current_response"
-                ],
-                "judge_decision": final_state["investment_debate_state"][
-                    "judge_decision"
-                ],
-            },
-            "trader_investment_decision": final_state["trader_investment_plan"],
-            "risk_debate_state": {
-                "risky_history": final_state["risk_debate_state"]["risky_history"],
-                "safe_history": final_state["risk_debate_state"]["safe_history"],
-                "neutral_history": final_state["risk_debate_state"]["neutral_history"],
-                "history": final_state["risk_debate_state"]["history"],
-                "judge_decision": final_state["risk_debate_state"]["judge_decision"],
-            },
-            "investment_plan": final_state["investment_plan"],
-            "final_trade_decision": final_state["final_trade_decision"],
-        }
+    def wait_for_artifacts(self, timeout=None):
+        """Block until the last run's report files are written.
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+        Returns:
+            Dict with 'markdown' and 'docx' paths and 'csv' files, or None if the run wrote no report
+        """
+        if self.artifacts is None:
+            return None
+        return self.artifacts.result(timeout=timeout)
+
+    def _run_graph(self, graph_input, args):
+        if self.debug:
+            # Debug mode: print and log every streamed message (only the latest state is kept)
+            last_chunk = None
+            # 日志文件每次运行只打开一次，每个 chunk 写完后 flush
+            try:
+                log_file = open("realtime_output.log", 'a', encoding='utf-8')
+            except OSError:
+                log_file = None
+            try:
+                for chunk in self.graph.stream(graph_input, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        # 输出到控制台
+                        chunk["messages"][-1].pretty_print()
+
+                        # 同时写入日志文件
+                        if log_file is not None:
+                            try:
+                                self._write_debug_message(log_file, chunk["messages"][-1])
+                            except Exception:
+                                # 如果写入失败，继续执行，不影响主程序
+                                pass
+
+                        last_chunk = chunk
+            finally:
+                if log_file is not None:
+                    log_file.close()
+
+            return last_chunk
+
+        # Standard mode (spans are still recorded by the tracing callbacks)
+        return self.graph.invoke(graph_input, **args)
+
+    @staticmethod
+    def _write_debug_message(log_file, message):
+        """Append a streamed message (content and tool calls) to the debug log."""
+        # 写入消息内容到日志文件
+        if hasattr(message, 'content'):
+            log_file.write("================================== Ai Message ==================================\n")
+            log_file.write(str(message.content) + "\n")
+
+        # 如果有工具调用，也写入日志
+        if hasattr(message, 'tool_calls') and message.tool_calls:
+            log_file.write("Tool Calls:\n")
+            for tool_call in message.tool_calls:
+                log_file.write(f"  {tool_call.name} ({tool_call.id})\n")
+                log_file.write(f"  Args:\n")
+                for key, value in tool_call.args.items():
+                    log_file.write(f"    {key}: {value}\n")
+            log_file.write("================================= Tool Message =================================\n")
+        log_file.flush()
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+    def _log_state(self, trade_date, final_state):
+        """Append the final state to the ticker's append-only state log."""
+        get_state_log(self.ticker, self.config).append(final_state)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+        return self.reflector.reflect_all(self.curr_state, returns_losses, self._reflection_memories())
+
+    def reflect_and_remember_batch(self, states_and_returns, max_concurrency=8):
+        """Reflect on many (final state, returns_losses) pairs, e.g. a nightly run over tickers and dates."""
+        return self.reflector.reflect_batch(
+            states_and_returns, self._reflection_memories(), max_concurrency=max_concurrency
         )
 
+    def _reflection_memories(self):
+        return {
+            "bull": self.bull_memory,
+            "bear": self.bear_memory,
+            "trader": self.trader_memory,
+            "invest_judge": self.invest_judge_memory,
+            "risk_manager": self.risk_manager_memory,
+        }
+
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
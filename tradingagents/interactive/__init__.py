@@ -24,6 +24,19 @@ from .interactive_workflow import (
     AnalystStatus
 )
 
+from .chat_jobs import (
+    ChatJob,
+    ChatJobManager,
+    ChatSession,
+    SessionBusyError,
+    ServerBusyError
+)
+
+from .log_shipping import (
+    LogShipper,
+    classify_line
+)
+
 from .gradio_ui import (
     TradingAnalysisUI,
     launch_ui
@@ -56,6 +69,17 @@ __all__ = [
     "GraphExecutorHelper",
     "create_executor_helper",
 
+    # Web chat jobs
+    "ChatJob",
+    "ChatJobManager",
+    "ChatSession",
+    "SessionBusyError",
+    "ServerBusyError",
+
+    # Web UI log streaming
+    "LogShipper",
+    "classify_line",
+
     # UI
     "TradingAnalysisUI",
     "launch_ui",
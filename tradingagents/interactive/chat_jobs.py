@@ -0,0 +1,295 @@
+"""
+Chat Job Server
+
+Per-session chat state and a bounded background worker pool for the web chat.
+Requests submit a job and return its ID immediately; progress notifications from
+InteractiveWorkflowController are published to the session's event log, which the
+web layer streams to the browser (Server-Sent Events or long-poll).
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class SessionBusyError(Exception):
+    """Raised when a session already has a queued or running job"""
+
+
+class ServerBusyError(Exception):
+    """Raised when the job queue is full"""
+
+
+@dataclass
+class ChatEvent:
+    """A progress event in a session's event log"""
+    seq: int
+    type: str  # 'job_queued', 'job_started', 'progress', 'llm_start', 'token', 'job_completed', 'job_failed'
+    data: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "type": self.type, "data": self.data, "timestamp": self.timestamp}
+
+    def to_sse(self) -> str:
+        """Format the event as a Server-Sent Events frame"""
+        return f"id: {self.seq}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+@dataclass
+class ChatJob:
+    """A chat message being processed in the background"""
+    job_id: str
+    session_id: str
+    waiting_for: Optional[str]  # Conversation state the message was answering
+    status: str = "queued"  # 'queued', 'running', 'completed', 'failed'
+    result: Optional[Dict[str, Any]] = None  # JSON payload the handler returned
+    http_status: int = 200
+    queued_seq: int = 0  # Seq of the session's job_queued event; this job's events follow it
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "result": self.result,
+            "http_status": self.http_status,
+            "queued_seq": self.queued_seq,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ChatSession:
+    """
+    Conversation state for one browser session.
+
+    Holds what flask_chat_app previously kept in module globals, plus the session's
+    workflow controller and a bounded event log for progress streaming.
+    """
+
+    def __init__(self, session_id: str, max_events: int = 2000):
+        self.session_id = session_id
+
+        # Conversation state
+        self.controller = None  # InteractiveWorkflowController, created on first analysis
+        self.waiting_for: Optional[str] = None  # 'analyst_selection', 'initial_setup', 'feedback', 'optimization_preference', 'final_decision', 'next_stock_prompt', None
+        self.current_analyst: Optional[str] = None
+        self.selected_analysts_choice: Optional[List[str]] = None  # User's chosen analysts
+        self.pending_ticker: Optional[str] = None  # Ticker held while waiting for optimization preference
+        self.pending_analysts: Optional[List[str]] = None
+        self.pending_user_message: Optional[str] = None
+
+        # Portfolio mode state
+        self.portfolio_mode = False
+        self.portfolio_tickers: List[str] = []
+        self.current_portfolio_ticker_index = 0
+        self.portfolio_results: Dict[str, Dict[str, Any]] = {}  # {ticker: {state, report, decision}}
+        self.portfolio_trade_date: Optional[str] = None
+        self.portfolio_optimization_preference: Optional[Dict[str, Any]] = None
+
+        # Job and event bookkeeping
+        self.active_job_id: Optional[str] = None
+        self.last_active = time.time()
+        self.closed = False  # Set when the session expires; ends its event streams
+        self._events: Deque[ChatEvent] = deque(maxlen=max_events)
+        self._next_seq = 1
+        self._condition = threading.Condition()
+
+    def touch(self):
+        self.last_active = time.time()
+
+    def close(self):
+        """Mark the session closed and wake any waiting stream"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> ChatEvent:
+        """Append an event to the log and wake any waiting stream"""
+        with self._condition:
+            event = ChatEvent(self._next_seq, event_type, data)
+            self._next_seq += 1
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def events_since(self, after_seq: int = 0, timeout: float = 0.0) -> List[ChatEvent]:
+        """
+        Return events newer than after_seq, waiting up to timeout seconds for one to arrive
+        (returns early once the session is closed)
+
+        Args:
+            after_seq: Last sequence number the client has seen
+            timeout: Long-poll wait in seconds (0 returns immediately)
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                events = [event for event in self._events if event.seq > after_seq]
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0 or self.closed:
+                    return events
+                self._condition.wait(remaining)
+
+    def ui_callback(self, update: Dict[str, Any]):
+        """InteractiveWorkflowController ui_callback: forward notifications as progress events"""
+        data = {"message": update.get("message", "")}
+        workflow_state = update.get("workflow_state")
+        if workflow_state is not None:
+            data.update({
+                "stage": workflow_state.stage.value,
+                "company": workflow_state.company_of_interest,
+                "current_analyst": workflow_state.get_current_analyst(),
+                "progress": workflow_state.get_progress_percentage(),
+            })
+        self.publish("progress", data)
+
+
+# Handler signature: handler(session, message) -> (JSON payload, HTTP status)
+JobHandler = Callable[[ChatSession, str], Tuple[Dict[str, Any], int]]
+
+
+class ChatJobManager:
+    """
+    Runs chat messages for many sessions on a bounded thread pool.
+
+    Each session runs at most one job at a time (its conversation state is sequential);
+    different sessions run concurrently up to max_workers, and at most max_pending
+    jobs may be queued or running before new submissions are rejected.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32, session_ttl: float = 6 * 3600,
+                 job_ttl: float = 3600):
+        """
+        Args:
+            max_workers: Number of analyses that run at the same time
+            max_pending: Maximum queued plus running jobs
+            session_ttl: Seconds of inactivity after which an idle session is dropped
+            job_ttl: Seconds a finished job's result stays available for polling
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.session_ttl = session_ttl
+        self.job_ttl = job_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chat-job")
+        self._sessions: Dict[str, ChatSession] = {}
+        self._jobs: Dict[str, ChatJob] = {}
+        self._lock = threading.Lock()
+
+    def create_session(self) -> ChatSession:
+        session = ChatSession(uuid.uuid4().hex)
+        with self._lock:
+            self._prune_locked()
+            self._sessions[session.session_id] = session
+        return session
+
+    def get_session(self, session_id: Optional[str]) -> Optional[ChatSession]:
+        with self._lock:
+            session = self._sessions.get(session_id) if session_id else None
+        if session:
+            session.touch()
+        return session
+
+    def get_job(self, job_id: str) -> Optional[ChatJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, session: ChatSession, handler: JobHandler, message: str) -> ChatJob:
+        """
+        Queue a message for background processing and return its job immediately
+
+        Raises:
+            SessionBusyError: The session already has a job in flight
+            ServerBusyError: max_pending jobs are already queued or running
+        """
+        with self._lock:
+            if session.active_job_id:
+                raise SessionBusyError(f"Session {session.session_id} is still processing job {session.active_job_id}")
+            self._prune_locked()
+            in_flight = sum(1 for job in self._jobs.values() if not job.done.is_set())
+            if in_flight >= self.max_pending:
+                raise ServerBusyError(f"{in_flight} jobs in flight (limit {self.max_pending})")
+
+            job = ChatJob(uuid.uuid4().hex, session.session_id, session.waiting_for)
+            self._jobs[job.job_id] = job
+            session.active_job_id = job.job_id
+
+        job.queued_seq = session.publish("job_queued", {"job_id": job.job_id, "waiting_for": job.waiting_for}).seq
+        self._executor.submit(self._run, session, job, handler, message)
+        return job
+
+    def _run(self, session: ChatSession, job: ChatJob, handler: JobHandler, message: str):
+        job.status = "running"
+        job.started_at = time.time()
+        session.publish("job_started", {"job_id": job.job_id})
+
+        try:
+            payload, http_status = handler(session, message)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            payload, http_status = {"error": str(e)}, 500
+
+        job.result = payload
+        job.http_status = http_status
+        job.status = "completed" if http_status < 400 else "failed"
+        job.finished_at = time.time()
+
+        print(f"[JOBS] Job {job.job_id[:8]} {job.status} in {job.finished_at - job.started_at:.1f}s "
+              f"(queued {job.started_at - job.created_at:.1f}s)", flush=True)
+        # Published before the session is freed, so it precedes the next job's events
+        session.publish(f"job_{job.status}", {
+            "job_id": job.job_id,
+            "http_status": http_status,
+            "waiting_for": payload.get("waiting_for") if isinstance(payload, dict) else None,
+        })
+
+        with self._lock:
+            session.active_job_id = None
+        session.touch()
+        job.done.set()
+
+    def wait(self, job: ChatJob, timeout: float) -> bool:
+        """Block up to timeout seconds for a job to finish; returns whether it has"""
+        return job.done.wait(timeout)
+
+    def _prune_locked(self):
+        """Drop idle sessions (closing their streams) and finished jobs older than job_ttl"""
+        now = time.time()
+        expired = [
+            session_id for session_id, session in self._sessions.items()
+            if session.last_active < now - self.session_ttl and not session.active_job_id
+        ]
+        for session_id in expired:
+            self._sessions.pop(session_id).close()
+        self._jobs = {
+            job_id: job for job_id, job in self._jobs.items()
+            if not job.done.is_set()
+            or (job.session_id in self._sessions and job.finished_at >= now - self.job_ttl)
+        }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "jobs_in_flight": sum(1 for job in self._jobs.values() if not job.done.is_set()),
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+            }
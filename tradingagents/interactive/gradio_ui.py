@@ -5,12 +5,16 @@ Provides a user-friendly web interface for interactive stock analysis.
 """
 
 import gradio as gr
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Tuple, Optional
 from datetime import datetime
+from queue import Empty, Queue
 import json
+import threading
+import uuid
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.streaming import get_event_bus, stream_scope
 from .interactive_workflow import InteractiveWorkflowController, WorkflowStage
 from .user_preference_parser import create_preference_parser
 from .feedback_analyzer import create_feedback_analyzer, FeedbackAction
@@ -36,7 +40,8 @@ class TradingAnalysisUI:
         Args:
             config: Configuration dictionary (uses DEFAULT_CONFIG if None)
         """
-        self.config = config or DEFAULT_CONFIG.copy()
+        # The chat shows LLM tokens as they are generated
+        self.config = {**(config or DEFAULT_CONFIG), "stream_tokens": True}
 
         # Initialize components
         self.graph = None
@@ -103,8 +108,8 @@ class TradingAnalysisUI:
             if not selected_analysts:
                 return "❌ Error: Please select at least one analyst", "", ""
 
-            # Initialize workflow
-            self.controller.initialize(
+            # Initialize workflow (or resume the unfinished session for this ticker and date)
+            resumed = self.controller.initialize(
                 company_of_interest=ticker.upper(),
                 trade_date=date or datetime.now().strftime("%Y-%m-%d"),
                 selected_analysts=selected_analysts,
@@ -117,7 +122,12 @@ class TradingAnalysisUI:
 
             self.current_state["initialized"] = True
 
-            status = f"✅ Analysis initialized for **{ticker.upper()}**\n\n"
+            if resumed:
+                workflow_state = self.controller.workflow_state
+                status = (f"✅ Resumed the unfinished analysis for **{ticker.upper()}** "
+                          f"({workflow_state.current_analyst_index}/{len(selected_analysts)} analysts approved)\n\n")
+            else:
+                status = f"✅ Analysis initialized for **{ticker.upper()}**\n\n"
             status += f"📅 Date: {date}\n"
             status += f"👥 Analysts: {', '.join(selected_analysts)}\n\n"
             status += "Click **Run Next Analyst** to begin!"
@@ -173,6 +183,54 @@ class TradingAnalysisUI:
         except Exception as e:
             return "Error", f"❌ Exception: {str(e)}", "Error", False, True
 
+    def stream_next_analyst(self) -> Iterator[Tuple[str, str, str, bool, bool]]:
+        """
+        Run the next analyst in a worker thread, yielding the partial report as tokens arrive
+
+        Yields:
+            Same tuples as run_next_analyst; the last one is its final result
+        """
+        channel = f"gradio-{uuid.uuid4().hex}"
+        events = Queue()
+        unsubscribe = get_event_bus().subscribe(events.put, channel=channel, event_types=["llm_start", "token"])
+        result = {}
+
+        def worker():
+            try:
+                with stream_scope(channel):
+                    result["value"] = self.run_next_analyst()
+            finally:
+                events.put(None)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+        node, partial, finished = "", "", False
+        try:
+            while not finished:
+                # Block for one event, then drain the backlog so the UI updates in batches
+                batch = [events.get()]
+                try:
+                    while True:
+                        batch.append(events.get_nowait())
+                except Empty:
+                    pass
+
+                changed = False
+                for event in batch:
+                    if event is None:
+                        finished = True
+                    elif event.type == "llm_start":
+                        node, partial = event.node, ""
+                    else:
+                        partial += event.delta
+                        changed = True
+                if changed and not finished:
+                    yield node, f"# {node}\n\n{partial}", "⏳ Streaming...", False, False
+        finally:
+            unsubscribe()
+
+        yield result["value"]
+
     def process_user_feedback(self, feedback_text: str) -> Tuple[str, bool, bool]:
         """
         Process user feedback on current analyst
@@ -383,18 +441,19 @@ class TradingAnalysisUI:
                 return status, prefs_summary
 
             def run_analyst_handler():
-                name, report, status, show_feedback, show_next = self.run_next_analyst()
-                progress = self.get_progress_info()
-
-                return (
-                    f"### {name}",  # analyst_name_display
-                    report,  # analyst_report_display
-                    status,  # analyst_status
-                    progress,  # progress_bar
-                    gr.update(visible=show_feedback),  # feedback_input
-                    gr.update(visible=show_feedback),  # submit_feedback_button
-                    gr.update(visible=show_next)  # next_analyst_button
-                )
+                # Generator handler: the report fills in as the analyst's tokens stream
+                for name, report, status, show_feedback, show_next in self.stream_next_analyst():
+                    progress = self.get_progress_info()
+
+                    yield (
+                        f"### {name}",  # analyst_name_display
+                        report,  # analyst_report_display
+                        status,  # analyst_status
+                        progress,  # progress_bar
+                        gr.update(visible=show_feedback),  # feedback_input
+                        gr.update(visible=show_feedback),  # submit_feedback_button
+                        gr.update(visible=show_next)  # next_analyst_button
+                    )
 
             def feedback_handler(feedback):
                 result, show_next, show_rerun = self.process_user_feedback(feedback)
@@ -7,6 +7,7 @@ for interactive analysis.
 
 from typing import Dict, Any, Optional
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.streaming import with_streaming_node
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents import (
     create_market_analyst,
@@ -85,6 +86,9 @@ class GraphExecutorHelper:
             if not analyst_func:
                 return (f"Error: Analyst type '{analyst_type}' not found", state)
 
+            # Attribute the analyst's LLM tokens to its graph node name for streaming UIs
+            analyst_func = with_streaming_node(analyst_func, f"{analyst_type.capitalize()} Analyst")
+
             # Add user context to state messages if provided
             if user_context:
                 from langchain_core.messages import HumanMessage
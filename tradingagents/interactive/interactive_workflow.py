@@ -10,6 +10,8 @@ from enum import Enum
 import time
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.checkpointing import checkpoint_thread_id
+from tradingagents.graph.streaming import streaming_node, with_streaming_node
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.trader.trader import create_trader
 from .user_preference_parser import UserPreferences, UserPreferenceParser
@@ -119,23 +121,34 @@ class InteractiveWorkflowController:
         self.executor = create_executor_helper(graph)
 
         self.workflow_state = WorkflowState()
+        # Analyst whose report was awaiting review when the session was restored
+        self._restored_review: Optional[str] = None
 
     def initialize(
         self,
         company_of_interest: str,
         trade_date: str,
         selected_analysts: List[str],
-        user_preference_text: str = ""
-    ):
+        user_preference_text: str = "",
+        resume: bool = True
+    ) -> bool:
         """
-        Initialize the workflow
+        Initialize the workflow, or resume the unfinished session saved for the same
+        ticker, date and analysts
 
         Args:
             company_of_interest: Stock ticker
             trade_date: Analysis date
             selected_analysts: List of analyst types to run
             user_preference_text: User's preference input
+            resume: Restore a saved session instead of starting over
+
+        Returns:
+            True if a saved session was restored
         """
+        if resume and self.rehydrate(company_of_interest, trade_date, selected_analysts):
+            return True
+
         self.workflow_state.stage = WorkflowStage.PREFERENCE_COLLECTION
         self.workflow_state.company_of_interest = company_of_interest
         self.workflow_state.trade_date = trade_date
@@ -173,6 +186,88 @@ class InteractiveWorkflowController:
         )
 
         self._notify_ui("Workflow initialized")
+        self.save_checkpoint()
+        return False
+
+    def rehydrate(
+        self,
+        company_of_interest: str,
+        trade_date: str,
+        selected_analysts: List[str]
+    ) -> bool:
+        """
+        Restore a session saved by an earlier controller (e.g. before a server restart)
+
+        Args:
+            company_of_interest: Stock ticker
+            trade_date: Analysis date
+            selected_analysts: Analyst selection the session was started with
+
+        Returns:
+            True if a saved session with analysts left to run or review was found and restored
+        """
+        checkpointer = self.graph.checkpointer
+        if checkpointer is None:
+            return False
+
+        saved = checkpointer.get_snapshot(
+            self._checkpoint_key(company_of_interest, trade_date, selected_analysts)
+        )
+        if not isinstance(saved, WorkflowState) or saved.stage == WorkflowStage.COMPLETED or saved.is_complete():
+            return False
+
+        # An analyst that was mid-run or failed when the session stopped is run again
+        for analyst_status in saved.analyst_statuses.values():
+            if analyst_status.status in ("running", "error"):
+                analyst_status.status = "pending"
+                analyst_status.start_time = None
+                analyst_status.end_time = None
+        if saved.stage == WorkflowStage.ANALYST_EXECUTION:
+            saved.stage = WorkflowStage.PREFERENCE_COLLECTION
+
+        current_analyst = saved.get_current_analyst()
+        awaiting_review = (
+            saved.stage == WorkflowStage.ANALYST_REVIEW
+            and saved.analyst_statuses[current_analyst].status == "completed"
+        )
+        self._restored_review = current_analyst if awaiting_review else None
+        self.workflow_state = saved
+        self._notify_ui(
+            f"Session restored: {saved.current_analyst_index}/{len(saved.selected_analysts)} analysts approved"
+        )
+        return True
+
+    def save_checkpoint(self):
+        """Persist the workflow state so rehydrate() can restore this session"""
+        checkpointer = self.graph.checkpointer
+        if checkpointer is None or not self.workflow_state.company_of_interest:
+            return
+        try:
+            checkpointer.put_snapshot(self._session_key(), self.workflow_state)
+        except Exception as e:
+            print(f"WARNING: Could not save workflow checkpoint: {e}", flush=True)
+
+    def clear_checkpoint(self):
+        """Delete the saved session once the workflow is complete; there is nothing left to resume"""
+        checkpointer = self.graph.checkpointer
+        if checkpointer is None or not self.workflow_state.company_of_interest:
+            return
+        try:
+            checkpointer.delete_snapshot(self._session_key())
+        except Exception as e:
+            print(f"WARNING: Could not delete workflow checkpoint: {e}", flush=True)
+
+    def _session_key(self) -> str:
+        return self._checkpoint_key(
+            self.workflow_state.company_of_interest,
+            self.workflow_state.trade_date,
+            self.workflow_state.selected_analysts
+        )
+
+    def _checkpoint_key(self, company_of_interest: str, trade_date: str, selected_analysts: List[str]) -> str:
+        return "interactive:" + checkpoint_thread_id(
+            company_of_interest, trade_date, self.graph.config, selected_analysts
+        )
 
     def run_current_analyst(self) -> Dict[str, Any]:
         """
@@ -185,9 +280,19 @@ class InteractiveWorkflowController:
         if not current_analyst:
             return {"error": "No analyst to run"}
 
-        self.workflow_state.stage = WorkflowStage.ANALYST_EXECUTION
-
         analyst_status = self.workflow_state.analyst_statuses[current_analyst]
+
+        restored_review, self._restored_review = self._restored_review, None
+        if restored_review == current_analyst and analyst_status.status == "completed":
+            # Restored while this report awaited review: show it again instead of rerunning
+            return {
+                "analyst": current_analyst,
+                "report": analyst_status.report,
+                "status": "completed",
+                "duration": analyst_status.duration()
+            }
+
+        self.workflow_state.stage = WorkflowStage.ANALYST_EXECUTION
         analyst_status.status = "running"
         analyst_status.start_time = time.time()
 
@@ -234,6 +339,7 @@ class InteractiveWorkflowController:
             self.workflow_state.stage = WorkflowStage.ANALYST_REVIEW
 
             self._notify_ui(f"{current_analyst} analyst completed")
+            self.save_checkpoint()
 
             return {
                 "analyst": current_analyst,
@@ -245,6 +351,8 @@ class InteractiveWorkflowController:
         except Exception as e:
             analyst_status.status = "error"
             analyst_status.end_time = time.time()
+            # Saved so a resumed session reruns this analyst and keeps the ones already done
+            self.save_checkpoint()
             return {
                 "analyst": current_analyst,
                 "error": str(e),
@@ -297,6 +405,7 @@ class InteractiveWorkflowController:
             self._notify_ui(f"{current_analyst} approved, moving to next analyst")
         # For CLARIFY or EXPAND actions, don't advance - stay on current analyst for conversation
 
+        self.save_checkpoint()
         return analysis
 
     def _execute_single_analyst(
@@ -439,7 +548,8 @@ Synthesize these reports into a comprehensive, unified analysis that:
 **Synthesized Analysis:**"""
 
             print("[SYNTHESIS] Calling LLM to generate unified report...", flush=True)
-            response = llm.invoke(synthesis_prompt)
+            with streaming_node("Synthesis"):
+                response = llm.invoke(synthesis_prompt)
             synthesized_report = response.content if hasattr(response, 'content') else str(response)
             print(f"[SYNTHESIS] Generated {len(synthesized_report)} character synthesis", flush=True)
 
@@ -448,7 +558,7 @@ Synthesize these reports into a comprehensive, unified analysis that:
             trading_strategy = ""
             try:
                 # Create trader node
-                trader_node = create_trader(self.graph.deep_thinking_llm, self.graph.trader_memory)
+                trader_node = with_streaming_node(create_trader(self.graph.deep_thinking_llm, self.graph.trader_memory), "Trader")
 
                 # Construct state for trader node
                 # Trader needs: company_of_interest, investment_plan, market_report, sentiment_report,
@@ -524,6 +634,7 @@ Synthesize these reports into a comprehensive, unified analysis that:
 
             self.workflow_state.final_report = final_report
             self.workflow_state.stage = WorkflowStage.COMPLETED
+            self.clear_checkpoint()
 
             return final_report
 
@@ -547,6 +658,7 @@ Note: Automated synthesis failed. Please review individual analyst reports above
 """
             self.workflow_state.final_report = fallback_report
             self.workflow_state.stage = WorkflowStage.COMPLETED
+            self.clear_checkpoint()
             return fallback_report
 
     def _notify_ui(self, message: str):
@@ -0,0 +1,224 @@
+"""
+Log Shipping
+
+Forwards captured stdout to a web UI without slowing down the code that prints.
+Writers pass text through to the console and log file (without flushing) and
+append complete lines to a bounded ring buffer; a background thread ships them
+in batches (one emit per interval or per size limit), filters them by level and
+flushes the streams. Under load, low-priority lines are condensed into a single
+"suppressed" notice instead of being sent one by one.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, Optional, TextIO
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40}
+
+_LEVEL_PATTERNS = [
+    ("ERROR", re.compile(r"ERROR|❌|Traceback|Exception|FAILED", re.IGNORECASE)),
+    ("WARNING", re.compile(r"WARNING|⚠️|\bWARN\b", re.IGNORECASE)),
+    ("DEBUG", re.compile(r"^\s*\[[A-Z_ ]*DEBUG\]|^\s{2,}-\s")),
+    ("SUCCESS", re.compile(r"✅|SUCCESS|\bcomplete\b", re.IGNORECASE)),
+]
+
+# Tag used to group condensed lines, e.g. "[DEBUG]" or "[CSV DEBUG]"
+_TAG_PATTERN = re.compile(r"^\s*(\[[^\]]{1,40}\])")
+
+
+def classify_line(line: str) -> str:
+    """Best-effort log level of a printed line (the codebase prints rather than using logging)"""
+    for level, pattern in _LEVEL_PATTERNS:
+        if pattern.search(line):
+            return level
+    return "INFO"
+
+
+class LogShipper:
+    """
+    Batches printed lines and ships them to a UI from a background thread.
+
+    write() never waits on the UI: it passes text through to the console and log
+    file and appends complete lines to a ring buffer. The shipper thread drains the
+    buffer every flush_interval seconds (or as soon as max_batch_lines are waiting)
+    and calls emit(batch) once per batch.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[List[Dict[str, str]]], None],
+        console: Optional[TextIO] = None,
+        log_file: Optional[TextIO] = None,
+        min_level: str = "INFO",
+        flush_interval: float = 0.25,
+        max_batch_lines: int = 200,
+        max_batch_bytes: int = 64 * 1024,
+        max_buffer: int = 5000,
+        condense_at: float = 0.5,
+    ):
+        """
+        Args:
+            emit: Called from the shipper thread with a list of {"message", "level"} dicts
+            console: Stream all text is passed through to (e.g. the original sys.stdout)
+            log_file: Optional file all text is appended to
+            min_level: Lines below this level are not sent to the UI (console and file still get them)
+            flush_interval: Maximum seconds a line waits before being shipped
+            max_batch_lines: Lines per emit
+            max_batch_bytes: Approximate message bytes per emit
+            max_buffer: Ring buffer size; beyond it the oldest lines are dropped
+            condense_at: Buffer fill ratio above which DEBUG lines are condensed into counts
+        """
+        self.emit = emit
+        self.console = console
+        self.log_file = log_file
+        self.min_level = LEVELS[min_level.upper()]
+        self.flush_interval = flush_interval
+        self.max_batch_lines = max_batch_lines
+        self.max_batch_bytes = max_batch_bytes
+        self.max_buffer = max_buffer
+        self.condense_threshold = int(max_buffer * condense_at)
+
+        self._buffer: Deque[Dict[str, str]] = deque()
+        self._partial: Dict[int, str] = {}  # Unterminated text per writer thread
+        self._condensed: Counter = Counter()
+        self._dropped = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self.stats = {"lines": 0, "shipped": 0, "filtered": 0, "condensed": 0, "dropped": 0, "batches": 0}
+
+        self._thread = threading.Thread(target=self._run, name="log-shipper", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Writer side (called from any thread)
+    # ------------------------------------------------------------------
+
+    def write(self, text: str):
+        if not text:
+            return
+        # Console and log file get every line unchanged; their buffers are flushed by the shipper
+        for stream in (self.console, self.log_file):
+            if stream is not None:
+                stream.write(text)
+
+        thread_id = threading.get_ident()
+        with self._condition:
+            text = self._partial.pop(thread_id, "") + text
+            *lines, rest = text.split("\n")
+            if rest:
+                self._partial[thread_id] = rest
+            for line in lines:
+                if line.strip():
+                    self._enqueue(line)
+            if len(self._buffer) >= self.max_batch_lines:
+                self._condition.notify()
+
+    def _enqueue(self, line: str):
+        self.stats["lines"] += 1
+        level = classify_line(line)
+
+        # Under load, low-priority lines become a count per tag
+        if level == "DEBUG" and len(self._buffer) >= self.condense_threshold:
+            match = _TAG_PATTERN.match(line)
+            self._condensed[match.group(1) if match else "[DEBUG]"] += 1
+            self.stats["condensed"] += 1
+            return
+
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self._dropped += 1
+            self.stats["dropped"] += 1
+        self._buffer.append({"message": line, "level": level})
+
+    def flush(self):
+        """Flush the console and log file; UI lines are shipped by the background thread"""
+        for stream in (self.console, self.log_file):
+            if stream is not None:
+                stream.flush()
+        with self._condition:
+            self._condition.notify()
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every complete line has been shipped; returns whether the buffer emptied"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify()
+            while self._buffer or self._condensed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self):
+        with self._condition:
+            for rest in self._partial.values():
+                if rest.strip():
+                    self._enqueue(rest)
+            self._partial.clear()
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=5)
+
+    # ------------------------------------------------------------------
+    # Shipper thread
+    # ------------------------------------------------------------------
+
+    def _take_batch(self) -> List[Dict[str, str]]:
+        batch: List[Dict[str, str]] = []
+        size = 0
+        while self._buffer and len(batch) < self.max_batch_lines and size < self.max_batch_bytes:
+            entry = self._buffer.popleft()
+            size += len(entry["message"])
+            batch.append(entry)
+        if self._dropped:
+            batch.append({"message": f"… {self._dropped} log lines dropped (UI log buffer full)", "level": "WARNING"})
+            self._dropped = 0
+        if self._condensed and not self._buffer:
+            summary = ", ".join(f"{count} {tag}" for tag, count in self._condensed.most_common())
+            batch.append({"message": f"… suppressed under load: {summary}", "level": "DEBUG"})
+            self._condensed.clear()
+        return batch
+
+    def _run(self):
+        last_ship = time.monotonic()
+        while True:
+            with self._condition:
+                # Wait for a full batch or the end of the interval, whichever comes first
+                while not self._closed and len(self._buffer) < self.max_batch_lines:
+                    remaining = self.flush_interval - (time.monotonic() - last_ship)
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._take_batch()
+                finished = self._closed and not self._buffer
+            last_ship = time.monotonic()
+
+            if batch:
+                self._ship(batch)
+            for stream in (self.console, self.log_file):
+                if stream is not None:
+                    try:
+                        stream.flush()
+                    except Exception:
+                        pass
+            with self._condition:
+                # Wake drain()
+                self._condition.notify_all()
+            if finished:
+                return
+
+    def _ship(self, batch: List[Dict[str, str]]):
+        visible = [entry for entry in batch if LEVELS[entry["level"]] >= self.min_level]
+        self.stats["filtered"] += len(batch) - len(visible)
+        if not visible:
+            return
+        try:
+            self.emit(visible)
+            self.stats["shipped"] += len(visible)
+            self.stats["batches"] += 1
+        except Exception:
+            # A broken UI connection must not take down the analysis
+            pass
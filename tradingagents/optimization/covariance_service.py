@@ -0,0 +1,302 @@
+"""
+Covariance Estimation Service
+Cached, incrementally updated covariance estimators shared by the portfolio optimizers
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+ESTIMATORS = ("sample", "ledoit_wolf", "oas", "ewma")
+
+
+def values_fingerprint(values: np.ndarray) -> str:
+    """Hash of a block of return rows, used to check that cached rows are unchanged"""
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+class IncrementalCovarianceEstimator:
+    """
+    Rolling covariance estimator for a fixed universe and window.
+
+    Keeps running sums of the returns, their outer products and the higher
+    moments Ledoit-Wolf needs, so appending one day of returns costs O(n^2)
+    instead of refitting on the full T x n window (O(T * n^2)).
+    """
+
+    def __init__(self, estimator: str = "ledoit_wolf", window: Optional[int] = None,
+                 ewma_lambda: float = 0.94, refit_every: int = 250):
+        """
+        Args:
+            estimator: One of "sample", "ledoit_wolf", "oas", "ewma"
+            window: Number of most recent observations to use (None = all)
+            ewma_lambda: Decay factor for the EWMA (RiskMetrics) estimator
+            refit_every: Recompute the running sums from scratch after this many
+                rolling updates to bound floating point drift
+        """
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Unknown estimator: {estimator}. Available: {list(ESTIMATORS)}")
+
+        self.estimator = estimator
+        self.window = window
+        self.ewma_lambda = ewma_lambda
+        self.refit_every = refit_every
+
+        self.columns = []
+        self.last_index = None
+        self.n_updates = 0
+        self.fingerprint = None  # values_fingerprint() of the rows in the current window
+        self._rows = deque()
+        self._cov = None
+
+    @property
+    def n_obs(self) -> int:
+        return len(self._rows)
+
+    def fit(self, returns: pd.DataFrame) -> "IncrementalCovarianceEstimator":
+        """Fit from scratch on a returns frame (assets as columns, dates as rows)"""
+        returns = returns.dropna()
+        if self.window is not None:
+            returns = returns.iloc[-self.window:]
+
+        self.columns = returns.columns.tolist()
+        values = returns.values.astype(np.float64)
+        self._rows = deque(values)
+        self.last_index = returns.index[-1] if len(returns) else None
+        self.fingerprint = values_fingerprint(values)
+        self._recompute_sums(values)
+        self._cov = None
+        return self
+
+    def update(self, new_returns: pd.DataFrame) -> "IncrementalCovarianceEstimator":
+        """Append new rows of returns, dropping rows that fall out of the window"""
+        new_returns = new_returns.dropna()
+        for index, row in zip(new_returns.index, new_returns[self.columns].values.astype(np.float64)):
+            self._add(row)
+            if self.window is not None and len(self._rows) > self.window:
+                self._remove(self._rows.popleft())
+            self.last_index = index
+            self.n_updates += 1
+
+        if self.refit_every and self.n_updates >= self.refit_every:
+            self._recompute_sums(np.asarray(self._rows))
+            self.n_updates = 0
+
+        self.fingerprint = values_fingerprint(np.asarray(self._rows).reshape(-1, len(self.columns)))
+        self._cov = None
+        return self
+
+    def covariance(self) -> np.ndarray:
+        """Daily (non-annualized) covariance matrix for the current window"""
+        if self._cov is None:
+            if self.n_obs < 2:
+                raise ValueError("Need at least 2 observations to estimate covariance")
+            estimators = {
+                "sample": self._sample_covariance,
+                "ledoit_wolf": self._ledoit_wolf_covariance,
+                "oas": self._oas_covariance,
+                "ewma": self._ewma_covariance,
+            }
+            self._cov = estimators[self.estimator]()
+        return self._cov
+
+    # ------------------------------------------------------------------
+    # Running sums
+    # ------------------------------------------------------------------
+
+    def _recompute_sums(self, values: np.ndarray):
+        n = len(self.columns)
+        values = values.reshape(-1, n)
+        sq_norms = np.einsum('ij,ij->i', values, values)
+
+        self._sum = values.sum(axis=0)
+        self._sum_outer = values.T @ values
+        self._sum_sq_norm = float(sq_norms.sum())
+        self._sum_sq_norm2 = float((sq_norms ** 2).sum())
+        self._sum_sq_norm_x = sq_norms @ values
+
+        # EWMA recursion seeded by running it over the window (vectorized)
+        lam = self.ewma_lambda
+        if len(values):
+            decay = lam ** np.arange(len(values) - 1, -1, -1)
+            self._ewma = (1 - lam) * (values * decay[:, None]).T @ values
+            self._ewma += (lam ** len(values)) * np.diag(values.var(axis=0))
+        else:
+            self._ewma = np.zeros((n, n))
+
+    def _add(self, row: np.ndarray):
+        sq_norm = float(row @ row)
+        outer = np.outer(row, row)
+        self._rows.append(row)
+        self._sum += row
+        self._sum_outer += outer
+        self._sum_sq_norm += sq_norm
+        self._sum_sq_norm2 += sq_norm ** 2
+        self._sum_sq_norm_x += sq_norm * row
+        self._ewma = self.ewma_lambda * self._ewma + (1 - self.ewma_lambda) * outer
+
+    def _remove(self, row: np.ndarray):
+        sq_norm = float(row @ row)
+        self._sum -= row
+        self._sum_outer -= np.outer(row, row)
+        self._sum_sq_norm -= sq_norm
+        self._sum_sq_norm2 -= sq_norm ** 2
+        self._sum_sq_norm_x -= sq_norm * row
+
+    def _empirical_covariance(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Maximum likelihood covariance (divides by T) and the window mean"""
+        t = self.n_obs
+        mean = self._sum / t
+        emp_cov = self._sum_outer / t - np.outer(mean, mean)
+        return emp_cov, mean
+
+    # ------------------------------------------------------------------
+    # Estimators
+    # ------------------------------------------------------------------
+
+    def _sample_covariance(self) -> np.ndarray:
+        t = self.n_obs
+        emp_cov, _ = self._empirical_covariance()
+        return emp_cov * t / (t - 1)
+
+    def _ledoit_wolf_covariance(self) -> np.ndarray:
+        """Ledoit-Wolf shrinkage towards a scaled identity (matches sklearn.covariance.LedoitWolf)"""
+        t = self.n_obs
+        n = len(self.columns)
+        emp_cov, mean = self._empirical_covariance()
+        mu = np.trace(emp_cov) / n
+
+        # sum_t ||x_t - mean||^4 expanded in terms of the running sums
+        mean_sq = float(mean @ mean)
+        sum_centered_norm4 = (
+            self._sum_sq_norm2
+            + 4 * float(mean @ self._sum_outer @ mean)
+            + t * mean_sq ** 2
+            - 4 * float(mean @ self._sum_sq_norm_x)
+            + 2 * mean_sq * self._sum_sq_norm
+            - 4 * mean_sq * float(mean @ self._sum)
+        )
+
+        delta_ = float(np.sum(emp_cov ** 2))
+        beta = (sum_centered_norm4 / t - delta_) / (n * t)
+        delta = (delta_ - 2 * mu * np.trace(emp_cov) + n * mu ** 2) / n
+        beta = min(beta, delta)
+        shrinkage = 0.0 if beta <= 0 else beta / delta
+
+        return (1 - shrinkage) * emp_cov + shrinkage * mu * np.eye(n)
+
+    def _oas_covariance(self) -> np.ndarray:
+        """Oracle Approximating Shrinkage (matches sklearn.covariance.OAS)"""
+        t = self.n_obs
+        n = len(self.columns)
+        emp_cov, _ = self._empirical_covariance()
+        mu = np.trace(emp_cov) / n
+
+        alpha = float(np.mean(emp_cov ** 2))
+        num = alpha + mu ** 2
+        den = (t + 1) * (alpha - mu ** 2 / n)
+        shrinkage = 1.0 if den == 0 else min(num / den, 1.0)
+
+        return (1 - shrinkage) * emp_cov + shrinkage * mu * np.eye(n)
+
+    def _ewma_covariance(self) -> np.ndarray:
+        """RiskMetrics exponentially weighted covariance (zero-mean returns)"""
+        return self._ewma.copy()
+
+
+class CovarianceService:
+    """
+    Shared cache of covariance estimators keyed by (universe, window, estimator).
+
+    Repeated requests for the same returns frame are served from cache; frames
+    that extend a cached one by new trailing dates are folded in incrementally.
+    A cached estimator is only reused if the rows it has absorbed are unchanged
+    in the new frame (same values, same position); otherwise it is refit.
+    """
+
+    def __init__(self, max_entries: int = 64, ewma_lambda: float = 0.94):
+        self.max_entries = max_entries
+        self.ewma_lambda = ewma_lambda
+        self._cache: "OrderedDict[Tuple, IncrementalCovarianceEstimator]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'incremental_updates': 0, 'full_fits': 0}
+
+    def get_covariance(self, returns: pd.DataFrame, estimator: str = "ledoit_wolf",
+                       window: Optional[int] = None, annualization: int = 252) -> pd.DataFrame:
+        """
+        Get the covariance matrix for a returns frame
+
+        Args:
+            returns: DataFrame with asset returns (assets as columns, dates as rows)
+            estimator: One of "sample", "ledoit_wolf", "oas", "ewma"
+            window: Number of most recent observations to use (None = all)
+            annualization: Factor applied to the daily covariance (1 = daily)
+
+        Returns:
+            Covariance matrix as a DataFrame indexed by the asset columns
+        """
+        returns = returns.dropna()
+        key = (tuple(returns.columns), window, estimator)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+            cov_estimator = self._refresh(key, cached, returns, estimator, window)
+            cov = cov_estimator.covariance()
+
+        return pd.DataFrame(cov * annualization, index=returns.columns, columns=returns.columns)
+
+    def _refresh(self, key: Tuple, cached: Optional[IncrementalCovarianceEstimator],
+                 returns: pd.DataFrame, estimator: str,
+                 window: Optional[int]) -> IncrementalCovarianceEstimator:
+        """Return an estimator that reflects `returns`, reusing the cached one where possible"""
+        if cached is not None and cached.last_index is not None and cached.last_index in returns.index:
+            position = returns.index.get_loc(cached.last_index)
+            reusable = (
+                isinstance(position, int)
+                and (position + 1 if window is None else min(position + 1, window)) == cached.n_obs
+                # Revised history or rescaled data with the same dates must not be served from cache
+                and values_fingerprint(
+                    returns[cached.columns].values[position + 1 - cached.n_obs:position + 1]
+                ) == cached.fingerprint
+            )
+            if reusable:
+                new_rows = returns.iloc[position + 1:]
+                if new_rows.empty:
+                    self.stats['hits'] += 1
+                else:
+                    cached.update(new_rows)
+                    self.stats['incremental_updates'] += 1
+                return cached
+
+        cov_estimator = IncrementalCovarianceEstimator(
+            estimator=estimator, window=window, ewma_lambda=self.ewma_lambda
+        ).fit(returns)
+        self.stats['full_fits'] += 1
+
+        self._cache[key] = cov_estimator
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return cov_estimator
+
+    def clear(self):
+        """Drop all cached estimators"""
+        with self._lock:
+            self._cache.clear()
+
+
+_default_service: Optional[CovarianceService] = None
+
+
+def get_covariance_service() -> CovarianceService:
+    """Process-wide covariance service shared by the portfolio optimizers"""
+    global _default_service
+    if _default_service is None:
+        _default_service = CovarianceService()
+    return _default_service
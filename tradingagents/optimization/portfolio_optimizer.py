@@ -6,40 +6,50 @@ Advanced portfolio optimization methods for institutional investors
 import numpy as np
 import pandas as pd
 from scipy.optimize import minimize
-from sklearn.covariance import LedoitWolf
 import cvxpy as cp
 from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from tradingagents.optimization.covariance_service import CovarianceService, get_covariance_service
+
 
 class EnterprisePortfolioOptimizer:
     """
     Advanced portfolio optimization using multiple sophisticated methods
     """
     
-    def __init__(self, returns_data: pd.DataFrame, risk_free_rate: float = 0.02):
+    def __init__(self, returns_data: pd.DataFrame, risk_free_rate: float = 0.02,
+                 cov_estimator: str = "ledoit_wolf", cov_window: Optional[int] = None,
+                 covariance_service: Optional[CovarianceService] = None):
         """
         Initialize the optimizer with returns data
         
         Args:
             returns_data: DataFrame with asset returns (assets as columns, dates as rows)
             risk_free_rate: Annual risk-free rate (default 2%)
+            cov_estimator: Covariance estimator ("sample", "ledoit_wolf", "oas", "ewma")
+            cov_window: Number of most recent observations for the covariance (None = all)
+            covariance_service: Covariance cache to use (default: shared process-wide service)
         """
         self.returns = returns_data
         self.assets = returns_data.columns.tolist()
         self.n_assets = len(self.assets)
         self.risk_free_rate = risk_free_rate
+        self.cov_estimator = cov_estimator
+        self.cov_window = cov_window
+        self.covariance_service = covariance_service or get_covariance_service()
         
         # Calculate statistics
         self.mean_returns = returns_data.mean() * 252  # Annualized
         self.cov_matrix = self._calculate_covariance_matrix()
         
     def _calculate_covariance_matrix(self) -> np.ndarray:
-        """Calculate robust covariance matrix using Ledoit-Wolf shrinkage"""
-        lw = LedoitWolf()
-        cov_matrix, _ = lw.fit(self.returns).covariance_, lw.shrinkage_
-        return cov_matrix * 252  # Annualized
+        """Calculate robust covariance matrix (Ledoit-Wolf shrinkage by default) via the shared service"""
+        cov_matrix = self.covariance_service.get_covariance(
+            self.returns, estimator=self.cov_estimator, window=self.cov_window
+        )
+        return cov_matrix.values  # Annualized
     
     def markowitz_optimization(self, target_return: Optional[float] = None, 
                              max_weight: float = 0.4) -> Dict:
@@ -0,0 +1,391 @@
+"""
+Walk-Forward Backtester for the Single-Stock Consensus Signal
+Replays the deterministic consensus of OptimizedSingleStockAnalyzer (optionally with
+SingleStockOptimizer's MA/RSI rule as an extra vote) over every historical date in
+vectorized form (no LLM calls)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+try:
+    from arch import arch_model
+    GARCH_AVAILABLE = True
+except ImportError:
+    GARCH_AVAILABLE = False
+
+
+ACTIONS = ['BUY', 'ACCUMULATE', 'HOLD', 'REDUCE', 'SELL']
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+HOLD_CODE = ACTION_CODES['HOLD']
+
+
+@dataclass
+class BacktestConfig:
+    """Walk-forward backtest settings"""
+    lookback: int = 504  # Trailing window for return statistics (the analyst loads 2y of prices)
+    warmup: int = 200  # Days of history required before the first signal
+    risk_free_rate: float = 0.025
+    max_single_position: float = 0.15  # OptimizedSingleStockAnalyzer default portfolio context
+    ma_short: int = 20  # SingleStockOptimizer MA/RSI rule (only voted with include_ma_rsi_vote)
+    ma_long: int = 50
+    rsi_oversold: float = 30.0
+    rsi_overbought: float = 70.0
+    include_kelly_vote: bool = True  # The live consensus votes forecast, weight, Kelly and technical
+    include_ma_rsi_vote: bool = False  # Extra SingleStockOptimizer vote, not part of the live consensus
+    sizing: str = "binary"  # "binary" (full sleeve) or "kelly" (Kelly position / max_single_position)
+    action_exposure: Dict[str, Optional[float]] = field(default_factory=lambda: {
+        'BUY': 1.0, 'ACCUMULATE': 1.0, 'HOLD': None, 'REDUCE': 0.5, 'SELL': 0.0  # None = keep position
+    })
+    vol_regime_scale: Dict[str, float] = field(default_factory=lambda: {
+        'Low Volatility': 1.0, 'Normal Volatility': 1.0, 'High Volatility': 0.5
+    })
+    garch_refit_every: int = 63  # Re-estimate GARCH parameters quarterly on the trailing window
+    transaction_cost_bps: float = 10.0
+
+
+# ----------------------------------------------------------------------
+# Vectorized indicator helpers
+# ----------------------------------------------------------------------
+
+def _rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """OLS slope of the last `window` values against 0..window-1, for every date"""
+    n = len(values)
+    slope = np.full(n, np.nan)
+    if n < window:
+        return slope
+    idx = np.arange(n, dtype=np.float64)
+    s_y = np.concatenate([[0.0], np.cumsum(values)])
+    s_iy = np.concatenate([[0.0], np.cumsum(idx * values)])
+    end = np.arange(window, n + 1)
+    sum_y = s_y[end] - s_y[end - window]
+    sum_iy = s_iy[end] - s_iy[end - window]
+    sum_xy = sum_iy - (end - window) * sum_y  # x measured from the window start
+    x_mean = (window - 1) / 2.0
+    sxx = window * (window ** 2 - 1) / 12.0
+    slope[window - 1:] = (sum_xy - x_mean * sum_y) / sxx
+    return slope
+
+
+def _rsi(prices: pd.Series, periods: int = 14) -> pd.Series:
+    delta = prices.diff()
+    gain = delta.where(delta > 0, 0).rolling(periods).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(periods).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def _garch_volatility(returns: pd.Series, refit_every: int, lookback: int, warmup: int) -> pd.Series:
+    """
+    Out-of-sample one-step GARCH(1,1) daily volatility.
+
+    Parameters are re-estimated every `refit_every` days on the trailing window and
+    the variance recursion between refits runs as a linear filter. Without arch the
+    RiskMetrics EWMA filter (lambda = 0.94) is used throughout.
+    """
+    r = returns.values
+    eps_sq = np.zeros(len(r))
+    variance = np.full(len(r), np.nan)
+    refit_points = list(range(max(warmup, 1), len(r), refit_every))
+
+    prev_var = np.nanvar(r[:warmup]) if len(r) else 0.0
+    prev_params = None
+    for start, stop in zip(refit_points, refit_points[1:] + [len(r)]):
+        mu, omega, alpha, beta = r[max(0, start - lookback):start].mean(), 0.0, 0.06, 0.94
+        if GARCH_AVAILABLE:
+            try:
+                # Warm-start from the previous window's estimate; consecutive windows overlap heavily
+                fitted = arch_model(r[max(0, start - lookback):start] * 100, vol='Garch', p=1, q=1,
+                                    dist='normal').fit(disp='off', starting_values=prev_params)
+                prev_params = fitted.params.values
+                p = fitted.params
+                mu, omega, alpha, beta = p['mu'] / 100, p['omega'] / 10000, p['alpha[1]'], p['beta[1]']
+            except Exception:
+                pass
+        eps_sq[start - 1:stop] = (r[start - 1:stop] - mu) ** 2
+        # sigma2[t] = omega + alpha * eps2[t-1] + beta * sigma2[t-1], seeded from the previous segment
+        drive = omega + alpha * eps_sq[start - 1:stop - 1]
+        segment, _ = lfilter([1.0], [1.0, -beta], drive, zi=[beta * prev_var])
+        variance[start:stop] = segment
+        if len(segment):
+            prev_var = segment[-1]
+
+    return pd.Series(np.sqrt(variance), index=returns.index)
+
+
+def _classify_volatility(annual_vol: np.ndarray) -> np.ndarray:
+    """Vectorized OptimizedSingleStockAnalyzer._classify_volatility"""
+    return np.where(annual_vol < 0.15, 'Low Volatility',
+                    np.where(annual_vol < 0.25, 'Normal Volatility', 'High Volatility'))
+
+
+# ----------------------------------------------------------------------
+# Backtester
+# ----------------------------------------------------------------------
+
+class WalkForwardBacktester:
+    """
+    Historical replay of the single-stock consensus action.
+
+    Every signal at date t uses only prices up to t; the resulting position
+    earns the close-to-close return of t+1.
+    """
+
+    def __init__(self, config: BacktestConfig = None):
+        self.config = config or BacktestConfig()
+
+    def compute_signals(self, prices: pd.Series) -> pd.DataFrame:
+        """
+        Per-date model votes, consensus action, sizing and target position
+
+        Args:
+            prices: Daily close prices for one ticker
+
+        Returns:
+            DataFrame indexed by date with each model's action, the consensus and the position
+        """
+        cfg = self.config
+        prices = prices.dropna().astype(np.float64)
+        returns = prices.pct_change()
+        values = prices.values
+
+        # 1. Statistical ensemble (OptimizedSingleStockAnalyzer._statistical_ensemble_forecast)
+        sma_5, sma_20, sma_50 = (prices.rolling(w).mean() for w in (5, 20, 50))
+        long_term_mean = prices.rolling(200, min_periods=1).mean()
+        momentum_5d = prices / prices.shift(5) - 1
+        deviation = (prices - long_term_mean) / long_term_mean
+        slope_20 = pd.Series(_rolling_slope(values, 20), index=prices.index)
+
+        def vote(bullish, bearish=None):
+            bearish = ~bullish if bearish is None else bearish
+            return np.where(bullish, 1, np.where(bearish, -1, 0))
+
+        ensemble_votes = np.stack([
+            vote(sma_5 > sma_20),
+            vote(sma_20 > sma_50),
+            vote(slope_20 > 0),
+            vote(momentum_5d > 0.02, momentum_5d < -0.02),
+            vote(deviation < -0.15, deviation > 0.15),
+        ])
+        bullish_votes = (ensemble_votes == 1).sum(axis=0)
+        bearish_votes = (ensemble_votes == -1).sum(axis=0)
+        forecast_confidence = np.where(bullish_votes != bearish_votes,
+                                       np.maximum(bullish_votes, bearish_votes) / 5.0, 0.5)
+        forecast_action = np.where(bullish_votes > bearish_votes, 'BUY', 'SELL')
+
+        # 2. Closed-form constrained weight (OptimizedSingleStockAnalyzer._fallback_portfolio_optimization)
+        mu = returns.rolling(cfg.lookback, min_periods=cfg.warmup).mean() * 252
+        sigma = returns.rolling(cfg.lookback, min_periods=cfg.warmup).std() * np.sqrt(252)
+        unconstrained = ((mu - cfg.risk_free_rate) / (2.0 * sigma ** 2)).where(sigma > 0, 0.1)
+        weight = unconstrained.clip(lower=0.05, upper=cfg.max_single_position)
+        optimization_action = np.select(
+            [weight >= 0.20, weight >= 0.15, weight >= 0.08, weight >= 0.03],
+            ['BUY', 'ACCUMULATE', 'HOLD', 'REDUCE'], default='SELL'
+        )
+
+        # 3. Technical RSI/MACD rule (OptimizedSingleStockAnalyzer._technical_to_action)
+        rsi = _rsi(prices)
+        macd = prices.ewm(span=12).mean() - prices.ewm(span=26).mean()
+        macd_signal = macd.ewm(span=9).mean()
+        technical_action = np.select(
+            [(rsi < 30) & (macd > macd_signal), (rsi > 70) & (macd < macd_signal)],
+            ['BUY', 'SELL'], default='HOLD'
+        )
+
+        # 4. MA crossover with RSI override (SingleStockOptimizer._get_current_signal)
+        ma_short = prices.rolling(cfg.ma_short).mean()
+        ma_long = prices.rolling(cfg.ma_long).mean()
+        ma_rsi_action = np.select(
+            [rsi < cfg.rsi_oversold, rsi > cfg.rsi_overbought, ma_short > ma_long],
+            ['BUY', 'SELL', 'BUY'], default='SELL'
+        )
+
+        # 5. Kelly sizing (OptimizedSingleStockAnalyzer._kelly_bootstrap_optimization, point estimate)
+        window = returns.rolling(cfg.lookback, min_periods=cfg.warmup)
+        win_rate = (returns > 0).astype(float).where(returns.notna()).rolling(
+            cfg.lookback, min_periods=cfg.warmup).mean()
+        avg_win = returns.where(returns > 0).rolling(cfg.lookback, min_periods=1).mean().fillna(0.05)
+        avg_loss = (-returns.where(returns < 0)).rolling(cfg.lookback, min_periods=1).mean().fillna(0.03)
+        b = avg_win / avg_loss
+        kelly = ((b * win_rate - (1 - win_rate)) / b).where((avg_win > 0) & (avg_loss > 0), 0.0)
+        volatility = window.std() * np.sqrt(252)
+        vol_adjustment = (0.15 / volatility).clip(upper=1.0).where(volatility > 0, 1.0)
+        kelly_position = (kelly * 0.125 * vol_adjustment).clip(lower=0.02, upper=0.15)
+        kelly_position = kelly_position * np.where(volatility > 0.40, 0.5, np.where(volatility > 0.30, 0.75, 1.0))
+        kelly_action = np.select([kelly_position > 0.15, kelly_position < 0.05], ['BUY', 'SELL'], default='HOLD')
+
+        # 6. GARCH volatility regime
+        garch_vol = _garch_volatility(returns.fillna(0.0), cfg.garch_refit_every, cfg.lookback, cfg.warmup)
+        vol_regime = _classify_volatility((garch_vol * np.sqrt(252)).fillna(np.inf).values)
+
+        # Consensus (OptimizedSingleStockAnalyzer._generate_consensus): majority vote,
+        # ties broken by summed confidence, then by HOLD
+        voters = [
+            (forecast_action, forecast_confidence),
+            (optimization_action, np.full(len(prices), 0.5)),
+        ]
+        if cfg.include_kelly_vote:
+            # Live confidence is 0.7 for a low-variance bootstrap; the point estimate has none
+            voters.append((kelly_action, np.full(len(prices), 0.5)))
+        voters.append((technical_action, np.full(len(prices), 0.6)))
+        if cfg.include_ma_rsi_vote:
+            voters.append((ma_rsi_action, np.full(len(prices), 0.5)))
+
+        rows = np.arange(len(prices))
+        counts = np.zeros((len(prices), len(ACTIONS)))
+        weights = np.zeros((len(prices), len(ACTIONS)))
+        for action, confidence in voters:
+            codes = pd.Series(action).map(ACTION_CODES).values
+            counts[rows, codes] += 1
+            weights[rows, codes] += confidence
+        hold_bias = np.zeros(len(ACTIONS))
+        hold_bias[HOLD_CODE] = 1e-9
+        score = counts * 1e3 + weights + hold_bias
+        consensus_code = score.argmax(axis=1)
+        agreement = counts.max(axis=1) / len(voters)
+
+        # Target position: action exposure (HOLD carries forward), sizing, vol-regime scaling
+        exposure_by_code = np.array([
+            np.nan if cfg.action_exposure[a] is None else cfg.action_exposure[a] for a in ACTIONS
+        ])
+        exposure = pd.Series(exposure_by_code[consensus_code], index=prices.index).ffill().fillna(0.0)
+        if cfg.sizing == "kelly":
+            exposure = exposure * (kelly_position / cfg.max_single_position).fillna(0.0)
+        exposure = exposure * pd.Series(vol_regime, index=prices.index).map(cfg.vol_regime_scale).fillna(1.0)
+
+        signals = pd.DataFrame({
+            'close': prices,
+            'forecast_action': forecast_action,
+            'forecast_confidence': forecast_confidence,
+            'optimization_action': optimization_action,
+            'optimal_weight': weight,
+            'technical_action': technical_action,
+            'ma_rsi_action': ma_rsi_action,
+            'kelly_position': kelly_position,
+            'kelly_action': kelly_action,
+            'garch_volatility': garch_vol * np.sqrt(252),
+            'vol_regime': vol_regime,
+            'consensus_action': np.array(ACTIONS)[consensus_code],
+            'model_agreement': agreement,
+            'position': exposure,
+        }, index=prices.index)
+
+        # No positions before the warm-up window is complete
+        signals.iloc[:cfg.warmup, signals.columns.get_loc('position')] = 0.0
+        return signals
+
+    def backtest_ticker(self, prices: pd.Series) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Walk-forward backtest of one ticker
+
+        Returns:
+            (daily PnL frame, summary metrics dict)
+        """
+        cfg = self.config
+        signals = self.compute_signals(prices)
+        asset_returns = signals['close'].pct_change().fillna(0.0)
+
+        # Position decided at the close of t earns the return of t+1
+        held = signals['position'].shift(1).fillna(0.0)
+        turnover = signals['position'].diff().abs().fillna(signals['position'].abs())
+        costs = turnover.shift(1).fillna(0.0) * cfg.transaction_cost_bps / 10000
+        strategy_returns = held * asset_returns - costs
+
+        daily = pd.DataFrame({
+            'position': held,
+            'asset_return': asset_returns,
+            'strategy_return': strategy_returns,
+            'turnover': turnover,
+            'consensus_action': signals['consensus_action'],
+            'vol_regime': signals['vol_regime'],
+        })
+        daily['equity'] = (1 + strategy_returns).cumprod()
+
+        live = daily.iloc[cfg.warmup + 1:]
+        return daily, self._summarize(live)
+
+    def _summarize(self, daily: pd.DataFrame) -> Dict:
+        n_days = len(daily)
+        if n_days == 0:
+            return {'days': 0}
+
+        strategy = daily['strategy_return']
+        equity = (1 + strategy).cumprod()
+        drawdown = equity / equity.cummax() - 1
+        ann_vol = float(strategy.std() * np.sqrt(252))
+        ann_return = float(equity.iloc[-1] ** (252 / n_days) - 1)
+
+        invested = daily['position'] > 0
+        trades = (daily['turnover'] > 0).sum()
+        active = daily.loc[invested, 'strategy_return']
+        # Direction is only called on invested days; flat days take no view
+        called = (daily['position'] != 0) & (daily['asset_return'] != 0)
+        action_hits = np.sign(daily.loc[called, 'position']) == np.sign(daily.loc[called, 'asset_return'])
+
+        return {
+            'days': n_days,
+            'total_return': float(equity.iloc[-1] - 1),
+            'annualized_return': ann_return,
+            'annualized_volatility': ann_vol,
+            'sharpe_ratio': (ann_return - self.config.risk_free_rate) / ann_vol if ann_vol > 0 else 0.0,
+            'max_drawdown': float(drawdown.min()),
+            'annual_turnover': float(daily['turnover'].sum() * 252 / n_days),
+            'trades': int(trades),
+            'exposure': float(daily['position'].mean()),
+            'hit_rate': float((active > 0).mean()) if len(active) else 0.0,
+            'directional_accuracy': float(action_hits.mean()) if len(action_hits) else 0.0,
+            'buy_and_hold_return': float((1 + daily['asset_return']).prod() - 1),
+        }
+
+
+def _backtest_worker(task: Tuple) -> Tuple[str, pd.DataFrame, Dict]:
+    """Module-level so tickers can be dispatched to worker processes"""
+    ticker, prices, config = task
+    daily, summary = WalkForwardBacktester(config).backtest_ticker(prices)
+    return ticker, daily, summary
+
+
+def run_walk_forward_backtest(price_panel: pd.DataFrame, config: BacktestConfig = None,
+                              n_jobs: int = 1) -> Dict[str, pd.DataFrame]:
+    """
+    Backtest every ticker of a wide close-price panel, optionally across processes
+
+    Args:
+        price_panel: Close prices (dates x tickers), e.g. BulkPriceLoader.load_price_matrix
+        config: Backtest settings
+        n_jobs: Worker processes (-1 = all cores)
+
+    Returns:
+        Dict with 'summary' (one row per ticker), 'pnl' (daily strategy returns),
+        'positions' and 'turnover' (dates x tickers)
+    """
+    config = config or BacktestConfig()
+    tasks = [(ticker, price_panel[ticker].dropna(), config) for ticker in price_panel.columns]
+
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+            results = list(executor.map(_backtest_worker, tasks))
+    else:
+        results = [_backtest_worker(task) for task in tasks]
+
+    return {
+        'summary': pd.DataFrame({ticker: summary for ticker, _, summary in results}).T,
+        'pnl': pd.DataFrame({ticker: daily['strategy_return'] for ticker, daily, _ in results}),
+        'positions': pd.DataFrame({ticker: daily['position'] for ticker, daily, _ in results}),
+        'turnover': pd.DataFrame({ticker: daily['turnover'] for ticker, daily, _ in results}),
+    }
+
+
+def backtest_universe(tickers: Iterable[str], start: str, end: Optional[str] = None,
+                      config: BacktestConfig = None, n_jobs: int = -1) -> Dict[str, pd.DataFrame]:
+    """Load prices for a universe in one batched fetch and run the walk-forward backtest"""
+    from tradingagents.dataflows.price_loader import get_price_loader
+
+    price_panel = get_price_loader().load_price_matrix(tickers, start=start, end=end)
+    return run_walk_forward_backtest(price_panel, config=config, n_jobs=n_jobs)
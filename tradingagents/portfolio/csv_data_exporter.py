@@ -9,6 +9,8 @@ from typing import Dict, Any, List
 from datetime import datetime
 import json
 
+from tradingagents.dataflows.utils import atomic_write_path
+
 class CSVDataExporter:
     """Export structured analysis results to CSV for portfolio aggregation"""
     
@@ -94,7 +96,8 @@ class CSVDataExporter:
         
         df = pd.DataFrame(financial_data)
         file_path = f"{self.csv_dir}/financial_metrics.csv"
-        df.to_csv(file_path, index=False)
+        with atomic_write_path(file_path) as tmp_path:
+            df.to_csv(tmp_path, index=False)
         return file_path
     
     def _export_technical_indicators(self, state: Dict[str, Any]) -> str:
@@ -117,7 +120,8 @@ class CSVDataExporter:
         
         df = pd.DataFrame(technical_data)
         file_path = f"{self.csv_dir}/technical_indicators.csv"
-        df.to_csv(file_path, index=False)
+        with atomic_write_path(file_path) as tmp_path:
+            df.to_csv(tmp_path, index=False)
         return file_path
     
     def _export_risk_metrics(self, state: Dict[str, Any]) -> str:
@@ -138,7 +142,8 @@ class CSVDataExporter:
         
         df = pd.DataFrame(risk_data)
         file_path = f"{self.csv_dir}/risk_metrics.csv"
-        df.to_csv(file_path, index=False)
+        with atomic_write_path(file_path) as tmp_path:
+            df.to_csv(tmp_path, index=False)
         return file_path
     
     def _export_optimization_results(self, state: Dict[str, Any]) -> str:
@@ -165,7 +170,8 @@ class CSVDataExporter:
         if optimization_data:
             df = pd.DataFrame(optimization_data)
             file_path = f"{self.csv_dir}/optimization_scenarios.csv"
-            df.to_csv(file_path, index=False)
+            with atomic_write_path(file_path) as tmp_path:
+                df.to_csv(tmp_path, index=False)
             return file_path
         
         return ""
@@ -238,7 +244,8 @@ class CSVDataExporter:
         if news_data:
             df = pd.DataFrame(news_data) 
             file_path = f"{self.csv_dir}/sentiment_analysis.csv"
-            df.to_csv(file_path, index=False)
+            with atomic_write_path(file_path) as tmp_path:
+                df.to_csv(tmp_path, index=False)
             return file_path
         
         return ""
@@ -262,7 +269,8 @@ class CSVDataExporter:
         
         df = pd.DataFrame(summary_data)
         file_path = f"{self.csv_dir}/summary_metrics.csv"
-        df.to_csv(file_path, index=False)
+        with atomic_write_path(file_path) as tmp_path:
+            df.to_csv(tmp_path, index=False)
         return file_path
     
     def _save_metadata(self, exported_files: Dict[str, str]) -> None:
@@ -277,8 +285,9 @@ class CSVDataExporter:
         }
         
         metadata_path = f"{self.csv_dir}/export_metadata.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        with atomic_write_path(metadata_path) as tmp_path:
+            with open(tmp_path, 'w') as f:
+                json.dump(metadata, f, indent=2)
     
     # Helper methods to extract values from various sources in state
     def _has_fundamental_data(self, state: Dict[str, Any]) -> bool:
@@ -300,11 +309,11 @@ class CSVDataExporter:
         
         # 尝试从股票基本面数据源获取
         try:
-            import yfinance as yf
+            from tradingagents.dataflows.transport import get_transport
             ticker = state.get('company_of_interest', '')
             
             if ticker:
-                stock = yf.Ticker(ticker)
+                stock = get_transport().yf_ticker(ticker)
                 
                 # 尝试获取财务数据
                 try:
@@ -8,10 +8,13 @@ import pandas as pd
 import cvxpy as cp
 from scipy.cluster.hierarchy import dendrogram, linkage
 from scipy.spatial.distance import squareform
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from tradingagents.optimization.covariance_service import CovarianceService, get_covariance_service
+from tradingagents.risk.monte_carlo_engine import MonteCarloRiskEngine, SimulationConfig
+
 
 class MultiScenarioPortfolioOptimizer:
     """
@@ -19,29 +22,38 @@ class MultiScenarioPortfolioOptimizer:
     Each method represents a different investment philosophy
     """
     
-    def __init__(self, returns_data: pd.DataFrame, stock_metrics: Dict[str, Dict]):
+    def __init__(self, returns_data: pd.DataFrame, stock_metrics: Dict[str, Dict],
+                 cov_estimator: str = "sample", cov_window: Optional[int] = None,
+                 covariance_service: Optional[CovarianceService] = None):
         """
         Initialize optimizer
         
         Args:
             returns_data: DataFrame with returns (stocks as columns, dates as rows)
             stock_metrics: Dict of stock metrics from aggregator
+            cov_estimator: Covariance estimator ("sample", "ledoit_wolf", "oas", "ewma")
+            cov_window: Number of most recent observations for the covariance (None = all)
+            covariance_service: Covariance cache to use (default: shared process-wide service)
         """
         self.returns = returns_data
         self.tickers = returns_data.columns.tolist()
         self.n_assets = len(self.tickers)
         self.stock_metrics = stock_metrics
+        self.covariance_service = covariance_service or get_covariance_service()
         
         # Calculate statistics
         self.mean_returns = returns_data.mean() * 252  # Annualized
-        self.cov_matrix = returns_data.cov() * 252  # Annualized
-        self.corr_matrix = returns_data.corr()
+        self.cov_matrix = self.covariance_service.get_covariance(
+            returns_data, estimator=cov_estimator, window=cov_window
+        )  # Annualized
+        vols = np.sqrt(np.diag(self.cov_matrix.values))
+        self.corr_matrix = self.cov_matrix / np.outer(vols, vols)
         
         print(f"Initialized optimizer for {self.n_assets} assets")
         print(f"   Tickers: {', '.join(self.tickers)}")
     
-    def optimize_all_scenarios(self) -> Dict[str, Dict]:
-        """Run all optimization scenarios"""
+    def optimize_all_scenarios(self, simulate_risk: bool = True) -> Dict[str, Dict]:
+        """Run all optimization scenarios (optionally with Monte Carlo risk per scenario)"""
         
         scenarios = {}
         
@@ -86,8 +98,42 @@ class MultiScenarioPortfolioOptimizer:
         
         print(f"\nGenerated {len(scenarios)} portfolio scenarios")
         
+        # Distributional risk for all scenarios in one batched simulation
+        if simulate_risk and scenarios:
+            try:
+                self.simulate_scenario_risk(scenarios)
+                print("   SUCCESS: Monte Carlo risk simulation")
+            except Exception as e:
+                print(f"   ERROR: Monte Carlo risk simulation failed: {e}")
+        
         return scenarios
     
+    def simulate_scenario_risk(self, scenarios: Dict[str, Dict],
+                               config: Optional[SimulationConfig] = None) -> pd.DataFrame:
+        """
+        Attach Monte Carlo VaR/CVaR/drawdown/probability-of-loss metrics to each scenario
+        
+        Args:
+            scenarios: Scenario dicts with 'weights' (modified in place, adds 'monte_carlo')
+            config: Simulation settings (default: 10k bootstrap paths over 21 trading days)
+            
+        Returns:
+            DataFrame of simulated risk metrics indexed by scenario name
+        """
+        engine = MonteCarloRiskEngine(self.returns, config)
+        risk_table = engine.evaluate({name: data['weights'] for name, data in scenarios.items()})
+        
+        for name, row in risk_table.iterrows():
+            scenarios[name]['monte_carlo'] = {
+                'method': risk_table.attrs['method'],
+                'horizon_days': risk_table.attrs['horizon'],
+                'n_paths': risk_table.attrs['n_paths'],
+                'confidence_levels': risk_table.attrs['confidence_levels'],
+                **{metric: float(value) for metric, value in row.items()}
+            }
+        
+        return risk_table
+    
     def max_sharpe_optimization(self) -> Dict:
         """True Maximum Sharpe Ratio optimization"""
         
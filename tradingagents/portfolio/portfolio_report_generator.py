@@ -12,6 +12,7 @@ import matplotlib
 matplotlib.use('Agg')
 from datetime import datetime
 from tradingagents.portfolio.portfolio_trader import PortfolioTrader
+from tradingagents.risk.monte_carlo_engine import level_label, reported_level
 
 
 class PortfolioReportGenerator:
@@ -139,6 +140,8 @@ We tested 6 different portfolio construction strategies:
             
             report += f"| **{scenario_data['method']}** | {scenario_data['philosophy']} | {scenario_data['expected_return']*100:.2f}% | {scenario_data['volatility']*100:.2f}% | {scenario_data['sharpe_ratio']:.3f} | {top_holdings} |\n"
         
+        report += self._create_simulated_risk_table()
+        
         report += """
 
 ### Detailed Scenario Analysis
@@ -366,6 +369,30 @@ Choose based on your investment philosophy:
         
         return report
     
+    def _create_simulated_risk_table(self) -> str:
+        """Monte Carlo risk comparison across scenarios (empty if no simulation was run)"""
+        
+        simulated = {name: data['monte_carlo'] for name, data in self.optimization_scenarios.items() if data.get('monte_carlo')}
+        if not simulated:
+            return ""
+        
+        first = next(iter(simulated.values()))
+        level = reported_level(first)
+        label = level_label(level)
+        table = f"""
+
+### Simulated Risk Comparison ({first['n_paths']} {first['method']} paths, {first['horizon_days']}-day horizon)
+
+| Strategy | Expected Return | VaR {level * 100:g}% | CVaR {level * 100:g}% | Prob. of Loss | Expected Max DD | Max DD {level * 100:g}% |
+|----------|-----------------|---------|----------|---------------|-----------------|------------|
+"""
+        
+        for scenario_name, mc in simulated.items():
+            method = self.optimization_scenarios[scenario_name]['method']
+            table += f"| **{method}** | {mc['expected_return']*100:.2f}% | {mc[f'var_{label}']*100:.2f}% | {mc[f'cvar_{label}']*100:.2f}% | {mc['prob_loss']*100:.1f}% | {mc['expected_max_drawdown']*100:.2f}% | {mc[f'max_drawdown_{label}']*100:.2f}% |\n"
+        
+        return table
+    
     def _generate_correlation_insights(self) -> str:
         """Generate correlation analysis insights"""
         
@@ -8,6 +8,8 @@ from langchain_core.prompts import ChatPromptTemplate
 import json
 import os
 
+from tradingagents.risk.monte_carlo_engine import level_label, reported_level
+
 class PortfolioTrader:
     """LLM-based portfolio trader that makes final allocation decisions"""
 
@@ -220,7 +222,20 @@ Based on this comprehensive analysis, provide your final allocation decision as
 - Portfolio Volatility: {scenario_data.get('volatility', 0)*100:.3f}%
 - Sharpe Ratio: {scenario_data.get('sharpe_ratio', 0):.4f}
 - Risk-Return Efficiency: {"High" if scenario_data.get('sharpe_ratio', 0) > 3.0 else "Moderate" if scenario_data.get('sharpe_ratio', 0) > 2.5 else "Low"}
-
+"""
+            
+            monte_carlo = scenario_data.get('monte_carlo')
+            if monte_carlo:
+                level = reported_level(monte_carlo)
+                label = level_label(level)
+                analysis += f"""
+**Simulated Risk ({monte_carlo['n_paths']} {monte_carlo['method']} paths, {monte_carlo['horizon_days']}-day horizon):**
+- VaR ({level * 100:g}%): {monte_carlo[f'var_{label}']*100:.2f}% | CVaR ({level * 100:g}%): {monte_carlo[f'cvar_{label}']*100:.2f}%
+- Probability of Loss: {monte_carlo['prob_loss']*100:.1f}%
+- Expected Max Drawdown: {monte_carlo['expected_max_drawdown']*100:.2f}% ({level * 100:g}% level: {monte_carlo[f'max_drawdown_{label}']*100:.2f}%)
+"""
+            
+            analysis += """
 **Precise Allocation Weights:**"""
             
             if 'weights' in scenario_data:
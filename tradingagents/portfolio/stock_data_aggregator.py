@@ -10,6 +10,9 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 
+from tradingagents.agents.utils.decision_extraction import extract_decision
+from tradingagents.agents.utils.state_log import load_logged_state
+
 
 class StockDataAggregator:
     """Aggregate and standardize data from multiple stock analyses"""
@@ -26,6 +29,14 @@ class StockDataAggregator:
         if csv_data:
             print(f"SUCCESS: Loaded {ticker} from CSV files")
             return csv_data
+
+        # CSV missing but the run is in the state log: rebuild the CSV files from the logged state
+        from tradingagents.agents.generators.report_outputs import regenerate_csv_data
+        if regenerate_csv_data(ticker, self.base_date):
+            csv_data = self._load_from_csv(ticker)
+            if csv_data:
+                print(f"SUCCESS: Loaded {ticker} from CSV files rebuilt from the state log")
+                return csv_data
         
         # Fallback to MD parsing
         print(f"WARNING: Loading {ticker} from MD parsing (CSV not available)")
@@ -42,12 +53,7 @@ class StockDataAggregator:
                 md_content = f.read()
             
             # Also try to load state for optimization results
-            state_path = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{self.base_date}.json")
-            state = {}
-            if state_path.exists():
-                with open(state_path, 'r') as f:
-                    data = json.load(f)
-                    state = data.get(self.base_date, {})
+            state = load_logged_state(ticker, self.base_date) or {}
             
             # Extract key metrics from MD content
             aggregated_data = {
@@ -223,6 +229,9 @@ class StockDataAggregator:
     
     def _extract_decision_from_md(self, md_content: str) -> str:
         """Extract final decision from MD"""
+        extracted = extract_decision(md_content)
+        if extracted.decision:
+            return extracted.decision
         if 'ACCUMULATE' in md_content.upper():
             return 'BUY'
         elif 'REDUCE' in md_content.upper():
@@ -7,12 +7,13 @@ Real-time monitoring interface for WatsonX trading analysis
 from flask import Flask, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 import threading
-import queue
 import sys
 import os
 from datetime import datetime
 import time
 
+from tradingagents.interactive.log_shipping import LogShipper
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'tradingagents-watsonx-secret'
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -20,7 +21,6 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 # Global state
 analysis_running = False
 analysis_thread = None
-log_queue = queue.Queue()
 current_status = {
     'stage': 'Idle',
     'progress': 0,
@@ -32,29 +32,26 @@ current_status = {
 
 
 class WebUILogger:
-    """Custom logger that emits to web UI"""
-    def __init__(self, original_stdout):
+    """Custom logger that emits to web UI
+
+    Lines are batched by a LogShipper so printing never waits on socket I/O;
+    WEB_UI_LOG_LEVEL (default INFO) sets the lowest level sent to the browser.
+    """
+    def __init__(self, original_stdout, log_file=None):
         self.original_stdout = original_stdout
-        self.log_file = None
+        self.log_file = log_file
+        self.shipper = LogShipper(
+            emit=lambda lines: socketio.emit('log_batch', {'lines': lines}, namespace='/'),
+            console=original_stdout,
+            log_file=log_file,
+            min_level=os.getenv("WEB_UI_LOG_LEVEL", "INFO"),
+        )
 
     def write(self, text):
-        # Write to original stdout
-        self.original_stdout.write(text)
-        self.original_stdout.flush()
-
-        # Emit to web UI
-        if text.strip():
-            socketio.emit('log', {'message': text}, namespace='/')
-
-        # Write to log file
-        if self.log_file:
-            self.log_file.write(text)
-            self.log_file.flush()
+        self.shipper.write(text)
 
     def flush(self):
-        self.original_stdout.flush()
-        if self.log_file:
-            self.log_file.flush()
+        self.shipper.flush()
 
 
 def run_analysis_thread(ticker, analysis_date):
@@ -133,6 +130,9 @@ def run_analysis_thread(ticker, analysis_date):
         current_status['confidence'] = final_state.get('decision_confidence', 'Medium')
         socketio.emit('status', current_status, namespace='/')
 
+        # The decision is shown right away; the report files finish in the background
+        ta.wait_for_artifacts()
+
         # Get result paths
         results_dir = f"results/{ticker}/{analysis_date}"
         socketio.emit('complete', {